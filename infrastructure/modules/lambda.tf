@@ -20,6 +20,7 @@ resource "aws_lambda_function" "ai_analyzer" {
       DEPLOYMENT_TABLE     = aws_dynamodb_table.deployment_history.name
       S3_BUCKET            = var.artifacts_bucket_name
       ENVIRONMENT          = var.environment
+      ANALYSIS_QUEUE_URL   = aws_sqs_queue.analysis_jobs.url
     }
   }
 
@@ -68,6 +69,31 @@ resource "aws_sqs_queue" "lambda_dlq" {
   }
 }
 
+# Async analysis jobs ("async": true enqueues here; the analyzer consumes it and
+# writes stage progress to the ai_analysis table, polled with {"action": "job_status"})
+resource "aws_sqs_queue" "analysis_jobs" {
+  name                       = "${var.app_name}-analysis-jobs"
+  visibility_timeout_seconds = 960  # > Lambda timeout (900s)
+  message_retention_seconds  = 86400
+  receive_wait_time_seconds  = 20
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.lambda_dlq.arn
+    maxReceiveCount     = 3  # ANALYSIS_JOB_MAX_ATTEMPTS
+  })
+
+  tags = {
+    Name = "${var.app_name}-analysis-jobs"
+  }
+}
+
+resource "aws_lambda_event_source_mapping" "analysis_jobs" {
+  event_source_arn        = aws_sqs_queue.analysis_jobs.arn
+  function_name           = aws_lambda_function.ai_analyzer.arn
+  batch_size              = 1
+  function_response_types = ["ReportBatchItemFailures"]
+}
+
 # CloudWatch Log Group for Lambda
 resource "aws_cloudwatch_log_group" "lambda_analyzer" {
   count             = 1
@@ -0,0 +1,125 @@
+"""
+Content-addressed analysis cache
+파일 목록, README, 샘플 파일, 프롬프트 버전, 템플릿 버전, 모델이 같으면 LLM 호출 없이 이전 결과를 재사용합니다.
+"""
+import hashlib
+import json
+import threading
+import time
+from typing import Dict, List, Any, Optional
+
+# DynamoDB 항목 키 prefix (분석 결과 항목과 구분)
+CACHE_KEY_PREFIX = "cache#"
+
+# 기본 TTL: 7일
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+# warm container 동안 누적되는 hit/miss 카운터 (batch item이 동시에 갱신)
+_stats = {"hits": 0, "misses": 0, "errors": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def compute_cache_key(
+    file_list: List[str],
+    readme_content: str,
+    file_samples: Optional[Dict[str, str]],
+    prompt_version: str,
+    model: str,
+    template_version: str = ""
+) -> str:
+    """분석 입력 전체에 대한 SHA-256 해시 (순서 보존, 구분자 포함)"""
+    digest = hashlib.sha256()
+
+    def _feed(label: str, value: str) -> None:
+        digest.update(label.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(value.encode("utf-8"))
+        digest.update(b"\0")
+
+    _feed("prompt_version", prompt_version)
+    # 템플릿이 바뀌면 (templates/registry.version) 이전 결과는 다른 key가 되어 자연스럽게 miss
+    _feed("template_version", template_version)
+    _feed("model", model)
+    for path in file_list:
+        _feed("file", path)
+    _feed("readme", readme_content or "")
+    for name in sorted(file_samples or {}):
+        _feed(f"sample:{name}", file_samples[name] or "")
+
+    return digest.hexdigest()
+
+
+def lookup(table, cache_key: str) -> Optional[Dict[str, Any]]:
+    """
+    캐시 조회. 만료되었거나 없으면 None.
+    DynamoDB TTL 삭제는 지연될 수 있으므로 ttl 값을 직접 확인합니다.
+    """
+    try:
+        resp = table.get_item(Key={"analysis_id": f"{CACHE_KEY_PREFIX}{cache_key}"})
+    except Exception as e:
+        _count("errors")
+        print(f"⚠️ Analysis cache lookup failed: {e}")
+        return None
+
+    item = resp.get("Item")
+    if not item or int(item.get("ttl", 0)) <= int(time.time()):
+        return None
+
+    try:
+        cached = json.loads(item["cached_result"])
+    except (KeyError, TypeError, json.JSONDecodeError) as e:
+        _count("errors")
+        print(f"⚠️ Corrupt analysis cache entry {cache_key[:12]}: {e}")
+        return None
+
+    return cached
+
+
+def record(hit: bool) -> None:
+    """캐시 사용 여부 기록 (포트 충돌 등으로 재사용하지 않은 경우는 miss)"""
+    _count("hits" if hit else "misses")
+
+
+def build_item(
+    cache_key: str,
+    project_info: Dict[str, Any],
+    specs: Dict[str, str],
+    ttl_seconds: int = DEFAULT_TTL_SECONDS
+) -> Dict[str, Any]:
+    """캐시 항목 (batch 모드에서는 batch_write_item으로 모아서 씀)"""
+    now = int(time.time())
+    return {
+        "analysis_id": f"{CACHE_KEY_PREFIX}{cache_key}",
+        "cached_result": json.dumps({"project_info": project_info, "specs": specs}),
+        "created_at": now,
+        "ttl": now + ttl_seconds
+    }
+
+
+def store(
+    table,
+    cache_key: str,
+    project_info: Dict[str, Any],
+    specs: Dict[str, str],
+    ttl_seconds: int = DEFAULT_TTL_SECONDS
+) -> None:
+    """분석 결과를 캐시에 저장 (실패해도 분석 결과에는 영향 없음)"""
+    item = build_item(cache_key, project_info, specs, ttl_seconds)
+
+    try:
+        table.put_item(Item=item)
+        print(f"✅ Cached analysis result: {cache_key[:12]}")
+    except Exception as e:
+        _count("errors")
+        print(f"⚠️ Could not store analysis cache entry: {e}")
+
+
+def stats() -> Dict[str, int]:
+    """현재 container의 hit/miss 카운터 스냅샷"""
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,113 @@
+"""
+Analysis artifact upload
+spec마다 올바른 Content-Type/파일명으로 analysis/<id>/<spec> 객체를 올리고,
+CI가 한 번에 받을 수 있도록 전체 spec + manifest.json을 bundle.tar.gz 하나로 묶어 올립니다.
+같은 prefix에 내용이 같은 객체가 이미 있으면 (ETag = MD5) 다시 올리지 않습니다.
+"""
+import gzip
+import hashlib
+import io
+import json
+import tarfile
+from typing import Any, Dict, Optional, Tuple
+
+# spec 이름 → (bundle 안 파일명, Content-Type)
+ARTIFACTS = {
+    "dockerfile": ("Dockerfile", "text/x-dockerfile; charset=utf-8"),
+    "terraform_ecs": ("terraform_ecs.tf", "text/x-hcl; charset=utf-8"),
+    "terraform_tfvars": ("terraform.tfvars", "text/x-hcl; charset=utf-8"),
+    "appspec": ("appspec.yaml", "application/yaml; charset=utf-8"),
+    "buildspec": ("buildspec.yml", "application/yaml; charset=utf-8"),
+    "recommendations": ("recommendations.md", "text/markdown; charset=utf-8"),
+    "dockerfile_findings": ("dockerfile_findings.json", "application/json; charset=utf-8"),
+}
+DEFAULT_CONTENT_TYPE = "text/plain; charset=utf-8"
+
+BUNDLE_NAME = "bundle.tar.gz"
+MANIFEST_NAME = "manifest.json"
+BUNDLE_CONTENT_TYPE = "application/gzip"
+
+
+def artifact_prefix(analysis_id: str) -> str:
+    return f"analysis/{analysis_id}/"
+
+
+def file_name(spec_name: str) -> str:
+    return ARTIFACTS.get(spec_name, (spec_name, DEFAULT_CONTENT_TYPE))[0]
+
+
+def content_type(spec_name: str) -> str:
+    return ARTIFACTS.get(spec_name, (spec_name, DEFAULT_CONTENT_TYPE))[1]
+
+
+def build_manifest(analysis_id: str, specs: Dict[str, str]) -> Dict[str, Any]:
+    """bundle 안 파일 목록 (spec 이름 → 파일명/sha256/크기/Content-Type)"""
+    files = {}
+    for spec_name in sorted(specs):
+        body = specs[spec_name].encode("utf-8")
+        files[spec_name] = {
+            "path": file_name(spec_name),
+            "sha256": hashlib.sha256(body).hexdigest(),
+            "bytes": len(body),
+            "content_type": content_type(spec_name),
+        }
+    return {"analysis_id": analysis_id, "files": files}
+
+
+def build_bundle(analysis_id: str, specs: Dict[str, str]) -> bytes:
+    """
+    manifest.json + spec 파일 tar.gz.
+    mtime/owner를 고정해서 같은 spec이면 byte 단위로 같은 bundle이 되도록 함 (ETag 비교로 skip 가능)
+    """
+    manifest = build_manifest(analysis_id, specs)
+    entries = [(MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))]
+    entries += [(manifest["files"][name]["path"], specs[name].encode("utf-8")) for name in sorted(specs)]
+
+    raw = io.BytesIO()
+    with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6, mtime=0) as gz:
+        with tarfile.open(fileobj=gz, mode="w", format=tarfile.USTAR_FORMAT) as tar:
+            for path, body in entries:
+                info = tarfile.TarInfo(path)
+                info.size = len(body)
+                info.mode = 0o644
+                info.mtime = 0
+                tar.addfile(info, io.BytesIO(body))
+    return raw.getvalue()
+
+
+def existing_etags(s3, bucket: str, prefix: str) -> Dict[str, str]:
+    """prefix 아래 객체의 ETag (LIST 1회로 여러 HEAD 대신). 실패하면 빈 dict (전부 업로드)"""
+    etags: Dict[str, str] = {}
+    try:
+        kwargs = {"Bucket": bucket, "Prefix": prefix}
+        while True:
+            resp = s3.list_objects_v2(**kwargs)
+            for obj in resp.get("Contents", []):
+                if obj.get("ETag"):
+                    etags[obj["Key"]] = obj["ETag"].strip('"')
+            if not resp.get("IsTruncated"):
+                return etags
+            kwargs["ContinuationToken"] = resp["NextContinuationToken"]
+    except Exception as e:
+        print(f"⚠️ Could not list existing artifacts under {prefix}: {e}")
+        return {}
+
+
+def put(s3, bucket: str, key: str, body: bytes, content_type_value: str,
+        etags: Optional[Dict[str, str]] = None) -> Tuple[str, bool]:
+    """
+    객체 1개 업로드. etags에 같은 MD5가 있으면 건너뜀 (SSE-KMS 등으로 ETag가 MD5가 아니면 항상 업로드).
+    Returns (s3 URL, skipped)
+    """
+    md5 = hashlib.md5(body).hexdigest()
+    url = f"s3://{bucket}/{key}"
+    if etags and etags.get(key) == md5:
+        return url, True
+    s3.put_object(
+        Bucket=bucket,
+        Key=key,
+        Body=body,
+        ContentType=content_type_value,
+        Metadata={"sha256": hashlib.sha256(body).hexdigest()},
+    )
+    return url, False
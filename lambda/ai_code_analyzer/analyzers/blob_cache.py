@@ -0,0 +1,149 @@
+"""
+Git blob content cache
+blob SHA는 내용 기반이므로 한 번 받은 파일 내용은 모든 commit/branch/repository 분석에서 재사용합니다.
+조회 순서: container 메모리 LRU → S3 (blob-cache/v1/<sha[:2]>/<sha>) → GitHub git/blobs API.
+GitHub에서 받은 내용은 SHA를 검증한 뒤 S3와 LRU에 기록합니다.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from analyzers.pipeline import run_parallel
+
+BLOB_PREFIX = "blob-cache/v1"
+
+# warm container 메모리 LRU 크기 (Lambda 1024MB 기준, 이보다 큰 blob은 S3에만 보관)
+DEFAULT_LRU_MAX_BYTES = int(os.getenv("BLOB_CACHE_LRU_MAX_BYTES", str(32 * 1024 * 1024)))
+
+FetchBlob = Callable[[str], bytes]
+
+
+def blob_key(sha: str) -> str:
+    return f"{BLOB_PREFIX}/{sha[:2]}/{sha}"
+
+
+def git_blob_sha(content: bytes) -> str:
+    """git hash-object와 같은 SHA-1 ("blob <size>\\0" + 내용)"""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+class _LRU:
+    """byte 크기 기준 LRU (thread-safe)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sha: str) -> Optional[bytes]:
+        with self._lock:
+            content = self._items.get(sha)
+            if content is not None:
+                self._items.move_to_end(sha)
+            return content
+
+    def put(self, sha: str, content: bytes) -> None:
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            if sha in self._items:
+                self._items.move_to_end(sha)
+                return
+            self._items[sha] = content
+            self.size += len(content)
+            while self.size > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+
+_memory = _LRU(DEFAULT_LRU_MAX_BYTES)
+
+# warm container 동안 누적되는 계층별 hit 카운터
+_stats = {"memory_hits": 0, "s3_hits": 0, "fetched": 0, "errors": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def _load(s3, bucket: Optional[str], sha: str, fetch: FetchBlob) -> Optional[bytes]:
+    content = _memory.get(sha)
+    if content is not None:
+        _count("memory_hits")
+        return content
+
+    if bucket:
+        try:
+            content = s3.get_object(Bucket=bucket, Key=blob_key(sha))["Body"].read()
+        except Exception:
+            content = None
+        if content is not None:
+            _count("s3_hits")
+            _memory.put(sha, content)
+            return content
+
+    content = fetch(sha)
+    if git_blob_sha(content) != sha:
+        raise ValueError(f"blob {sha[:12]} content does not match its SHA")
+    _count("fetched")
+    _memory.put(sha, content)
+    if bucket:
+        try:
+            s3.put_object(
+                Bucket=bucket, Key=blob_key(sha), Body=content, ContentType="application/octet-stream"
+            )
+        except Exception as e:
+            print(f"⚠️ Could not store blob {sha[:12]} in cache: {e}")
+    return content
+
+
+def get_many(
+    s3,
+    bucket: Optional[str],
+    blobs: Dict[str, str],
+    fetch: FetchBlob,
+    concurrent: bool = True
+) -> Dict[str, str]:
+    """
+    {path: blob sha} → {path: utf-8 내용}. 같은 SHA는 한 번만 조회하고 병렬로 가져옵니다.
+    조회 실패/바이너리 파일은 결과에서 빠집니다.
+    """
+    unique = sorted(set(blobs.values()))
+    contents, errors = run_parallel(
+        {sha: (lambda sha=sha: _load(s3, bucket, sha, fetch)) for sha in unique},
+        concurrent=concurrent
+    )
+    for sha, e in errors.items():
+        _count("errors")
+        print(f"⚠️ Could not load blob {sha[:12]}: {e}")
+
+    texts: Dict[str, str] = {}
+    for path, sha in blobs.items():
+        content = contents.get(sha)
+        if content is None:
+            continue
+        try:
+            texts[path] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            continue
+    return texts
+
+
+def stats() -> Dict[str, int]:
+    with _stats_lock:
+        return {**_stats, "memory_bytes": _memory.size}
+
+
+def clear_memory() -> None:
+    """테스트/replay용: container LRU 비우기"""
+    _memory.clear()
@@ -0,0 +1,276 @@
+"""
+Image size / cold build time estimate
+최종 stage의 base image, builder image, 의존성 manifest로 대략적인 image 크기와 cold build 시간을 추정하고,
+실제 빌드 결과(record_actuals)가 쌓이면 repository / base image 단위 보정 계수를 적용합니다.
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from analyzers import rule_detector
+from analyzers.dockerfile_validator import stage_images
+
+STATS_KEY_PREFIX = "buildstats#"
+
+# (image 이름, variant) → 압축 해제 후 크기(MB), docker images 기준 대략값
+BASE_IMAGE_SIZES_MB = {
+    ("python", "slim"): 125, ("python", "alpine"): 55, ("python", "full"): 1020,
+    ("node", "alpine"): 135, ("node", "slim"): 200, ("node", "full"): 1100,
+    ("golang", "alpine"): 250, ("golang", "full"): 815,
+    ("rust", "slim"): 800, ("rust", "alpine"): 850, ("rust", "full"): 1500,
+    ("alpine", "full"): 8,
+    ("debian", "slim"): 75, ("debian", "full"): 120, ("ubuntu", "full"): 78,
+    ("eclipse-temurin", "jre"): 190, ("eclipse-temurin", "jdk"): 330, ("eclipse-temurin", "full"): 430,
+    ("openjdk", "slim"): 420, ("openjdk", "full"): 470,
+    ("maven", "full"): 500, ("gradle", "full"): 700,
+    ("nginx", "alpine"): 45, ("nginx", "full"): 190,
+    ("distroless", "static"): 2, ("distroless", "full"): 20,
+    ("scratch", "full"): 0,
+}
+UNKNOWN_BASE_IMAGE_MB = 300
+
+# 언어별 의존성 하나당 평균 (설치 크기 MB, 설치/빌드 초)
+ECOSYSTEM_COSTS = {
+    "python": (4.0, 1.5),
+    "node": (6.0, 1.0),
+    "go": (0.5, 3.0),
+    "rust": (0.3, 10.0),
+    "java": (1.5, 1.0),
+}
+# 의존성을 알 수 없을 때 가정하는 개수
+DEFAULT_DEPENDENCY_COUNT = 15
+
+# 컴파일 언어는 최종 image에 binary만 남음 (MB, 기본 빌드 초)
+COMPILED_ARTIFACTS = {"go": (15, 20), "rust": (10, 60), "java": (20, 40)}
+
+# 크기가 큰 패키지 (설치 크기 MB, transitive 포함 대략값)
+HEAVY_PACKAGES_MB = {
+    "torch": 900, "tensorflow": 1100, "tensorflow-cpu": 600, "jax": 250, "jaxlib": 250,
+    "xgboost": 200, "pyarrow": 120, "scipy": 110, "opencv-python": 90, "opencv-python-headless": 60,
+    "boto3": 90, "pandas": 70, "scikit-learn": 45, "numpy": 40, "matplotlib": 40, "spacy": 50,
+    "streamlit": 250, "transformers": 40, "grpcio": 15,
+    "puppeteer": 300, "next": 120, "@prisma/client": 60, "prisma": 60, "aws-sdk": 90, "sharp": 30,
+}
+
+PULL_MB_PER_SECOND = 60
+PUSH_MB_PER_SECOND = 40
+FIXED_BUILD_OVERHEAD_SECONDS = 15
+LARGE_IMAGE_WARNING_MB = 1024
+
+# 보정 계수 범위 (이상치 한 건이 추정을 망치지 않도록)
+MIN_FACTOR, MAX_FACTOR = 0.25, 4.0
+
+
+def base_image_size_mb(image: str) -> Tuple[int, bool]:
+    """Returns (크기 MB, table에 있는 image인지)"""
+    name, _, tag = image.lower().rpartition("@")[2].partition(":")
+    if "distroless" in name:
+        return BASE_IMAGE_SIZES_MB[("distroless", "static" if "static" in name else "full")], True
+    name = name.rsplit("/", 1)[-1]
+
+    for variant in ("alpine", "slim", "jre", "jdk"):
+        if variant in tag and (name, variant) in BASE_IMAGE_SIZES_MB:
+            return BASE_IMAGE_SIZES_MB[(name, variant)], True
+    if (name, "full") in BASE_IMAGE_SIZES_MB:
+        return BASE_IMAGE_SIZES_MB[(name, "full")], True
+    return UNKNOWN_BASE_IMAGE_MB, False
+
+
+def _ecosystem(project_info: Dict[str, Any]) -> str:
+    language = (project_info.get("primary_language") or "").lower()
+    if "python" in language:
+        return "python"
+    if "javascript" in language or "typescript" in language:
+        return "node"
+    if language in ("go", "golang"):
+        return "go"
+    if "rust" in language:
+        return "rust"
+    if "java" in language or "kotlin" in language:
+        return "java"
+    return "python"
+
+
+def _dependencies(ecosystem: str, file_samples: Dict[str, str]) -> Optional[List[str]]:
+    """root manifest의 의존성 이름 (manifest 내용이 없으면 None)"""
+    if ecosystem == "python":
+        names = None
+        if "requirements.txt" in file_samples:
+            names = set(rule_detector.parse_requirements(file_samples["requirements.txt"]))
+        if "pyproject.toml" in file_samples:
+            names = (names or set()) | rule_detector.parse_pyproject(file_samples["pyproject.toml"])
+        return sorted(names) if names is not None else None
+    if ecosystem == "node" and "package.json" in file_samples:
+        package = rule_detector.parse_package_json(file_samples["package.json"])
+        return sorted(package.get("dependencies") or {})
+    if ecosystem == "go" and "go.mod" in file_samples:
+        return sorted(rule_detector.parse_go_mod(file_samples["go.mod"])["requires"])
+    if ecosystem == "rust" and "Cargo.toml" in file_samples:
+        return sorted(rule_detector.parse_cargo_toml(file_samples["Cargo.toml"]))
+    return None
+
+
+def stats_keys(repository: str, base_image: str) -> Dict[str, str]:
+    """보정 통계 항목 key (repository 단위, 최종 base image 단위)"""
+    return {
+        "repository": f"{STATS_KEY_PREFIX}repo#{repository}",
+        "base_image": f"{STATS_KEY_PREFIX}image#{base_image}",
+    }
+
+
+def load_history(table, repository: str, base_image: str) -> Dict[str, Dict[str, Any]]:
+    """repository / base image 보정 통계 (없으면 빈 dict)"""
+    history = {}
+    for scope, key in stats_keys(repository, base_image).items():
+        item = table.get_item(Key={"analysis_id": key}).get("Item")
+        if item and int(item.get("samples", 0)) > 0:
+            history[scope] = item
+    return history
+
+
+def _calibration(history: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """repository 실측이 있으면 우선, 없으면 같은 base image 실측 평균"""
+    for scope, min_samples in (("repository", 1), ("base_image", 3)):
+        item = (history or {}).get(scope)
+        if not item or int(item["samples"]) < min_samples:
+            continue
+        samples = int(item["samples"])
+
+        def _factor(total) -> float:
+            return round(min(MAX_FACTOR, max(MIN_FACTOR, float(total) / samples)), 3)
+
+        return {
+            "source": scope,
+            "samples": samples,
+            "size_factor": _factor(item.get("size_ratio_sum", samples)),
+            "time_factor": _factor(item.get("time_ratio_sum", samples)),
+        }
+    return {"source": "none", "samples": 0, "size_factor": 1.0, "time_factor": 1.0}
+
+
+def estimate(
+    dockerfile: str,
+    project_info: Dict[str, Any],
+    file_samples: Optional[Dict[str, str]] = None,
+    history: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """image 크기(MB)와 cold build 시간(초) 추정"""
+    stages = stage_images(dockerfile) if dockerfile else []
+    stage_names = {name: image for name, image in stages}
+    # FROM <이전 stage> 는 그 stage의 image로 치환
+    images = [stage_names.get(image, image) for _, image in stages]
+    final_image = images[-1] if images else "unknown"
+    builder_images = sorted(set(images[:-1]) - {final_image})
+
+    ecosystem = _ecosystem(project_info)
+    dependencies = _dependencies(ecosystem, file_samples or {})
+    dependency_count = len(dependencies) if dependencies is not None else DEFAULT_DEPENDENCY_COUNT
+    heavy = {name: HEAVY_PACKAGES_MB[name] for name in dependencies or [] if name in HEAVY_PACKAGES_MB}
+    per_dep_mb, per_dep_seconds = ECOSYSTEM_COSTS[ecosystem]
+
+    final_base_mb, final_known = base_image_size_mb(final_image)
+    builder_mb = sum(base_image_size_mb(image)[0] for image in builder_images)
+
+    if ecosystem in COMPILED_ARTIFACTS and builder_images:
+        # 의존성은 builder에만 있고 최종 image에는 binary만 복사
+        artifact_mb, base_build_seconds = COMPILED_ARTIFACTS[ecosystem]
+        content_mb = artifact_mb + dependency_count * per_dep_mb
+        install_mb = dependency_count * per_dep_mb
+    else:
+        light = dependency_count - len(heavy)
+        content_mb = light * per_dep_mb + sum(heavy.values())
+        install_mb = content_mb
+        base_build_seconds = 0
+
+    model_size_mb = final_base_mb + content_mb
+    model_build_seconds = (
+        FIXED_BUILD_OVERHEAD_SECONDS
+        + base_build_seconds
+        + (final_base_mb + builder_mb) / PULL_MB_PER_SECOND
+        + dependency_count * per_dep_seconds
+        + install_mb / PULL_MB_PER_SECOND
+        + model_size_mb / PUSH_MB_PER_SECOND
+    )
+
+    calibration = _calibration(history)
+    image_size_mb = round(model_size_mb * calibration["size_factor"])
+    build_seconds = round(model_build_seconds * calibration["time_factor"])
+
+    if calibration["source"] == "repository" and calibration["samples"] >= 3:
+        confidence = "high"
+    elif calibration["source"] != "none" or (dependencies is not None and final_known):
+        confidence = "medium"
+    else:
+        confidence = "low"
+
+    result = {
+        "image_size_mb": image_size_mb,
+        "build_seconds": build_seconds,
+        "base_image": final_image,
+        "builder_images": builder_images,
+        "ecosystem": ecosystem,
+        "dependency_count": dependency_count,
+        "dependencies_known": dependencies is not None,
+        "heavy_dependencies": heavy,
+        "confidence": confidence,
+        "calibration": calibration,
+        # 보정 전 모델 값 (실측 비율 계산용)
+        "model_image_size_mb": round(model_size_mb, 1),
+        "model_build_seconds": round(model_build_seconds, 1),
+    }
+    if image_size_mb >= LARGE_IMAGE_WARNING_MB:
+        result["warning"] = f"Estimated image size {image_size_mb / 1024:.1f} GB exceeds {LARGE_IMAGE_WARNING_MB} MB"
+    return result
+
+
+def summary_text(build_estimate: Dict[str, Any]) -> str:
+    """PR comment / recommendation용 한 줄 요약"""
+    text = (
+        f"📦 Estimated image ~{build_estimate['image_size_mb']} MB ({build_estimate['base_image']}), "
+        f"cold build ~{build_estimate['build_seconds']}s ({build_estimate['confidence']} confidence)"
+    )
+    if build_estimate.get("warning"):
+        text += f" ⚠️ {build_estimate['warning']}"
+    return text
+
+
+def record_actuals(
+    table,
+    analysis_id: str,
+    repository: str,
+    build_estimate: Optional[Dict[str, Any]],
+    image_size_mb: float,
+    build_seconds: float
+) -> Dict[str, Any]:
+    """
+    실제 빌드 결과를 분석 항목에 기록하고, 추정값이 있으면 보정 통계(ADD)를 갱신.
+    비율은 보정 전 모델 값 기준이므로 보정이 누적되어 발산하지 않습니다.
+    """
+    actuals = {
+        "image_size_mb": Decimal(str(round(image_size_mb, 1))),
+        "build_seconds": Decimal(str(round(build_seconds, 1))),
+        "recorded_at": datetime.now(timezone.utc).isoformat()
+    }
+    table.update_item(
+        Key={"analysis_id": analysis_id},
+        UpdateExpression="SET build_actuals = :actuals",
+        ExpressionAttributeValues={":actuals": actuals}
+    )
+
+    if not build_estimate or not build_estimate.get("model_image_size_mb") or not build_estimate.get("model_build_seconds"):
+        return {"calibrated": False}
+
+    size_ratio = image_size_mb / build_estimate["model_image_size_mb"]
+    time_ratio = build_seconds / build_estimate["model_build_seconds"]
+    for key in stats_keys(repository, build_estimate.get("base_image", "unknown")).values():
+        table.update_item(
+            Key={"analysis_id": key},
+            UpdateExpression="ADD samples :one, size_ratio_sum :size, time_ratio_sum :time SET updated_at = :now",
+            ExpressionAttributeValues={
+                ":one": 1,
+                ":size": Decimal(str(round(size_ratio, 4))),
+                ":time": Decimal(str(round(time_ratio, 4))),
+                ":now": actuals["recorded_at"]
+            }
+        )
+    return {"calibrated": True, "size_ratio": round(size_ratio, 3), "time_ratio": round(time_ratio, 3)}
@@ -0,0 +1,164 @@
+"""
+Active deployments index
+repository별 배포 요약(port/cpu/memory/language/framework)을 하나의 index 항목에 attribute로 유지합니다.
+포트 충돌 확인은 get_item 한 번으로 끝나며, project_info JSON을 파싱하지 않습니다.
+index 항목이 없을 때의 첫 갱신은 기존 분석 항목 전체로 index를 채운 뒤 적용합니다 (backfill).
+"""
+import threading
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from botocore.exceptions import ClientError
+
+INDEX_ITEM_KEY = "index#active-deployments"
+REPO_ATTR_PREFIX = "repo#"
+
+# UpdateExpression 크기 제한(4KB) 안에서 한 번에 갱신할 repository 수
+MAX_SUMMARIES_PER_UPDATE = 25
+
+
+def _plain(value: Any) -> Any:
+    """DynamoDB Decimal → int/float"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def build_summary(
+    repository: str,
+    analysis_id: str,
+    project_info: Dict[str, Any],
+    cpu: int,
+    memory: int
+) -> Dict[str, Any]:
+    """index에 저장할 compact 요약"""
+    return {
+        "repository": repository,
+        "analysis_id": analysis_id,
+        "port": int(project_info.get("app_port", 8000)),
+        "language": project_info.get("primary_language") or "Unknown",
+        "framework": project_info.get("primary_framework") or "None",
+        "cpu": int(cpu),
+        "memory": int(memory),
+        "updated_at": datetime.now(timezone.utc).isoformat()
+    }
+
+
+LoadAll = Callable[[], List[Dict[str, Any]]]
+
+
+def _is_conditional_failure(error: Exception) -> bool:
+    return (
+        isinstance(error, ClientError)
+        and error.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException"
+    )
+
+
+def record_deployment(table, summary: Dict[str, Any], load_all: Optional[LoadAll] = None) -> None:
+    """
+    repository 요약 갱신. repository마다 별도 top-level attribute이므로
+    동시에 다른 repo를 갱신해도 서로 덮어쓰지 않습니다.
+    """
+    record_deployments(table, [summary], load_all)
+
+
+def _update(table, summaries: List[Dict[str, Any]], condition: Optional[str]) -> None:
+    for start in range(0, len(summaries), MAX_SUMMARIES_PER_UPDATE):
+        chunk = summaries[start:start + MAX_SUMMARIES_PER_UPDATE]
+        kwargs = {"ConditionExpression": condition} if condition else {}
+        table.update_item(
+            Key={"analysis_id": INDEX_ITEM_KEY},
+            UpdateExpression="SET " + ", ".join(f"#repo{i} = :summary{i}" for i in range(len(chunk))),
+            ExpressionAttributeNames={
+                f"#repo{i}": f"{REPO_ATTR_PREFIX}{summary['repository']}" for i, summary in enumerate(chunk)
+            },
+            ExpressionAttributeValues={f":summary{i}": summary for i, summary in enumerate(chunk)},
+            **kwargs
+        )
+
+
+def record_deployments(table, summaries: List[Dict[str, Any]], load_all: Optional[LoadAll] = None) -> None:
+    """
+    여러 repository 요약을 update_item 하나(최대 MAX_SUMMARIES_PER_UPDATE개)로 갱신.
+    index 항목이 있을 때만 갱신하고, 없으면 load_all()(기존 분석 항목의 repository별 최신 요약)로
+    전체를 먼저 기록합니다. 이 repo 하나만 담긴 index가 생기면 이전 배포가 충돌 확인에서 빠지기 때문입니다.
+    load_all이 실패하면 예외를 그대로 올려 index를 만들지 않습니다 (조회는 계속 scan으로 대체).
+    """
+    # 같은 attribute를 한 expression에서 두 번 SET 할 수 없으므로 repository별 마지막 요약만 사용
+    latest = list({summary["repository"]: summary for summary in summaries}.values())
+    if not latest:
+        return
+
+    try:
+        _update(table, latest, "attribute_exists(analysis_id)")
+        return
+    except ClientError as e:
+        if not _is_conditional_failure(e) or load_all is None:
+            raise
+
+    existing = load_all()
+    print(f"🗂️ Backfilling deployment index with {len(existing)} existing deployments")
+    backfill = {summary["repository"]: summary for summary in existing}
+    backfill.update({summary["repository"]: summary for summary in latest})
+    _update(table, list(backfill.values()), None)
+
+
+def read_deployments(table) -> Optional[List[Dict[str, Any]]]:
+    """index 전체 읽기. index 항목이 아직 없으면 None (호출자가 scan으로 대체)"""
+    resp = table.get_item(Key={"analysis_id": INDEX_ITEM_KEY}, ConsistentRead=True)
+    item = resp.get("Item")
+    if item is None:
+        return None
+
+    return [
+        _plain(value)
+        for name, value in item.items()
+        if name.startswith(REPO_ATTR_PREFIX) and isinstance(value, dict)
+    ]
+
+
+class DeploymentRegistry:
+    """
+    invocation(또는 batch) 동안 공유하는 배포 목록.
+    같은 batch에서 먼저 분석된 repo의 포트도 충돌 확인에 포함됩니다.
+    """
+
+    def __init__(self, deployments: List[Dict[str, Any]]):
+        self._deployments = {dep.get("repository"): dep for dep in deployments}
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._deployments.values())
+
+    def _used_ports(self, repository: str) -> Set[int]:
+        return {
+            dep.get("port") for repo, dep in self._deployments.items()
+            if repo != repository and dep.get("port") is not None
+        }
+
+    def claim(
+        self,
+        repository: str,
+        project_info: Dict[str, Any],
+        assign: Optional[Callable[[Dict[str, Any], Set[int]], Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        repository의 포트를 등록. assign이 있으면 다른 repo와 겹치지 않게 먼저 조정합니다
+        (확인과 등록이 lock 안에서 함께 일어나므로 batch 안에서 같은 포트를 두 번 주지 않음).
+        """
+        with self._lock:
+            if assign is not None:
+                project_info = assign(project_info, self._used_ports(repository))
+            self._deployments[repository] = {
+                "repository": repository,
+                "port": int(project_info.get("app_port", 8000)),
+                "language": project_info.get("primary_language") or "Unknown",
+                "framework": project_info.get("primary_framework") or "None",
+            }
+        return project_info
@@ -0,0 +1,597 @@
+"""
+Static Dockerfile validator / optimizer
+생성된 Dockerfile을 instruction 단위로 파싱해서 layer cache 순서, pip/apk cache, multi-stage에서
+빠지는 site-packages, EXPOSE/CMD 포트 불일치, repository에 없는 lockfile을 전제로 한 설치 명령을 확인합니다.
+안전한 경우에만 자동으로 고치고, 모든 결과는 findings report로 남깁니다.
+"""
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+SEVERITY_ORDER = ("error", "warning", "info")
+
+# 의존성 설치로 간주하는 명령 (manifest만 있으면 실행 가능)
+_PIP_INSTALL = re.compile(r"\b(?:pip3?|python3?\s+-m\s+pip)\s+install\b")
+_PIP_REQUIREMENT = re.compile(r"(?:-r|--requirement)[=\s]+(\S+)")
+_PIP_DEST = re.compile(r"--(prefix|target|root)[=\s]+(\S+)|\s-t\s+(\S+)")
+_NODE_INSTALL = re.compile(r"^(npm\s+(?:ci|install|i)|yarn(?:\s+install)?|pnpm\s+(?:install|i))((?:\s+-[\w-]+(?:=\S+)?)*)\s*$")
+_GO_DOWNLOAD = re.compile(r"^go\s+mod\s+download\b")
+_BUNDLE_INSTALL = re.compile(r"^bundle\s+install\b")
+_COMPOSER_INSTALL = re.compile(r"^composer\s+install\b")
+_POETRY_INSTALL = re.compile(r"^poetry\s+install\b.*--no-root")
+_PIP_UPGRADE = re.compile(r"^(?:pip3?|python3?\s+-m\s+pip)\s+install\s+(?:-U|--upgrade)\s+pip(?:\s+setuptools)?(?:\s+wheel)?\s*$")
+_VENV = re.compile(r"\bpython3?\s+-m\s+venv\s+(\S+)")
+_RUN_FLAGS = re.compile(r"^(?:--(?:mount|network|security)=\S+\s+)+")
+
+# lockfile이 있어야만 성공하는 설치 명령 → 필요한 lockfile 중 하나
+_LOCKFILE_COMMANDS = [
+    (re.compile(r"\bnpm\s+ci\b"), ("package-lock.json", "npm-shrinkwrap.json"), "npm-ci-without-lockfile"),
+    (re.compile(r"\byarn(?:\s+install)?\b[^&;|]*\s--frozen-lockfile\b"), ("yarn.lock",), "frozen-lockfile-missing"),
+    (re.compile(r"\bpnpm\s+(?:install|i)\b[^&;|]*\s--frozen-lockfile\b"), ("pnpm-lock.yaml",), "frozen-lockfile-missing"),
+]
+_POETRY_NO_DEV = re.compile(r"(\bpoetry\s+install\b[^&;|]*?)\s--no-dev\b")
+# COPY source로 쓰였는데 repository에 없으면 build가 실패하는 lockfile
+LOCKFILE_NAMES = {
+    "package-lock.json", "npm-shrinkwrap.json", "yarn.lock", "pnpm-lock.yaml",
+    "poetry.lock", "uv.lock", "Pipfile.lock", "go.sum", "Cargo.lock", "Gemfile.lock", "composer.lock",
+}
+
+# CMD/ENTRYPOINT에서 app이 listen하는 포트 (bind/listen 인자만 — redis://localhost:6379 같은 의존성 주소는 제외)
+_PORT_PATTERNS = [
+    re.compile(r"(--port(?:\"\s*,\s*\"|[=\s]+))(\d{2,5})\b"),
+    re.compile(r"(--server\.port(?:\"\s*,\s*\"|[=\s]+))(\d{2,5})\b"),
+    re.compile(r"((?<![\w-])(?:--bind|-b)(?:\"\s*,\s*\"|[=\s]+)(?:\[[0-9a-fA-F:]*\]|[\w.-]*):)(\d{2,5})\b"),
+    re.compile(r"((?<![\w./:@-])(?:0\.0\.0\.0|\[::\]):)(\d{2,5})\b"),
+    re.compile(r"(\$\{PORT:-)(\d{2,5})(?=\})"),
+]
+# HEALTHCHECK은 컨테이너 자신을 호출하므로 loopback URL의 포트가 app 포트
+_HEALTHCHECK_PORT_PATTERNS = _PORT_PATTERNS + [
+    re.compile(r"(://(?:localhost|127\.0\.0\.1|0\.0\.0\.0|\[::1\]):)(\d{2,5})\b"),
+]
+# pip --user 설치를 /usr/local로 옮긴 뒤 필요 없는 PATH 항목
+_USER_SITE_PATH = re.compile(r"/root/\.local/bin:?")
+_NOOP_PATH = re.compile(r"^PATH(?:=|\s+)\"?\$\{?PATH\}?\"?$")
+_ENV_PORT = re.compile(r"(\bPORT[=\s]+\"?)(\d{2,5})\b")
+# CMD/ENTRYPOINT의 그 밖의 loopback host:port (의존성 주소일 수 있으므로 보고만 함)
+_LOOPBACK_PORT = re.compile(r"\b(?:localhost|127\.0\.0\.1):(\d{2,5})\b")
+
+
+class Instruction:
+    """Dockerfile instruction 하나 (continuation line 포함) + 앞의 주석/빈 줄"""
+
+    __slots__ = ("keyword", "raw", "leading", "line")
+
+    def __init__(self, keyword: str, raw: List[str], leading: List[str], line: int):
+        self.keyword = keyword
+        self.raw = raw
+        self.leading = leading
+        self.line = line
+
+    @property
+    def args(self) -> str:
+        """continuation을 합친 인자 문자열"""
+        parts = [self.raw[0].strip()[len(self.keyword):]] + self.raw[1:]
+        return " ".join(
+            part.strip().rstrip("\\").strip()
+            for part in parts
+            if part.strip() and not part.strip().startswith("#")
+        ).strip()
+
+    def set_text(self, text: str) -> None:
+        self.raw = text.split("\n")
+
+
+def parse_dockerfile(text: str) -> Tuple[List[Instruction], List[str]]:
+    """Returns (instructions, trailing lines)"""
+    lines = text.split("\n")
+    instructions: List[Instruction] = []
+    pending: List[str] = []
+    i = 0
+
+    while i < len(lines):
+        stripped = lines[i].strip()
+        if not stripped or stripped.startswith("#"):
+            pending.append(lines[i])
+            i += 1
+            continue
+
+        start = i
+        raw = [lines[i]]
+        while raw[-1].rstrip().endswith("\\") and i + 1 < len(lines):
+            i += 1
+            raw.append(lines[i])
+        i += 1
+
+        instructions.append(Instruction(stripped.split(None, 1)[0].upper(), raw, pending, start + 1))
+        pending = []
+
+    return instructions, pending
+
+
+def render(instructions: List[Instruction], trailing: List[str]) -> str:
+    lines: List[str] = []
+    for instruction in instructions:
+        lines.extend(instruction.leading)
+        lines.extend(instruction.raw)
+    lines.extend(trailing)
+    return "\n".join(lines)
+
+
+def _stages(instructions: List[Instruction]) -> List[Dict[str, Any]]:
+    """FROM 단위 stage: {"name", "image", "start", "end"} (instruction index 범위)"""
+    stages: List[Dict[str, Any]] = []
+    for idx, instruction in enumerate(instructions):
+        if instruction.keyword != "FROM":
+            continue
+        tokens = [t for t in instruction.args.split() if not t.startswith("--platform")]
+        name = tokens[2] if len(tokens) >= 3 and tokens[1].lower() == "as" else str(len(stages))
+        if stages:
+            stages[-1]["end"] = idx
+        stages.append({"name": name, "index": len(stages), "image": tokens[0] if tokens else "", "start": idx})
+    if stages:
+        stages[-1]["end"] = len(instructions)
+    return stages
+
+
+def stage_images(dockerfile: str) -> List[Tuple[str, str]]:
+    """stage별 (name, base image). 마지막 stage가 최종 image"""
+    instructions, _ = parse_dockerfile(dockerfile)
+    return [(stage["name"], stage["image"]) for stage in _stages(instructions)]
+
+
+def _copy_parts(instruction: Instruction) -> Tuple[Dict[str, str], List[str], str]:
+    """COPY/ADD → (flags, sources, dest). exec(JSON) 형식도 처리"""
+    args = instruction.args
+    flags: Dict[str, str] = {}
+    tokens = args.split()
+    while tokens and tokens[0].startswith("--"):
+        flag, _, value = tokens.pop(0)[2:].partition("=")
+        flags[flag] = value
+    rest = " ".join(tokens)
+    if rest.startswith("["):
+        tokens = [t.strip().strip('"') for t in rest.strip("[]").split(",")]
+    if len(tokens) < 2:
+        return flags, [], ""
+    return flags, tokens[:-1], tokens[-1]
+
+
+def _copy_text(flags: Dict[str, str], sources: List[str], dest: str) -> str:
+    """_copy_parts 결과로 COPY instruction을 다시 만듦 (shell 형식)"""
+    parts = ["COPY"] + [f"--{flag}={value}" if value else f"--{flag}" for flag, value in flags.items()]
+    return " ".join(parts + sources + [dest])
+
+
+def _is_broad_copy(instruction: Instruction) -> bool:
+    if instruction.keyword not in ("COPY", "ADD"):
+        return False
+    flags, sources, _ = _copy_parts(instruction)
+    return "from" not in flags and any(src in (".", "./") for src in sources)
+
+
+def _run_command(args: str) -> str:
+    """RUN --mount=... 같은 BuildKit flag를 뺀 명령 부분"""
+    return _RUN_FLAGS.sub("", args)
+
+
+def _shell_segments(command: str) -> List[str]:
+    return [seg.strip() for seg in re.split(r"&&|;", command) if seg.strip()]
+
+
+def _root_file(file_list: Optional[List[str]], name: str) -> bool:
+    return file_list is not None and name in file_list
+
+
+def _install_manifests(command: str, file_list: Optional[List[str]]) -> Tuple[bool, Optional[List[str]]]:
+    """
+    RUN 명령이 manifest 기반 의존성 설치인지 판별.
+    Returns (is_dependency_install, 먼저 복사하면 되는 manifest 목록 — 안전하게 옮길 수 없으면 None)
+    """
+    segments = _shell_segments(command)
+    manifests: List[str] = []
+    found = False
+    movable = True
+
+    for segment in segments:
+        if _PIP_UPGRADE.match(segment):
+            continue
+        if _PIP_INSTALL.search(segment):
+            requirements = _PIP_REQUIREMENT.findall(segment)
+            if not requirements:
+                movable = False
+                continue
+            found = True
+            manifests.extend(requirements)
+            continue
+        node = _NODE_INSTALL.match(segment)
+        if node:
+            found = True
+            tool = node.group(1).split()[0]
+            manifests.append("package*.json" if tool == "npm" else "package.json")
+            lockfile = {"yarn": "yarn.lock", "pnpm": "pnpm-lock.yaml"}.get(tool)
+            if lockfile and (_root_file(file_list, lockfile) or "frozen-lockfile" in segment or "--immutable" in segment):
+                manifests.append(lockfile)
+            continue
+        if _GO_DOWNLOAD.match(segment):
+            found = True
+            manifests.append("go.mod")
+            if _root_file(file_list, "go.sum"):
+                manifests.append("go.sum")
+            continue
+        for pattern, files in (
+            (_BUNDLE_INSTALL, ("Gemfile", "Gemfile.lock")),
+            (_COMPOSER_INSTALL, ("composer.json", "composer.lock")),
+            (_POETRY_INSTALL, ("pyproject.toml", "poetry.lock")),
+        ):
+            if pattern.match(segment):
+                found = True
+                manifests.append(files[0])
+                if _root_file(file_list, files[1]):
+                    manifests.append(files[1])
+                break
+        else:
+            # 소스가 필요한 다른 명령이 섞여 있음
+            movable = False
+
+    if not found:
+        return False, None
+    if not movable or "cd " in command:
+        return True, None
+    return True, list(dict.fromkeys(manifests))
+
+
+class _Validator:
+    def __init__(self, text: str, project_info: Dict[str, Any], file_list: Optional[List[str]], autofix: bool):
+        self.instructions, self.trailing = parse_dockerfile(text)
+        self.project_info = project_info or {}
+        self.file_list = file_list
+        self.autofix = autofix
+        self.findings: List[Dict[str, Any]] = []
+
+    def report(self, rule: str, severity: str, instruction: Optional[Instruction], message: str, fixed: bool) -> None:
+        self.findings.append({
+            "rule": rule,
+            "severity": severity,
+            "line": instruction.line if instruction else None,
+            "message": message,
+            "fixed": fixed
+        })
+
+    # -- cache flags --------------------------------------------------------
+
+    def check_package_caches(self) -> None:
+        stages = _stages(self.instructions)
+        for stage in stages:
+            final = stage is stages[-1]
+            env_no_cache = any(
+                ins.keyword == "ENV" and "PIP_NO_CACHE_DIR" in ins.args
+                for ins in self.instructions[stage["start"]:stage["end"]]
+            )
+            for ins in self.instructions[stage["start"]:stage["end"]]:
+                if ins.keyword != "RUN":
+                    continue
+                text = "\n".join(ins.raw)
+
+                # cache mount를 쓰면 cache는 layer 밖에 있으므로 --no-cache-dir이 오히려 손해
+                cache_mounted = "--mount=type=cache" in text
+                if _PIP_INSTALL.search(text) and "--no-cache-dir" not in text and not env_no_cache and not cache_mounted:
+                    if self.autofix:
+                        ins.set_text(_PIP_INSTALL.sub(lambda m: f"{m.group(0)} --no-cache-dir", text))
+                    self.report(
+                        "pip-no-cache-dir", "warning" if final else "info", ins,
+                        "pip install without --no-cache-dir keeps the wheel cache in the layer", self.autofix
+                    )
+
+                text = "\n".join(ins.raw)
+                if re.search(r"\bapk\s+add\b", text) and "--no-cache" not in text:
+                    if self.autofix:
+                        ins.set_text(re.sub(r"\bapk\s+add\b", "apk add --no-cache", text))
+                    self.report(
+                        "apk-no-cache", "warning" if final else "info", ins,
+                        "apk add without --no-cache keeps the package index in the layer", self.autofix
+                    )
+
+                text = "\n".join(ins.raw)
+                if re.search(r"\bapt-get\s+install\b", text) and "/var/lib/apt/lists" not in text:
+                    fixable = self.autofix and not ins.args.startswith("[")
+                    if fixable:
+                        ins.raw[-1] = ins.raw[-1].rstrip() + " && rm -rf /var/lib/apt/lists/*"
+                    self.report(
+                        "apt-lists-not-removed", "warning" if final else "info", ins,
+                        "apt-get install without removing /var/lib/apt/lists in the same layer", fixable
+                    )
+
+    # -- lockfiles ----------------------------------------------------------
+
+    def check_lockfile_commands(self) -> None:
+        for ins in self.instructions:
+            text = "\n".join(ins.raw)
+            if ins.keyword == "RUN":
+                if _POETRY_NO_DEV.search(text):
+                    if self.autofix:
+                        ins.set_text(_POETRY_NO_DEV.sub(r"\1 --only main", text))
+                    self.report(
+                        "poetry-no-dev", "error", ins,
+                        "poetry install --no-dev was removed in Poetry 2.0; use --only main", self.autofix
+                    )
+                if self.file_list is None:
+                    continue
+                for pattern, lockfiles, rule in _LOCKFILE_COMMANDS:
+                    text = "\n".join(ins.raw)
+                    # if [ -f package-lock.json ] 처럼 build 시점에 확인하는 경우는 제외
+                    if not pattern.search(text) or any(name in text for name in lockfiles):
+                        continue
+                    if any(_root_file(self.file_list, name) for name in lockfiles):
+                        continue
+                    if self.autofix:
+                        fixed = re.sub(r"\bnpm\s+ci\b", "npm install", text) if rule == "npm-ci-without-lockfile" \
+                            else re.sub(r"\s--frozen-lockfile\b", "", text)
+                        ins.set_text(fixed)
+                    self.report(
+                        rule, "error", ins,
+                        f"install requires {' or '.join(lockfiles)} but the repository has none", self.autofix
+                    )
+            elif ins.keyword in ("COPY", "ADD") and self.file_list is not None:
+                flags, sources, dest = _copy_parts(ins)
+                if "from" in flags:
+                    continue
+                missing = [src for src in sources if src in LOCKFILE_NAMES and not _root_file(self.file_list, src)]
+                if not missing:
+                    continue
+                remaining = [src for src in sources if src not in missing]
+                fixable = self.autofix and bool(remaining) and not ins.args.split()[-1].startswith("[")
+                if fixable:
+                    ins.set_text(" ".join([ins.keyword] + [f"--{k}={v}" if v else f"--{k}" for k, v in flags.items()] + remaining + [dest]))
+                self.report(
+                    "copy-missing-lockfile", "error", ins,
+                    f"{ins.keyword} references {', '.join(missing)} which is not in the repository", fixable
+                )
+
+    # -- layer ordering -----------------------------------------------------
+
+    def check_layer_order(self) -> None:
+        for stage in reversed(_stages(self.instructions)):
+            body = self.instructions[stage["start"]:stage["end"]]
+            broad_idx = next((i for i, ins in enumerate(body) if _is_broad_copy(ins)), None)
+            if broad_idx is None:
+                continue
+
+            for offset, ins in enumerate(body[broad_idx + 1:], start=broad_idx + 1):
+                if ins.keyword != "RUN":
+                    continue
+                is_install, manifests = _install_manifests(_run_command(ins.args), self.file_list)
+                if not is_install:
+                    continue
+
+                # 바로 다음 instruction일 때만 순서를 바꿔도 의미가 같음
+                fixable = self.autofix and bool(manifests) and offset == broad_idx + 1
+                if fixable:
+                    _, _, dest = _copy_parts(body[broad_idx])
+                    dest = "./" if dest in (".", "./") else dest.rstrip("/") + "/"
+                    absolute = stage["start"] + broad_idx
+                    manifest_copy = Instruction(
+                        "COPY", [f"COPY {' '.join(manifests)} {dest}"],
+                        ["# Copy dependency manifests first so the install layer stays cached"], 0
+                    )
+                    moved = self.instructions.pop(absolute + 1)
+                    self.instructions[absolute:absolute] = [manifest_copy, moved]
+                self.report(
+                    "layer-order", "warning", ins,
+                    "dependency install runs after the whole source tree is copied, so every code change "
+                    "re-installs dependencies; copy the manifests and install before 'COPY . .'",
+                    fixable
+                )
+                break
+
+    # -- multi-stage site-packages -------------------------------------------
+
+    def check_multistage_python(self) -> None:
+        stages = _stages(self.instructions)
+        if len(stages) < 2:
+            return
+        final = stages[-1]
+        final_body = self.instructions[final["start"]:final["end"]]
+        if any(ins.keyword == "RUN" and _PIP_INSTALL.search(ins.args) for ins in final_body):
+            return
+        non_root = any(
+            ins.keyword == "USER" and ins.args.split(":")[0] not in ("root", "0") for ins in final_body
+        )
+
+        copies: Dict[str, List[Tuple[Instruction, List[str], str]]] = {}
+        for ins in final_body:
+            if ins.keyword == "COPY":
+                flags, sources, dest = _copy_parts(ins)
+                if "from" in flags:
+                    copies.setdefault(flags["from"], []).append((ins, sources, dest))
+
+        for stage in stages[:-1]:
+            stage_copies = copies.get(stage["name"], []) + copies.get(str(stage["index"]), [])
+            if not stage_copies:
+                continue
+            same_image = stage["image"] == final["image"]
+
+            for location, layout in self._python_install_locations(stage):
+                covering = [
+                    (ins, src, dest) for ins, sources, dest in stage_copies for src in sources
+                    if location.startswith(src.rstrip("/") + "/") or src.rstrip("/") == location
+                    or src.startswith(location.rstrip("/") + "/")
+                ]
+                if not covering:
+                    fixable = self.autofix and same_image and layout in ("user", "prefix", "system", "venv")
+                    if fixable:
+                        self._insert_site_packages_copy(final, stage["name"], location, layout)
+                    self.report(
+                        "multistage-site-packages", "error", self.instructions[final["start"]],
+                        f"packages installed to {location} in stage '{stage['name']}' are not copied "
+                        "into the final image",
+                        fixable
+                    )
+                    continue
+
+                if layout == "user" and non_root:
+                    for ins, src, dest in covering:
+                        if not dest.startswith("/root"):
+                            continue
+                        fixable = self.autofix and same_image and src.rstrip("/") == "/root/.local"
+                        if fixable:
+                            flags, sources, _ = _copy_parts(ins)
+                            ins.set_text(_copy_text(flags, sources, "/usr/local"))
+                            self._drop_user_site_path(final)
+                        self.report(
+                            "multistage-user-site", "error", ins,
+                            f"packages copied to {dest} are not readable by the non-root USER",
+                            fixable
+                        )
+
+    def _drop_user_site_path(self, final: Dict[str, Any]) -> None:
+        """/usr/local로 옮긴 뒤 남은 /root/.local/bin PATH 항목 제거 (PATH=$PATH만 남으면 ENV 삭제)"""
+        for idx in range(min(final["end"], len(self.instructions)) - 1, final["start"], -1):
+            ins = self.instructions[idx]
+            if ins.keyword != "ENV" or "/root/.local/bin" not in ins.args:
+                continue
+            text = _USER_SITE_PATH.sub("", "\n".join(ins.raw))
+            ins.set_text(text)
+            if _NOOP_PATH.match(ins.args):
+                del self.instructions[idx]
+                if idx < len(self.instructions):
+                    self.instructions[idx].leading = ins.leading + self.instructions[idx].leading
+
+    def _python_install_locations(self, stage: Dict[str, Any]) -> List[Tuple[str, str]]:
+        locations: List[Tuple[str, str]] = []
+        venvs: List[str] = []
+        for ins in self.instructions[stage["start"]:stage["end"]]:
+            if ins.keyword != "RUN":
+                continue
+            venvs.extend(_VENV.findall(ins.args))
+            for segment in _shell_segments(ins.args):
+                if not _PIP_INSTALL.search(segment) or _PIP_UPGRADE.match(segment):
+                    continue
+                dest = _PIP_DEST.search(segment)
+                venv = next((v for v in venvs if segment.startswith(v.rstrip("/") + "/bin/")), None)
+                if "--user" in segment:
+                    entry = ("/root/.local", "user")
+                elif dest and dest.group(1) == "prefix":
+                    entry = (dest.group(2), "prefix")
+                elif dest:
+                    entry = (dest.group(2) or dest.group(3), "target")
+                elif venv or venvs:
+                    entry = ((venv or venvs[-1]).rstrip("/"), "venv")
+                else:
+                    entry = ("/usr/local", "system")
+                if entry not in locations:
+                    locations.append(entry)
+        return locations
+
+    def _insert_site_packages_copy(self, final: Dict[str, Any], stage_name: str, location: str, layout: str) -> None:
+        target = location if layout == "venv" else "/usr/local"
+        new = [Instruction("COPY", [f"COPY --from={stage_name} {location} {target}"], [], 0)]
+        if layout == "venv":
+            new.append(Instruction("ENV", [f'ENV PATH="{location}/bin:$PATH"'], [], 0))
+
+        insert_at = final["start"] + 1
+        if insert_at < len(self.instructions) and self.instructions[insert_at].keyword == "WORKDIR":
+            insert_at += 1
+        self.instructions[insert_at:insert_at] = new
+
+    # -- ports --------------------------------------------------------------
+
+    def check_ports(self) -> None:
+        if self.project_info.get("app_port") is None:
+            return
+        port = str(int(self.project_info["app_port"]))
+        stages = _stages(self.instructions)
+        if not stages:
+            return
+        final = stages[-1]
+        body = self.instructions[final["start"]:final["end"]]
+
+        exposes = [ins for ins in body if ins.keyword == "EXPOSE"]
+        exposed = {p.split("/")[0] for ins in exposes for p in ins.args.split()}
+        if not exposes:
+            if self.autofix:
+                cmd_idx = next(
+                    (final["start"] + i for i, ins in enumerate(body) if ins.keyword in ("CMD", "ENTRYPOINT")),
+                    final["end"]
+                )
+                self.instructions.insert(cmd_idx, Instruction("EXPOSE", [f"EXPOSE {port}"], [], 0))
+            self.report("expose-missing", "warning", None, f"no EXPOSE for app_port {port}", self.autofix)
+        elif port not in exposed:
+            fixable = self.autofix and len(exposes) == 1 and len(exposed) == 1
+            if fixable:
+                exposes[0].set_text(f"EXPOSE {port}")
+            self.report(
+                "expose-port-mismatch", "error", exposes[0],
+                f"EXPOSE {' '.join(sorted(exposed))} does not match app_port {port}", fixable
+            )
+
+        for ins in body:
+            if ins.keyword not in ("CMD", "ENTRYPOINT", "HEALTHCHECK", "ENV"):
+                continue
+            original = text = "\n".join(ins.raw)
+            if ins.keyword == "ENV":
+                patterns = [_ENV_PORT]
+            elif ins.keyword == "HEALTHCHECK":
+                patterns = _HEALTHCHECK_PORT_PATTERNS
+            else:
+                patterns = _PORT_PATTERNS
+            matches = [m for pattern in patterns for m in pattern.finditer(text)]
+            mismatched = sorted({m.group(2) for m in matches} - {port})
+            if mismatched:
+                if self.autofix:
+                    for pattern in patterns:
+                        text = pattern.sub(lambda m: m.group(1) + port, text)
+                    ins.set_text(text)
+                self.report(
+                    "port-mismatch", "error", ins,
+                    f"{ins.keyword} uses port {', '.join(mismatched)} but app_port is {port}", self.autofix
+                )
+
+            if ins.keyword in ("CMD", "ENTRYPOINT"):
+                bound = [m.span(2) for m in matches]
+                others = sorted({
+                    m.group(1) for m in _LOOPBACK_PORT.finditer(original)
+                    if m.group(1) != port and m.span(1) not in bound
+                })
+                if others:
+                    self.report(
+                        "loopback-port", "info", ins,
+                        f"{ins.keyword} references localhost port {', '.join(others)} "
+                        f"(not app_port {port}); left unchanged", False
+                    )
+
+    def run(self) -> Tuple[str, Dict[str, Any]]:
+        start = time.perf_counter()
+        stages = len(_stages(self.instructions))
+        if stages:
+            self.check_ports()
+            self.check_lockfile_commands()
+            self.check_package_caches()
+            self.check_multistage_python()
+            self.check_layer_order()
+        else:
+            self.report("no-from", "error", None, "Dockerfile has no FROM instruction", False)
+
+        self.findings.sort(key=lambda f: (SEVERITY_ORDER.index(f["severity"]), f["line"] or 0))
+        report = {
+            "findings": self.findings,
+            "summary": {
+                **{severity: sum(1 for f in self.findings if f["severity"] == severity) for severity in SEVERITY_ORDER},
+                "fixed": sum(1 for f in self.findings if f["fixed"])
+            },
+            "stages": stages,
+            "instructions": len(self.instructions),
+            "validation_ms": round((time.perf_counter() - start) * 1000, 2)
+        }
+        return render(self.instructions, self.trailing), report
+
+
+def validate_dockerfile(
+    dockerfile: str,
+    project_info: Optional[Dict[str, Any]] = None,
+    file_list: Optional[List[str]] = None,
+    autofix: bool = True
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Returns (Dockerfile — autofix가 켜져 있으면 안전한 수정 적용, findings report).
+    file_list가 있으면 lockfile 존재 여부를 확인해서 manifest COPY를 만듭니다.
+    """
+    return _Validator(dockerfile, project_info or {}, file_list, autofix).run()
@@ -0,0 +1,193 @@
+"""
+Relevance ranking for analyzer prompt inputs
+빌드 manifest / Dockerfile / entrypoint를 우선하고 vendored 코드나 asset은 뒤로 보내서,
+고정 개수(file_list[:100]) 대신 token budget 안에서 중요한 path만 프롬프트에 넣습니다.
+"""
+import posixpath
+from typing import Dict, List, Optional
+
+# 대략적인 token 추정 (영문/코드 기준 4 chars ≈ 1 token)
+CHARS_PER_TOKEN = 4
+
+# 프롬프트 구역별 token budget
+ANALYSIS_FILE_TOKEN_BUDGET = 1500
+SPEC_FILE_TOKEN_BUDGET = 700
+ANALYSIS_README_TOKEN_BUDGET = 750
+SPEC_README_TOKEN_BUDGET = 500
+SAMPLE_TOKEN_BUDGET = 2500
+PER_SAMPLE_TOKEN_BUDGET = 500
+
+# 자동으로 내용을 가져올 manifest 최대 개수
+MAX_AUTO_SAMPLES = 8
+AUTO_SAMPLE_MIN_SCORE = 70
+
+# basename(소문자) → 점수
+MANIFEST_SCORES = {
+    "package.json": 100,
+    "pyproject.toml": 100,
+    "go.mod": 100,
+    "cargo.toml": 100,
+    "requirements.txt": 95,
+    "pom.xml": 95,
+    "build.gradle": 95,
+    "build.gradle.kts": 95,
+    "gemfile": 90,
+    "composer.json": 90,
+    "pipfile": 90,
+    "dockerfile": 90,
+    "setup.py": 85,
+    "procfile": 70,
+    "docker-compose.yml": 70,
+    "docker-compose.yaml": 70,
+    "compose.yaml": 70,
+    "setup.cfg": 60,
+    "next.config.js": 60,
+    "next.config.mjs": 60,
+    ".nvmrc": 50,
+    ".python-version": 50,
+    "runtime.txt": 50,
+    "tsconfig.json": 45,
+    "package-lock.json": 40,
+    "yarn.lock": 40,
+    "pnpm-lock.yaml": 40,
+    "poetry.lock": 40,
+    "uv.lock": 40,
+    "pipfile.lock": 40,
+    "go.sum": 30,
+    "cargo.lock": 30,
+}
+
+ENTRYPOINT_SCORES = {
+    "main.py": 80,
+    "app.py": 80,
+    "streamlit_app.py": 80,
+    "server.js": 80,
+    "main.go": 80,
+    "manage.py": 75,
+    "server.ts": 70,
+    "wsgi.py": 70,
+    "asgi.py": 70,
+    "main.rs": 70,
+    "index.js": 60,
+    "main.ts": 60,
+    "app.js": 60,
+    "index.ts": 55,
+}
+
+SOURCE_EXTENSIONS = {".py", ".js", ".mjs", ".ts", ".tsx", ".jsx", ".go", ".rs", ".java", ".kt", ".rb", ".php", ".cs"}
+
+ASSET_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico", ".webp", ".bmp",
+    ".woff", ".woff2", ".ttf", ".eot", ".otf",
+    ".mp3", ".mp4", ".wav", ".webm", ".mov",
+    ".zip", ".gz", ".tar", ".jar", ".whl", ".so", ".dylib", ".dll", ".exe", ".bin",
+    ".pdf", ".psd", ".map", ".pem", ".csv", ".parquet", ".pkl", ".pt", ".onnx",
+}
+
+IGNORED_DIRS = {
+    "node_modules", "vendor", "third_party", "dist", "build", "target", ".git",
+    "__pycache__", ".venv", "venv", "site-packages", ".next", ".terraform", "coverage",
+}
+
+LOW_SIGNAL_DIRS = {"test", "tests", "__tests__", "spec", "docs", "examples", "fixtures", "migrations"}
+
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 token 수"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def score_path(path: str) -> float:
+    """build/manifest/entrypoint 중요도 점수 (높을수록 중요)"""
+    parts = path.split("/")
+    name = parts[-1].lower()
+    dirs = [p.lower() for p in parts[:-1]]
+    ext = posixpath.splitext(name)[1]
+
+    if any(d in IGNORED_DIRS for d in dirs):
+        return -1000.0
+    if ext in ASSET_EXTENSIONS or name.endswith(".min.js") or name.endswith(".min.css"):
+        return -100.0
+
+    score = 0.0
+    if name in MANIFEST_SCORES:
+        score = MANIFEST_SCORES[name]
+    elif name.startswith("requirements") and name.endswith(".txt"):
+        score = 80
+    elif name.startswith("dockerfile") or name.endswith(".dockerfile"):
+        score = 70
+    elif name in ENTRYPOINT_SCORES:
+        score = ENTRYPOINT_SCORES[name]
+    elif ext in SOURCE_EXTENSIONS:
+        score = 10
+    elif name.startswith("readme"):
+        score = 5
+
+    if any(d in LOW_SIGNAL_DIRS for d in dirs):
+        score -= 30
+    # 얕은 경로일수록 배포 단위의 root일 가능성이 높음
+    score -= 5 * len(dirs)
+    return score
+
+
+def rank_files(file_list: List[str]) -> List[str]:
+    """점수 내림차순 (동점이면 원래 순서 유지)"""
+    return sorted(file_list, key=score_path, reverse=True)
+
+
+def select_paths(file_list: List[str], token_budget: int) -> List[str]:
+    """
+    budget 안에 들어가는 상위 path를 골라 원래(tree) 순서로 반환.
+    ignored 디렉터리의 path는 budget이 남아도 넣지 않습니다.
+    """
+    selected = set()
+    used = 0
+    for path in rank_files(file_list):
+        if score_path(path) <= -1000:
+            break
+        cost = estimate_tokens(path) + 1
+        if used + cost > token_budget:
+            continue
+        selected.add(path)
+        used += cost
+
+    return [path for path in file_list if path in selected]
+
+
+def truncate_to_budget(text: str, token_budget: int) -> str:
+    """token budget에 맞게 앞부분만 남김"""
+    max_chars = token_budget * CHARS_PER_TOKEN
+    return text if len(text) <= max_chars else text[:max_chars]
+
+
+def select_sample_paths(
+    file_list: List[str],
+    limit: int = MAX_AUTO_SAMPLES,
+    exclude: Optional[List[str]] = None
+) -> List[str]:
+    """내용을 가져와 file_samples로 넣을 상위 manifest/entrypoint path"""
+    excluded = set(exclude or [])
+    picked = []
+    for path in rank_files(file_list):
+        if len(picked) >= limit or score_path(path) < AUTO_SAMPLE_MIN_SCORE:
+            break
+        if path not in excluded:
+            picked.append(path)
+    return picked
+
+
+def budget_samples(
+    file_samples: Dict[str, str],
+    total_budget: int = SAMPLE_TOKEN_BUDGET,
+    per_sample_budget: int = PER_SAMPLE_TOKEN_BUDGET
+) -> Dict[str, str]:
+    """중요도 순으로 sample 내용을 budget 안에서 잘라서 반환"""
+    budgeted: Dict[str, str] = {}
+    remaining = total_budget
+    for name in rank_files(list(file_samples)):
+        if remaining <= 0:
+            break
+        content = truncate_to_budget(file_samples[name] or "", min(per_sample_budget, remaining))
+        budgeted[name] = content
+        remaining -= estimate_tokens(content)
+    return budgeted
@@ -0,0 +1,228 @@
+"""
+Incremental GitHub tree listing
+git tree SHA는 내용 기반이므로 이전 분석의 snapshot에 같은 SHA가 있으면 그 하위 전체를 재사용하고,
+SHA가 바뀐 디렉터리만 non-recursive trees API로 다시 가져옵니다.
+"""
+import gzip
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from analyzers.pipeline import run_parallel
+
+SNAPSHOT_PREFIX = "tree-snapshots"
+SNAPSHOT_VERSION = 1
+
+# 변경된 tree가 이보다 많으면 recursive=1 한 번이 더 저렴
+MAX_INCREMENTAL_TREE_REQUESTS = 200
+
+# tree entry: [name, type("blob"|"tree"), sha]
+TreeEntries = List[List[str]]
+FetchTree = Callable[[str, bool], Tuple[str, List[Dict[str, Any]], bool]]
+
+
+def snapshot_key(repository: str) -> str:
+    """repository별 최신 snapshot S3 key"""
+    return f"{SNAPSHOT_PREFIX}/{repository}.json.gz"
+
+
+def load_snapshot(s3_client, bucket: str, repository: str) -> Optional[Dict[str, Any]]:
+    """이전 분석의 tree snapshot (없거나 형식이 다르면 None)"""
+    try:
+        obj = s3_client.get_object(Bucket=bucket, Key=snapshot_key(repository))
+        snapshot = json.loads(gzip.decompress(obj["Body"].read()))
+    except Exception as e:
+        print(f"ℹ️ No tree snapshot for {repository}: {e}")
+        return None
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+def save_snapshot(s3_client, bucket: str, repository: str, snapshot: Dict[str, Any]) -> None:
+    """다음 분석을 위해 snapshot 저장 (실패해도 분석은 계속)"""
+    try:
+        s3_client.put_object(
+            Bucket=bucket,
+            Key=snapshot_key(repository),
+            Body=gzip.compress(json.dumps(snapshot, separators=(",", ":")).encode("utf-8")),
+            ContentType="application/json",
+            ContentEncoding="gzip"
+        )
+    except Exception as e:
+        print(f"⚠️ Could not store tree snapshot for {repository}: {e}")
+
+
+def _entries(raw_entries: List[Dict[str, Any]]) -> TreeEntries:
+    return [
+        [item["path"], item["type"], item["sha"]]
+        for item in raw_entries
+        if item.get("type") in ("blob", "tree")
+    ]
+
+
+def _trees_from_recursive(root_sha: str, raw_entries: List[Dict[str, Any]]) -> Dict[str, TreeEntries]:
+    """recursive=1 응답(전체 path)을 tree SHA별 entry 목록으로 변환"""
+    sha_by_dir = {"": root_sha}
+    trees: Dict[str, TreeEntries] = {root_sha: []}
+
+    # recursive 응답은 부모 tree가 항상 자식보다 먼저 나옴
+    for item in raw_entries:
+        if item.get("type") not in ("blob", "tree"):
+            continue
+        parent, _, name = item["path"].rpartition("/")
+        parent_sha = sha_by_dir.get(parent)
+        if parent_sha is None:
+            continue
+        trees[parent_sha].append([name, item["type"], item["sha"]])
+        if item["type"] == "tree":
+            sha_by_dir[item["path"]] = item["sha"]
+            trees.setdefault(item["sha"], [])
+
+    return trees
+
+
+def walk(
+    fetch_tree: FetchTree,
+    commit_sha: str,
+    previous: Optional[Dict[str, Any]]
+) -> Tuple[str, Dict[str, TreeEntries], Dict[str, Any]]:
+    """
+    commit의 전체 tree를 구성. Returns (root_tree_sha, trees, stats).
+    fetch_tree(sha, recursive) → (tree_sha, raw_entries, truncated)
+    """
+    previous_trees: Dict[str, TreeEntries] = (previous or {}).get("trees", {})
+    # recursive listing이 잘린 경우에는 subtree를 전부 개별 조회해야 하므로 상한을 두지 않음
+    recursive_fallback = True
+
+    if not previous_trees:
+        root_sha, raw_entries, truncated = fetch_tree(commit_sha, True)
+        if not truncated:
+            return root_sha, _trees_from_recursive(root_sha, raw_entries), {
+                "mode": "full", "fetched_trees": 1, "reused_trees": 0
+            }
+        print("⚠️ Recursive tree listing truncated, walking subtrees individually")
+        recursive_fallback = False
+
+    root_sha, raw_root, _ = fetch_tree(commit_sha, False)
+    if root_sha in previous_trees:
+        return root_sha, _reachable(root_sha, previous_trees), {
+            "mode": "unchanged", "fetched_trees": 1, "reused_trees": len(previous_trees)
+        }
+
+    trees: Dict[str, TreeEntries] = {root_sha: _entries(raw_root)}
+    fetched, reused = 1, 0
+    pending = [root_sha]
+
+    while pending:
+        to_fetch = []
+        for tree_sha in pending:
+            for _, entry_type, child_sha in trees[tree_sha]:
+                if entry_type != "tree" or child_sha in trees:
+                    continue
+                if child_sha in previous_trees:
+                    # 변경 없는 subtree: 하위 전체 재사용
+                    for sha, entries in _reachable(child_sha, previous_trees).items():
+                        if sha not in trees:
+                            trees[sha] = entries
+                            reused += 1
+                elif child_sha not in to_fetch:
+                    to_fetch.append(child_sha)
+
+        if recursive_fallback and fetched + len(to_fetch) > MAX_INCREMENTAL_TREE_REQUESTS:
+            print(f"⚠️ {len(to_fetch)} changed subtrees, falling back to recursive listing")
+            return walk(fetch_tree, commit_sha, None)
+
+        results, errors = run_parallel({
+            sha: (lambda sha=sha: fetch_tree(sha, False)) for sha in to_fetch
+        })
+        if errors:
+            raise next(iter(errors.values()))
+
+        for sha, (_, raw_entries, _) in results.items():
+            trees[sha] = _entries(raw_entries)
+        fetched += len(results)
+        pending = to_fetch
+
+    return root_sha, trees, {"mode": "incremental", "fetched_trees": fetched, "reused_trees": reused}
+
+
+def _reachable(root_sha: str, trees: Dict[str, TreeEntries]) -> Dict[str, TreeEntries]:
+    """root_sha 에서 도달 가능한 tree만 (snapshot 정리용)"""
+    reachable: Dict[str, TreeEntries] = {}
+    stack = [root_sha]
+    while stack:
+        sha = stack.pop()
+        if sha in reachable or sha not in trees:
+            continue
+        reachable[sha] = trees[sha]
+        stack.extend(child for _, entry_type, child in trees[sha] if entry_type == "tree")
+    return reachable
+
+
+def list_files(root_sha: str, trees: Dict[str, TreeEntries]) -> List[str]:
+    """GitHub recursive listing과 같은 순서(pre-order)의 blob path 목록"""
+    files: List[str] = []
+
+    def _visit(tree_sha: str, prefix: str) -> None:
+        for name, entry_type, sha in trees.get(tree_sha, []):
+            path = f"{prefix}{name}"
+            if entry_type == "blob":
+                files.append(path)
+            else:
+                _visit(sha, f"{path}/")
+
+    _visit(root_sha, "")
+    return files
+
+
+def blob_shas(root_sha: str, trees: Dict[str, TreeEntries]) -> Dict[str, str]:
+    """blob path → blob SHA (blob_cache 조회용)"""
+    blobs: Dict[str, str] = {}
+
+    def _visit(tree_sha: str, prefix: str) -> None:
+        for name, entry_type, sha in trees.get(tree_sha, []):
+            path = f"{prefix}{name}"
+            if entry_type == "blob":
+                blobs[path] = sha
+            else:
+                _visit(sha, f"{path}/")
+
+    _visit(root_sha, "")
+    return blobs
+
+
+def directory_shas(root_sha: str, trees: Dict[str, TreeEntries]) -> Dict[str, str]:
+    """디렉터리 path → tree SHA ("" 는 root)"""
+    dirs = {"": root_sha}
+
+    def _visit(tree_sha: str, prefix: str) -> None:
+        for name, entry_type, sha in trees.get(tree_sha, []):
+            if entry_type == "tree":
+                dirs[f"{prefix}{name}"] = sha
+                _visit(sha, f"{prefix}{name}/")
+
+    _visit(root_sha, "")
+    return dirs
+
+
+def find_root_blob(root_sha: str, trees: Dict[str, TreeEntries], candidates: Tuple[str, ...]) -> Optional[List[str]]:
+    """root 디렉터리에서 이름이 candidates(소문자)와 일치하는 첫 blob entry"""
+    for entry in trees.get(root_sha, []):
+        if entry[1] == "blob" and entry[0].lower() in candidates:
+            return entry
+    return None
+
+
+def build_snapshot(
+    root_sha: str,
+    trees: Dict[str, TreeEntries],
+    readme: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """다음 분석용 snapshot (현재 root에서 도달 가능한 tree만 보관)"""
+    return {
+        "version": SNAPSHOT_VERSION,
+        "root_sha": root_sha,
+        "trees": _reachable(root_sha, trees),
+        "readme": readme or {}
+    }
@@ -0,0 +1,408 @@
+"""
+Analysis history export
+분석 결과마다 타입이 고정된 compact row 하나를 만들어 S3에 append-only로 쌓습니다.
+invocation(batch 포함)마다 part 파일 하나를 쓰고, 하루가 지나면 compact_history action이
+그날의 part들을 daily 파일 하나로 합칩니다 (pyarrow가 있으면 Parquet, 없으면 JSONL.gz).
+
+    s3://<bucket>/history/v1/dt=2025-01-31/part-<time>-<analysis_id>.jsonl.gz
+    s3://<bucket>/history/v1/dt=2025-01-31/daily-<time>.parquet
+
+DynamoDB 분석 항목(JSON blob, 30일 TTL)을 scan하지 않고 trend를 조회하는 용도입니다:
+    python -m analyzers.history query s3://delightful-deploy-artifacts/history/v1 \\
+        --since 2025-01-01 --until 2025-01-31 --group-by framework --metric ms_total
+    python -m analyzers.history query ./history --where analysis_path=llm --group-by language --metric total_tokens
+"""
+import argparse
+import gzip
+import io
+import json
+import math
+import os
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+HISTORY_PREFIX = "history/v1"
+PARTITION_KEY = "dt"
+
+# stage별 소요 시간은 자주 조회하는 것만 column으로 두고, 나머지는 stage_timings(JSON)에 남김
+TIMED_STAGES = (
+    "total", "existing_deployments", "prefetch", "sample_fetch", "cache_lookup", "rule_detection",
+    "project_analysis", "spec_generation", "dockerfile_validation", "build_estimate", "right_sizing",
+    "persist", "time_to_first_artifact",
+)
+
+# (column, type) — type은 "string" | "int" | "float" | "bool"
+SCHEMA: List[Tuple[str, str]] = [
+    ("analysis_id", "string"),
+    ("timestamp", "string"),
+    (PARTITION_KEY, "string"),
+    ("repository", "string"),
+    ("commit_sha", "string"),
+    ("status", "string"),
+    ("error_type", "string"),
+    ("analysis_path", "string"),
+    ("execution_mode", "string"),
+    ("cache_status", "string"),
+    ("cold_start", "bool"),
+    ("language", "string"),
+    ("framework", "string"),
+    ("app_type", "string"),
+    ("runtime", "string"),
+    ("app_port", "int"),
+    ("confidence", "string"),
+    ("recommendation", "string"),
+    ("cpu", "int"),
+    ("memory", "int"),
+    ("desired_count", "int"),
+    ("max_capacity", "int"),
+    ("monthly_cost_usd", "float"),
+    ("image_size_mb", "int"),
+    ("build_seconds", "int"),
+    ("template_version", "string"),
+    ("model", "string"),
+    ("prompt_tokens", "int"),
+    ("completion_tokens", "int"),
+    ("total_tokens", "int"),
+    ("cost_usd", "float"),
+    ("llm_calls", "int"),
+    ("model_fallbacks", "int"),
+    *[(f"ms_{stage}", "float") for stage in TIMED_STAGES],
+    ("stage_timings", "string"),
+]
+COLUMNS = [name for name, _ in SCHEMA]
+_TYPES = dict(SCHEMA)
+_CASTS: Dict[str, Callable[[Any], Any]] = {
+    "string": str,
+    "int": lambda value: int(float(value)),
+    "float": float,
+    "bool": lambda value: value if isinstance(value, bool) else str(value).lower() in ("1", "true", "yes"),
+}
+
+
+def coerce(row: Dict[str, Any]) -> Dict[str, Any]:
+    """schema의 column만, 선언된 타입으로 (변환 불가/누락은 None)"""
+    typed = {}
+    for name in COLUMNS:
+        value = row.get(name)
+        if value is not None and value != "":
+            try:
+                value = _CASTS[_TYPES[name]](value)
+            except (TypeError, ValueError):
+                value = None
+        else:
+            value = None
+        typed[name] = value
+    return typed
+
+
+def build_row(result: Dict[str, Any]) -> Dict[str, Any]:
+    """handler 결과(성공/실패 모두) → history row"""
+    timestamp = result.get("timestamp") or datetime.now(timezone.utc).isoformat()
+    project_info = result.get("project_info") or {}
+    config = result.get("deployment_config") or {}
+    sizing = result.get("resource_sizing") or {}
+    timings = result.get("stage_timings_ms") or {}
+    usage = result.get("token_usage") or {}
+
+    row = {
+        "analysis_id": result.get("analysis_id"),
+        "timestamp": timestamp,
+        PARTITION_KEY: timestamp[:10],
+        "repository": result.get("repository"),
+        "commit_sha": result.get("commit_sha"),
+        "status": result.get("status"),
+        "error_type": result.get("error_type"),
+        "analysis_path": result.get("analysis_path"),
+        "execution_mode": result.get("execution_mode"),
+        "cache_status": (result.get("cache") or {}).get("status"),
+        "cold_start": (result.get("runtime_stats") or {}).get("cold_start"),
+        "language": project_info.get("primary_language"),
+        "framework": project_info.get("primary_framework"),
+        "app_type": project_info.get("app_type"),
+        "runtime": project_info.get("runtime"),
+        "app_port": project_info.get("app_port"),
+        "confidence": project_info.get("confidence"),
+        "recommendation": result.get("recommendation"),
+        "cpu": config.get("cpu"),
+        "memory": config.get("memory"),
+        "desired_count": config.get("desired_count"),
+        "max_capacity": config.get("max_capacity"),
+        "monthly_cost_usd": sizing.get("monthly_cost_usd"),
+        "image_size_mb": config.get("estimated_image_size_mb"),
+        "build_seconds": config.get("estimated_build_seconds"),
+        "template_version": (result.get("templates") or {}).get("version"),
+        "model": usage.get("model"),
+        "prompt_tokens": usage.get("prompt_tokens"),
+        "completion_tokens": usage.get("completion_tokens"),
+        "total_tokens": usage.get("total_tokens"),
+        "cost_usd": usage.get("cost_usd"),
+        "llm_calls": usage.get("calls"),
+        "model_fallbacks": usage.get("fallbacks"),
+        "stage_timings": json.dumps(
+            {stage: ms for stage, ms in timings.items() if stage not in TIMED_STAGES}, sort_keys=True
+        ) if timings else None,
+    }
+    for stage in TIMED_STAGES:
+        row[f"ms_{stage}"] = timings.get(stage)
+    return coerce(row)
+
+
+def _encode_jsonl(rows: List[Dict[str, Any]]) -> bytes:
+    body = "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+    return gzip.compress(body.encode("utf-8"))
+
+
+def _encode_parquet(rows: List[Dict[str, Any]]) -> Optional[bytes]:
+    """pyarrow가 없으면 None (Lambda 패키지에는 포함하지 않음)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    arrow_types = {"string": pa.string(), "int": pa.int64(), "float": pa.float64(), "bool": pa.bool_()}
+    schema = pa.schema([(name, arrow_types[kind]) for name, kind in SCHEMA])
+    table = pa.Table.from_pylist([coerce(row) for row in rows], schema=schema)
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, compression="zstd")
+    return buffer.getvalue()
+
+
+def encode(rows: List[Dict[str, Any]], fmt: str = "jsonl") -> Tuple[bytes, str]:
+    """rows → (body, 파일 확장자). parquet을 쓸 수 없으면 jsonl.gz"""
+    if fmt == "parquet":
+        body = _encode_parquet(rows)
+        if body is not None:
+            return body, "parquet"
+    return _encode_jsonl(rows), "jsonl.gz"
+
+
+def decode(body: bytes, name: str) -> List[Dict[str, Any]]:
+    """파일 이름(확장자)에 맞춰 rows 읽기"""
+    if name.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        return [coerce(row) for row in pq.read_table(io.BytesIO(body)).to_pylist()]
+    if name.endswith(".gz"):
+        body = gzip.decompress(body)
+    return [coerce(json.loads(line)) for line in body.decode("utf-8").splitlines() if line.strip()]
+
+
+def partition_prefix(prefix: str, day: str) -> str:
+    return f"{prefix.rstrip('/')}/{PARTITION_KEY}={day}/"
+
+
+def append(s3, bucket: str, rows: List[Dict[str, Any]], prefix: str = HISTORY_PREFIX) -> List[str]:
+    """
+    rows를 날짜 partition별 part 파일로 기록 (기존 객체는 덮어쓰지 않음)
+    Returns 기록한 S3 key 목록
+    """
+    by_day: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        by_day.setdefault(row[PARTITION_KEY], []).append(row)
+
+    keys = []
+    stamp = datetime.now(timezone.utc).strftime("%H%M%S%f")
+    for day, day_rows in sorted(by_day.items()):
+        suffix = day_rows[0].get("analysis_id") or uuid.uuid4().hex[:12]
+        key = f"{partition_prefix(prefix, day)}part-{stamp}-{suffix}.jsonl.gz"
+        s3.put_object(
+            Bucket=bucket, Key=key, Body=_encode_jsonl(day_rows),
+            ContentType="application/gzip"
+        )
+        keys.append(key)
+    return keys
+
+
+def _list_keys(s3, bucket: str, prefix: str) -> List[str]:
+    keys, token = [], None
+    while True:
+        kwargs = {"Bucket": bucket, "Prefix": prefix}
+        if token:
+            kwargs["ContinuationToken"] = token
+        resp = s3.list_objects_v2(**kwargs)
+        keys.extend(obj["Key"] for obj in resp.get("Contents", []))
+        if not resp.get("IsTruncated"):
+            return keys
+        token = resp.get("NextContinuationToken")
+
+
+def compact(s3, bucket: str, day: str, prefix: str = HISTORY_PREFIX, fmt: str = "parquet") -> Dict[str, Any]:
+    """
+    하루 partition의 part/daily 파일을 daily 파일 하나로 합치고, 합친 원본만 삭제.
+    compaction 도중 새로 쓰인 part는 목록에 없으므로 다음 compaction에 포함됩니다.
+    """
+    keys = _list_keys(s3, bucket, partition_prefix(prefix, day))
+    if len(keys) <= 1:
+        return {"date": day, "merged": len(keys), "rows": None, "key": keys[0] if keys else None}
+
+    rows = []
+    for key in keys:
+        rows.extend(decode(s3.get_object(Bucket=bucket, Key=key)["Body"].read(), key))
+    rows.sort(key=lambda row: row.get("timestamp") or "")
+
+    body, extension = encode(rows, fmt)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    daily_key = f"{partition_prefix(prefix, day)}daily-{stamp}.{extension}"
+    s3.put_object(
+        Bucket=bucket, Key=daily_key, Body=body,
+        ContentType="application/vnd.apache.parquet" if extension == "parquet" else "application/gzip"
+    )
+    for start in range(0, len(keys), 1000):
+        s3.delete_objects(
+            Bucket=bucket, Delete={"Objects": [{"Key": key} for key in keys[start:start + 1000]], "Quiet": True}
+        )
+    return {"date": day, "merged": len(keys), "rows": len(rows), "key": daily_key}
+
+
+# -- local query tool ---------------------------------------------------------
+
+def _days(since: Optional[str], until: Optional[str]) -> Optional[set]:
+    if not since and not until:
+        return None
+    start = date.fromisoformat(since) if since else date.fromisoformat(until) - timedelta(days=31)
+    end = date.fromisoformat(until) if until else date.today()
+    return {(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)}
+
+
+def _partition_of(path: str) -> Optional[str]:
+    for part in path.split("/"):
+        if part.startswith(f"{PARTITION_KEY}="):
+            return part.split("=", 1)[1]
+    return None
+
+
+def read_rows(source: str, since: Optional[str] = None, until: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """s3://bucket/prefix 또는 local directory에서 기간 내 partition만 읽기"""
+    days = _days(since, until)
+
+    if source.startswith("s3://"):
+        import boto3
+        bucket, _, prefix = source[len("s3://"):].partition("/")
+        s3 = boto3.client("s3")
+        prefixes = [partition_prefix(prefix, day) for day in sorted(days)] if days else [prefix.rstrip("/") + "/"]
+        for day_prefix in prefixes:
+            for key in _list_keys(s3, bucket, day_prefix):
+                yield from decode(s3.get_object(Bucket=bucket, Key=key)["Body"].read(), key)
+        return
+
+    for directory, _, files in sorted(os.walk(source)):
+        day = _partition_of(directory.replace(os.sep, "/"))
+        if days is not None and day not in days:
+            continue
+        for name in sorted(files):
+            if name.endswith((".jsonl", ".jsonl.gz", ".parquet")):
+                with open(os.path.join(directory, name), "rb") as f:
+                    yield from decode(f.read(), name)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+AGGREGATES: Dict[str, Callable[[List[float]], float]] = {
+    "sum": sum,
+    "avg": lambda values: sum(values) / len(values),
+    "min": min,
+    "max": max,
+    "p50": lambda values: _percentile(values, 50),
+    "p95": lambda values: _percentile(values, 95),
+}
+
+
+def _matches(row: Dict[str, Any], filters: List[Tuple[str, str]]) -> bool:
+    return all(str(row.get(column)) == value for column, value in filters)
+
+
+def aggregate(
+    rows: Iterator[Dict[str, Any]],
+    group_by: List[str],
+    metric: str,
+    aggregates: List[str],
+    filters: Optional[List[Tuple[str, str]]] = None
+) -> List[Dict[str, Any]]:
+    """group별 metric 집계. count는 group의 row 수, 나머지는 metric 값이 있는 row만 사용"""
+    groups: Dict[Tuple[Any, ...], List[float]] = {}
+    counts: Dict[Tuple[Any, ...], int] = {}
+    for row in rows:
+        if filters and not _matches(row, filters):
+            continue
+        key = tuple(row.get(column) for column in group_by)
+        counts[key] = counts.get(key, 0) + 1
+        values = groups.setdefault(key, [])
+        if row.get(metric) is not None:
+            values.append(float(row[metric]))
+
+    table = []
+    for key, values in sorted(groups.items(), key=lambda item: [str(v) for v in item[0]]):
+        entry = dict(zip(group_by, key))
+        for name in aggregates:
+            if name == "count":
+                entry[name] = counts[key]
+            else:
+                entry[name] = round(AGGREGATES[name](values), 2) if values else None
+        table.append(entry)
+    return table
+
+
+def _print_table(table: List[Dict[str, Any]]) -> None:
+    if not table:
+        print("(no rows)")
+        return
+    columns = list(table[0])
+    widths = {c: max(len(c), *(len(str(row[c])) for row in table)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in table:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query the analysis history export")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    query = sub.add_parser("query", help="aggregate a metric per group")
+    query.add_argument("source", help="s3://bucket/history/v1 or a local directory (e.g. aws s3 sync output)")
+    query.add_argument("--since", help="YYYY-MM-DD (inclusive)")
+    query.add_argument("--until", help="YYYY-MM-DD (inclusive)")
+    query.add_argument("--group-by", default="framework", help="comma separated columns")
+    query.add_argument("--metric", default="ms_total", choices=[n for n, t in SCHEMA if t in ("int", "float")])
+    query.add_argument("--agg", default="count,avg,p50,p95", help=f"comma separated: count,{','.join(AGGREGATES)}")
+    query.add_argument("--where", action="append", default=[], help="column=value (repeatable)")
+    query.add_argument("--json", action="store_true", help="print JSON instead of a table")
+
+    export = sub.add_parser("export", help="write the matching rows to one local .jsonl.gz / .parquet file")
+    export.add_argument("source")
+    export.add_argument("output")
+    export.add_argument("--since")
+    export.add_argument("--until")
+
+    args = parser.parse_args()
+
+    if args.command == "export":
+        rows = list(read_rows(args.source, args.since, args.until))
+        body, extension = encode(rows, "parquet" if args.output.endswith(".parquet") else "jsonl")
+        if not args.output.endswith(extension):
+            parser.error(f"pyarrow is required to write {args.output}")
+        with open(args.output, "wb") as f:
+            f.write(body)
+        print(f"{len(rows)} rows → {args.output}")
+        return
+
+    group_by = [column for column in args.group_by.split(",") if column]
+    unknown = [column for column in group_by if column not in _TYPES]
+    if unknown:
+        parser.error(f"unknown column(s): {', '.join(unknown)}")
+    filters = [tuple(condition.split("=", 1)) for condition in args.where]
+    table = aggregate(
+        read_rows(args.source, args.since, args.until), group_by, args.metric,
+        [name for name in args.agg.split(",") if name == "count" or name in AGGREGATES], filters
+    )
+    if args.json:
+        print(json.dumps(table, indent=2))
+    else:
+        _print_table(table)
+
+
+if __name__ == "__main__":
+    main()
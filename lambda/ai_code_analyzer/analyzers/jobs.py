@@ -0,0 +1,184 @@
+"""
+Asynchronous analysis jobs
+enqueue는 상태 항목을 만들고 SQS에 event를 넣은 뒤 바로 analysis_id를 돌려줍니다.
+SQS로 호출된 Lambda가 분석하면서 단계(fetch → analyze → generate → upload)를 상태 항목에 기록하고,
+CI는 job_status로 작은 상태 항목 하나만 읽어 polling합니다 (전체 분석 결과 항목은 읽지 않음).
+"""
+import json
+import time
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+# DynamoDB 항목 키 prefix (분석 결과 항목과 구분)
+JOB_KEY_PREFIX = "job#"
+
+STAGES = ("queued", "fetch", "analyze", "generate", "upload")
+TERMINAL_STATUSES = ("completed", "failed")
+
+# SQS 메시지 최대 256 KiB: 이보다 큰 event(file_samples 등)는 S3에 두고 key만 전달
+MAX_INLINE_EVENT_BYTES = 200 * 1024
+EVENT_S3_PREFIX = "jobs"
+
+# 상태 항목 TTL: 3일
+DEFAULT_TTL_SECONDS = 3 * 24 * 3600
+
+
+def job_key(analysis_id: str) -> str:
+    return f"{JOB_KEY_PREFIX}{analysis_id}"
+
+
+def _now() -> int:
+    return int(time.time())
+
+
+def create(table, analysis_id: str, repository: str, commit_sha: str,
+           ttl_seconds: int = DEFAULT_TTL_SECONDS) -> None:
+    """queued 상태 항목 (같은 analysis_id로 다시 enqueue하면 덮어씀)"""
+    now = _now()
+    table.put_item(Item={
+        "analysis_id": job_key(analysis_id),
+        "job_status": "queued",
+        "stage": "queued",
+        "repository": repository,
+        "commit_sha": commit_sha,
+        "queued_at": now,
+        "stage_queued_at": now,
+        "updated_at": now,
+        "attempts": 0,
+        "ttl": now + ttl_seconds,
+    })
+
+
+def enqueue(sqs, queue_url: str, s3, bucket: str, analysis_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    event를 SQS에 넣음. 큰 event는 s3://bucket/jobs/<analysis_id>/event.json에 올리고 포인터만 전송.
+    Returns {"message_id", "event_s3_key"}
+    """
+    payload = {**event, "analysis_id": analysis_id}
+    body = json.dumps(payload, default=str)
+    event_s3_key = None
+    if len(body.encode("utf-8")) > MAX_INLINE_EVENT_BYTES:
+        event_s3_key = f"{EVENT_S3_PREFIX}/{analysis_id}/event.json"
+        s3.put_object(Bucket=bucket, Key=event_s3_key, Body=body.encode("utf-8"), ContentType="application/json")
+        body = json.dumps({"analysis_id": analysis_id, "event_s3_key": event_s3_key})
+
+    resp = sqs.send_message(QueueUrl=queue_url, MessageBody=body)
+    return {"message_id": resp.get("MessageId"), "event_s3_key": event_s3_key}
+
+
+def load_message(body: str, s3, bucket: str) -> Dict[str, Any]:
+    """SQS 메시지 본문 → 분석 event (S3 포인터면 원본 event를 읽어옴)"""
+    message = json.loads(body)
+    if message.get("event_s3_key"):
+        obj = s3.get_object(Bucket=bucket, Key=message["event_s3_key"])
+        message = json.loads(obj["Body"].read())
+    return message
+
+
+class ProgressReporter:
+    """
+    단계 전환을 상태 항목에 기록 (같은 단계 반복 호출은 무시).
+    기록 실패는 분석을 막지 않도록 경고만 남깁니다.
+    """
+
+    def __init__(self, table, analysis_id: str):
+        self.table = table
+        self.analysis_id = analysis_id
+        self.stage: Optional[str] = None
+
+    def _update(self, expression: str, values: Dict[str, Any]) -> None:
+        try:
+            self.table.update_item(
+                Key={"analysis_id": job_key(self.analysis_id)},
+                UpdateExpression=expression,
+                # DynamoDB는 식에서 쓰지 않는 이름이 있으면 거부함
+                ExpressionAttributeNames={
+                    name: name[1:] for name in ("#job_status", "#stage") if name in expression
+                },
+                ExpressionAttributeValues=values,
+            )
+        except Exception as e:
+            print(f"⚠️ Error updating job status {self.analysis_id}: {e}")
+
+    def start(self, attempt: int) -> None:
+        now = _now()
+        self._update(
+            "SET #job_status = :status, started_at = :now, updated_at = :now, attempts = :attempt REMOVE job_error",
+            {":status": "running", ":now": now, ":attempt": attempt}
+        )
+
+    def __call__(self, stage: str) -> None:
+        if stage == self.stage:
+            return
+        self.stage = stage
+        now = _now()
+        self._update(
+            f"SET #stage = :stage, updated_at = :now, stage_{stage}_at = :now",
+            {":stage": stage, ":now": now}
+        )
+
+    def complete(self, result: Dict[str, Any]) -> None:
+        now = _now()
+        self._update(
+            "SET #job_status = :status, updated_at = :now, completed_at = :now, job_result = :result",
+            {":status": "completed", ":now": now, ":result": json.dumps(summarize_result(result), default=str)}
+        )
+
+    def fail(self, error: Exception, will_retry: bool) -> None:
+        now = _now()
+        self._update(
+            "SET #job_status = :status, updated_at = :now, job_error = :error",
+            {
+                ":status": "retrying" if will_retry else "failed",
+                ":now": now,
+                ":error": json.dumps({"error": str(error), "error_type": type(error).__name__}),
+            }
+        )
+
+
+def summarize_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """CI가 다음 단계에 쓰는 필드만 (spec 본문은 S3 / 분석 결과 항목에 있음)"""
+    project_info = result.get("project_info") or {}
+    return {
+        "recommendation": result.get("recommendation"),
+        "analysis_path": result.get("analysis_path"),
+        "primary_language": project_info.get("primary_language"),
+        "primary_framework": project_info.get("primary_framework"),
+        "spec_urls": result.get("spec_urls"),
+        "download_urls": result.get("download_urls"),
+        "deployment_config": result.get("deployment_config"),
+        "total_tokens": (result.get("token_usage") or {}).get("total_tokens", 0),
+        "total_ms": (result.get("stage_timings_ms") or {}).get("total"),
+    }
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def read(table, analysis_id: str) -> Optional[Dict[str, Any]]:
+    """상태 항목 1개 (eventually consistent read, 없으면 None)"""
+    item = table.get_item(Key={"analysis_id": job_key(analysis_id)}).get("Item")
+    if not item:
+        return None
+
+    status = {
+        "analysis_id": analysis_id,
+        "status": item.get("job_status"),
+        "stage": item.get("stage"),
+        "repository": item.get("repository"),
+        "commit_sha": item.get("commit_sha"),
+        "attempts": _plain(item.get("attempts", 0)),
+        "queued_at": _plain(item.get("queued_at")),
+        "updated_at": _plain(item.get("updated_at")),
+        "stages": {
+            stage: _plain(item[f"stage_{stage}_at"]) for stage in STAGES if f"stage_{stage}_at" in item
+        },
+    }
+    if item.get("job_result"):
+        status["result"] = json.loads(item["job_result"])
+    if item.get("job_error"):
+        status.update(json.loads(item["job_error"]))
+    return status
@@ -0,0 +1,458 @@
+"""
+Dependency lockfile resolver
+LLM이 추정한 package_managers 대신 repository에 실제로 있는 lockfile(package-lock.json, yarn.lock, pnpm-lock.yaml,
+poetry.lock, uv.lock, Pipfile.lock, requirements*.txt, go.sum)을 보고 가장 빠르면서 올바른 설치 방법을 고르고,
+BuildKit cache mount를 쓰는 Dockerfile 설치 단계(install_steps / build_steps)를 만듭니다.
+"""
+import json
+import posixpath
+import re
+import tomllib
+from typing import Any, Dict, List, Optional, Tuple
+
+from analyzers import rule_detector
+
+# 우선순위 순 (lockfile basename, 도구)
+NODE_LOCKFILES = (
+    ("pnpm-lock.yaml", "pnpm"),
+    ("yarn.lock", "yarn"),
+    ("package-lock.json", "npm"),
+    ("npm-shrinkwrap.json", "npm"),
+)
+PYTHON_LOCKFILES = (
+    ("uv.lock", "uv"),
+    ("poetry.lock", "poetry"),
+    ("Pipfile.lock", "pipenv"),
+)
+
+# 도구별 BuildKit cache mount 위치 (공식 이미지 기본 사용자 root 기준)
+CACHE_TARGETS = {
+    "npm": "/root/.npm",
+    "yarn": "/usr/local/share/.cache/yarn",
+    "pnpm": "/pnpm/store",
+    "pip": "/root/.cache/pip",
+    "uv": "/root/.cache/uv",
+    "go": "/go/pkg/mod",
+    "go-build": "/root/.cache/go-build",
+}
+
+# 운영용 requirements 파일 우선순위 (dev/test 변형은 제외)
+REQUIREMENTS_PRIORITY = (
+    "requirements.txt",
+    "requirements/prod.txt",
+    "requirements/production.txt",
+    "requirements/main.txt",
+    "requirements/base.txt",
+    "requirements.in",
+)
+_DEV_REQUIREMENTS = re.compile(r"(^|[/_.-])(dev|test|tests|lint|docs|ci)([/_.-]|$)", re.IGNORECASE)
+_REQUIREMENT_INCLUDE = re.compile(r"^\s*(?:-r|--requirement|-c|--constraint)[=\s]+(\S+)", re.MULTILINE)
+_LOCAL_REQUIREMENT = re.compile(r"^\s*(?:-e|--editable)\s+\.|^\s*\.(?:\[[^\]]*\])?\s*$", re.MULTILINE)
+_PINNED_REQUIREMENT = re.compile(r"^\s*[A-Za-z0-9][A-Za-z0-9._-]*(?:\[[^\]]*\])?\s*===?\s*[^\s;#,]+", re.MULTILINE)
+
+UV_IMAGE = "ghcr.io/astral-sh/uv:0.5"
+DEFAULT_GO_VERSION = "1.21"
+# package-lock.json은 수 MB가 될 수 있어서 root 항목만 필요한 sync 검사용으로만 가져옴
+CONTENT_LOCKFILES = ("package-lock.json", "npm-shrinkwrap.json")
+
+
+def _join(root: str, name: str) -> str:
+    return posixpath.join(root, name) if root else name
+
+
+def _mount(*tools: str) -> str:
+    return " ".join(f"--mount=type=cache,target={CACHE_TARGETS[tool]}" for tool in tools)
+
+
+def _copy(manifests: List[str]) -> str:
+    """manifest COPY (하위 디렉터리 파일은 경로를 유지해야 -r requirements/base.txt 등이 동작)"""
+    root_files = [path for path in manifests if "/" not in path.rstrip("/")]
+    lines = [f"COPY {' '.join(root_files)} ./"] if root_files else []
+    lines.extend(f"COPY {path} {path}" for path in manifests if "/" in path.rstrip("/"))
+    return "\n".join(lines)
+
+
+def lockfile_paths(file_list: List[str], root: str = "") -> List[str]:
+    """내용이 필요한 lockfile / requirements path (file_samples로 가져오지 않는 것들)"""
+    files = set(file_list)
+    paths = [_join(root, name) for name in CONTENT_LOCKFILES if _join(root, name) in files]
+    paths.extend(_requirements_files(files, root))
+    return paths
+
+
+def _requirements_files(files, root: str) -> List[str]:
+    """root의 운영용 requirements 파일 (우선순위 순)"""
+    found = [_join(root, name) for name in REQUIREMENTS_PRIORITY if _join(root, name) in files]
+    if found:
+        return found
+    prefix = _join(root, "")
+    return sorted(
+        path for path in files
+        if path.startswith(prefix) and posixpath.basename(path).startswith("requirements")
+        and path.endswith(".txt") and path.count("/") - prefix.count("/") <= 1
+        and not _DEV_REQUIREMENTS.search(path[len(prefix):])
+    )
+
+
+def _npm_lock_sync(lock_text: str, package: Dict[str, Any]) -> Tuple[Optional[bool], Optional[int], Optional[int], List[str]]:
+    """
+    package-lock.json이 package.json과 맞는지 (npm ci는 어긋나면 실패).
+    Returns (in_sync, lockfileVersion, 고정된 패키지 수, 누락된 의존성)
+    """
+    try:
+        lock = json.loads(lock_text)
+    except (json.JSONDecodeError, TypeError):
+        return None, None, None, []
+    version = lock.get("lockfileVersion")
+    packages = lock.get("packages")
+    if isinstance(packages, dict) and "" in packages:
+        locked_root = packages[""]
+        locked = {
+            **(locked_root.get("dependencies") or {}),
+            **(locked_root.get("devDependencies") or {}),
+            **(locked_root.get("optionalDependencies") or {}),
+        }
+        count = len(packages) - 1
+    else:
+        # lockfileVersion 1: top-level dependencies가 설치 트리
+        locked = lock.get("dependencies") or {}
+        count = len(locked)
+
+    declared = {
+        **(package.get("dependencies") or {}),
+        **(package.get("devDependencies") or {}),
+        **(package.get("optionalDependencies") or {}),
+    }
+    missing = sorted(name for name in declared if name not in locked)
+    if isinstance(packages, dict) and "" in packages:
+        # v2+ root 항목은 package.json 범위를 그대로 복사하므로 범위가 바뀌어도 어긋남
+        missing += sorted(
+            name for name, spec in declared.items()
+            if name in locked and isinstance(locked[name], str) and locked[name] != spec
+        )
+    return not missing, version, count, missing
+
+
+def _resolve_node(files, samples: Dict[str, str], root: str) -> Dict[str, Any]:
+    package = rule_detector.parse_package_json(samples.get(_join(root, "package.json"), ""))
+    scripts = package.get("scripts") or {}
+    has_build = "build" in scripts
+    manager_field = str(package.get("packageManager") or "")
+
+    tool, lockfile = "npm", None
+    for name, candidate in NODE_LOCKFILES:
+        if _join(root, name) in files:
+            tool, lockfile = candidate, name
+            break
+    if not lockfile and manager_field.split("@")[0] in ("yarn", "pnpm"):
+        tool = manager_field.split("@")[0]
+
+    notes: List[str] = []
+    in_sync, lock_version, locked_packages = None, None, None
+    corepack = "corepack enable && " if tool != "npm" else ""
+
+    if tool == "npm" and lockfile:
+        lock_text = samples.get(_join(root, lockfile))
+        if lock_text is not None and package:
+            in_sync, lock_version, locked_packages, missing = _npm_lock_sync(lock_text, package)
+            if in_sync is False:
+                notes.append(
+                    f"{lockfile} is out of sync with package.json ({', '.join(missing[:5])}); "
+                    "npm ci would fail, falling back to npm install"
+                )
+        if in_sync is False:
+            prod, full, prune = "npm install --omit=dev", "npm install", "npm prune --omit=dev"
+        else:
+            prod, full, prune = "npm ci --omit=dev", "npm ci", "npm prune --omit=dev"
+    elif tool == "npm":
+        notes.append("No lockfile; installs are not reproducible (commit package-lock.json to enable npm ci)")
+        prod, full, prune = (
+            "npm install --omit=dev --no-audit --no-fund", "npm install --no-audit --no-fund", "npm prune --omit=dev"
+        )
+    elif tool == "yarn":
+        berry = _join(root, ".yarnrc.yml") in files or (manager_field.startswith("yarn@") and not manager_field.startswith("yarn@1"))
+        if berry:
+            # Yarn 2+는 --production이 없음 (workspace focus는 plugin 필요)
+            prod = full = "yarn install --immutable"
+            prune = ""
+        elif lockfile:
+            prod, full = "yarn install --frozen-lockfile --production", "yarn install --frozen-lockfile"
+            prune = "yarn install --frozen-lockfile --production --ignore-scripts --prefer-offline"
+        else:
+            notes.append("No yarn.lock; installs are not reproducible")
+            prod, full = "yarn install --production", "yarn install"
+            prune = "yarn install --production --ignore-scripts --prefer-offline"
+    else:
+        frozen = " --frozen-lockfile" if lockfile else ""
+        if not lockfile:
+            notes.append("No pnpm-lock.yaml; installs are not reproducible")
+        store = f" --store-dir {CACHE_TARGETS['pnpm']}"
+        prod, full = f"pnpm install{frozen} --prod{store}", f"pnpm install{frozen}{store}"
+        prune = "pnpm prune --prod"
+
+    manifests = ["package.json"] + ([lockfile] if lockfile else [])
+    if _join(root, ".yarnrc.yml") in files and tool == "yarn":
+        manifests.append(".yarnrc.yml")
+    if tool == "pnpm" and _join(root, ".npmrc") in files:
+        manifests.append(".npmrc")
+    run_build = {"npm": "npm run build", "yarn": "yarn build", "pnpm": "pnpm build"}[tool]
+
+    install = full if has_build else prod
+    install_steps = f"{_copy(manifests)}\nRUN {_mount(tool)} {corepack}{install}"
+    if has_build:
+        build_steps = f"RUN {run_build}" + (f" && {prune}" if prune else "")
+        command = f"{corepack}{full} && {run_build}"
+    else:
+        build_steps = "# No build script in package.json"
+        command = f"{corepack}{prod}"
+
+    return {
+        "ecosystem": "node",
+        "package_manager": tool,
+        "lockfile": lockfile,
+        "lockfile_version": lock_version,
+        "locked_packages": locked_packages,
+        "in_sync": in_sync,
+        "manifests": manifests,
+        "has_build_script": has_build,
+        "command": command,
+        "install_stages": "",
+        "install_steps": install_steps,
+        "build_steps": build_steps,
+        "cache_mounts": [CACHE_TARGETS[tool]],
+        "notes": notes,
+    }
+
+
+def _generic_node() -> Dict[str, Any]:
+    """파일 목록을 모를 때: lockfile 유무를 build 시점에 판단"""
+    return {
+        "ecosystem": "node",
+        "package_manager": "npm",
+        "lockfile": None,
+        "lockfile_version": None,
+        "locked_packages": None,
+        "in_sync": None,
+        "manifests": ["package*.json"],
+        "has_build_script": None,
+        "command": "npm ci --omit=dev",
+        "install_stages": "",
+        "install_steps": (
+            "COPY package*.json ./\n"
+            f"RUN {_mount('npm')} if [ -f package-lock.json ]; then npm ci --omit=dev; else npm install --omit=dev; fi"
+        ),
+        "build_steps": "RUN npm run build --if-present",
+        "cache_mounts": [CACHE_TARGETS["npm"]],
+        "notes": [],
+    }
+
+
+def _requirements_info(path: str, samples: Dict[str, str]) -> Dict[str, Any]:
+    text = samples.get(path)
+    if text is None:
+        return {"pinned": None, "hashes": None, "includes": [], "local": False}
+    includes = [
+        posixpath.normpath(posixpath.join(posixpath.dirname(path), name))
+        for name in _REQUIREMENT_INCLUDE.findall(text)
+    ]
+    requirements = rule_detector.parse_requirements(text)
+    pinned = len(_PINNED_REQUIREMENT.findall(text))
+    return {
+        "pinned": (pinned, len(requirements)),
+        "hashes": "--hash=" in text,
+        "includes": includes,
+        "local": bool(_LOCAL_REQUIREMENT.search(text)),
+    }
+
+
+def _relative(path: str, root: str) -> str:
+    return path[len(root) + 1:] if root and path.startswith(root + "/") else path
+
+
+def _resolve_python(files, samples: Dict[str, str], root: str) -> Dict[str, Any]:
+    notes: List[str] = []
+    tool, lockfile = "pip", None
+    for name, candidate in PYTHON_LOCKFILES:
+        if _join(root, name) in files:
+            tool, lockfile = candidate, name
+            break
+
+    pip_install = f"RUN {_mount('pip')} pip install --prefix=/install"
+    install_stages = ""
+    locked_packages = None
+
+    if tool == "uv":
+        lock_text = samples.get(_join(root, lockfile))
+        if lock_text:
+            try:
+                locked_packages = len(tomllib.loads(lock_text).get("package", []))
+            except tomllib.TOMLDecodeError:
+                notes.append("uv.lock could not be parsed")
+        manifests = ["pyproject.toml", lockfile]
+        install_steps = (
+            f"COPY --from={UV_IMAGE} /uv /usr/local/bin/uv\n"
+            f"COPY {' '.join(manifests)} ./\n"
+            f"RUN {_mount('uv')} UV_LINK_MODE=copy uv export --frozen --no-dev --no-emit-project --no-hashes "
+            "-o requirements.lock \\\n"
+            "    && UV_LINK_MODE=copy uv pip install --python /usr/local/bin/python --prefix=/install -r requirements.lock"
+        )
+        command = "uv sync --frozen --no-dev"
+    elif tool == "poetry":
+        # lock-version 2.0에는 group 정보가 없어서 poetry export로만 main 의존성을 정확히 뽑을 수 있음.
+        # poetry 자체는 별도 stage에서만 설치해서 최종 image에 섞이지 않게 함
+        manifests = ["pyproject.toml", lockfile]
+        install_stages = (
+            "FROM python:3.11-slim AS poetry-export\n"
+            "WORKDIR /app\n"
+            f"RUN {_mount('pip')} pip install poetry poetry-plugin-export\n"
+            f"COPY {' '.join(manifests)} ./\n"
+            "RUN poetry export --only main --without-hashes -o requirements.lock\n\n"
+        )
+        install_steps = (
+            "COPY --from=poetry-export /app/requirements.lock .\n"
+            f"{pip_install} -r requirements.lock"
+        )
+        command = "poetry install --only main --no-root"
+    elif tool == "pipenv":
+        # Pipfile.lock의 default 섹션이 운영 의존성 (pipenv 설치 없이 변환)
+        manifests = [lockfile]
+        install_steps = (
+            f"COPY {lockfile} .\n"
+            "RUN python -c \"import json; d = json.load(open('Pipfile.lock'))['default']; "
+            "print('\\n'.join(k + v.get('version', '') for k, v in d.items() if 'version' in v))\" > requirements.lock\n"
+            f"{pip_install} -r requirements.lock"
+        )
+        command = "pipenv install --deploy --system"
+    else:
+        requirement_files = _requirements_files(files, root)
+        if requirement_files:
+            main = requirement_files[0]
+            info = _requirements_info(main, samples)
+            manifests = list(dict.fromkeys([_relative(main, root)] + [
+                _relative(path, root) for path in info["includes"] if path in files
+            ]))
+            if info["pinned"] is not None:
+                pinned, total = info["pinned"]
+                locked_packages = total
+                if total and pinned < total:
+                    notes.append(f"{total - pinned} of {total} requirements are not pinned (==); builds may drift")
+            if info["local"]:
+                # '-e .' / '.'는 소스 전체가 있어야 설치 가능
+                manifests = ["."]
+                notes.append(f"{_relative(main, root)} installs the local project; dependency layer cannot be cached separately")
+            lockfile = _relative(main, root)
+            install_steps = f"{_copy(manifests)}\n{pip_install} -r {_relative(main, root)}"
+            command = f"pip install -r {_relative(main, root)}"
+        elif _join(root, "pyproject.toml") in files:
+            manifests = ["."]
+            notes.append("No lockfile or requirements.txt; installing the project from pyproject.toml")
+            install_steps = f"COPY . .\n{pip_install} ."
+            command = "pip install ."
+        else:
+            manifests = ["requirements.txt"]
+            install_steps = f"COPY requirements.txt .\n{pip_install} -r requirements.txt"
+            command = "pip install -r requirements.txt"
+
+    return {
+        "ecosystem": "python",
+        "package_manager": tool,
+        "lockfile": lockfile,
+        "lockfile_version": None,
+        "locked_packages": locked_packages,
+        "in_sync": None,
+        "manifests": manifests,
+        "has_build_script": False,
+        "command": command,
+        "install_stages": install_stages,
+        "install_steps": install_steps,
+        "build_steps": "",
+        "cache_mounts": [CACHE_TARGETS["uv" if tool == "uv" else "pip"]],
+        "notes": notes,
+    }
+
+
+def _resolve_go(files, samples: Dict[str, str], root: str) -> Dict[str, Any]:
+    go_mod = rule_detector.parse_go_mod(samples.get(_join(root, "go.mod"), ""))
+    has_sum = _join(root, "go.sum") in files
+    notes: List[str] = []
+
+    if has_sum:
+        install_steps = f"COPY go.mod go.sum ./\nRUN {_mount('go')} go mod download"
+        manifests = ["go.mod", "go.sum"]
+    else:
+        install_steps = "COPY go.mod ./"
+        manifests = ["go.mod"]
+        if go_mod["requires"]:
+            notes.append("go.mod has requirements but go.sum is missing; the build will fail until go.sum is committed")
+
+    version = go_mod.get("go_version") or DEFAULT_GO_VERSION
+    return {
+        "ecosystem": "go",
+        "package_manager": "go modules",
+        "lockfile": "go.sum" if has_sum else None,
+        "lockfile_version": None,
+        "locked_packages": len(go_mod["requires"]) if go_mod["requires"] else 0,
+        "in_sync": None if has_sum or not go_mod["requires"] else False,
+        "manifests": manifests,
+        "has_build_script": False,
+        # -a는 모든 package를 강제로 다시 빌드해서 build cache를 무효화함
+        "command": "CGO_ENABLED=0 GOOS=linux go build -o app .",
+        "install_stages": "",
+        "install_steps": install_steps,
+        "build_steps": f"RUN {_mount('go', 'go-build')} CGO_ENABLED=0 GOOS=linux go build -o app .",
+        "go_version": version,
+        "cache_mounts": [CACHE_TARGETS["go"], CACHE_TARGETS["go-build"]],
+        "notes": notes,
+    }
+
+
+def ecosystem(project_info: Dict[str, Any]) -> Optional[str]:
+    language = (project_info.get("primary_language") or "").lower()
+    if "python" in language:
+        return "python"
+    if "javascript" in language or "typescript" in language or "node" in language:
+        return "node"
+    if language in ("go", "golang"):
+        return "go"
+    return None
+
+
+def resolve(
+    project_info: Dict[str, Any],
+    file_list: Optional[List[str]] = None,
+    file_samples: Optional[Dict[str, str]] = None,
+    root: str = ""
+) -> Optional[Dict[str, Any]]:
+    """
+    project의 설치 계획 (지원하지 않는 언어면 None).
+    file_list가 없으면 파일 존재를 알 수 없으므로 lockfile이 없다고 보고 보수적인 명령을 만듭니다.
+    """
+    files = set(file_list or [])
+    samples = file_samples or {}
+    kind = ecosystem(project_info)
+    if kind == "node":
+        plan = _resolve_node(files, samples, root) if file_list is not None else _generic_node()
+    elif kind == "python":
+        plan = _resolve_python(files, samples, root)
+    elif kind == "go":
+        if file_list is None:
+            # 파일 목록이 없으면 일반적인 구성(go.sum 있음)을 가정
+            files = {_join(root, "go.mod"), _join(root, "go.sum")}
+        plan = _resolve_go(files, samples, root)
+    else:
+        return None
+    plan["root"] = root
+    plan["files_known"] = file_list is not None
+    return plan
+
+
+def summary(plan: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """result/분석 항목에 넣을 요약 (Dockerfile 조각 제외)"""
+    if not plan:
+        return None
+    return {
+        key: plan[key] for key in (
+            "ecosystem", "package_manager", "lockfile", "lockfile_version", "locked_packages",
+            "in_sync", "has_build_script", "command", "cache_mounts", "notes"
+        )
+    }
@@ -0,0 +1,89 @@
+"""
+Concurrent pipeline helpers for the analyzer
+독립적인 단계(GitHub fetch, DynamoDB 조회, 섹션별 LLM 호출, S3 업로드)를 thread pool로 병렬 실행하고
+단계별 소요 시간을 기록합니다.
+streaming 모드는 병렬 단계는 그대로 두고 spec 생성만 단일 streaming 호출로 바꿉니다.
+"""
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+EXECUTION_MODES = ("concurrent", "streaming", "serial")
+DEFAULT_EXECUTION_MODE = "concurrent"
+
+# Lambda 1024MB 기준 I/O bound 작업에 충분한 수준
+DEFAULT_MAX_WORKERS = 8
+
+
+class StageTimer:
+    """단계별 wall-clock 시간(ms) 기록"""
+
+    def __init__(self):
+        self.timings_ms: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    def record(self, name: str, start: float) -> None:
+        self.timings_ms[name] = round((time.perf_counter() - start) * 1000, 1)
+
+
+def resolve_execution_mode(requested: Optional[str], default: str = DEFAULT_EXECUTION_MODE) -> str:
+    """event/환경변수 값 검증, 알 수 없는 값이면 기본값"""
+    mode = (requested or default).lower()
+    if mode not in EXECUTION_MODES:
+        print(f"⚠️ Unknown execution mode '{requested}', using {default}")
+        return default
+    return mode
+
+
+def run_parallel(
+    tasks: Dict[str, Callable[[], Any]],
+    timer: Optional[StageTimer] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    concurrent: bool = True
+) -> Tuple[Dict[str, Any], Dict[str, Exception]]:
+    """
+    이름 → callable 을 실행하고 (results, errors) 반환.
+    한 작업의 실패가 다른 작업을 취소하지 않으며, 각 작업은 호출 시점의 contextvars를 이어받습니다.
+    concurrent=False 이면 같은 순서로 직렬 실행합니다 (serial 모드/디버깅용).
+    """
+    results: Dict[str, Any] = {}
+    errors: Dict[str, Exception] = {}
+
+    def _timed(name: str, fn: Callable[[], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            if timer is not None:
+                timer.record(name, start)
+
+    if not concurrent or len(tasks) <= 1:
+        for name, fn in tasks.items():
+            try:
+                results[name] = _timed(name, fn)
+            except Exception as e:
+                errors[name] = e
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        # Context 객체는 동시에 여러 thread에서 진입할 수 없으므로 작업마다 복사
+        futures = {
+            name: executor.submit(contextvars.copy_context().run, _timed, name, fn)
+            for name, fn in tasks.items()
+        }
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = e
+
+    return results, errors
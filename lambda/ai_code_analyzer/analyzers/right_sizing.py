@@ -0,0 +1,366 @@
+"""
+Fargate right-sizing
+같은 repository의 이전 배포에서 관측한 CPU/메모리 사용률(CloudWatch ECS 지표)과 framework/runtime 사전값을 섞어
+필요한 총 CPU와 task당 메모리를 추정하고, 가장 저렴한 합법 Fargate cpu/memory 조합과 task 수,
+그리고 p95 latency 목표를 만족하는 autoscaling target을 계산합니다.
+
+offline 확인:
+    python -m analyzers.right_sizing fixtures/utilization_samples.json
+"""
+import argparse
+import json
+import math
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.resource_config import (
+    CPU_MAPPING, MEMORY_MAPPING, DEFAULT_COMPLEXITY, SCALING_CONFIG,
+    FARGATE_SIZES, FARGATE_PRICE_PER_VCPU_HOUR, FARGATE_PRICE_PER_GB_HOUR,
+    LATENCY_P95_GOAL_MS, CPU_TARGET_RANGE
+)
+
+USAGE_KEY_PREFIX = "usage#repo#"
+# 최근 1주일 (1시간 단위 sample 기준)
+MAX_SAMPLES = 168
+HOURS_PER_MONTH = 730
+
+# framework/runtime별 task 하나의 p95 사용량 사전값 (CPU units, 메모리 MB)
+FRAMEWORK_PRIORS = {
+    "streamlit": (300, 600),
+    "fastapi": (200, 250),
+    "flask": (200, 200),
+    "django": (300, 400),
+    "express": (150, 180),
+    "nestjs": (200, 300),
+    "next": (300, 450),
+    "nextjs": (300, 450),
+    "gin": (100, 60),
+    "echo": (100, 60),
+    "spring": (500, 900),
+    "spring boot": (500, 900),
+    "actix": (100, 40),
+    "axum": (100, 40),
+}
+LANGUAGE_PRIORS = {
+    "python": (200, 250),
+    "node": (150, 200),
+    "go": (100, 60),
+    "rust": (100, 40),
+    "java": (500, 900),
+}
+# 복잡도 label은 사전값의 배율로만 사용
+COMPLEXITY_MULTIPLIERS = {"simple": 0.75, "moderate": 1.0, "complex": 1.75}
+
+# 사전값이 관측 sample 몇 개 분량의 무게를 갖는지
+PRIOR_WEIGHT = 6
+# CPU 사용률이 이 값 이상이면 throttling 중으로 보고 실제 수요를 더 크게 잡음
+SATURATION_UTILIZATION = 90
+SATURATION_FACTOR = 1.5
+# task당 메모리 여유분 (GC, 순간 peak)
+MEMORY_HEADROOM = 0.25
+# 최대 task 수 산정 시 관측 peak 대비 여유
+BURST_FACTOR = 1.5
+MAX_TASKS = 20
+# latency = base / (1 - 사용률) 모델에서 사용률 상한 (발산 방지)
+MAX_MODEL_UTILIZATION = 0.95
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """nearest-rank percentile"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _runtime(project_info: Dict[str, Any]) -> str:
+    language = (project_info.get("primary_language") or "").lower()
+    if "python" in language:
+        return "python"
+    if "javascript" in language or "typescript" in language:
+        return "node"
+    if language in ("go", "golang"):
+        return "go"
+    if "rust" in language:
+        return "rust"
+    if "java" in language or "kotlin" in language:
+        return "java"
+    return ""
+
+
+def prior(project_info: Dict[str, Any]) -> Tuple[float, float, str]:
+    """task 하나의 사전 p95 사용량 (CPU units, 메모리 MB, 출처)"""
+    complexity = project_info.get("deployment_complexity", DEFAULT_COMPLEXITY)
+    multiplier = COMPLEXITY_MULTIPLIERS.get(complexity, 1.0)
+
+    framework = (project_info.get("primary_framework") or "").lower()
+    runtime = _runtime(project_info)
+    if framework in FRAMEWORK_PRIORS:
+        cpu, memory = FRAMEWORK_PRIORS[framework]
+        source = f"framework:{framework}"
+    elif runtime in LANGUAGE_PRIORS:
+        cpu, memory = LANGUAGE_PRIORS[runtime]
+        source = f"runtime:{runtime}"
+    else:
+        # 알 수 없는 stack은 기존 복잡도 mapping의 절반 정도를 사용한다고 가정
+        cpu = CPU_MAPPING.get(complexity, CPU_MAPPING[DEFAULT_COMPLEXITY]) * 0.5
+        memory = MEMORY_MAPPING.get(complexity, MEMORY_MAPPING[DEFAULT_COMPLEXITY]) * 0.5
+        return cpu, memory, f"complexity:{complexity}"
+    return cpu * multiplier, memory * multiplier, source
+
+
+def hourly_cost(cpu: int, memory: int) -> float:
+    """task 하나의 시간당 Fargate 요금 (USD)"""
+    return cpu / 1024 * FARGATE_PRICE_PER_VCPU_HOUR + memory / 1024 * FARGATE_PRICE_PER_GB_HOUR
+
+
+def _observed(samples: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    sample(기존 task 크기 기준 사용률 %)을 절대 사용량으로 변환.
+    Returns task당 메모리 p95, 서비스 전체 CPU p50/p95/peak, throttling 여부
+    """
+    memory_used, cpu_totals, saturated = [], [], 0
+    for sample in samples:
+        try:
+            cpu = float(sample["cpu"])
+            memory = float(sample["memory"])
+            cpu_util = float(sample["cpu_utilization"])
+            memory_util = float(sample["memory_utilization"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        tasks = max(1, int(sample.get("task_count", 1)))
+
+        cpu_used = cpu_util / 100 * cpu * tasks
+        if cpu_util >= SATURATION_UTILIZATION:
+            cpu_used *= SATURATION_FACTOR
+            saturated += 1
+        cpu_totals.append(cpu_used)
+        memory_used.append(memory_util / 100 * memory)
+
+    if not cpu_totals:
+        return None
+    return {
+        "samples": len(cpu_totals),
+        "memory_mb_p95": _percentile(memory_used, 95),
+        "cpu_units_p50": _percentile(cpu_totals, 50),
+        "cpu_units_p95": _percentile(cpu_totals, 95),
+        "cpu_units_peak": max(cpu_totals),
+        "saturated_samples": saturated,
+    }
+
+
+def _base_latency_ms(samples: List[Dict[str, Any]]) -> Optional[float]:
+    """
+    latency ≈ base / (1 - CPU 사용률) 모델의 base (부하가 없을 때 p95) 추정.
+    sample마다 역산한 값의 중앙값이라 outlier 한두 건에 흔들리지 않습니다.
+    """
+    bases = []
+    for sample in samples:
+        try:
+            latency = float(sample["latency_p95_ms"])
+            utilization = min(MAX_MODEL_UTILIZATION, float(sample["cpu_utilization"]) / 100)
+        except (KeyError, TypeError, ValueError):
+            continue
+        bases.append(latency * (1 - utilization))
+    return _percentile(bases, 50) if bases else None
+
+
+def _cpu_target(base_latency_ms: Optional[float], latency_goal_ms: float) -> Tuple[int, List[str]]:
+    """p95 latency 목표를 만족하는 최대 CPU 사용률 (scale-out 기준)"""
+    low, high = CPU_TARGET_RANGE
+    if base_latency_ms is None:
+        return SCALING_CONFIG["cpu_target_value"], []
+    if base_latency_ms >= latency_goal_ms:
+        return low, [
+            f"Unloaded p95 latency (~{base_latency_ms:.0f}ms) already exceeds the {latency_goal_ms:.0f}ms goal; "
+            "scaling out alone cannot meet it"
+        ]
+    target = int((1 - base_latency_ms / latency_goal_ms) * 100)
+    if target < low:
+        return low, [
+            f"The {latency_goal_ms:.0f}ms goal needs CPU below {target}%; clamped to {low}%, "
+            "consider a faster code path or caching"
+        ]
+    return min(high, target), []
+
+
+def recommend(
+    project_info: Dict[str, Any],
+    samples: Optional[List[Dict[str, Any]]] = None,
+    latency_goal_ms: float = LATENCY_P95_GOAL_MS
+) -> Dict[str, Any]:
+    """
+    cpu/memory, desired/min/max task 수, CPU/메모리 scaling target과 예상 비용.
+    samples 항목: cpu, memory (당시 task 크기), cpu_utilization, memory_utilization (%, p95),
+    task_count, latency_p95_ms (optional)
+    """
+    samples = samples or []
+    prior_cpu, prior_memory, prior_source = prior(project_info)
+    observed = _observed(samples)
+    base_latency = _base_latency_ms(samples)
+    cpu_target, notes = _cpu_target(base_latency, latency_goal_ms)
+
+    # 관측 sample이 많을수록 사전값 비중이 줄어듦
+    prior_total = prior_cpu * SCALING_CONFIG["desired_count"]
+    if observed:
+        weight = observed["samples"] / (observed["samples"] + PRIOR_WEIGHT)
+        cpu_p95 = weight * observed["cpu_units_p95"] + (1 - weight) * prior_total
+        cpu_p50 = weight * observed["cpu_units_p50"] + (1 - weight) * prior_total
+        cpu_peak = max(cpu_p95, observed["cpu_units_peak"])
+        memory_p95 = weight * observed["memory_mb_p95"] + (1 - weight) * prior_memory
+        if observed["saturated_samples"]:
+            notes.append(
+                f"{observed['saturated_samples']} sample(s) at >= {SATURATION_UTILIZATION}% CPU; "
+                f"demand scaled by {SATURATION_FACTOR}x to account for throttling"
+            )
+    else:
+        weight = 0.0
+        cpu_p95 = cpu_p50 = cpu_peak = prior_total
+        memory_p95 = prior_memory
+
+    memory_required = memory_p95 * (1 + MEMORY_HEADROOM)
+    min_tasks = SCALING_CONFIG["min_capacity"]
+
+    # 합법 조합마다 p95 수요를 target 사용률로 처리할 task 수를 구하고 총 비용이 가장 낮은 것을 선택
+    best = None
+    for cpu, memories in sorted(FARGATE_SIZES.items()):
+        memory = next((m for m in memories if m >= memory_required), None)
+        if memory is None:
+            continue
+        capacity = cpu * cpu_target / 100
+        tasks = max(min_tasks, math.ceil(cpu_p95 / capacity))
+        if tasks > MAX_TASKS:
+            continue
+        cost = tasks * hourly_cost(cpu, memory)
+        # 비용이 같으면 task 수가 적은 쪽 (latency 분산, 배포 시간)
+        if best is None or (round(cost, 6), tasks) < (round(best[3], 6), best[2]):
+            best = (cpu, memory, tasks, cost)
+
+    if best is None:
+        cpu, memories = max(FARGATE_SIZES.items())
+        memory = next((m for m in memories if m >= memory_required), memories[-1])
+        best = (cpu, memory, MAX_TASKS, MAX_TASKS * hourly_cost(cpu, memory))
+        notes.append("Demand exceeds the largest Fargate size at MAX_TASKS; consider EC2 capacity")
+    cpu, memory, desired, cost = best
+
+    capacity = cpu * cpu_target / 100
+    min_capacity = max(min_tasks, math.ceil(cpu_p50 / capacity))
+    max_capacity = min(MAX_TASKS, max(
+        desired + 2, SCALING_CONFIG["max_capacity"], math.ceil(cpu_peak * BURST_FACTOR / capacity)
+    ))
+    # 평상시 메모리 사용률보다 충분히 높게 두어 baseline 메모리만으로 scale-out 되지 않도록
+    memory_utilization = memory_p95 / memory * 100
+    memory_target = int(min(90, max(SCALING_CONFIG["memory_target_value"], memory_utilization + 15)))
+
+    complexity = project_info.get("deployment_complexity", DEFAULT_COMPLEXITY)
+    baseline_cpu = CPU_MAPPING.get(complexity, CPU_MAPPING[DEFAULT_COMPLEXITY])
+    baseline_memory = MEMORY_MAPPING.get(complexity, MEMORY_MAPPING[DEFAULT_COMPLEXITY])
+    baseline_cost = SCALING_CONFIG["desired_count"] * hourly_cost(baseline_cpu, baseline_memory)
+
+    predicted_latency = None
+    if base_latency is not None:
+        predicted_latency = round(base_latency / (1 - min(MAX_MODEL_UTILIZATION, cpu_target / 100)), 1)
+
+    if observed and observed["samples"] >= 24:
+        confidence = "high"
+    elif observed:
+        confidence = "medium"
+    else:
+        confidence = "low"
+
+    return {
+        "cpu": cpu,
+        "memory": memory,
+        "desired_count": desired,
+        "min_capacity": min(min_capacity, desired),
+        "max_capacity": max_capacity,
+        "cpu_target_value": cpu_target,
+        "memory_target_value": memory_target,
+        "hourly_cost_usd": round(cost, 5),
+        "monthly_cost_usd": round(cost * HOURS_PER_MONTH, 2),
+        "baseline": {
+            "cpu": baseline_cpu,
+            "memory": baseline_memory,
+            "desired_count": SCALING_CONFIG["desired_count"],
+            "monthly_cost_usd": round(baseline_cost * HOURS_PER_MONTH, 2),
+        },
+        "demand": {
+            "cpu_units_p95": round(cpu_p95, 1),
+            "memory_mb_p95": round(memory_p95, 1),
+        },
+        "latency": {
+            "goal_p95_ms": latency_goal_ms,
+            "base_p95_ms": round(base_latency, 1) if base_latency is not None else None,
+            "predicted_p95_ms": predicted_latency,
+        },
+        "prior": prior_source,
+        "samples": observed["samples"] if observed else 0,
+        "observed_weight": round(weight, 2),
+        "confidence": confidence,
+        "notes": notes,
+    }
+
+
+def summary_text(sizing: Dict[str, Any]) -> str:
+    """recommendation_text에 붙일 한 줄 요약"""
+    text = (
+        f"Sizing: {sizing['cpu']} CPU / {sizing['memory']} MB x{sizing['desired_count']} "
+        f"(~${sizing['monthly_cost_usd']}/mo vs ${sizing['baseline']['monthly_cost_usd']}/mo baseline, "
+        f"{sizing['samples']} usage samples)."
+    )
+    if sizing["notes"]:
+        text += f" ⚠️ {sizing['notes'][0]}."
+    return text
+
+
+def usage_key(repository: str) -> str:
+    return f"{USAGE_KEY_PREFIX}{repository}"
+
+
+def load_samples(table, repository: str) -> List[Dict[str, Any]]:
+    """repository의 최근 사용률 sample (없으면 빈 list)"""
+    item = table.get_item(Key={"analysis_id": usage_key(repository)}).get("Item")
+    return list(item.get("samples") or []) if item else []
+
+
+def record_samples(table, repository: str, samples: List[Dict[str, Any]]) -> int:
+    """
+    CloudWatch에서 집계한 sample을 추가하고 최근 MAX_SAMPLES개만 유지.
+    Returns 저장된 sample 수
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    fields = ("cpu", "memory", "cpu_utilization", "memory_utilization", "task_count", "latency_p95_ms")
+    new_samples = [
+        {
+            **{name: Decimal(str(sample[name])) for name in fields if sample.get(name) is not None},
+            "recorded_at": sample.get("recorded_at") or now
+        }
+        for sample in samples
+    ]
+
+    kept = (load_samples(table, repository) + new_samples)[-MAX_SAMPLES:]
+    table.put_item(Item={
+        "analysis_id": usage_key(repository),
+        "repository": repository,
+        "samples": kept,
+        "updated_at": now
+    })
+    return len(kept)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Right-size a Fargate service from a utilization fixture")
+    parser.add_argument("fixture", help='JSON file: {"project_info": {...}, "samples": [...]}')
+    parser.add_argument("--latency-goal-ms", type=float, default=LATENCY_P95_GOAL_MS)
+    args = parser.parse_args()
+
+    with open(args.fixture) as f:
+        fixture = json.load(f)
+    print(json.dumps(
+        recommend(fixture.get("project_info", {}), fixture.get("samples", []), args.latency_goal_ms),
+        indent=2
+    ))
+
+
+if __name__ == "__main__":
+    main()
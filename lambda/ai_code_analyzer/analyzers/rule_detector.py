@@ -0,0 +1,374 @@
+"""
+Deterministic rule-based project detection
+manifest(package.json, requirements/pyproject, go.mod, Cargo.toml)를 직접 파싱해서
+FastAPI / Express / Streamlit / Go HTTP 처럼 흔한 구성은 LLM 없이 high confidence로 판별합니다.
+"""
+import json
+import posixpath
+import re
+import tomllib
+from typing import Any, Callable, Dict, List, Optional, Set
+
+RULE_DETECTION_NOTES = "Detected by rule-based manifest analysis"
+
+# basename(소문자) → 언어/런타임/패키지 매니저 (LLM 실패 시 기본 판별용)
+BASIC_PATTERNS = {
+    "package.json": {"lang": "JavaScript", "runtime": "Node.js 20", "pkg_mgr": "npm"},
+    "requirements.txt": {"lang": "Python", "runtime": "Python 3.11", "pkg_mgr": "pip"},
+    "pyproject.toml": {"lang": "Python", "runtime": "Python 3.11", "pkg_mgr": "pip"},
+    "go.mod": {"lang": "Go", "runtime": "Go 1.21", "pkg_mgr": "go modules"},
+    "cargo.toml": {"lang": "Rust", "runtime": "Rust 1.75", "pkg_mgr": "cargo"},
+    "pom.xml": {"lang": "Java", "runtime": "Java 17", "build": "Maven"},
+    "build.gradle": {"lang": "Java", "runtime": "Java 17", "build": "Gradle"},
+    "gemfile": {"lang": "Ruby", "runtime": "Ruby 3.2", "pkg_mgr": "bundler"},
+}
+
+GO_HTTP_FRAMEWORKS = {
+    "github.com/gin-gonic/gin": "Gin",
+    "github.com/labstack/echo": "Echo",
+    "github.com/gofiber/fiber": "Fiber",
+    "github.com/go-chi/chi": "Chi",
+    "github.com/gorilla/mux": "Gorilla Mux",
+}
+
+_REQUIREMENT_NAME = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+_FASTAPI_APP = re.compile(r"^(\w+)\s*(?::\s*\w+\s*)?=\s*FastAPI\(", re.MULTILINE)
+_NODE_PORT = re.compile(r"PORT\s*\|\|\s*(\d{2,5})|\.listen\(\s*(\d{2,5})")
+_GO_PORT = re.compile(r"\"[\w.]*:(\d{2,5})\"")
+_GO_VERSION = re.compile(r"^go\s+(\d+\.\d+)", re.MULTILINE)
+
+
+# ---------------------------------------------------------------------------
+# Manifest parsers
+# ---------------------------------------------------------------------------
+
+def _normalize(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def parse_requirements(text: str) -> Set[str]:
+    """requirements.txt → 패키지 이름 집합 (extras/버전/주석 제외)"""
+    names = set()
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if not line or line.startswith("-"):
+            continue
+        match = _REQUIREMENT_NAME.match(line)
+        if match:
+            names.add(_normalize(match.group(1)))
+    return names
+
+
+def parse_pyproject(text: str) -> Set[str]:
+    """pyproject.toml의 PEP 621 / poetry 의존성 이름"""
+    try:
+        data = tomllib.loads(text)
+    except tomllib.TOMLDecodeError:
+        return set()
+
+    names = parse_requirements("\n".join(data.get("project", {}).get("dependencies", [])))
+    poetry_deps = data.get("tool", {}).get("poetry", {}).get("dependencies", {})
+    names.update(_normalize(name) for name in poetry_deps if name.lower() != "python")
+    return names
+
+
+def parse_package_json(text: str) -> Dict[str, Any]:
+    """package.json (파싱 실패 시 빈 dict)"""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def parse_go_mod(text: str) -> Dict[str, Any]:
+    """go.mod → {"go_version", "requires"}"""
+    requires = set()
+    in_block = False
+    for raw in text.splitlines():
+        line = raw.split("//", 1)[0].strip()
+        if line.startswith("require ("):
+            in_block = True
+            continue
+        if in_block and line == ")":
+            in_block = False
+            continue
+        if line.startswith("require "):
+            line = line[len("require "):]
+        elif not in_block:
+            continue
+        if line:
+            requires.add(line.split()[0])
+
+    version = _GO_VERSION.search(text)
+    return {"go_version": version.group(1) if version else None, "requires": requires}
+
+
+def parse_cargo_toml(text: str) -> Set[str]:
+    """Cargo.toml [dependencies] 이름"""
+    try:
+        data = tomllib.loads(text)
+    except tomllib.TOMLDecodeError:
+        return set()
+    return set(data.get("dependencies", {}))
+
+
+# ---------------------------------------------------------------------------
+# Detection
+# ---------------------------------------------------------------------------
+
+class _Repo:
+    """root 기준 상대 경로로 파일/샘플 조회"""
+
+    def __init__(self, file_list: List[str], file_samples: Dict[str, str], root: str = ""):
+        prefix = f"{root.rstrip('/')}/" if root else ""
+        self.files = [f[len(prefix):] for f in file_list if f.startswith(prefix)]
+        self.file_set = set(self.files)
+        self.samples = {
+            name[len(prefix):]: content
+            for name, content in (file_samples or {}).items()
+            if name.startswith(prefix)
+        }
+
+    def has(self, path: str) -> bool:
+        return path in self.file_set
+
+    def sample(self, path: str) -> Optional[str]:
+        return self.samples.get(path)
+
+    def first_existing(self, candidates: List[str]) -> Optional[str]:
+        return next((c for c in candidates if self.has(c)), None)
+
+    def python_deps(self) -> Optional[Set[str]]:
+        """root의 requirements.txt/pyproject.toml 의존성 (내용이 없으면 None)"""
+        deps: Optional[Set[str]] = None
+        if self.sample("requirements.txt") is not None:
+            deps = parse_requirements(self.sample("requirements.txt"))
+        if self.sample("pyproject.toml") is not None:
+            deps = (deps or set()) | parse_pyproject(self.sample("pyproject.toml"))
+        return deps
+
+    def python_package_manager(self) -> str:
+        if self.has("poetry.lock"):
+            return "poetry"
+        if self.has("uv.lock"):
+            return "uv"
+        if self.has("Pipfile.lock") or self.has("Pipfile"):
+            return "pipenv"
+        return "pip"
+
+
+def _base_info(language: str, framework: str, runtime: str, port: int) -> Dict[str, Any]:
+    return {
+        "languages": [language],
+        "primary_language": language,
+        "frameworks": [framework],
+        "primary_framework": framework,
+        "build_tools": [],
+        "package_managers": [],
+        "runtime": runtime,
+        "app_type": "web-api",
+        "app_port": port,
+        "database_needed": False,
+        "database_type": "none",
+        "external_services": [],
+        "containerizable": True,
+        "deployment_complexity": "simple",
+        "confidence": "high",
+        "notes": RULE_DETECTION_NOTES,
+        # 환경변수/CLI 옵션으로 포트를 바꿀 수 있는지 (충돌 시 재할당 가능 여부)
+        "port_configurable": True,
+    }
+
+
+def _detect_streamlit(repo: _Repo) -> Optional[Dict[str, Any]]:
+    deps = repo.python_deps()
+    if not deps or "streamlit" not in deps:
+        return None
+
+    entry = next(
+        (path for path, content in repo.samples.items()
+         if path.endswith(".py") and "/" not in path and "import streamlit" in content),
+        None
+    ) or repo.first_existing(["streamlit_app.py", "app.py", "main.py"])
+    if not entry:
+        return None
+
+    info = _base_info("Python", "Streamlit", "Python 3.11", 8501)
+    info["app_type"] = "frontend"
+    info["package_managers"] = [repo.python_package_manager()]
+    info["entrypoint"] = entry
+    return info
+
+
+def _detect_fastapi(repo: _Repo) -> Optional[Dict[str, Any]]:
+    deps = repo.python_deps()
+    if not deps or "fastapi" not in deps:
+        return None
+
+    entrypoint = None
+    for path, content in repo.samples.items():
+        if not path.endswith(".py"):
+            continue
+        match = _FASTAPI_APP.search(content)
+        if match:
+            entrypoint = f"{posixpath.splitext(path)[0].replace('/', '.')}:{match.group(1)}"
+            break
+
+    if not entrypoint:
+        candidate = repo.first_existing(["main.py", "app/main.py", "app.py", "src/main.py"])
+        if not candidate:
+            return None
+        entrypoint = f"{posixpath.splitext(candidate)[0].replace('/', '.')}:app"
+
+    info = _base_info("Python", "FastAPI", "Python 3.11", 8000)
+    info["package_managers"] = [repo.python_package_manager()]
+    info["entrypoint"] = entrypoint
+    return info
+
+
+def _detect_express(repo: _Repo) -> Optional[Dict[str, Any]]:
+    if repo.sample("package.json") is None:
+        return None
+    package = parse_package_json(repo.sample("package.json"))
+    if "express" not in (package.get("dependencies") or {}):
+        return None
+
+    start_script = (package.get("scripts") or {}).get("start", "")
+    entry = None
+    if start_script.startswith("node "):
+        entry = start_script.split()[1]
+    entry = entry or package.get("main") or repo.first_existing(["server.js", "index.js", "app.js"])
+    if not entry or not repo.has(entry):
+        return None
+
+    port, port_configurable = 3000, True
+    match = _NODE_PORT.search(repo.sample(entry) or "")
+    if match:
+        port = int(match.group(1) or match.group(2))
+        # .listen(3000) 처럼 하드코딩된 포트는 변경 불가
+        port_configurable = match.group(1) is not None
+
+    if repo.has("pnpm-lock.yaml"):
+        package_manager = "pnpm"
+    elif repo.has("yarn.lock"):
+        package_manager = "yarn"
+    else:
+        package_manager = "npm"
+
+    info = _base_info("JavaScript", "Express", "Node.js 20", port)
+    info["package_managers"] = [package_manager]
+    info["entrypoint"] = entry
+    info["port_configurable"] = port_configurable
+    return info
+
+
+def _detect_go_http(repo: _Repo) -> Optional[Dict[str, Any]]:
+    if repo.sample("go.mod") is None:
+        return None
+    go_mod = parse_go_mod(repo.sample("go.mod"))
+
+    framework = next(
+        (name for module, name in GO_HTTP_FRAMEWORKS.items()
+         if any(req.startswith(module) for req in go_mod["requires"])),
+        None
+    )
+    main_source = repo.sample("main.go") or repo.sample("cmd/server/main.go") or ""
+    if not framework:
+        if "net/http" not in main_source or "ListenAndServe" not in main_source:
+            return None
+        framework = "net/http"
+
+    port, port_configurable = 8080, True
+    match = _GO_PORT.search(main_source)
+    if match:
+        port, port_configurable = int(match.group(1)), False
+
+    runtime = f"Go {go_mod['go_version']}" if go_mod["go_version"] else "Go 1.21"
+    info = _base_info("Go", framework, runtime, port)
+    info["package_managers"] = ["go modules"]
+    info["port_configurable"] = port_configurable
+    return info
+
+
+DETECTORS: List[Callable[[_Repo], Optional[Dict[str, Any]]]] = [
+    _detect_streamlit,
+    _detect_fastapi,
+    _detect_express,
+    _detect_go_http,
+]
+
+
+def detect(
+    file_list: List[str],
+    file_samples: Optional[Dict[str, str]],
+    root: str = ""
+) -> Optional[Dict[str, Any]]:
+    """
+    잘 알려진 구성이면 high confidence project_info, 아니면 None (LLM 분석으로 진행).
+    manifest 내용(file_samples)이 있어야 판별합니다.
+    """
+    repo = _Repo(file_list, file_samples or {}, root)
+    for detector in DETECTORS:
+        info = detector(repo)
+        if info:
+            return info
+    return None
+
+
+def detect_basic(file_list: List[str], notes: str) -> Dict[str, Any]:
+    """
+    LLM 실패 시 basename 기반 기본 판별 (low confidence).
+    root에 가까운 manifest가 우선합니다.
+    """
+    project_info = {
+        "languages": [],
+        "primary_language": "Unknown",
+        "frameworks": [],
+        "primary_framework": None,
+        "build_tools": [],
+        "package_managers": [],
+        "runtime": "Unknown",
+        "app_type": "web-api",
+        "app_port": 8000,
+        "database_needed": False,
+        "database_type": "none",
+        "external_services": [],
+        "containerizable": True,
+        "deployment_complexity": "moderate",
+        "confidence": "low",
+        "notes": notes
+    }
+
+    matches = sorted(
+        (path.count("/"), path, BASIC_PATTERNS[posixpath.basename(path).lower()])
+        for path in file_list
+        if posixpath.basename(path).lower() in BASIC_PATTERNS
+    )
+    for _, _, info in reversed(matches):
+        # 얕은 경로가 마지막에 적용되어 primary가 됨
+        if "lang" in info:
+            project_info["primary_language"] = info["lang"]
+            if info["lang"] not in project_info["languages"]:
+                project_info["languages"].append(info["lang"])
+        if "runtime" in info:
+            project_info["runtime"] = info["runtime"]
+        if "pkg_mgr" in info and info["pkg_mgr"] not in project_info["package_managers"]:
+            project_info["package_managers"].append(info["pkg_mgr"])
+        if "build" in info and info["build"] not in project_info["build_tools"]:
+            project_info["build_tools"].append(info["build"])
+
+    return project_info
+
+
+def assign_port(project_info: Dict[str, Any], used_ports: Set[int]) -> Dict[str, Any]:
+    """다른 repo가 쓰는 포트와 겹치면 (변경 가능한 경우) 다음 빈 포트로 재할당"""
+    port = int(project_info.get("app_port", 8000))
+    if port not in used_ports or not project_info.get("port_configurable"):
+        return project_info
+
+    candidate = port + 1
+    while candidate in used_ports:
+        candidate += 1
+    print(f"⚠️ Port {port} already in use, assigning {candidate}")
+    return {**project_info, "app_port": candidate}
@@ -0,0 +1,160 @@
+"""
+Monorepo service discovery
+Dockerfile 또는 runtime manifest(package.json, requirements.txt, go.mod ...)가 있는 디렉터리를 배포 단위 후보로 보고
+가장 위에 있는 후보를 service root로 고릅니다. root 아래의 manifest는 그 service에 포함되고 (workspace package 등),
+Dockerfile이 있는 하위 디렉터리만 별도 service가 됩니다. workspace 설정만 있는 repository root는 service가 아닙니다.
+
+service별 subtree의 git tree SHA를 services#<repository> 항목에 기록해 두고,
+다음 분석에서 SHA가 같은 service는 이전 결과를 그대로 사용합니다.
+"""
+import json
+import os
+import posixpath
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+from analyzers import jobs
+from analyzers.rule_detector import BASIC_PATTERNS
+
+# DynamoDB 항목 키 prefix (분석 결과 항목과 구분)
+SERVICES_KEY_PREFIX = "services#"
+SERVICES_TTL_SECONDS = 30 * 24 * 3600
+
+# 한 번에 분석할 최대 service 수 (얕은 root 우선)
+MAX_SERVICES = int(os.getenv("MONOREPO_MAX_SERVICES", "10"))
+
+MANIFESTS = tuple(BASIC_PATTERNS)
+DOCKERFILE = "dockerfile"
+
+# 이 파일이 root에 있으면 root manifest는 workspace 설정 (배포 단위 아님)
+WORKSPACE_FILES = ("pnpm-workspace.yaml", "lerna.json", "nx.json", "turbo.json", "rush.json", "go.work")
+
+# 배포 단위가 아닌 디렉터리 (경로 중 하나라도 해당하면 제외)
+IGNORED_DIRS = {
+    "node_modules", "vendor", "third_party", "dist", "build", "venv", "fixtures", "testdata",
+    "test", "tests", "__tests__", "e2e", "example", "examples", "docs", "scripts",
+}
+_IGNORED_PREFIXES = (".", "test-", "test_", "tests-", "tests_", "example-", "example_")
+
+
+def _ignored(directory: str) -> bool:
+    return any(
+        part.lower() in IGNORED_DIRS or part.lower().startswith(_IGNORED_PREFIXES)
+        for part in directory.split("/") if part
+    )
+
+
+def _contains(root: str, directory: str) -> bool:
+    return root == "" or directory == root or directory.startswith(f"{root}/")
+
+
+def _is_workspace_root(file_list: List[str], file_samples: Optional[Dict[str, str]]) -> bool:
+    root_files = {path.lower() for path in file_list if "/" not in path}
+    if root_files & set(WORKSPACE_FILES):
+        return True
+    samples = file_samples or {}
+    if '"workspaces"' in samples.get("package.json", ""):
+        return True
+    cargo = samples.get("Cargo.toml", samples.get("cargo.toml", ""))
+    return "[workspace]" in cargo and "[package]" not in cargo
+
+
+def service_name(root: str) -> str:
+    """root 경로 → analysis_id/파일명에 쓸 수 있는 이름 ("" 는 "root")"""
+    return re.sub(r"[^a-z0-9]+", "-", root.lower()).strip("-") or "root"
+
+
+def discover(file_list: List[str], file_samples: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """
+    배포 단위 목록 [{"name", "root", "dockerfile", "manifests"}] (얕은 root 순).
+    후보가 없으면 repository 전체를 service 하나로 봅니다.
+    """
+    markers: Dict[str, List[str]] = {}
+    for path in file_list:
+        directory, name = posixpath.split(path)
+        name = name.lower()
+        if (name == DOCKERFILE or name in MANIFESTS) and not _ignored(directory):
+            markers.setdefault(directory, []).append(name)
+
+    if "" in markers and DOCKERFILE not in markers[""] and len(markers) > 1 \
+            and _is_workspace_root(file_list, file_samples):
+        del markers[""]
+
+    roots: List[str] = []
+    for directory in sorted(markers, key=lambda d: (d.count("/") + bool(d), d)):
+        nested = any(_contains(root, directory) for root in roots)
+        if nested and DOCKERFILE not in markers[directory]:
+            continue
+        roots.append(directory)
+
+    if not roots:
+        roots = [""]
+    if len(roots) > MAX_SERVICES:
+        print(f"⚠️ {len(roots)} services found, analyzing the first {MAX_SERVICES}")
+        roots = roots[:MAX_SERVICES]
+
+    services = []
+    for root in roots:
+        found = markers.get(root, [])
+        services.append({
+            "name": service_name(root),
+            "root": root,
+            "dockerfile": DOCKERFILE in found,
+            "manifests": sorted(name for name in found if name != DOCKERFILE),
+        })
+    return services
+
+
+def subtree(paths: Dict[str, Any], root: str, all_roots: List[str]) -> Dict[str, Any]:
+    """
+    {path: value}에서 root 아래 항목만 root 기준 상대 경로로 (더 깊은 다른 service root 아래는 제외)
+    """
+    prefix = f"{root}/" if root else ""
+    others = [f"{other}/" for other in all_roots if other != root and _contains(root, other)]
+    return {
+        path[len(prefix):]: value for path, value in paths.items()
+        if path.startswith(prefix) and not any(path.startswith(other) for other in others)
+    }
+
+
+def services_key(repository: str) -> str:
+    return f"{SERVICES_KEY_PREFIX}{repository}"
+
+
+def load_previous(table, repository: str) -> Dict[str, Dict[str, Any]]:
+    """이전 분석의 service별 기록 {root: entry} (없거나 읽기 실패면 빈 dict)"""
+    try:
+        item = table.get_item(Key={"analysis_id": services_key(repository)}).get("Item")
+    except Exception as e:
+        print(f"⚠️ Could not load previous services for {repository}: {e}")
+        return {}
+    return json.loads(item["services"]) if item and item.get("services") else {}
+
+
+def build_entry(result: Dict[str, Any], tree_sha: str, version: str) -> Dict[str, Any]:
+    """다음 분석에서 그대로 돌려줄 service 결과 (spec 본문은 S3 / 분석 결과 항목에 있음)"""
+    return {
+        "tree_sha": tree_sha,
+        "version": version,
+        "analysis_id": result["analysis_id"],
+        "commit_sha": result.get("commit_sha"),
+        "project_info": result.get("project_info") or {},
+        "summary": jobs.summarize_result(result),
+    }
+
+
+def record(table, repository: str, commit_sha: str, entries: Dict[str, Dict[str, Any]]) -> None:
+    """현재 service 목록으로 덮어씀 (사라진 service는 빠짐). 실패해도 분석 결과에는 영향 없음"""
+    now = int(time.time())
+    try:
+        table.put_item(Item={
+            "analysis_id": services_key(repository),
+            "repository": repository,
+            "commit_sha": commit_sha,
+            "services": json.dumps(entries, default=str),
+            "updated_at": now,
+            "ttl": now + SERVICES_TTL_SECONDS,
+        })
+    except Exception as e:
+        print(f"⚠️ Could not record services for {repository}: {e}")
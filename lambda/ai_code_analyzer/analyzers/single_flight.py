@@ -0,0 +1,158 @@
+"""
+Single-flight analysis lease
+같은 repository/commit을 동시에 분석하는 invocation 중 하나만 조건부 put_item으로 lease를 잡고 계산합니다.
+나머지는 lease 항목을 polling하다가 leader가 기록한 결과를 그대로 돌려받습니다.
+호출 시작 전에 이미 끝난 결과는 재사용하지 않습니다 (순차 재실행은 analysis cache가 담당).
+leader가 실패하면 lease를 지우고, 죽어서 못 지운 lease는 expires_at이 지나면 다른 호출이 가져갑니다.
+"""
+import json
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+# DynamoDB 항목 키 prefix (분석 결과 항목과 구분)
+LEASE_KEY_PREFIX = "lease#"
+
+# Lambda timeout(900s) 동안은 leader가 살아 있다고 봄
+DEFAULT_LEASE_SECONDS = 900
+# 완료된 lease 항목 보관 시간 (기다리던 호출이 결과를 읽어 갈 여유)
+DEFAULT_RESULT_SECONDS = 120
+DEFAULT_MAX_WAIT_SECONDS = 600
+
+POLL_INITIAL_SECONDS = 1.0
+POLL_MAX_SECONDS = 5.0
+
+# DynamoDB 항목 400 KB 제한: 이보다 큰 결과는 저장하지 않음 (follower는 직접 계산)
+MAX_RESULT_BYTES = 350 * 1024
+
+# warm container 동안 누적되는 역할별 카운터
+_stats = {"leader": 0, "follower": 0, "timeout": 0, "takeover": 0, "errors": 0}
+
+
+def lease_key(repository: str, commit_sha: str) -> str:
+    return f"{LEASE_KEY_PREFIX}{repository}#{commit_sha}"
+
+
+def _is_conditional_failure(error: Exception) -> bool:
+    return (
+        isinstance(error, ClientError)
+        and error.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException"
+    )
+
+
+class SingleFlight:
+    """lease 항목 하나에 대한 acquire / wait / complete / release"""
+
+    def __init__(self, table, key: str, owner: str,
+                 lease_seconds: int = DEFAULT_LEASE_SECONDS,
+                 result_seconds: int = DEFAULT_RESULT_SECONDS,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.table = table
+        self.key = key
+        self.owner = owner
+        self.lease_seconds = lease_seconds
+        self.result_seconds = result_seconds
+        self._sleep = sleep
+
+    def try_acquire(self, started_ms: int) -> bool:
+        """
+        lease가 없거나, 만료되었거나, started_ms(호출 시작) 전에 완료된 것이면 잡음 (조건부 put_item 1회)
+        """
+        now = int(time.time())
+        try:
+            self.table.put_item(
+                Item={
+                    "analysis_id": self.key,
+                    "lease_owner": self.owner,
+                    "lease_status": "running",
+                    "acquired_at": now,
+                    "expires_at": now + self.lease_seconds,
+                    "ttl": now + self.lease_seconds + self.result_seconds,
+                },
+                ConditionExpression=(
+                    "attribute_not_exists(analysis_id) OR expires_at < :now OR completed_at_ms < :started_ms"
+                ),
+                ExpressionAttributeValues={":now": now, ":started_ms": started_ms},
+            )
+            return True
+        except Exception as e:
+            if _is_conditional_failure(e):
+                return False
+            raise
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        return self.table.get_item(Key={"analysis_id": self.key}, ConsistentRead=True).get("Item")
+
+    def acquire_or_wait(self, max_wait_seconds: float) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Returns ("leader", None) | ("follower", leader 결과) | ("timeout", None).
+        기다리는 중 lease가 사라지거나 만료되면 (leader 실패) 다시 잡아서 leader가 됩니다.
+        """
+        started_ms = int(time.time() * 1000)
+        deadline = time.monotonic() + max_wait_seconds
+        delay = POLL_INITIAL_SECONDS
+        first = True
+        while True:
+            if self.try_acquire(started_ms):
+                _stats["leader" if first else "takeover"] += 1
+                return "leader", None
+            first = False
+
+            item = self._read()
+            if item and item.get("lease_status") == "completed" and item.get("result"):
+                _stats["follower"] += 1
+                return "follower", json.loads(item["result"])
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                _stats["timeout"] += 1
+                return "timeout", None
+            if item and item.get("lease_status") == "running":
+                print(f"⏳ Waiting for in-flight analysis {item.get('lease_owner')} ({self.key})")
+            self._sleep(min(delay, remaining))
+            delay = min(delay * 2, POLL_MAX_SECONDS)
+
+    def complete(self, result: Dict[str, Any]) -> None:
+        """결과를 lease 항목에 기록 (내가 아직 owner일 때만). 너무 크면 lease만 해제"""
+        body = json.dumps(result, default=str)
+        if len(body.encode("utf-8")) > MAX_RESULT_BYTES:
+            print(f"⚠️ Result too large to share ({len(body)} bytes), releasing lease")
+            self.release()
+            return
+        now = int(time.time())
+        try:
+            self.table.update_item(
+                Key={"analysis_id": self.key},
+                UpdateExpression="SET lease_status = :completed, #result = :result, completed_at_ms = :now_ms, "
+                                 "expires_at = :expires, #ttl = :expires",
+                ConditionExpression="lease_owner = :owner",
+                ExpressionAttributeNames={"#result": "result", "#ttl": "ttl"},
+                ExpressionAttributeValues={
+                    ":completed": "completed",
+                    ":result": body,
+                    ":now_ms": int(time.time() * 1000),
+                    ":expires": now + self.result_seconds,
+                    ":owner": self.owner,
+                },
+            )
+        except Exception as e:
+            _stats["errors"] += 1
+            print(f"⚠️ Error completing lease {self.key}: {e}")
+
+    def release(self) -> None:
+        """실패 시 lease 삭제 (기다리던 호출이 바로 이어받을 수 있도록)"""
+        try:
+            self.table.delete_item(
+                Key={"analysis_id": self.key},
+                ConditionExpression="lease_owner = :owner",
+                ExpressionAttributeValues={":owner": self.owner},
+            )
+        except Exception as e:
+            if not _is_conditional_failure(e):
+                _stats["errors"] += 1
+                print(f"⚠️ Error releasing lease {self.key}: {e}")
+
+
+def stats() -> Dict[str, int]:
+    return dict(_stats)
@@ -0,0 +1,186 @@
+"""
+Single-pass index over LLM spec responses
+응답 전체를 한 번만 스캔해서 ---NAME--- 구분자와 ``` fenced block 경계를 기록하고,
+모든 섹션/코드 블록 조회를 이 index에서 처리합니다.
+섹션은 다음 "알려진" 구분자에서만 끝나므로 본문 안의 YAML 문서 구분자('---')에 잘리지 않습니다.
+파싱 시간은 분석별 ParseLog(결과의 spec_parse)와 container 누적 통계에 함께 기록됩니다.
+"""
+import contextvars
+import json
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+# warm container 동안 누적되는 파싱 통계
+_stats = {"parses": 0, "chars": 0, "total_ms": 0.0, "max_ms": 0.0}
+_stats_lock = threading.Lock()
+
+
+class ParseLog:
+    """
+    분석 하나의 파싱 기록 (kind별 횟수/문자 수/시간).
+    병렬 섹션 생성 thread도 같은 log에 기록하므로 thread-safe.
+    """
+
+    def __init__(self):
+        self.parses = 0
+        self.chars = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.by_kind: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, kind: str, chars: int, ms: float) -> None:
+        with self._lock:
+            self.parses += 1
+            self.chars += chars
+            self.total_ms = round(self.total_ms + ms, 3)
+            self.max_ms = max(self.max_ms, ms)
+            self.by_kind[kind] = round(self.by_kind.get(kind, 0.0) + ms, 3)
+
+    def summary(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "parses": self.parses,
+                "chars": self.chars,
+                "total_ms": self.total_ms,
+                "max_ms": self.max_ms,
+                "by_kind": dict(self.by_kind),
+            }
+
+
+# 현재 분석의 log (run_parallel 작업은 호출 시점의 context를 이어받음)
+_current_log: contextvars.ContextVar = contextvars.ContextVar("spec_parse_log", default=None)
+
+
+def start_log() -> ParseLog:
+    """현재 context(분석 하나)의 파싱 기록을 새로 시작"""
+    log = ParseLog()
+    _current_log.set(log)
+    return log
+
+
+def record(kind: str, chars: int, ms: float) -> None:
+    """container 누적 통계와 현재 분석의 log에 파싱 한 번 기록"""
+    with _stats_lock:
+        _stats["parses"] += 1
+        _stats["chars"] += chars
+        _stats["total_ms"] = round(_stats["total_ms"] + ms, 3)
+        _stats["max_ms"] = max(_stats["max_ms"], ms)
+    log = _current_log.get()
+    if log is not None:
+        log.add(kind, chars, ms)
+
+
+@contextmanager
+def timed(kind: str, chars: int):
+    """블록 실행 시간을 파싱 한 번으로 기록 (예외가 나도 기록)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(kind, chars, round((time.perf_counter() - start) * 1000, 3))
+
+
+def parse_json(content: str, kind: str = "json") -> Any:
+    """json.loads + 파싱 시간 기록 (JSONDecodeError는 그대로 전달)"""
+    with timed(kind, len(content)):
+        return json.loads(content)
+
+
+@lru_cache(maxsize=8)
+def _token_pattern(delimiters: Tuple[str, ...]) -> Pattern:
+    """구분자와 fence를 한 번에 찾는 정규식 (delimiter 조합별로 한 번만 compile)"""
+    return re.compile(
+        "---(?P<delimiter>" + "|".join(re.escape(d) for d in delimiters) + ")---"
+        r"|```(?P<info>[^\n`]*)"
+    )
+
+
+class SpecIndex:
+    """
+    content의 구분자/코드 블록 위치 index.
+    sections: delimiter → (본문 시작, 끝) — 같은 구분자가 반복되면 처음 것을 사용
+    blocks: (언어, fence 위치, 본문 시작, 끝) — 닫히지 않은 fence는 다음 구분자나 응답 끝에서 닫음
+    """
+
+    def __init__(self, content: str, delimiters: Tuple[str, ...]):
+        start = time.perf_counter()
+        self.content = content
+        self.sections: Dict[str, Tuple[int, int]] = {}
+        self.blocks: List[Tuple[str, int, int, int]] = []
+        self._lower: Optional[str] = None
+
+        current: Optional[Tuple[str, int]] = None
+        fence: Optional[Tuple[str, int, int]] = None
+
+        for match in _token_pattern(delimiters).finditer(content):
+            delimiter = match.group("delimiter")
+            if delimiter is not None:
+                # fenced block은 섹션 경계를 넘지 않음
+                if fence:
+                    self.blocks.append((*fence, match.start()))
+                    fence = None
+                if current and current[0] not in self.sections:
+                    self.sections[current[0]] = (current[1], match.start())
+                current = (delimiter, match.end())
+            elif fence:
+                self.blocks.append((*fence, match.start()))
+                fence = None
+            else:
+                info = match.group("info").strip().split()
+                fence = (info[0].lower() if info else "", match.start(), match.end())
+
+        if fence:
+            self.blocks.append((*fence, len(content)))
+        if current and current[0] not in self.sections:
+            self.sections[current[0]] = (current[1], len(content))
+
+        self.parse_ms = round((time.perf_counter() - start) * 1000, 3)
+        record("section_index", len(content), self.parse_ms)
+
+    def section(self, delimiter: str, unwrap_fence: bool = True) -> str:
+        """
+        ---DELIMITER--- 와 다음 구분자 사이 내용.
+        unwrap_fence이면 섹션 전체가 하나의 ``` 블록일 때 블록 내용만 반환합니다.
+        """
+        bounds = self.sections.get(delimiter)
+        if bounds is None:
+            return ""
+        text = self.content[bounds[0]:bounds[1]].strip()
+
+        if unwrap_fence and text.startswith("```"):
+            block = next((b for b in self.blocks if bounds[0] <= b[1] < bounds[1]), None)
+            # 닫는 fence 뒤에 다른 내용이 없을 때만 (설명이 섞인 섹션은 그대로 둠)
+            if block and not self.content[block[3]:bounds[1]].strip().lstrip("`").strip():
+                return self.content[block[2]:block[3]].strip()
+        return text
+
+    def code_block(self, language: str, context: str = "") -> str:
+        """
+        ```language 블록 내용. context가 있으면 그 단어가 처음 나온 위치 이후의 블록을 우선합니다
+        (예: 같은 yaml 블록 중 appspec/buildspec 구분).
+        """
+        language = language.lower()
+        candidates = [block for block in self.blocks if block[0] == language]
+        if not candidates:
+            return ""
+
+        chosen = candidates[0]
+        if context:
+            if self._lower is None:
+                self._lower = self.content.lower()
+            context_idx = self._lower.find(context.lower())
+            if context_idx != -1:
+                chosen = next((block for block in candidates if block[1] > context_idx), chosen)
+
+        return self.content[chosen[2]:chosen[3]].strip()
+
+
+def stats() -> Dict[str, float]:
+    """현재 container의 파싱 횟수/시간 (모든 분석 누적)"""
+    with _stats_lock:
+        return dict(_stats)
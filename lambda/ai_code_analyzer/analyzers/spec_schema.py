@@ -0,0 +1,208 @@
+"""
+Structured output schemas and validation
+project_info / spec bundle을 OpenAI json_schema(strict) 형식으로 요청하고,
+응답을 빠르게 검증합니다 (포트 범위, 알려진 runtime, Fargate cpu/memory 조합, 섹션별 필수 내용).
+문제는 필드/섹션 단위로 돌려주므로 호출자는 잘못된 부분만 다시 생성합니다 (전체 재생성 없음).
+"""
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+from config.resource_config import FARGATE_SIZES
+
+# 컨테이너는 non-root로 실행되므로 1024 미만 포트는 bind 불가
+PORT_RANGE = (1024, 65535)
+
+# "<runtime> <version>" 형식 (예: "Python 3.11", "Node.js 20", "Go 1.21")
+KNOWN_RUNTIMES = (
+    "python", "node.js", "node", "deno", "bun", "go", "rust", "java", "kotlin",
+    "ruby", "php", ".net", "dotnet", "elixir", "scala"
+)
+_RUNTIME = re.compile(
+    r"^(" + "|".join(re.escape(r) for r in KNOWN_RUNTIMES) + r")\s+\d+(\.\d+)*\b", re.IGNORECASE
+)
+
+APP_TYPES = ["web-api", "frontend", "cli", "microservice", "monolith", "static-site", "mobile-backend"]
+DATABASE_TYPES = ["postgres", "mysql", "mongodb", "redis", "none"]
+COMPLEXITIES = ["simple", "moderate", "complex"]
+CONFIDENCES = ["high", "medium", "low"]
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+# strict 모드: 모든 property가 required, additionalProperties false, nullable은 type 배열
+PROJECT_INFO_PROPERTIES: Dict[str, Dict[str, Any]] = {
+    "languages": _STRING_LIST,
+    "primary_language": {"type": "string"},
+    "frameworks": _STRING_LIST,
+    "primary_framework": {"type": ["string", "null"]},
+    "build_tools": _STRING_LIST,
+    "package_managers": _STRING_LIST,
+    "runtime": {"type": "string"},
+    "app_type": {"type": "string", "enum": APP_TYPES},
+    "app_port": {"type": "integer"},
+    "database_needed": {"type": "boolean"},
+    "database_type": {"type": "string", "enum": DATABASE_TYPES},
+    "external_services": _STRING_LIST,
+    "containerizable": {"type": "boolean"},
+    "deployment_complexity": {"type": "string", "enum": COMPLEXITIES},
+    "confidence": {"type": "string", "enum": CONFIDENCES},
+    "notes": {"type": "string"},
+}
+
+_JSON_TYPES = {
+    "string": str, "integer": int, "boolean": bool, "array": list, "object": dict, "null": type(None),
+}
+
+# warm container 동안 누적되는 검증/repair 카운터
+_stats = {"validated": 0, "invalid_fields": 0, "invalid_sections": 0, "repaired": 0, "fallback": 0}
+_stats_lock = threading.Lock()
+
+
+def count(name: str, amount: int = 1) -> None:
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def object_schema(properties: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def project_info_schema(fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """전체 project_info schema, fields를 주면 그 필드만 (repair 요청용)"""
+    names = list(fields) if fields is not None else list(PROJECT_INFO_PROPERTIES)
+    return object_schema({name: PROJECT_INFO_PROPERTIES[name] for name in names if name in PROJECT_INFO_PROPERTIES})
+
+
+def spec_bundle_schema(sections: Iterable[str]) -> Dict[str, Any]:
+    """spec 이름 → 파일 내용(문자열)"""
+    return object_schema({name: {"type": "string"} for name in sections})
+
+
+def response_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": schema}}
+
+
+def fargate_size_ok(cpu: int, memory: int) -> bool:
+    return memory in FARGATE_SIZES.get(cpu, [])
+
+
+def _type_ok(value: Any, schema: Dict[str, Any]) -> bool:
+    types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+    for name in types:
+        expected = _JSON_TYPES[name]
+        # bool은 int의 subclass이므로 integer에서 제외
+        if isinstance(value, expected) and not (name == "integer" and isinstance(value, bool)):
+            if name == "array" and not all(isinstance(item, str) for item in value):
+                continue
+            return True
+    return False
+
+
+def _coerce(value: Any, schema: Dict[str, Any]) -> Any:
+    """LLM이 자주 틀리는 단순 형식 ("8000", "true", enum 대소문자)은 호출 없이 교정"""
+    kind = schema["type"]
+    if kind == "integer" and isinstance(value, str) and value.strip().isdigit():
+        return int(value.strip())
+    if kind == "boolean" and isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    if "enum" in schema and isinstance(value, str) and value.strip().lower() in schema["enum"]:
+        return value.strip().lower()
+    return value
+
+
+def validate_project_info(info: Dict[str, Any]) -> Dict[str, str]:
+    """
+    단순 형식은 info에서 바로 교정하고, 남은 문제를 {field: 이유}로 반환 (비어 있으면 valid)
+    """
+    problems: Dict[str, str] = {}
+    for name, schema in PROJECT_INFO_PROPERTIES.items():
+        if name not in info:
+            problems[name] = "missing"
+            continue
+        info[name] = _coerce(info[name], schema)
+        if not _type_ok(info[name], schema):
+            problems[name] = f"expected {schema['type']}, got {type(info[name]).__name__}"
+        elif "enum" in schema and info[name] not in schema["enum"]:
+            problems[name] = f"must be one of {', '.join(schema['enum'])}"
+
+    port = info.get("app_port")
+    if "app_port" not in problems and not PORT_RANGE[0] <= port <= PORT_RANGE[1]:
+        problems["app_port"] = f"port {port} outside {PORT_RANGE[0]}-{PORT_RANGE[1]}"
+    if "runtime" not in problems and not _RUNTIME.match(info["runtime"].strip()):
+        problems["runtime"] = f"unknown runtime '{info['runtime']}' (expected '<runtime> <version>')"
+
+    count("validated")
+    count("invalid_fields", len(problems))
+    return problems
+
+
+def _numbers(pattern: str, text: str) -> List[int]:
+    return [int(value) for value in re.findall(pattern, text, re.MULTILINE)]
+
+
+def _check_dockerfile(text: str, port: Optional[int]) -> Optional[str]:
+    # 포트는 dockerfile_validator가 autofix하므로 여기서는 보지 않음
+    if not re.search(r"^\s*FROM\s+\S+", text, re.MULTILINE | re.IGNORECASE):
+        return "no FROM instruction"
+    return None
+
+
+def _check_terraform(text: str, port: Optional[int]) -> Optional[str]:
+    cpus = _numbers(r"^\s*cpu\s*=\s*\"?(\d+)\"?", text)
+    memories = _numbers(r"^\s*memory\s*=\s*\"?(\d+)\"?", text)
+    if cpus and memories and not fargate_size_ok(cpus[0], memories[0]):
+        return f"cpu {cpus[0]} / memory {memories[0]} is not a valid Fargate size"
+    ports = _numbers(r"containerPort\"?\s*[=:]\s*\"?(\d+)", text)
+    if port and ports and ports[0] != port:
+        return f"containerPort {ports[0]} does not match app_port {port}"
+    return None
+
+
+def _check_appspec(text: str, port: Optional[int]) -> Optional[str]:
+    ports = _numbers(r"ContainerPort:\s*\"?(\d+)", text)
+    if port and ports and ports[0] != port:
+        return f"ContainerPort {ports[0]} does not match app_port {port}"
+    return None
+
+
+def _check_buildspec(text: str, port: Optional[int]) -> Optional[str]:
+    return None if "phases" in text else "no phases"
+
+
+_SECTION_CHECKS = {
+    "dockerfile": _check_dockerfile,
+    "terraform_ecs": _check_terraform,
+    "appspec": _check_appspec,
+    "buildspec": _check_buildspec,
+}
+
+
+def validate_specs(specs: Dict[str, str], project_info: Dict[str, Any],
+                   sections: Iterable[str]) -> Dict[str, str]:
+    """
+    sections의 spec 검증 → {section: 이유}. 숫자 literal로 적힌 값만 확인합니다 (var.* 참조는 통과).
+    """
+    problems: Dict[str, str] = {}
+    port = project_info.get("app_port")
+    for section in sections:
+        text = specs.get(section) or ""
+        if not text.strip():
+            problems[section] = "empty"
+            continue
+        check = _SECTION_CHECKS.get(section)
+        problem = check(text, port) if check else None
+        if problem:
+            problems[section] = problem
+
+    count("invalid_sections", len(problems))
+    return problems
+
+
+def stats() -> Dict[str, int]:
+    with _stats_lock:
+        return dict(_stats)
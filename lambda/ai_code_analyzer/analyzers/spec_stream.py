@@ -0,0 +1,127 @@
+"""
+Streaming spec response parsing
+OpenAI SSE 스트림을 받으면서 ---DOCKERFILE--- 등의 구분자를 점진적으로 파싱하고,
+섹션이 닫히는 즉시 호출자에게 넘겨줍니다.
+"""
+import bisect
+import json
+import re
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from analyzers import spec_parser
+
+
+def iter_sse_deltas(
+    lines: Iterable[str],
+    on_usage: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Iterator[str]:
+    """
+    chat.completions SSE 라인에서 content delta만 추출
+    stream_options.include_usage로 받은 마지막 usage chunk는 on_usage로 넘김
+    """
+    for line in lines:
+        if not line or not line.startswith("data:"):
+            continue
+
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            print(f"⚠️ Skipping malformed SSE chunk: {data[:80]}")
+            continue
+
+        if on_usage and chunk.get("usage"):
+            on_usage(chunk["usage"])
+
+        for choice in chunk.get("choices") or []:
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                yield content
+
+
+class IncrementalSectionParser:
+    """
+    스트림 chunk를 받아 ---NAME--- 구분자 단위로 섹션을 닫습니다.
+    섹션은 알려진 다음 구분자 또는 스트림 종료 시에만 닫히므로 본문 안의 YAML '---'에 잘리지 않습니다.
+    feed/finish에 쓴 시간을 합쳐 finish 때 spec_parser에 파싱 한 번("stream_sections")으로 기록합니다.
+    """
+
+    def __init__(self, delimiters: Dict[str, str]):
+        # delimiter(예: "DOCKERFILE") → spec key(예: "dockerfile")
+        self._delimiters = delimiters
+        self._pattern = re.compile(
+            "---(" + "|".join(re.escape(d) for d in delimiters) + ")---"
+        )
+        # chunk 경계에 걸친 구분자를 놓치지 않도록 이만큼은 다시 스캔
+        self._max_marker_len = max(len(d) for d in delimiters) + 6
+        # 받은 chunk와 각 chunk의 시작 위치 (delta마다 전체 문자열을 다시 만들지 않음)
+        self._chunks: List[str] = []
+        self._offsets: List[int] = []
+        self._length = 0
+        self._joined: Optional[str] = None
+        self._scan_pos = 0
+        self._current: Optional[Tuple[str, int]] = None
+        self.sections: Dict[str, str] = {}
+        self.parse_ms = 0.0
+
+    @property
+    def text(self) -> str:
+        """지금까지 받은 전체 응답"""
+        if self._joined is None:
+            self._joined = "".join(self._chunks)
+        return self._joined
+
+    def _slice(self, start: int, end: int) -> str:
+        """[start, end) 범위의 응답 (그 범위에 걸친 chunk만 합침)"""
+        first = max(bisect.bisect_right(self._offsets, start) - 1, 0)
+        parts = []
+        for idx in range(first, len(self._chunks)):
+            if self._offsets[idx] >= end:
+                break
+            parts.append(self._chunks[idx])
+        return "".join(parts)[start - self._offsets[first]:end - self._offsets[first]] if parts else ""
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """chunk 추가 후 새로 닫힌 (spec key, content) 목록 반환"""
+        start = time.perf_counter()
+        if chunk:
+            self._chunks.append(chunk)
+            self._offsets.append(self._length)
+            self._length += len(chunk)
+            self._joined = None
+        closed = []
+
+        # 아직 스캔하지 않은 꼬리만 합쳐서 구분자 검색
+        tail_start = self._scan_pos
+        tail = self._slice(tail_start, self._length)
+        for match in self._pattern.finditer(tail):
+            if self._current:
+                closed.extend(self._close(tail_start + match.start()))
+            self._current = (self._delimiters[match.group(1)], tail_start + match.end())
+            self._scan_pos = tail_start + match.end()
+
+        self._scan_pos = max(self._scan_pos, self._length - self._max_marker_len)
+        self.parse_ms += (time.perf_counter() - start) * 1000
+        return closed
+
+    def finish(self) -> List[Tuple[str, str]]:
+        """스트림 종료: 열려 있는 마지막 섹션을 닫음"""
+        start = time.perf_counter()
+        closed = self._close(self._length) if self._current else []
+        self._current = None
+        self.parse_ms = round(self.parse_ms + (time.perf_counter() - start) * 1000, 3)
+        spec_parser.record("stream_sections", self._length, self.parse_ms)
+        return closed
+
+    def _close(self, end: int) -> List[Tuple[str, str]]:
+        key, start = self._current
+        content = self._slice(start, end).strip()
+        # 같은 구분자가 반복되면 처음 나온 섹션을 유지
+        if key in self.sections:
+            return []
+        self.sections[key] = content
+        return [(key, content)]
@@ -0,0 +1,23 @@
+#!/bin/bash
+# Build the AI analyzer Lambda zip from this directory (single source of truth).
+# 소스를 복사해두는 package/ 디렉터리 대신 매번 새로 조립하므로 handler 사본이 갈라지지 않습니다.
+#
+# Usage: ./build.sh [output.zip]   (default: <repo root>/build/ai_analyzer.zip)
+
+set -e
+
+SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
+REPO_ROOT="$( cd "$SCRIPT_DIR/../.." && pwd )"
+OUTPUT="${1:-$REPO_ROOT/build/ai_analyzer.zip}"
+STAGING="$(mktemp -d)"
+trap 'rm -rf "$STAGING"' EXIT
+
+pip install --quiet --requirement "$SCRIPT_DIR/requirements.txt" --target "$STAGING"
+cp -R "$SCRIPT_DIR/handler.py" "$SCRIPT_DIR/analyzers" "$SCRIPT_DIR/clients" "$SCRIPT_DIR/config" \
+  "$SCRIPT_DIR/generators" "$SCRIPT_DIR/templates" "$STAGING/"
+find "$STAGING" -name "__pycache__" -type d -prune -exec rm -rf {} +
+
+mkdir -p "$(dirname "$OUTPUT")"
+rm -f "$OUTPUT"
+(cd "$STAGING" && zip -qr "$OUTPUT" .)
+echo "✅ Built $OUTPUT (templates version: $(cd "$SCRIPT_DIR" && python -c 'from templates import registry; print(registry.version())'))"
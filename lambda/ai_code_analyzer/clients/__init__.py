@@ -0,0 +1,3 @@
+"""
+Outbound clients (HTTP, AWS) for Lambda AI Analyzer
+"""
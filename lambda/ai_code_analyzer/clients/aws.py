@@ -0,0 +1,34 @@
+"""
+Lazily constructed boto3 clients/resources
+처음 사용할 때 생성해서 container 수명 동안 재사용합니다 (import 시점에 생성하지 않음).
+"""
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+
+_clients: Dict[Tuple[str, str, Optional[str]], Any] = {}
+_lock = threading.Lock()
+
+
+def _get(kind: str, service: str, region_name: Optional[str]) -> Any:
+    key = (kind, service, region_name)
+    obj = _clients.get(key)
+    if obj is None:
+        with _lock:
+            obj = _clients.get(key)
+            if obj is None:
+                factory = boto3.client if kind == "client" else boto3.resource
+                obj = factory(service, region_name=region_name) if region_name else factory(service)
+                _clients[key] = obj
+    return obj
+
+
+def get_client(service: str, region_name: Optional[str] = None) -> Any:
+    """boto3.client (thread-safe, container 당 1개)"""
+    return _get("client", service, region_name)
+
+
+def get_resource(service: str, region_name: Optional[str] = None) -> Any:
+    """boto3.resource (container 당 1개)"""
+    return _get("resource", service, region_name)
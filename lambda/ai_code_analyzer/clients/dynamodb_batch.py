@@ -0,0 +1,83 @@
+"""
+Buffered DynamoDB writes for batch invocations
+항목마다 put_item 하는 대신 batch_write_item(요청당 최대 25개)으로 모아서 쓰고,
+UnprocessedItems는 backoff 후 재시도합니다. 끝까지 실패한 항목은 owner 단위로 보고합니다.
+"""
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+BATCH_WRITE_LIMIT = 25
+DEFAULT_MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 0.1
+BACKOFF_MAX_SECONDS = 2.0
+
+
+class WriteBuffer:
+    """batch 동안 put 요청을 모아두었다가 flush()에서 한꺼번에 기록"""
+
+    def __init__(self, key_attribute: str = "analysis_id"):
+        self.key_attribute = key_attribute
+        # (table, key) → (item, owners). 같은 key는 마지막 item만 쓰고 owner는 모두 기록
+        self._puts: Dict[Tuple[str, str], Tuple[Dict[str, Any], List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, table_name: str, item: Dict[str, Any], owner: Optional[str] = None) -> None:
+        key = (table_name, str(item[self.key_attribute]))
+        with self._lock:
+            owners = self._puts[key][1] if key in self._puts else []
+            if owner is not None and owner not in owners:
+                owners.append(owner)
+            self._puts[key] = (item, owners)
+
+    def __len__(self) -> int:
+        return len(self._puts)
+
+    def flush(self, dynamodb, max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> Set[str]:
+        """
+        dynamodb: boto3 DynamoDB service resource.
+        Returns 기록에 실패한 항목의 owner 집합.
+        """
+        with self._lock:
+            pending = list(self._puts.items())
+            self._puts = {}
+
+        failed: Set[str] = set()
+        for start in range(0, len(pending), BATCH_WRITE_LIMIT):
+            chunk = dict(pending[start:start + BATCH_WRITE_LIMIT])
+            for key in self._write_chunk(dynamodb, chunk, max_attempts):
+                failed.update(chunk[key][1])
+        return failed
+
+    def _write_chunk(
+        self,
+        dynamodb,
+        chunk: Dict[Tuple[str, str], Tuple[Dict[str, Any], List[str]]],
+        max_attempts: int
+    ) -> List[Tuple[str, str]]:
+        """한 요청(≤25개) 기록. 재시도 후에도 남은 key 목록 반환"""
+        request_items: Dict[str, List[Dict[str, Any]]] = {}
+        for (table_name, _), (item, _) in chunk.items():
+            request_items.setdefault(table_name, []).append({"PutRequest": {"Item": item}})
+
+        for attempt in range(max_attempts):
+            try:
+                response = dynamodb.batch_write_item(RequestItems=request_items)
+            except Exception as e:
+                print(f"⚠️ batch_write_item failed ({e}), attempt {attempt + 1}/{max_attempts}")
+            else:
+                request_items = response.get("UnprocessedItems") or {}
+                if not request_items:
+                    return []
+                remaining = sum(len(requests) for requests in request_items.values())
+                print(f"⚠️ {remaining} unprocessed items, attempt {attempt + 1}/{max_attempts}")
+
+            if attempt + 1 < max_attempts:
+                time.sleep(random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt))))
+
+        return [
+            (table_name, str(request["PutRequest"]["Item"][self.key_attribute]))
+            for table_name, requests in request_items.items()
+            for request in requests
+        ]
@@ -0,0 +1,146 @@
+"""
+Pooled keep-alive HTTP session for outbound calls (OpenAI, GitHub)
+warm Lambda invocation 사이에 TCP/TLS 연결을 재사용하고, 429/5xx는 jitter가 있는
+exponential backoff로 재시도합니다 (Retry-After 헤더 우선).
+"""
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+DEFAULT_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+BACKOFF_BASE_SECONDS = float(os.getenv("HTTP_BACKOFF_BASE_SECONDS", "0.5"))
+BACKOFF_MAX_SECONDS = float(os.getenv("HTTP_BACKOFF_MAX_SECONDS", "20"))
+# Retry-After가 이보다 길면 기다리지 않고 실패 처리 (Lambda timeout 보호)
+MAX_RETRY_AFTER_SECONDS = float(os.getenv("HTTP_MAX_RETRY_AFTER_SECONDS", "60"))
+
+# host별 동시 연결 수 제한 (pool_block=True 이므로 초과 요청은 대기)
+POOL_MAXSIZE_PER_HOST = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+POOL_HOSTS = 4
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_counters = {"requests": 0, "retries": 0, "retry_after_honoured": 0, "failures": 0}
+_counters_lock = threading.Lock()
+
+
+def _count(name: str, amount: int = 1) -> None:
+    with _counters_lock:
+        _counters[name] += amount
+
+
+def get_session() -> requests.Session:
+    """module-level session (container 당 1개)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # 재시도는 request()에서 직접 처리 (Retry-After, 카운터)
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_HOSTS,
+                    pool_maxsize=POOL_MAXSIZE_PER_HOST,
+                    pool_block=True,
+                    max_retries=0
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP-date) 해석"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """full jitter exponential backoff"""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+def request(
+    method: str,
+    url: str,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    **kwargs
+) -> requests.Response:
+    """
+    session.request + 재시도.
+    429/5xx 응답과 연결 실패만 재시도하며, read timeout은 (LLM 호출이 길기 때문에) 재시도하지 않습니다.
+    재시도 후에도 실패한 응답은 그대로 반환하므로 호출자가 raise_for_status()로 처리합니다.
+    """
+    session = get_session()
+    attempt = 0
+
+    while True:
+        _count("requests")
+        try:
+            response = session.request(method, url, **kwargs)
+        except requests.exceptions.ConnectionError as e:
+            if attempt >= max_retries:
+                _count("failures")
+                raise
+            delay = _backoff_seconds(attempt)
+            print(f"⚠️ {method} {url} connection error ({e}), retry {attempt + 1}/{max_retries} in {delay:.1f}s")
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+                if response.status_code >= 400:
+                    _count("failures")
+                return response
+
+            retry_after = _retry_after_seconds(response)
+            if retry_after is not None:
+                if retry_after > MAX_RETRY_AFTER_SECONDS:
+                    _count("failures")
+                    return response
+                _count("retry_after_honoured")
+                delay = retry_after
+            else:
+                delay = _backoff_seconds(attempt)
+            print(f"⚠️ {method} {url} returned {response.status_code}, retry {attempt + 1}/{max_retries} in {delay:.1f}s")
+            # 연결을 pool로 돌려보냄
+            response.close()
+
+        _count("retries")
+        attempt += 1
+        time.sleep(delay)
+
+
+def stats() -> Dict[str, object]:
+    """요청/재시도 카운터와 host별 연결 재사용 현황"""
+    with _counters_lock:
+        result: Dict[str, object] = dict(_counters)
+
+    hosts = {}
+    if _session is not None:
+        adapter = _session.get_adapter("https://")
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            hosts[pool.host] = {
+                "requests": pool.num_requests,
+                "new_connections": pool.num_connections,
+                "reused_connections": max(0, pool.num_requests - pool.num_connections)
+            }
+    result["hosts"] = hosts
+    return result
@@ -0,0 +1,216 @@
+"""
+LLM model routing and token accounting
+작업(task)별로 모델/temperature/timeout을 고르고, 호출마다 usage를 TokenLedger에 모아 비용을 계산합니다.
+  - analysis (프로젝트 분류, JSON): 작은 모델
+  - generation (spec 생성): 큰 모델
+timeout/연결 실패/5xx가 나면 fallback 체인의 다음 모델로 넘어갑니다.
+
+repository별 하루 token 사용량은 분석 테이블의 tokens#repo#<repo>#<day> 항목에 누적되며,
+budget의 DEGRADED_RATIO를 넘으면 generation도 작은 모델로, budget을 다 쓰면 LLM 없이 처리합니다.
+"""
+import os
+import threading
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+USAGE_KEY_PREFIX = "tokens#repo#"
+
+ANALYSIS_MODEL = os.getenv("LLM_ANALYSIS_MODEL", "gpt-4o-mini")
+GENERATION_MODEL = os.getenv("LLM_GENERATION_MODEL", "gpt-4o")
+# 요청한 모델이 timeout/장애일 때 순서대로 시도할 모델
+FALLBACK_MODELS = [m for m in os.getenv("LLM_FALLBACK_MODELS", "gpt-4o,gpt-4o-mini").split(",") if m]
+
+# task → (temperature, 요청당 timeout 초). 분류는 결정적으로, 생성은 기존 설정 유지
+TASK_SETTINGS = {
+    "analysis": (0.0, float(os.getenv("LLM_ANALYSIS_TIMEOUT_SECONDS", "60"))),
+    "generation": (0.3, float(os.getenv("LLM_GENERATION_TIMEOUT_SECONDS", "240"))),
+}
+
+# USD per 1M tokens (input, output)
+MODEL_PRICES_PER_MTOK = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+# 가격표에 없는 모델은 큰 모델 가격으로 (과소 추정 방지)
+DEFAULT_PRICE_PER_MTOK = MODEL_PRICES_PER_MTOK["gpt-4o"]
+
+# repository별 하루 token budget (0이면 제한 없음)
+DEFAULT_REPO_DAILY_TOKEN_BUDGET = int(os.getenv("LLM_REPO_DAILY_TOKEN_BUDGET", "300000"))
+DEGRADED_RATIO = 0.8
+USAGE_TTL_SECONDS = 3 * 86400
+
+
+class TokenBudgetExceeded(Exception):
+    """repository token budget 소진 (호출자는 fallback 경로로 처리)"""
+
+
+def call_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    input_price, output_price = MODEL_PRICES_PER_MTOK.get(model, DEFAULT_PRICE_PER_MTOK)
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+
+def task_settings(task: str) -> Tuple[float, float]:
+    """(temperature, timeout)"""
+    return TASK_SETTINGS.get(task, TASK_SETTINGS["generation"])
+
+
+def chain(model: str) -> List[str]:
+    """요청 모델 + fallback 모델 (중복 제외)"""
+    return [model] + [m for m in FALLBACK_MODELS if m != model]
+
+
+def budget_state(used: int, budget: int) -> str:
+    """ok | degraded | exhausted"""
+    if budget <= 0:
+        return "ok"
+    if used >= budget:
+        return "exhausted"
+    if used >= budget * DEGRADED_RATIO:
+        return "degraded"
+    return "ok"
+
+
+def select_models(state: str) -> Dict[str, str]:
+    """budget 상태에 따른 task별 모델"""
+    if state == "ok":
+        return {"analysis": ANALYSIS_MODEL, "generation": GENERATION_MODEL}
+    return {"analysis": ANALYSIS_MODEL, "generation": ANALYSIS_MODEL}
+
+
+class TokenLedger:
+    """
+    분석 하나의 LLM 호출 기록. concurrent spec 생성에서 여러 thread가 같이 기록합니다.
+    remaining이 0 이하가 되면 이후 호출은 TokenBudgetExceeded.
+    """
+
+    def __init__(self, budget: int = 0, used_before: int = 0):
+        self.budget = budget
+        self.used_before = used_before
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(call["total_tokens"] for call in self.calls)
+
+    @property
+    def remaining(self) -> Optional[int]:
+        if self.budget <= 0:
+            return None
+        return self.budget - self.used_before - self.total_tokens
+
+    def check(self) -> None:
+        remaining = self.remaining
+        if remaining is not None and remaining <= 0:
+            raise TokenBudgetExceeded(
+                f"token budget exhausted ({self.used_before + self.total_tokens}/{self.budget})"
+            )
+
+    def record(
+        self,
+        task: str,
+        model: str,
+        usage: Optional[Dict[str, Any]],
+        latency_ms: float,
+        attempt: int = 0,
+        error: Optional[str] = None
+    ) -> None:
+        usage = usage or {}
+        prompt_tokens = int(usage.get("prompt_tokens") or 0)
+        completion_tokens = int(usage.get("completion_tokens") or 0)
+        with self._lock:
+            self.calls.append({
+                "task": task,
+                "model": model,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": int(usage.get("total_tokens") or prompt_tokens + completion_tokens),
+                "cost_usd": call_cost(model, prompt_tokens, completion_tokens),
+                "latency_ms": round(latency_ms, 1),
+                "fallback": attempt > 0,
+                "error": error
+            })
+
+    def summary(self) -> Dict[str, Any]:
+        """result/history에 넣는 집계"""
+        with self._lock:
+            calls = list(self.calls)
+
+        by_task: Dict[str, Dict[str, Any]] = {}
+        for call in calls:
+            entry = by_task.setdefault(call["task"], {
+                "models": [], "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0
+            })
+            if call["error"] is None and call["model"] not in entry["models"]:
+                entry["models"].append(call["model"])
+            entry["calls"] += 1
+            entry["prompt_tokens"] += call["prompt_tokens"]
+            entry["completion_tokens"] += call["completion_tokens"]
+            entry["cost_usd"] += call["cost_usd"]
+        for entry in by_task.values():
+            entry["cost_usd"] = round(entry["cost_usd"], 6)
+
+        generation_models = by_task.get("generation", {}).get("models") or by_task.get("analysis", {}).get("models")
+        prompt_tokens = sum(call["prompt_tokens"] for call in calls)
+        completion_tokens = sum(call["completion_tokens"] for call in calls)
+        return {
+            "model": generation_models[0] if generation_models else None,
+            "calls": len(calls),
+            "failed_calls": sum(1 for call in calls if call["error"]),
+            "fallbacks": sum(1 for call in calls if call["fallback"] and call["error"] is None),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "cost_usd": round(sum(call["cost_usd"] for call in calls), 6),
+            "by_task": by_task,
+            "budget": {
+                "daily_limit": self.budget or None,
+                "used_before": self.used_before,
+                "state": budget_state(self.used_before, self.budget),
+            }
+        }
+
+
+def usage_key(repository: str, day: Optional[str] = None) -> str:
+    day = day or datetime.now(timezone.utc).date().isoformat()
+    return f"{USAGE_KEY_PREFIX}{repository}#{day}"
+
+
+def load_repo_usage(table, repository: str) -> int:
+    """오늘(UTC) repository가 쓴 token 수"""
+    item = table.get_item(Key={"analysis_id": usage_key(repository)}).get("Item") or {}
+    return int(item.get("tokens", 0))
+
+
+def record_repo_usage(table, repository: str, ledger: TokenLedger) -> None:
+    """ledger 합계를 오늘 사용량에 원자적으로 더함"""
+    tokens = ledger.total_tokens
+    if not tokens:
+        return
+    cost = round(sum(call["cost_usd"] for call in ledger.calls), 6)
+    table.update_item(
+        Key={"analysis_id": usage_key(repository)},
+        UpdateExpression="SET #ttl = :ttl ADD tokens :tokens, cost_usd :cost, calls :calls",
+        ExpressionAttributeNames={"#ttl": "ttl"},
+        ExpressionAttributeValues={
+            ":ttl": int(datetime.now(timezone.utc).timestamp()) + USAGE_TTL_SECONDS,
+            ":tokens": tokens,
+            ":cost": Decimal(str(cost)),
+            ":calls": len(ledger.calls),
+        }
+    )
+
+
+def should_fall_back(error: Exception) -> bool:
+    """다음 모델로 넘어갈 오류인지 (timeout, 연결 실패, 429/5xx, 모델 없음)"""
+    if isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code in (404, 429) or error.response.status_code >= 500
+    return False
@@ -0,0 +1,83 @@
+"""
+Cached secret provider (SSM Parameter Store)
+warm invocation에서는 SSM을 다시 호출하지 않도록 TTL 동안 값을 캐시합니다.
+"""
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from botocore.exceptions import ClientError
+
+from clients.aws import get_client
+
+# 값이 있는 secret 캐시 시간 (rotation 반영 주기)
+SECRET_TTL_SECONDS = int(os.getenv("SECRET_CACHE_TTL_SECONDS", "900"))
+# 존재하지 않는 secret (예: 선택 사항인 GitHub token) 재조회 간격 — throttle/네트워크 오류는 캐시하지 않음
+NEGATIVE_TTL_SECONDS = int(os.getenv("SECRET_NEGATIVE_TTL_SECONDS", "300"))
+
+# (param_name, region) → (value, expires_at)
+_cache: Dict[Tuple[str, Optional[str]], Tuple[Optional[str], float]] = {}
+_lock = threading.Lock()
+_stats = {"hits": 0, "ssm_calls": 0}
+# 캐시 hit 경로가 SSM 호출 중인 _lock을 기다리지 않도록 통계는 별도 lock
+_stats_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def _is_not_found(error: Exception) -> bool:
+    return (
+        isinstance(error, ClientError)
+        and error.response.get("Error", {}).get("Code") == "ParameterNotFound"
+    )
+
+
+def get_secret(param_name: str, region_name: Optional[str] = None) -> Optional[str]:
+    """Retrieve secret from SSM Parameter Store (TTL cache)"""
+    key = (param_name, region_name)
+    now = time.monotonic()
+
+    cached = _cache.get(key)
+    if cached and cached[1] > now:
+        _count("hits")
+        return cached[0]
+
+    with _lock:
+        # 다른 thread가 먼저 갱신했을 수 있음
+        cached = _cache.get(key)
+        if cached and cached[1] > now:
+            _count("hits")
+            return cached[0]
+
+        _count("ssm_calls")
+        try:
+            resp = get_client("ssm", region_name).get_parameter(Name=param_name, WithDecryption=True)
+            value = resp["Parameter"]["Value"]
+            _cache[key] = (value, now + SECRET_TTL_SECONDS)
+        except Exception as e:
+            print(f"Error retrieving SSM parameter {param_name}: {e}")
+            value = None
+            if _is_not_found(e):
+                _cache[key] = (None, now + NEGATIVE_TTL_SECONDS)
+
+    return value
+
+
+def invalidate(param_name: Optional[str] = None) -> None:
+    """캐시 삭제 (예: 401 응답 후 rotation된 키 재조회)"""
+    with _lock:
+        if param_name is None:
+            _cache.clear()
+        else:
+            for key in [k for k in _cache if k[0] == param_name]:
+                del _cache[key]
+
+
+def stats() -> Dict[str, int]:
+    """캐시 hit / 실제 SSM 호출 횟수 (container 누적)"""
+    with _stats_lock:
+        return dict(_stats)
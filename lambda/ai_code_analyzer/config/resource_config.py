@@ -37,6 +37,29 @@ SCALING_CONFIG = {
     "memory_target_value": 80    # Memory 80% 도달 시 scale out
 }
 
+# ===================================================================
+# Right-sizing 설정 (analyzers/right_sizing.py)
+# ===================================================================
+
+# Fargate에서 허용되는 CPU → 메모리(MB) 조합
+FARGATE_SIZES = {
+    256: [512, 1024, 2048],
+    512: list(range(1024, 4096 + 1, 1024)),
+    1024: list(range(2048, 8192 + 1, 1024)),
+    2048: list(range(4096, 16384 + 1, 1024)),
+    4096: list(range(8192, 30720 + 1, 1024)),
+}
+
+# Fargate 요금 (ap-northeast-2, Linux/x86, USD/hour)
+FARGATE_PRICE_PER_VCPU_HOUR = 0.04656
+FARGATE_PRICE_PER_GB_HOUR = 0.00511
+
+# 목표 p95 응답 시간 (ms), ALB TargetResponseTime 기준
+LATENCY_P95_GOAL_MS = 500
+
+# CPU scaling target 허용 범위 (%)
+CPU_TARGET_RANGE = (40, 85)
+
 # ===================================================================
 # Health Check 설정
 # ===================================================================
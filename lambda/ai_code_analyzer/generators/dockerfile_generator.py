@@ -2,12 +2,18 @@
 Dockerfile generator
 Uses templates from templates/dockerfile_templates.py
 """
-from typing import Dict, Any
-from templates.dockerfile_templates import get_dockerfile_template
+import json
+from typing import Dict, Any, Optional
+from analyzers import lockfile_resolver
+from templates import registry
+from templates.dockerfile_templates import get_dockerfile_template_name
 
 
-def get_build_command(project_info: Dict[str, Any]) -> str:
-    """언어/프레임워크에 따라 빌드 명령어 결정"""
+def get_build_command(project_info: Dict[str, Any], install_plan: Optional[Dict[str, Any]] = None) -> str:
+    """언어/프레임워크에 따라 빌드 명령어 결정 (lockfile 기반 install_plan이 있으면 우선)"""
+    if install_plan:
+        return json.dumps(["sh", "-c", install_plan["command"]])
+
     primary_lang = project_info.get("primary_language", "").lower()
     frameworks = [f.lower() for f in project_info.get("frameworks", [])]
     pkg_managers = project_info.get("package_managers", [])
@@ -15,7 +21,7 @@ def get_build_command(project_info: Dict[str, Any]) -> str:
     # Python
     if "python" in primary_lang:
         if "poetry" in pkg_managers:
-            return "[\"poetry\", \"install\", \"--no-dev\"]"
+            return "[\"poetry\", \"install\", \"--only\", \"main\"]"
         elif "pipenv" in pkg_managers:
             return "[\"pipenv\", \"install\", \"--deploy\"]"
         return "[\"pip\", \"install\", \"-r\", \"requirements.txt\"]"
@@ -56,26 +62,28 @@ def get_start_command(project_info: Dict[str, Any]) -> str:
     primary_lang = project_info.get("primary_language", "").lower()
     frameworks = [f.lower() for f in project_info.get("frameworks", [])]
     port = project_info.get("app_port", 8000)
+    # rule 기반 판별 시 실제 entrypoint (예: "main:app", "app.py", "server.js")
+    entrypoint = project_info.get("entrypoint")
 
     # Python
     if "python" in primary_lang:
         # Streamlit 특수 처리
         if any("streamlit" in f for f in frameworks):
-            return f"[\"streamlit\", \"run\", \"app.py\", \"--server.port={port}\", \"--server.address=0.0.0.0\", \"--server.headless=true\"]"
+            return f"[\"streamlit\", \"run\", \"{entrypoint or 'app.py'}\", \"--server.port={port}\", \"--server.address=0.0.0.0\", \"--server.headless=true\"]"
         elif any("fastapi" in f for f in frameworks):
-            return "[\"uvicorn\", \"app.main:app\", \"--host\", \"0.0.0.0\", \"--port\", \"8000\"]"
+            return f"[\"uvicorn\", \"{entrypoint or 'app.main:app'}\", \"--host\", \"0.0.0.0\", \"--port\", \"{port}\"]"
         elif any("django" in f for f in frameworks):
-            return "[\"gunicorn\", \"myproject.wsgi:application\", \"--bind\", \"0.0.0.0:8000\"]"
+            return f"[\"gunicorn\", \"myproject.wsgi:application\", \"--bind\", \"0.0.0.0:{port}\"]"
         elif any("flask" in f for f in frameworks):
-            return "[\"gunicorn\", \"app:app\", \"--bind\", \"0.0.0.0:8000\"]"
-        return "[\"python\", \"app.py\"]"
+            return f"[\"gunicorn\", \"{entrypoint or 'app:app'}\", \"--bind\", \"0.0.0.0:{port}\"]"
+        return f"[\"python\", \"{entrypoint or 'app.py'}\"]"
 
     # JavaScript/TypeScript
     if "javascript" in primary_lang or "typescript" in primary_lang:
         if any("next" in f for f in frameworks):
             return "[\"npm\", \"start\"]"
         elif any("express" in f for f in frameworks):
-            return "[\"node\", \"server.js\"]"
+            return f"[\"node\", \"{entrypoint or 'server.js'}\"]"
         return "[\"npm\", \"start\"]"
 
     # Go
@@ -93,10 +101,11 @@ def get_start_command(project_info: Dict[str, Any]) -> str:
     return "[\"python\", \"app.py\"]"
 
 
-def generate_dockerfile(project_info: Dict[str, Any]) -> str:
+def generate_dockerfile(project_info: Dict[str, Any], install_plan: Optional[Dict[str, Any]] = None) -> str:
     """
     프로젝트 정보를 기반으로 Dockerfile 생성
     템플릿 기반이므로 수정이 쉽습니다.
+    install_plan: lockfile_resolver.resolve 결과 (없으면 project_info만으로 보수적인 설치 단계)
     """
     primary_language = project_info.get("primary_language", "Python")
     primary_framework = project_info.get("primary_framework", "")
@@ -104,12 +113,19 @@ def generate_dockerfile(project_info: Dict[str, Any]) -> str:
     start_command = get_start_command(project_info)
 
     # 템플릿 가져오기 (framework 정보 전달)
-    template = get_dockerfile_template(primary_language, primary_framework)
+    template_name = get_dockerfile_template_name(primary_language, primary_framework)
+
+    plan = install_plan or lockfile_resolver.resolve(project_info) or {}
 
     # 템플릿에 값 채우기
-    dockerfile = template.format(
+    dockerfile = registry.render(
+        template_name,
         port=port,
-        start_command=start_command
+        start_command=start_command,
+        install_stages=plan.get("install_stages", ""),
+        install_steps=plan.get("install_steps", ""),
+        build_steps=plan.get("build_steps", ""),
+        go_version=plan.get("go_version", lockfile_resolver.DEFAULT_GO_VERSION)
     )
 
     return dockerfile
@@ -2,42 +2,45 @@
 Terraform tfvars generator
 Uses templates from templates/terraform_templates.py and config/resource_config.py
 """
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from analyzers import right_sizing
 from templates.terraform_templates import generate_terraform_tfvars
-from config.resource_config import (
-    get_cpu, get_memory,
-    SCALING_CONFIG, HEALTH_CHECK_CONFIG, DEPLOYMENT_CONFIG
-)
+from config.resource_config import HEALTH_CHECK_CONFIG, DEPLOYMENT_CONFIG
 
 
 def generate_tfvars(
     analysis_id: str,
     image_tag: str,
-    project_info: Dict[str, Any]
+    project_info: Dict[str, Any],
+    utilization_samples: Optional[List[Dict[str, Any]]] = None,
+    sizing: Optional[Dict[str, Any]] = None
 ) -> str:
     """
     프로젝트 정보를 기반으로 terraform.tfvars 생성
     config/resource_config.py 설정을 자동으로 반영합니다.
+    CPU/메모리와 scaling 값은 analyzers/right_sizing.py가 사용률 sample과 사전값으로 결정합니다
+    (이미 계산한 sizing이 있으면 그대로 사용).
     """
-    complexity = project_info.get("deployment_complexity", "moderate")
     port = project_info.get("app_port", 8000)
     primary_language = project_info.get("primary_language", "Unknown")
     primary_framework = project_info.get("primary_framework", "N/A")
     database_needed = project_info.get("database_needed", False)
     database_type = project_info.get("database_type", "none")
 
-    # CPU/메모리는 config에서 가져옴
-    cpu = get_cpu(complexity)
-    memory = get_memory(complexity)
+    sizing = sizing or right_sizing.recommend(project_info, utilization_samples)
+    scaling_config = {
+        name: sizing[name]
+        for name in ("desired_count", "min_capacity", "max_capacity", "cpu_target_value", "memory_target_value")
+    }
 
     # Terraform tfvars 생성
     tfvars = generate_terraform_tfvars(
         analysis_id=analysis_id,
         image_tag=image_tag,
         port=port,
-        cpu=cpu,
-        memory=memory,
-        scaling_config=SCALING_CONFIG,
+        cpu=sizing["cpu"],
+        memory=sizing["memory"],
+        scaling_config=scaling_config,
         health_check_config=HEALTH_CHECK_CONFIG,
         deployment_config=DEPLOYMENT_CONFIG,
         primary_language=primary_language,
@@ -1,122 +1,303 @@
+import time
+
+_MODULE_LOAD_START = time.perf_counter()
+
+import base64
+import hashlib
 import json
 import os
-import hashlib
-from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional
-import boto3
+import posixpath
+import re
+import traceback
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable, Iterator, Set, Tuple
 import requests
 
-# Initialize AWS clients
-ssm = boto3.client("ssm")
-dynamodb = boto3.resource("dynamodb")
-s3 = boto3.client("s3")
+from analyzers import (
+    analysis_cache, artifacts, blob_cache, build_estimator, deployment_index, dockerfile_validator, file_ranking,
+    github_tree, history, jobs, lockfile_resolver, right_sizing, rule_detector, service_discovery, single_flight,
+    spec_parser, spec_schema
+)
+from clients import http_session, llm_router, secrets
+from clients.aws import get_client, get_resource
+from clients.dynamodb_batch import WriteBuffer
+from analyzers.pipeline import StageTimer, run_parallel, resolve_execution_mode
+from analyzers.spec_stream import IncrementalSectionParser, iter_sse_deltas
+from generators.appspec_generator import generate_appspec_yaml
+from generators.dockerfile_generator import generate_dockerfile
+from generators.terraform_generator import generate_tfvars
+from templates import registry as template_registry
+
+# AWS clients are created lazily on first use (clients/aws.py)
+
+OPENAI_API_KEY_PARAM = "/delightful-deploy/openai-api-key"
+OPENAI_API_KEY_REGION = "ap-northeast-2"
+GITHUB_TOKEN_PARAM = "/delightful/github/token"
+GITHUB_API_BASE = "https://api.github.com"
+README_NAMES = ("readme.md", "readme", "readme.rst", "readme.txt")
+
+# 프롬프트/파싱 로직이 바뀌면 올려서 기존 캐시를 무효화합니다
+PROMPT_VERSION = "2025-11-v3"
+
+FALLBACK_DETECTION_NOTES = "Detected using fallback pattern matching"
+FALLBACK_SPECS_PREFIX = "Fallback specs generated"
+
+
+def _fetch_github_tree(
+    repository: str,
+    sha: str,
+    headers: Dict[str, str],
+    recursive: bool
+) -> Tuple[str, List[Dict[str, Any]], bool]:
+    """git/trees API 호출. Returns (tree_sha, entries, truncated)"""
+    tree_url = f"{GITHUB_API_BASE}/repos/{repository}/git/trees/{sha}"
+    if recursive:
+        tree_url += "?recursive=1"
+    tree_resp = http_session.request("GET", tree_url, headers=headers, timeout=10)
+    tree_resp.raise_for_status()
+    tree_data = tree_resp.json()
+    return tree_data["sha"], tree_data.get("tree", []), bool(tree_data.get("truncated"))
+
+
+def _github_blob_fetcher(repository: str) -> Callable[[str], bytes]:
+    """git/blobs API raw 내용 조회 함수 (blob_cache miss 시 사용)"""
+    headers = {"Accept": "application/vnd.github.v3.raw"}
+    github_token = _get_secret_from_ssm(GITHUB_TOKEN_PARAM)
+    if github_token:
+        headers["Authorization"] = f"token {github_token}"
+
+    def _fetch_blob(sha: str) -> bytes:
+        url = f"{GITHUB_API_BASE}/repos/{repository}/git/blobs/{sha}"
+        resp = http_session.request("GET", url, headers=headers, timeout=10)
+        resp.raise_for_status()
+        return resp.content
 
+    return _fetch_blob
 
-def _fetch_github_repo_info(repository: str, commit_sha: str) -> tuple[List[str], str]:
+
+def _fetch_github_repo_info(
+    repository: str,
+    commit_sha: str,
+    snapshot_bucket: Optional[str] = None
+) -> Tuple[List[str], str, Dict[str, Any], Dict[str, str], Dict[str, str]]:
     """
     GitHub API를 통해 repo 파일 목록과 README 가져오기
     repository: "owner/repo" 형식
+    snapshot_bucket이 있으면 이전 분석의 tree snapshot을 이용해 바뀐 subtree만 조회합니다.
+    Returns (file_list, readme_content, tree_info, blob_shas, directory_shas)
     """
-    import requests
-
     # Public API (rate limit 낮음, 하지만 demo용으로는 충분)
-    api_base = "https://api.github.com"
     headers = {"Accept": "application/vnd.github.v3+json"}
 
     # SSM에서 GitHub token 가져오기 (선택사항)
-    github_token = _get_secret_from_ssm("/delightful/github/token")
+    github_token = _get_secret_from_ssm(GITHUB_TOKEN_PARAM)
     if github_token:
         headers["Authorization"] = f"token {github_token}"
 
     try:
-        # 1. 파일 트리 가져오기
-        tree_url = f"{api_base}/repos/{repository}/git/trees/{commit_sha}?recursive=1"
-        tree_resp = requests.get(tree_url, headers=headers, timeout=10)
-        tree_resp.raise_for_status()
-        tree_data = tree_resp.json()
+        # 1. 파일 트리 가져오기 (변경된 subtree만)
+        previous = (
+            github_tree.load_snapshot(get_client("s3"), snapshot_bucket, repository)
+            if snapshot_bucket else None
+        )
+        root_sha, trees, tree_stats = github_tree.walk(
+            lambda sha, recursive: _fetch_github_tree(repository, sha, headers, recursive),
+            commit_sha,
+            previous
+        )
 
-        file_list = [item["path"] for item in tree_data.get("tree", []) if item["type"] == "blob"]
-        print(f"✅ Fetched {len(file_list)} files from GitHub")
+        file_list = github_tree.list_files(root_sha, trees)
+        print(f"✅ Fetched {len(file_list)} files from GitHub ({tree_stats['mode']}, "
+              f"{tree_stats['fetched_trees']} fetched / {tree_stats['reused_trees']} reused trees)")
 
-        # 2. README 가져오기
-        readme_url = f"{api_base}/repos/{repository}/readme"
-        readme_resp = requests.get(readme_url, headers=headers, timeout=10)
+        # 2. README 가져오기 (blob SHA가 같으면 snapshot 재사용)
+        readme_entry = github_tree.find_root_blob(root_sha, trees, README_NAMES)
+        previous_readme = (previous or {}).get("readme") or {}
+        readme_reused = bool(readme_entry) and previous_readme.get("sha") == readme_entry[2]
 
         readme_content = ""
-        if readme_resp.status_code == 200:
-            import base64
-            readme_data = readme_resp.json()
-            readme_content = base64.b64decode(readme_data["content"]).decode("utf-8")
-            print(f"✅ Fetched README ({len(readme_content)} chars)")
+        if readme_reused:
+            readme_content = previous_readme.get("content", "")
+        else:
+            readme_url = f"{GITHUB_API_BASE}/repos/{repository}/readme?ref={commit_sha}"
+            readme_resp = http_session.request("GET", readme_url, headers=headers, timeout=10)
+
+            if readme_resp.status_code == 200:
+                readme_data = readme_resp.json()
+                readme_content = base64.b64decode(readme_data["content"]).decode("utf-8")
+                print(f"✅ Fetched README ({len(readme_content)} chars)")
 
-        return file_list, readme_content
+        if snapshot_bucket:
+            readme_snapshot = (
+                {"sha": readme_entry[2], "content": readme_content} if readme_entry else {}
+            )
+            github_tree.save_snapshot(
+                get_client("s3"), snapshot_bucket, repository,
+                github_tree.build_snapshot(root_sha, trees, readme_snapshot)
+            )
+
+        tree_info = {"root_tree_sha": root_sha, "readme_reused": readme_reused, **tree_stats}
+        return (
+            file_list, readme_content, tree_info,
+            github_tree.blob_shas(root_sha, trees), github_tree.directory_shas(root_sha, trees)
+        )
 
     except Exception as e:
         print(f"❌ GitHub API error: {e}")
         raise
 
 
-def _get_secret_from_ssm(param_name: str) -> Optional[str]:
-    """Retrieve secret from SSM Parameter Store"""
+def _fetch_github_file_samples(
+    repository: str,
+    commit_sha: str,
+    paths: List[str],
+    blob_shas: Optional[Dict[str, str]] = None,
+    cache_bucket: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    상위 manifest/entrypoint 내용을 병렬 조회 (실패한 파일은 제외).
+    blob SHA를 아는 파일은 blob_cache(메모리 → S3 → git/blobs API)로, 나머지는 contents API로 가져옵니다.
+    """
+    headers = {"Accept": "application/vnd.github.v3.raw"}
+    github_token = _get_secret_from_ssm(GITHUB_TOKEN_PARAM)
+    if github_token:
+        headers["Authorization"] = f"token {github_token}"
+
+    def _fetch(path: str) -> str:
+        url = f"{GITHUB_API_BASE}/repos/{repository}/contents/{path}?ref={commit_sha}"
+        resp = http_session.request("GET", url, headers=headers, timeout=10)
+        resp.raise_for_status()
+        return resp.text
+
+    known = {path: blob_shas[path] for path in paths if path in (blob_shas or {})}
+    tasks: Dict[str, Callable[[], Any]] = {
+        path: (lambda path=path: _fetch(path)) for path in paths if path not in known
+    }
+    if known:
+        tasks["__blobs__"] = lambda: blob_cache.get_many(
+            get_client("s3"), cache_bucket, known, _github_blob_fetcher(repository)
+        )
+    samples, errors = run_parallel(tasks)
+    samples.update(samples.pop("__blobs__", {}))
+    errors.pop("__blobs__", None)
+    for path, e in errors.items():
+        print(f"⚠️ Could not fetch sample {path}: {e}")
+
+    print(f"✅ Fetched {len(samples)} file samples from GitHub ({len(known)} via blob cache)")
+    # 순위 순서 유지
+    return {path: samples[path] for path in paths if path in samples}
+
+
+def _get_secret_from_ssm(param_name: str, region_name: Optional[str] = None) -> Optional[str]:
+    """Retrieve secret from SSM Parameter Store (cached across warm invocations)"""
+    return secrets.get_secret(param_name, region_name)
+
+
+def _get_existing_deployments(table_name: Optional[str] = None) -> List[Dict]:
+    """Read the active deployments index to avoid conflicts (scan fallback until the index exists)"""
+    table = get_resource("dynamodb").Table(
+        table_name or os.getenv("AI_ANALYSIS_TABLE", "delightful-deploy-ai-analysis")
+    )
+
     try:
-        resp = ssm.get_parameter(Name=param_name, WithDecryption=True)
-        return resp["Parameter"]["Value"]
+        deployments = deployment_index.read_deployments(table)
+        if deployments is not None:
+            print(f"✅ Found {len(deployments)} existing deployments (index)")
+            return deployments
+        print("⚠️ Deployment index not built yet, falling back to table scan")
     except Exception as e:
-        print(f"Error retrieving SSM parameter {param_name}: {e}")
-        return None
+        print(f"⚠️ Deployment index unavailable ({e}), falling back to table scan")
 
+    return _scan_existing_deployments(table)
 
-def _get_existing_deployments() -> List[Dict]:
-    """Query DynamoDB for existing successful deployments to avoid conflicts"""
-    try:
-        # Query AI analysis table for successful deployments
-        ai_analysis_table = dynamodb.Table("delightful-deploy-ai-analysis")
 
-        response = ai_analysis_table.scan(
-            FilterExpression="attribute_exists(project_info)",
-            Limit=50  # Get last 50 deployments
-        )
+def _scan_existing_deployments(
+    table,
+    max_items: Optional[int] = 1000,
+    raise_errors: bool = False
+) -> List[Dict]:
+    """
+    Legacy path: paginated scan of analysis items (latest per repository).
+    Limit은 filter 이전에 적용되므로 LastEvaluatedKey로 끝까지 읽습니다.
+    index backfill은 max_items=None(전체), raise_errors=True로 호출합니다 (일부만 읽은 index 방지).
+    """
+    try:
+        latest: Dict[str, Dict] = {}
+        scan_kwargs = {
+            "FilterExpression": "attribute_exists(project_info)",
+            "ProjectionExpression": "repository, project_info, #ts",
+            "ExpressionAttributeNames": {"#ts": "timestamp"}
+        }
+        scanned = 0
+
+        while max_items is None or scanned < max_items:
+            response = table.scan(**scan_kwargs)
+            for item in response.get('Items', []):
+                try:
+                    project_info_str = item.get('project_info', '{}')
+                    if isinstance(project_info_str, str):
+                        project_info = json.loads(project_info_str)
+                    else:
+                        project_info = project_info_str
+
+                    repository = item.get('repository', 'unknown')
+                    timestamp = item.get('timestamp', '')
+                    if repository in latest and latest[repository]['_timestamp'] >= timestamp:
+                        continue
+
+                    latest[repository] = {
+                        'repository': repository,
+                        'port': project_info.get('app_port', 8000),
+                        'language': project_info.get('primary_language', 'Unknown'),
+                        'framework': project_info.get('primary_framework', 'None'),
+                        'cpu': project_info.get('cpu', 256),
+                        'memory': project_info.get('memory', 512),
+                        '_timestamp': timestamp
+                    }
+                except Exception as e:
+                    print(f"Error parsing deployment item: {e}")
+                    continue
+
+            scanned += response.get('ScannedCount', len(response.get('Items', [])))
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
 
         deployments = []
-        for item in response.get('Items', []):
-            try:
-                project_info_str = item.get('project_info', '{}')
-                if isinstance(project_info_str, str):
-                    project_info = json.loads(project_info_str)
-                else:
-                    project_info = project_info_str
-
-                deployments.append({
-                    'repository': item.get('repository', 'unknown'),
-                    'port': project_info.get('app_port', 8000),
-                    'language': project_info.get('primary_language', 'Unknown'),
-                    'framework': project_info.get('primary_framework', 'None'),
-                    'cpu': project_info.get('cpu', 256),
-                    'memory': project_info.get('memory', 512)
-                })
-            except Exception as e:
-                print(f"Error parsing deployment item: {e}")
-                continue
+        for dep in latest.values():
+            dep.pop('_timestamp')
+            deployments.append(dep)
 
-        print(f"✅ Found {len(deployments)} existing deployments")
+        print(f"✅ Found {len(deployments)} existing deployments (scan)")
         return deployments
 
     except Exception as e:
         print(f"❌ Error querying existing deployments: {e}")
+        if raise_errors:
+            raise
         return []
 
 
+def _index_backfill(table) -> Callable[[], List[Dict]]:
+    """deployment index가 없을 때 기존 분석 항목 전체에서 repository별 최신 요약을 읽는 loader"""
+    return lambda: _scan_existing_deployments(table, max_items=None, raise_errors=True)
+
+
 def _call_openai_api(
     base_url: str,
     api_key: str,
     model: str,
     messages: List[Dict[str, str]],
-    temperature: float = 0.3,
-    response_format: Optional[Dict[str, str]] = None
+    temperature: Optional[float] = None,
+    response_format: Optional[Dict[str, str]] = None,
+    task: str = "generation",
+    ledger: Optional[llm_router.TokenLedger] = None
 ) -> str:
     """
     Call OpenAI API directly using requests (no pydantic dependency)
-    Returns the content of the first choice
+    Returns the content of the first choice.
+    timeout/장애 시 llm_router fallback 모델로 재시도하고, 호출별 usage는 ledger에 기록합니다.
     """
     endpoint = f"{base_url}/chat/completions"
 
@@ -125,30 +306,121 @@ def _call_openai_api(
         "Content-Type": "application/json"
     }
 
-    payload = {
-        "model": model,
-        "messages": messages,
-        "temperature": temperature
-    }
+    task_temperature, timeout = llm_router.task_settings(task)
+    models = llm_router.chain(model)
 
-    if response_format:
-        payload["response_format"] = response_format
+    for attempt, candidate in enumerate(models):
+        if ledger is not None:
+            ledger.check()
 
-    try:
-        response = requests.post(
-            endpoint,
-            headers=headers,
-            json=payload,
-            timeout=900  # 15분
-        )
-        response.raise_for_status()
+        payload = {
+            "model": candidate,
+            "messages": messages,
+            "temperature": task_temperature if temperature is None else temperature
+        }
+
+        if response_format:
+            payload["response_format"] = response_format
+
+        start = time.perf_counter()
+        try:
+            response = http_session.request(
+                "POST",
+                endpoint,
+                headers=headers,
+                json=payload,
+                timeout=timeout
+            )
+            response.raise_for_status()
 
-        data = response.json()
+            data = response.json()
+
+        except requests.exceptions.RequestException as e:
+            if ledger is not None:
+                ledger.record(task, candidate, None, (time.perf_counter() - start) * 1000, attempt, type(e).__name__)
+            if attempt + 1 < len(models) and llm_router.should_fall_back(e):
+                print(f"⚠️ {candidate} failed ({e}), falling back to {models[attempt + 1]}")
+                continue
+            print(f"Error calling OpenAI API: {e}")
+            raise
+
+        if ledger is not None:
+            ledger.record(task, candidate, data.get("usage"), (time.perf_counter() - start) * 1000, attempt)
         return data["choices"][0]["message"]["content"]
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error calling OpenAI API: {e}")
-        raise
+
+def _stream_openai_api(
+    base_url: str,
+    api_key: str,
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: Optional[float] = None,
+    task: str = "generation",
+    ledger: Optional[llm_router.TokenLedger] = None
+) -> Iterator[str]:
+    """
+    Call OpenAI chat completions with stream=True
+    Yields content deltas as they arrive (SSE)
+    fallback 모델 전환은 첫 응답 전(연결/상태 코드 오류)에만 가능합니다.
+    """
+    endpoint = f"{base_url}/chat/completions"
+
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+    task_temperature, _ = llm_router.task_settings(task)
+    models = llm_router.chain(model)
+
+    for attempt, candidate in enumerate(models):
+        if ledger is not None:
+            ledger.check()
+
+        payload = {
+            "model": candidate,
+            "messages": messages,
+            "temperature": task_temperature if temperature is None else temperature,
+            "stream": True,
+            # 마지막 chunk에 usage 포함
+            "stream_options": {"include_usage": True}
+        }
+
+        start = time.perf_counter()
+        response = None
+        try:
+            # read timeout은 chunk 간 간격 기준이므로 전체 응답 대기(task timeout)보다 짧게 둘 수 있음
+            response = http_session.request(
+                "POST",
+                endpoint,
+                headers=headers,
+                json=payload,
+                stream=True,
+                timeout=(10, 120)
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            if response is not None:
+                response.close()
+            if ledger is not None:
+                ledger.record(task, candidate, None, (time.perf_counter() - start) * 1000, attempt, type(e).__name__)
+            if attempt + 1 < len(models) and llm_router.should_fall_back(e):
+                print(f"⚠️ {candidate} failed ({e}), falling back to {models[attempt + 1]}")
+                continue
+            print(f"Error streaming OpenAI API: {e}")
+            raise
+
+        usage: Dict[str, Any] = {}
+        try:
+            with response:
+                yield from iter_sse_deltas(response.iter_lines(decode_unicode=True), usage.update)
+        except requests.exceptions.RequestException as e:
+            print(f"Error streaming OpenAI API: {e}")
+            raise
+        finally:
+            if ledger is not None:
+                ledger.record(task, candidate, usage, (time.perf_counter() - start) * 1000, attempt)
+        return
 
 
 def _analyze_project_with_gpt5(
@@ -158,11 +430,14 @@ def _analyze_project_with_gpt5(
     file_list: List[str],
     readme_content: str,
     file_samples: Optional[Dict[str, str]] = None,
-    existing_deployments: Optional[List[Dict]] = None
+    existing_deployments: Optional[List[Dict]] = None,
+    ledger: Optional[llm_router.TokenLedger] = None,
+    structured: bool = True
 ) -> Dict[str, Any]:
     """
     Use GPT-5 to intelligently analyze ANY project type.
     Returns comprehensive project information including language, framework, runtime, etc.
+    structured이면 json_schema(strict)로 요청하고, 검증에 실패한 필드만 repair 호출로 다시 받습니다.
     """
 
     system_prompt = """You are an expert software architect and DevOps engineer with deep knowledge of:
@@ -184,8 +459,13 @@ Your task is to analyze a code repository and determine:
 
 Analyze the file structure, README, and any code samples provided. Return your analysis as a JSON object."""
 
-    # Prepare file structure summary
-    file_structure = "\n".join(file_list[:100])  # First 100 files
+    # Prepare file structure summary (relevance-ranked paths within the token budget)
+    file_structure = "\n".join(
+        file_ranking.select_paths(file_list, file_ranking.ANALYSIS_FILE_TOKEN_BUDGET)
+    )
+    readme_excerpt = file_ranking.truncate_to_budget(
+        readme_content, file_ranking.ANALYSIS_README_TOKEN_BUDGET
+    ) if readme_content else ""
 
     # Build user prompt with all available information
     user_prompt = f"""Analyze this repository and provide detailed project information.
@@ -197,14 +477,14 @@ Analyze the file structure, README, and any code samples provided. Return your a
 
 # README Content
 ```
-{readme_content[:3000] if readme_content else "No README available"}
+{readme_excerpt or "No README available"}
 ```
 """
 
     if file_samples:
         user_prompt += "\n# Sample File Contents\n"
-        for filename, content in file_samples.items():
-            user_prompt += f"\n## {filename}\n```\n{content[:500]}\n```\n"
+        for filename, content in file_ranking.budget_samples(file_samples).items():
+            user_prompt += f"\n## {filename}\n```\n{content}\n```\n"
 
     # Add existing deployments context
     if existing_deployments and len(existing_deployments) > 0:
@@ -245,20 +525,28 @@ Return a JSON object with this structure:
 
 Only return the JSON object, nothing else."""
 
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
     try:
         content = _call_openai_api(
             base_url=base_url,
             api_key=api_key,
             model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.3,
-            response_format={"type": "json_object"}
+            messages=messages,
+            response_format=(
+                spec_schema.response_format("project_info", spec_schema.project_info_schema())
+                if structured else {"type": "json_object"}
+            ),
+            task="analysis",
+            ledger=ledger
         )
 
-        project_info = json.loads(content)
+        project_info = _repair_project_info(
+            base_url, api_key, model, messages, content,
+            spec_parser.parse_json(content, "project_info_json"), file_list, ledger
+        )
 
         print(f"GPT-5 Project Analysis: {json.dumps(project_info, indent=2)}")
         return project_info
@@ -272,52 +560,63 @@ Only return the JSON object, nothing else."""
         return _fallback_project_detection(file_list)
 
 
-def _fallback_project_detection(files: List[str]) -> Dict[str, Any]:
-    """Fallback project detection using simple pattern matching"""
-
-    print("Using fallback project detection...")
+def _repair_project_info(
+    base_url: str,
+    api_key: str,
+    model: str,
+    messages: List[Dict[str, str]],
+    content: str,
+    project_info: Dict[str, Any],
+    file_list: List[str],
+    ledger: Optional[llm_router.TokenLedger] = None
+) -> Dict[str, Any]:
+    """
+    검증에 실패한 필드만 다시 요청 (원래 대화에 이어서 묻기 때문에 prompt prefix cache가 적용됨).
+    repair 후에도 잘못된 필드는 fallback 판별 값으로 채웁니다 (나머지 분석 결과는 유지).
+    """
+    problems = spec_schema.validate_project_info(project_info)
+    if not problems:
+        return project_info
 
-    project_info = {
-        "languages": [],
-        "primary_language": "Unknown",
-        "frameworks": [],
-        "primary_framework": None,
-        "build_tools": [],
-        "package_managers": [],
-        "runtime": "Unknown",
-        "app_type": "web-api",
-        "app_port": 8000,
-        "database_needed": False,
-        "database_type": "none",
-        "external_services": [],
-        "containerizable": True,
-        "deployment_complexity": "moderate",
-        "confidence": "low",
-        "notes": "Detected using fallback pattern matching"
-    }
+    print(f"🩹 Repairing project_info fields: {', '.join(f'{k} ({v})' for k, v in problems.items())}")
+    try:
+        repaired = spec_parser.parse_json(_call_openai_api(
+            base_url=base_url,
+            api_key=api_key,
+            model=model,
+            messages=messages + [
+                {"role": "assistant", "content": content},
+                {"role": "user", "content": (
+                    "These fields are invalid:\n"
+                    + "\n".join(f"- {field}: {reason}" for field, reason in problems.items())
+                    + "\nReturn a JSON object with corrected values for only these fields."
+                )}
+            ],
+            response_format=spec_schema.response_format(
+                "project_info_repair", spec_schema.project_info_schema(problems)
+            ),
+            task="analysis",
+            ledger=ledger
+        ), "project_info_json")
+        project_info.update({field: value for field, value in repaired.items() if field in problems})
+    except Exception as e:
+        print(f"⚠️ Error repairing project_info: {e}")
+
+    remaining = spec_schema.validate_project_info(project_info)
+    spec_schema.count("repaired", len(problems) - len(remaining))
+    if remaining:
+        print(f"⚠️ Using fallback values for: {', '.join(remaining)}")
+        spec_schema.count("fallback", len(remaining))
+        fallback = rule_detector.detect_basic(file_list, "")
+        project_info.update({field: fallback[field] for field in remaining})
+    return project_info
 
-    # Basic pattern matching
-    file_patterns = {
-        "package.json": {"lang": "JavaScript", "runtime": "Node.js 20", "pkg_mgr": "npm"},
-        "requirements.txt": {"lang": "Python", "runtime": "Python 3.11", "pkg_mgr": "pip"},
-        "go.mod": {"lang": "Go", "runtime": "Go 1.21", "pkg_mgr": "go modules"},
-        "Cargo.toml": {"lang": "Rust", "runtime": "Rust 1.75", "pkg_mgr": "cargo"},
-        "pom.xml": {"lang": "Java", "runtime": "Java 17", "build": "Maven"},
-        "Gemfile": {"lang": "Ruby", "runtime": "Ruby 3.2", "pkg_mgr": "bundler"},
-    }
 
-    for file in files:
-        for pattern, info in file_patterns.items():
-            if pattern in file.lower():
-                if "lang" in info:
-                    project_info["primary_language"] = info["lang"]
-                    project_info["languages"].append(info["lang"])
-                if "runtime" in info:
-                    project_info["runtime"] = info["runtime"]
-                if "pkg_mgr" in info:
-                    project_info["package_managers"].append(info["pkg_mgr"])
+def _fallback_project_detection(files: List[str]) -> Dict[str, Any]:
+    """Fallback project detection using simple pattern matching"""
 
-    return project_info
+    print("Using fallback project detection...")
+    return rule_detector.detect_basic(files, FALLBACK_DETECTION_NOTES)
 
 
 def _remove_heredoc_from_dockerfile(dockerfile: str) -> str:
@@ -325,7 +624,6 @@ def _remove_heredoc_from_dockerfile(dockerfile: str) -> str:
     Post-process Dockerfile to remove heredoc syntax (COPY << EOF).
     Converts heredoc patterns to RUN echo commands.
     """
-    import re
 
     # Pattern to match COPY << heredoc blocks
     # Matches: COPY [--chown=...] << or <<' or <<- with delimiter
@@ -381,20 +679,7 @@ def _remove_heredoc_from_dockerfile(dockerfile: str) -> str:
     return cleaned
 
 
-def _generate_deployment_specs(
-    base_url: str,
-    api_key: str,
-    model: str,
-    project_info: Dict[str, Any],
-    readme_content: str,
-    file_list: List[str]
-) -> Dict[str, str]:
-    """
-    Generate deployment specifications for ANY project type using GPT-5.
-    Returns Dockerfile, Terraform, AppSpec, BuildSpec, and recommendations.
-    """
-
-    system_prompt = """You are an expert DevOps engineer specialized in cloud deployments and infrastructure as code.
+SPEC_SYSTEM_PROMPT = """You are an expert DevOps engineer specialized in cloud deployments and infrastructure as code.
 
 Your task is to generate production-ready deployment specifications for ANY type of application.
 
@@ -413,40 +698,7 @@ Requirements for ALL specifications:
 
 Use the project information provided to customize each specification appropriately."""
 
-    user_prompt = f"""Generate complete deployment specifications for this project:
-
-# Project Analysis
-- **Languages**: {', '.join(project_info.get('languages', ['Unknown']))}
-- **Primary Language**: {project_info.get('primary_language', 'Unknown')}
-- **Frameworks**: {', '.join(project_info.get('frameworks', ['None']))}
-- **Runtime**: {project_info.get('runtime', 'Unknown')}
-- **App Type**: {project_info.get('app_type', 'web-api')}
-- **App Port**: {project_info.get('app_port', 8000)}
-- **Package Managers**: {', '.join(project_info.get('package_managers', ['Unknown']))}
-- **Database**: {project_info.get('database_type', 'none')}
-- **Complexity**: {project_info.get('deployment_complexity', 'moderate')}
-
-# README Content
-```
-{readme_content[:2000] if readme_content else "No README available"}
-```
-
-# File Structure (sample)
-```
-{chr(10).join(file_list[:50])}
-```
-
-Generate COMPLETE specifications. Each file should be production-ready and fully functional.
-
-**IMPORTANT**:
-- For ECS Fargate, assume VPC, ALB, ECR repository already exist
-- Use appropriate CPU/memory based on app complexity (256/512 for simple, 512/1024 for moderate, 1024/2048 for complex)
-- Container port should be {project_info.get('app_port', 8000)}
-- Include health check endpoint at /health
-- Use Blue-Green deployment strategy with CodeDeploy
-- Generate appropriate build commands for the detected language/framework
-
-**CRITICAL - Dockerfile Requirements (MUST FOLLOW)**:
+DOCKERFILE_RULES = """**CRITICAL - Dockerfile Requirements (MUST FOLLOW)**:
 ⛔ ABSOLUTELY FORBIDDEN SYNTAX:
 - NEVER use: COPY << or COPY <<'...' (BuildKit heredoc) - THIS WILL FAIL!
 - NEVER use: cat << EOF or cat <<'EOF' (shell heredoc)
@@ -482,8 +734,9 @@ Generate COMPLETE specifications. Each file should be production-ready and fully
       echo "set -e" >> /entrypoint.sh && \\
       echo "exec \\"$@\\"" >> /entrypoint.sh && \\
       chmod +x /entrypoint.sh
+"""
 
-Return your response in this format:
+SPEC_RESPONSE_FORMAT = """Return your response in this format:
 
 ---DOCKERFILE---
 [Complete Dockerfile content]
@@ -501,163 +754,463 @@ Return your response in this format:
 [Deployment recommendations in markdown]
 """
 
-    try:
-        # Use GPT-5 to generate all deployment specs (with heredoc prohibition)
-        content = _call_openai_api(
-            base_url=base_url,
-            api_key=api_key,
-            model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.3
-        )
-
-        # Parse the delimited response
-        specs = {
-            "dockerfile": _extract_section(content, "DOCKERFILE"),
-            "terraform_ecs": _extract_section(content, "TERRAFORM"),
-            "appspec": _extract_section(content, "APPSPEC"),
-            "buildspec": _extract_section(content, "BUILDSPEC"),
-            "recommendations": _extract_section(content, "RECOMMENDATIONS")
-        }
+# structured output (json_schema) 모드의 응답 형식
+SPEC_JSON_RESPONSE_FORMAT = """Return a JSON object with one string per file, each the complete file content without code fences:
+- dockerfile: the Dockerfile
+- terraform_ecs: the Terraform ECS configuration
+- appspec: the AppSpec YAML
+- buildspec: the BuildSpec YAML
+- recommendations: deployment recommendations in markdown
+"""
 
-        # If parsing failed, try code block extraction as fallback
-        if not specs["dockerfile"]:
-            specs["dockerfile"] = _extract_code_block(content, "dockerfile") or _extract_code_block(content, "docker")
-        if not specs["terraform_ecs"]:
-            specs["terraform_ecs"] = _extract_code_block(content, "terraform") or _extract_code_block(content, "hcl")
-        if not specs["appspec"]:
-            specs["appspec"] = _extract_code_block(content, "yaml", "appspec")
-        if not specs["buildspec"]:
-            specs["buildspec"] = _extract_code_block(content, "yaml", "buildspec")
-
-        # Store full response as recommendations if not extracted
-        if not specs["recommendations"]:
-            specs["recommendations"] = content
-
-        # POST-PROCESSING: Remove heredoc syntax from Dockerfile
-        if specs["dockerfile"]:
-            original_dockerfile = specs["dockerfile"]
-            cleaned_dockerfile = _remove_heredoc_from_dockerfile(original_dockerfile)
-
-            # Check if any heredoc was found and removed
-            if cleaned_dockerfile != original_dockerfile:
-                print("⚠️ WARNING: Heredoc syntax detected and removed from Dockerfile")
-                specs["dockerfile"] = cleaned_dockerfile
-            else:
-                print("✓ Dockerfile clean - no heredoc syntax detected")
+# spec key → (delimiter, 섹션별 생성 시 요청 문구)
+SPEC_SECTIONS = {
+    "dockerfile": ("DOCKERFILE", "the complete Dockerfile"),
+    "terraform_ecs": ("TERRAFORM", "the complete Terraform configuration for AWS ECS Fargate (terraform/ecs.tf)"),
+    "appspec": ("APPSPEC", "the complete CodeDeploy Blue-Green appspec.yaml"),
+    "buildspec": ("BUILDSPEC", "the complete AWS CodeBuild buildspec.yaml"),
+    "recommendations": ("RECOMMENDATIONS", "deployment_recommendations.md, a detailed deployment guide in markdown"),
+}
+SPEC_DELIMITERS = tuple(delimiter for delimiter, _ in SPEC_SECTIONS.values())
 
-        print(f"Generated specs: {list(specs.keys())}")
-        return specs
 
-    except Exception as e:
-        print(f"Error generating deployment specs: {e}")
-        return _generate_fallback_specs(project_info)
+def _build_spec_context(
+    project_info: Dict[str, Any],
+    readme_content: str,
+    file_list: List[str]
+) -> str:
+    """spec 생성 프롬프트의 공통 부분 (프로젝트 분석, README, 파일 구조)"""
+    readme_excerpt = file_ranking.truncate_to_budget(
+        readme_content, file_ranking.SPEC_README_TOKEN_BUDGET
+    ) if readme_content else ""
+    file_structure = "\n".join(
+        file_ranking.select_paths(file_list, file_ranking.SPEC_FILE_TOKEN_BUDGET)
+    )
+
+    return f"""# Project Analysis
+- **Languages**: {', '.join(project_info.get('languages', ['Unknown']))}
+- **Primary Language**: {project_info.get('primary_language', 'Unknown')}
+- **Frameworks**: {', '.join(project_info.get('frameworks', ['None']))}
+- **Runtime**: {project_info.get('runtime', 'Unknown')}
+- **App Type**: {project_info.get('app_type', 'web-api')}
+- **App Port**: {project_info.get('app_port', 8000)}
+- **Package Managers**: {', '.join(project_info.get('package_managers', ['Unknown']))}
+- **Database**: {project_info.get('database_type', 'none')}
+- **Complexity**: {project_info.get('deployment_complexity', 'moderate')}
 
+# README Content
+```
+{readme_excerpt or "No README available"}
+```
 
-def _extract_section(content: str, delimiter: str) -> str:
-    """Extract content between ---DELIMITER--- markers"""
-    start_marker = f"---{delimiter}---"
-    end_marker = "---"
+# File Structure (most relevant files)
+```
+{file_structure}
+```
+"""
 
-    start_idx = content.find(start_marker)
-    if start_idx == -1:
-        return ""
 
-    start_idx += len(start_marker)
-    end_idx = content.find(end_marker, start_idx)
+def _build_spec_requirements(project_info: Dict[str, Any]) -> str:
+    """ECS/CodeDeploy 관련 필수 조건"""
+    return f"""**IMPORTANT**:
+- For ECS Fargate, assume VPC, ALB, ECR repository already exist
+- Use appropriate CPU/memory based on app complexity (256/512 for simple, 512/1024 for moderate, 1024/2048 for complex)
+- Container port should be {project_info.get('app_port', 8000)}
+- Include health check endpoint at /health
+- Use Blue-Green deployment strategy with CodeDeploy
+- Generate appropriate build commands for the detected language/framework
+"""
 
-    if end_idx == -1:
-        return content[start_idx:].strip()
 
-    return content[start_idx:end_idx].strip()
+def _postprocess_dockerfile(dockerfile: str) -> str:
+    """POST-PROCESSING: Remove heredoc syntax from Dockerfile"""
+    if not dockerfile:
+        return dockerfile
 
+    cleaned_dockerfile = _remove_heredoc_from_dockerfile(dockerfile)
 
-def _extract_code_block(content: str, language: str, context: str = "") -> str:
-    """Extract code from markdown code blocks"""
-    marker = f"```{language}"
-    start_idx = content.lower().find(marker.lower())
+    # Check if any heredoc was found and removed
+    if cleaned_dockerfile != dockerfile:
+        print("⚠️ WARNING: Heredoc syntax detected and removed from Dockerfile")
+    else:
+        print("✓ Dockerfile clean - no heredoc syntax detected")
+    return cleaned_dockerfile
 
-    # If context provided, try to find it near the code block
-    if context and start_idx == -1:
-        context_idx = content.lower().find(context.lower())
-        if context_idx > 0:
-            # Search for code block after context mention
-            start_idx = content.lower().find(marker.lower(), context_idx)
 
-    if start_idx == -1:
-        return ""
+def _build_spec_prompt(
+    project_info: Dict[str, Any],
+    readme_content: str,
+    file_list: List[str],
+    structured: bool = False
+) -> str:
+    """5개 spec을 한 번에 생성하는 프롬프트 (delimiter 형식, structured이면 JSON 응답)"""
+    return f"""Generate complete deployment specifications for this project:
 
-    start_idx += len(marker)
-    end_idx = content.find("```", start_idx)
+{_build_spec_context(project_info, readme_content, file_list)}
+Generate COMPLETE specifications. Each file should be production-ready and fully functional.
 
-    if end_idx == -1:
-        return content[start_idx:].strip()
+{_build_spec_requirements(project_info)}
+{DOCKERFILE_RULES}
+{SPEC_JSON_RESPONSE_FORMAT if structured else SPEC_RESPONSE_FORMAT}"""
 
-    return content[start_idx:end_idx].strip()
 
+def _parse_spec_response(content: str) -> Dict[str, str]:
+    """delimiter 형식 응답 파싱, 실패한 섹션은 code block 추출로 보완 (응답은 한 번만 스캔)"""
+    parsed = spec_parser.SpecIndex(content, SPEC_DELIMITERS)
 
-def _get_cpu_from_complexity(complexity: str) -> int:
-    """프로젝트 복잡도에 따라 CPU 할당"""
-    mapping = {
-        "simple": 256,
-        "moderate": 512,
-        "complex": 1024
+    # Parse the delimited response
+    specs = {
+        key: parsed.section(delimiter)
+        for key, (delimiter, _) in SPEC_SECTIONS.items()
     }
-    return mapping.get(complexity, 512)
-
 
-def _get_memory_from_complexity(complexity: str) -> int:
-    """프로젝트 복잡도에 따라 메모리 할당"""
-    mapping = {
-        "simple": 512,
-        "moderate": 1024,
-        "complex": 2048
-    }
-    return mapping.get(complexity, 1024)
+    # If parsing failed, try code block extraction as fallback
+    if not specs["dockerfile"]:
+        specs["dockerfile"] = parsed.code_block("dockerfile") or parsed.code_block("docker")
+    if not specs["terraform_ecs"]:
+        specs["terraform_ecs"] = parsed.code_block("terraform") or parsed.code_block("hcl")
+    if not specs["appspec"]:
+        specs["appspec"] = parsed.code_block("yaml", "appspec")
+    if not specs["buildspec"]:
+        specs["buildspec"] = parsed.code_block("yaml", "buildspec")
 
+    # Store full response as recommendations if not extracted
+    if not specs["recommendations"]:
+        specs["recommendations"] = content
 
-def _get_build_command(project_info: Dict[str, Any]) -> str:
-    """언어/프레임워크에 따라 빌드 명령어 결정"""
-    primary_lang = project_info.get("primary_language", "").lower()
-    frameworks = [f.lower() for f in project_info.get("frameworks", [])]
-    pkg_managers = project_info.get("package_managers", [])
+    return specs
 
-    # Python
-    if "python" in primary_lang:
-        if "poetry" in pkg_managers:
-            return "poetry install --no-dev"
-        elif "pipenv" in pkg_managers:
-            return "pipenv install --deploy"
-        return "pip install -r requirements.txt"
 
-    # JavaScript/TypeScript
-    if "javascript" in primary_lang or "typescript" in primary_lang:
-        if "yarn" in pkg_managers:
-            return "yarn install --production && yarn build"
-        elif "pnpm" in pkg_managers:
-            return "pnpm install --prod && pnpm build"
-        return "npm ci && npm run build"
+def _parse_spec_bundle(content: str) -> Dict[str, str]:
+    """
+    json_schema 응답 파싱. JSON이 깨졌으면 (max_tokens로 잘린 응답 등) 끝까지 닫힌 문자열 값만 살리고
+    나머지 섹션은 비워 둡니다 (_repair_specs가 그 섹션만 다시 생성).
+    """
+    with spec_parser.timed("spec_bundle_json", len(content)):
+        try:
+            bundle = json.loads(content)
+        except json.JSONDecodeError as e:
+            print(f"⚠️ Spec bundle is not valid JSON ({e}), salvaging complete sections")
+            bundle = {}
+            for key in SPEC_SECTIONS:
+                match = re.search(rf'"{key}"\s*:\s*"', content)
+                if not match:
+                    continue
+                try:
+                    bundle[key], _ = json.decoder.scanstring(content, match.end())
+                except ValueError:
+                    continue
+    if not isinstance(bundle, dict):
+        bundle = {}
 
-    # Go
-    if "go" in primary_lang:
-        return "go build -o app ."
+    return {
+        key: (bundle.get(key) or "").strip() if key == "recommendations" else _strip_code_fence(bundle.get(key) or "")
+        for key in SPEC_SECTIONS
+    }
 
-    # Rust
-    if "rust" in primary_lang:
-        return "cargo build --release"
 
-    # Java
-    if "java" in primary_lang or "kotlin" in primary_lang:
-        if "maven" in [b.lower() for b in project_info.get("build_tools", [])]:
-            return "mvn clean package -DskipTests"
-        return "gradle build -x test"
+def _generate_deployment_specs(
+    base_url: str,
+    api_key: str,
+    model: str,
+    project_info: Dict[str, Any],
+    readme_content: str,
+    file_list: List[str],
+    ledger: Optional[llm_router.TokenLedger] = None,
+    structured: bool = False
+) -> Dict[str, str]:
+    """
+    Generate deployment specifications for ANY project type using GPT-5.
+    Returns Dockerfile, Terraform, AppSpec, BuildSpec, and recommendations.
+    structured이면 spec bundle을 json_schema(strict) 객체로 받습니다.
+    """
 
-    # Ruby
-    if "ruby" in primary_lang:
-        return "bundle install --without development test"
+    user_prompt = _build_spec_prompt(project_info, readme_content, file_list, structured)
+
+    try:
+        # Use GPT-5 to generate all deployment specs (with heredoc prohibition)
+        content = _call_openai_api(
+            base_url=base_url,
+            api_key=api_key,
+            model=model,
+            messages=[
+                {"role": "system", "content": SPEC_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format=(
+                spec_schema.response_format("deployment_specs", spec_schema.spec_bundle_schema(SPEC_SECTIONS))
+                if structured else None
+            ),
+            ledger=ledger
+        )
+
+        specs = _parse_spec_bundle(content) if structured else _parse_spec_response(content)
+        specs["dockerfile"] = _postprocess_dockerfile(specs["dockerfile"])
+
+        print(f"Generated specs: {list(specs.keys())}")
+        return specs
+
+    except Exception as e:
+        print(f"Error generating deployment specs: {e}")
+        return _generate_fallback_specs(project_info)
+
+
+def _generate_deployment_specs_streaming(
+    base_url: str,
+    api_key: str,
+    model: str,
+    project_info: Dict[str, Any],
+    readme_content: str,
+    file_list: List[str],
+    on_section: Optional[Callable[[str, str], None]] = None,
+    ledger: Optional[llm_router.TokenLedger] = None
+) -> Dict[str, str]:
+    """
+    단일 streaming 호출로 spec 생성.
+    ---SECTION--- 이 닫히는 즉시 on_section(key, content)을 호출하고,
+    스트림이 끝난 뒤 구분자로 찾지 못한 섹션만 기존 파서/fallback으로 채웁니다.
+    """
+    user_prompt = _build_spec_prompt(project_info, readme_content, file_list)
+    parser = IncrementalSectionParser(
+        {delimiter: key for key, (delimiter, _) in SPEC_SECTIONS.items()}
+    )
+    specs: Dict[str, str] = {}
+
+    def _emit(closed: List[Tuple[str, str]]) -> None:
+        for key, content in closed:
+            # serial/concurrent 경로와 같이 섹션을 감싼 ```lang fence는 업로드 전에 제거
+            if key != "recommendations":
+                content = _strip_code_fence(content)
+            if key == "dockerfile":
+                content = _postprocess_dockerfile(content)
+            specs[key] = content
+            if on_section and content:
+                on_section(key, content)
+
+    try:
+        for delta in _stream_openai_api(
+            base_url=base_url,
+            api_key=api_key,
+            model=model,
+            messages=[
+                {"role": "system", "content": SPEC_SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt}
+            ],
+            ledger=ledger
+        ):
+            _emit(parser.feed(delta))
+        _emit(parser.finish())
+
+        missing = [key for key in SPEC_SECTIONS if not specs.get(key)]
+        if missing:
+            parsed = _parse_spec_response(parser.text)
+            for key in missing:
+                specs[key] = parsed[key]
+            if "dockerfile" in missing:
+                specs["dockerfile"] = _postprocess_dockerfile(specs["dockerfile"])
+
+    except Exception as e:
+        print(f"Error streaming deployment specs: {e}")
+        if not specs:
+            return _generate_fallback_specs(project_info)
+        # 이미 업로드된 섹션은 유지하고 나머지만 fallback으로 채움
+        fallback = _generate_fallback_specs(project_info)
+        for key in SPEC_SECTIONS:
+            specs.setdefault(key, fallback[key])
+
+    print(f"Generated specs (streaming): {list(specs.keys())}")
+    return specs
+
+
+def _strip_code_fence(content: str) -> str:
+    """섹션 단독 응답에서 감싸는 ```lang ... ``` 제거"""
+    stripped = content.strip()
+    if stripped.startswith("```"):
+        first_newline = stripped.find("\n")
+        if first_newline == -1:
+            return ""
+        stripped = stripped[first_newline + 1:]
+        if stripped.rstrip().endswith("```"):
+            stripped = stripped.rstrip()[:-3]
+    return stripped.strip()
+
+
+def _generate_spec_section(
+    base_url: str,
+    api_key: str,
+    model: str,
+    project_info: Dict[str, Any],
+    context_prompt: str,
+    spec_key: str,
+    ledger: Optional[llm_router.TokenLedger] = None,
+    issue: Optional[str] = None
+) -> str:
+    """단일 spec 섹션을 독립된 LLM 호출로 생성 (issue: repair 시 이전 결과가 거부된 이유)"""
+    _, description = SPEC_SECTIONS[spec_key]
+
+    user_prompt = f"""Generate {description} for this project:
+
+{context_prompt}
+{_build_spec_requirements(project_info)}
+"""
+    if spec_key == "dockerfile":
+        user_prompt += f"\n{DOCKERFILE_RULES}"
+    if issue:
+        user_prompt += f"\nThe previous version of this file was rejected: {issue}. Make sure this is fixed.\n"
+
+    user_prompt += "\nReturn ONLY the file content. Do not include any other files or explanations."
+
+    content = _call_openai_api(
+        base_url=base_url,
+        api_key=api_key,
+        model=model,
+        messages=[
+            {"role": "system", "content": SPEC_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ],
+        ledger=ledger
+    )
+
+    if spec_key == "recommendations":
+        return content.strip()
+    return _strip_code_fence(content)
+
+
+def _generate_deployment_specs_concurrent(
+    base_url: str,
+    api_key: str,
+    model: str,
+    project_info: Dict[str, Any],
+    readme_content: str,
+    file_list: List[str],
+    timer: Optional[StageTimer] = None,
+    ledger: Optional[llm_router.TokenLedger] = None
+) -> Dict[str, str]:
+    """
+    5개 spec 섹션을 독립적인 LLM 호출로 동시에 생성.
+    실패한 섹션만 fallback spec으로 채우고, 전부 실패하면 fallback spec 전체를 반환합니다.
+    """
+    context_prompt = _build_spec_context(project_info, readme_content, file_list)
+
+    tasks = {
+        key: (lambda key=key: _generate_spec_section(
+            base_url, api_key, model, project_info, context_prompt, key, ledger
+        ))
+        for key in SPEC_SECTIONS
+    }
+    section_timer = StageTimer()
+    results, errors = run_parallel(tasks, timer=section_timer)
+
+    if timer is not None:
+        for key, elapsed in section_timer.timings_ms.items():
+            timer.timings_ms[f"spec_generation.{key}"] = elapsed
+
+    if len(errors) == len(SPEC_SECTIONS):
+        print(f"Error generating deployment specs: {next(iter(errors.values()))}")
+        return _generate_fallback_specs(project_info)
+
+    fallback = _generate_fallback_specs(project_info) if errors else {}
+    specs = {}
+    for key in SPEC_SECTIONS:
+        if key in errors:
+            print(f"⚠️ Section {key} failed ({errors[key]}), using fallback")
+            specs[key] = fallback[key]
+        else:
+            specs[key] = results[key]
+
+    specs["dockerfile"] = _postprocess_dockerfile(specs["dockerfile"])
+
+    print(f"Generated specs (concurrent): {list(specs.keys())}")
+    return specs
+
+
+def _repair_specs(
+    base_url: str,
+    api_key: str,
+    model: str,
+    project_info: Dict[str, Any],
+    readme_content: str,
+    file_list: List[str],
+    specs: Dict[str, str],
+    concurrent: bool = True,
+    ledger: Optional[llm_router.TokenLedger] = None
+) -> Dict[str, str]:
+    """
+    검증에 실패한 섹션만 섹션 단독 호출로 다시 생성 (병렬, 나머지 섹션은 그대로).
+    다시 만든 섹션도 검증에 실패하면 그 섹션만 fallback spec으로 채웁니다.
+    Returns {다시 만든 섹션: 원래 문제}
+    """
+    problems = spec_schema.validate_specs(specs, project_info, SPEC_SECTIONS)
+    if not problems:
+        return {}
+
+    print(f"🩹 Regenerating spec sections: {', '.join(f'{k} ({v})' for k, v in problems.items())}")
+    context_prompt = _build_spec_context(project_info, readme_content, file_list)
+    results, errors = run_parallel({
+        key: (lambda key=key: _generate_spec_section(
+            base_url, api_key, model, project_info, context_prompt, key, ledger, problems[key]
+        ))
+        for key in problems
+    }, concurrent=concurrent)
+
+    fallback = None
+    for key in problems:
+        content = results.get(key)
+        if key == "dockerfile" and content:
+            content = _postprocess_dockerfile(content)
+        if key in errors or spec_schema.validate_specs({key: content}, project_info, [key]):
+            print(f"⚠️ Section {key} still invalid ({errors.get(key, 'validation')}), using fallback")
+            fallback = fallback or _generate_fallback_specs(project_info)
+            spec_schema.count("fallback")
+            content = fallback[key]
+        else:
+            spec_schema.count("repaired")
+        specs[key] = content
+    return problems
+
+
+def _get_build_command(project_info: Dict[str, Any], install_plan: Optional[Dict[str, Any]] = None) -> str:
+    """언어/프레임워크에 따라 빌드 명령어 결정 (lockfile 기반 install_plan이 있으면 우선)"""
+    if install_plan:
+        return install_plan["command"]
+
+    primary_lang = project_info.get("primary_language", "").lower()
+    frameworks = [f.lower() for f in project_info.get("frameworks", [])]
+    pkg_managers = project_info.get("package_managers", [])
+
+    # Python
+    if "python" in primary_lang:
+        if "poetry" in pkg_managers:
+            return "poetry install --only main --no-root"
+        elif "pipenv" in pkg_managers:
+            return "pipenv install --deploy"
+        return "pip install -r requirements.txt"
+
+    # JavaScript/TypeScript
+    if "javascript" in primary_lang or "typescript" in primary_lang:
+        if "yarn" in pkg_managers:
+            return "yarn install --production && yarn build"
+        elif "pnpm" in pkg_managers:
+            return "pnpm install --prod && pnpm build"
+        return "npm ci && npm run build"
+
+    # Go
+    if "go" in primary_lang:
+        return "go build -o app ."
+
+    # Rust
+    if "rust" in primary_lang:
+        return "cargo build --release"
+
+    # Java
+    if "java" in primary_lang or "kotlin" in primary_lang:
+        if "maven" in [b.lower() for b in project_info.get("build_tools", [])]:
+            return "mvn clean package -DskipTests"
+        return "gradle build -x test"
+
+    # Ruby
+    if "ruby" in primary_lang:
+        return "bundle install --without development test"
 
     # PHP
     if "php" in primary_lang:
@@ -670,23 +1223,27 @@ def _get_start_command(project_info: Dict[str, Any]) -> str:
     """언어/프레임워크에 따라 시작 명령어 결정"""
     primary_lang = project_info.get("primary_language", "").lower()
     frameworks = [f.lower() for f in project_info.get("frameworks", [])]
+    port = project_info.get("app_port", 8000)
+    entrypoint = project_info.get("entrypoint")
 
     # Python
     if "python" in primary_lang:
         if any("fastapi" in f for f in frameworks):
-            return "uvicorn app.main:app --host 0.0.0.0 --port 8000"
+            return f"uvicorn {entrypoint or 'app.main:app'} --host 0.0.0.0 --port {port}"
         elif any("django" in f for f in frameworks):
-            return "gunicorn myproject.wsgi:application --bind 0.0.0.0:8000"
+            return f"gunicorn myproject.wsgi:application --bind 0.0.0.0:{port}"
         elif any("flask" in f for f in frameworks):
-            return "gunicorn app:app --bind 0.0.0.0:8000"
-        return "python app.py"
+            return f"gunicorn {entrypoint or 'app:app'} --bind 0.0.0.0:{port}"
+        elif any("streamlit" in f for f in frameworks):
+            return f"streamlit run {entrypoint or 'app.py'} --server.port={port} --server.address=0.0.0.0"
+        return f"python {entrypoint or 'app.py'}"
 
     # JavaScript/TypeScript
     if "javascript" in primary_lang or "typescript" in primary_lang:
         if any("next" in f for f in frameworks):
             return "npm start"
         elif any("express" in f for f in frameworks):
-            return "node server.js"
+            return f"node {entrypoint or 'server.js'}"
         return "npm start"
 
     # Go
@@ -707,49 +1264,11 @@ def _get_start_command(project_info: Dict[str, Any]) -> str:
 def _generate_terraform_tfvars(
     project_info: Dict[str, Any],
     analysis_id: str,
-    image_tag: str = "latest"
+    image_tag: str = "latest",
+    sizing: Optional[Dict[str, Any]] = None
 ) -> str:
-    """Terraform에서 사용할 tfvars 파일 생성"""
-
-    cpu = _get_cpu_from_complexity(project_info.get("deployment_complexity", "moderate"))
-    memory = _get_memory_from_complexity(project_info.get("deployment_complexity", "moderate"))
-    port = project_info.get("app_port", 8000)
-
-    tfvars = f"""# Generated by AI Analyzer: {analysis_id}
-# Project: {project_info.get('primary_language', 'Unknown')} - {project_info.get('primary_framework', 'N/A')}
-
-# Container Configuration
-image_tag = "{image_tag}"
-container_port = {port}
-cpu = {cpu}
-memory = {memory}
-
-# Scaling Configuration
-desired_count = 2
-min_capacity = 2
-max_capacity = 4
-
-# Auto-scaling thresholds
-cpu_target_value = 70
-memory_target_value = 80
-
-# Health Check
-health_check_path = "/health"
-health_check_interval = 30
-health_check_timeout = 5
-health_check_healthy_threshold = 2
-health_check_unhealthy_threshold = 3
-
-# Deployment
-deployment_minimum_healthy_percent = 100
-deployment_maximum_percent = 200
-
-# Database (if needed)
-database_enabled = {str(project_info.get('database_needed', False)).lower()}
-database_engine = "{project_info.get('database_type', 'none')}"
-"""
-
-    return tfvars
+    """Terraform에서 사용할 tfvars 파일 생성 (sizing: right_sizing.recommend 결과)"""
+    return generate_tfvars(analysis_id, image_tag, project_info, sizing=sizing)
 
 
 def _generate_fallback_specs(project_info: Dict[str, Any]) -> Dict[str, str]:
@@ -758,72 +1277,45 @@ def _generate_fallback_specs(project_info: Dict[str, Any]) -> Dict[str, str]:
     runtime = project_info.get('runtime', 'python:3.11-slim')
     port = project_info.get('app_port', 8000)
 
-    # Basic Dockerfile
-    dockerfile = f"""# Multi-stage build
-FROM {runtime} AS base
-WORKDIR /app
-COPY . .
-
-FROM {runtime}
-WORKDIR /app
-COPY --from=base /app .
-RUN useradd -m -u 1000 appuser
-USER appuser
-EXPOSE {port}
-HEALTHCHECK --interval=30s CMD curl -f http://localhost:{port}/health || exit 1
-CMD ["python", "app.py"]
-"""
+    return {
+        "dockerfile": template_registry.render("fallback/dockerfile", runtime=runtime, port=port),
+        "terraform_ecs": template_registry.render("fallback/terraform_ecs", port=port),
+        "appspec": template_registry.render("fallback/appspec", port=port),
+        "buildspec": "",
+        "recommendations": f"{FALLBACK_SPECS_PREFIX} for {project_info.get('primary_language', 'Unknown')} project. Please review and customize."
+    }
 
-    # Basic Terraform
-    terraform = f"""resource "aws_ecs_task_definition" "app" {{
-  family                   = "delightful-deploy"
-  requires_compatibilities = ["FARGATE"]
-  network_mode            = "awsvpc"
-  cpu                     = 256
-  memory                  = 512
-
-  container_definitions = jsonencode([{{
-    name  = "app"
-    image = "${{var.ecr_repository_url}}:latest"
-    portMappings = [{{ containerPort = {port} }}]
-  }}])
-}}
-"""
 
-    # Basic AppSpec
-    appspec = """version: 0.0
-Resources:
-  - TargetService:
-      Type: AWS::ECS::Service
-      Properties:
-        TaskDefinition: <TASK_DEFINITION>
-        LoadBalancerInfo:
-          ContainerName: "app"
-          ContainerPort: 8000
-"""
+def _generate_rule_based_specs(
+    project_info: Dict[str, Any],
+    install_plan: Optional[Dict[str, Any]] = None
+) -> Dict[str, str]:
+    """rule 기반 판별 결과로 템플릿 spec 생성 (LLM 호출 없음)"""
 
     return {
-        "dockerfile": dockerfile,
-        "terraform_ecs": terraform,
-        "appspec": appspec,
+        "dockerfile": generate_dockerfile(project_info, install_plan),
+        "terraform_ecs": template_registry.render("fallback/terraform_ecs", port=project_info.get("app_port", 8000)),
+        "appspec": generate_appspec_yaml(project_info),
         "buildspec": "",
-        "recommendations": f"Fallback specs generated for {project_info.get('primary_language', 'Unknown')} project. Please review and customize."
+        "recommendations": (
+            f"{rule_detector.RULE_DETECTION_NOTES}: {project_info.get('primary_framework')} "
+            f"on port {project_info.get('app_port')} (entrypoint: {project_info.get('entrypoint', 'n/a')}). "
+            "Specs were generated from templates without an LLM call."
+        )
     }
 
 
-def _store_analysis_results(
-    table_name: str,
+def _build_analysis_item(
     analysis_id: str,
     repository: str,
     commit_sha: str,
     project_info: Dict,
     specs: Dict,
-    recommendation: str
-) -> None:
-    """Store analysis results in DynamoDB"""
-    table = dynamodb.Table(table_name)
-
-    item = {
+    recommendation: str,
+    extra_attributes: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """분석 결과 DynamoDB 항목"""
+    return {
         "analysis_id": analysis_id,
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "repository": repository,
@@ -831,123 +1323,581 @@ def _store_analysis_results(
         "project_info": json.dumps(project_info),
         "specs": json.dumps(specs),
         "recommendation": recommendation,
-        "ttl": int(datetime.now(timezone.utc).timestamp()) + 2592000  # 30 days
+        "ttl": int(datetime.now(timezone.utc).timestamp()) + 2592000,  # 30 days
+        **(extra_attributes or {})
     }
 
+
+def _deployment_summary(
+    repository: str,
+    analysis_id: str,
+    project_info: Dict,
+    sizing: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """active deployments index 요약"""
+    sizing = sizing or right_sizing.recommend(project_info)
+    return deployment_index.build_summary(
+        repository, analysis_id, project_info, sizing["cpu"], sizing["memory"]
+    )
+
+
+def _store_analysis_results(
+    table_name: str,
+    analysis_id: str,
+    repository: str,
+    commit_sha: str,
+    project_info: Dict,
+    specs: Dict,
+    recommendation: str,
+    extra_attributes: Optional[Dict[str, Any]] = None,
+    sizing: Optional[Dict[str, Any]] = None
+) -> None:
+    """Store analysis results in DynamoDB"""
+    table = get_resource("dynamodb").Table(table_name)
+
+    item = _build_analysis_item(
+        analysis_id, repository, commit_sha, project_info, specs, recommendation, extra_attributes
+    )
+
     try:
         table.put_item(Item=item)
         print(f"✅ Stored analysis results: {analysis_id}")
     except Exception as e:
         print(f"❌ Error storing analysis results: {e}")
+        return
 
+    # Keep the active deployments index current for conflict checks
+    try:
+        deployment_index.record_deployment(
+            table, _deployment_summary(repository, analysis_id, project_info, sizing), _index_backfill(table)
+        )
+    except Exception as e:
+        print(f"⚠️ Error updating deployment index: {e}")
 
-def _upload_specs_to_s3(bucket: str, analysis_id: str, specs: Dict) -> Dict[str, str]:
-    """Upload generated specs to S3 and return URLs"""
-    urls = {}
 
-    for spec_name, content in specs.items():
-        if not content:
-            continue
+def _upload_spec(
+    bucket: str,
+    analysis_id: str,
+    spec_name: str,
+    content: str,
+    etags: Optional[Dict[str, str]] = None
+) -> Tuple[str, bool]:
+    """단일 spec 업로드 (spec별 Content-Type). Returns (S3 URL, 같은 내용이라 건너뛰었는지)"""
+    return artifacts.put(
+        get_client("s3"), bucket, f"{artifacts.artifact_prefix(analysis_id)}{spec_name}",
+        content.encode("utf-8"), artifacts.content_type(spec_name), etags
+    )
+
+
+def _upload_specs_to_s3(
+    bucket: str,
+    analysis_id: str,
+    specs: Dict,
+    concurrent: bool = False,
+    uploaded: Optional[Dict[str, str]] = None,
+    bundle: bool = True
+) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    """
+    Upload generated specs to S3 and return URLs
+    spec 객체와 bundle.tar.gz를 병렬로 올리고, prefix에 같은 내용이 이미 있으면 건너뜀.
+    uploaded: streaming 중 이미 올린 spec (개별 업로드는 생략하고 bundle에만 포함)
+    Returns (spec URL, {"bundle", "uploaded", "skipped", "bytes"})
+    """
+    uploaded = uploaded or {}
+    specs = {name: content for name, content in specs.items() if content}
+    etags = artifacts.existing_etags(get_client("s3"), bucket, artifacts.artifact_prefix(analysis_id))
+
+    tasks = {
+        spec_name: (lambda spec_name=spec_name, content=content: _upload_spec(
+            bucket, analysis_id, spec_name, content, etags
+        ))
+        for spec_name, content in specs.items()
+        if spec_name not in uploaded
+    }
+    bundle_sizes: Dict[str, int] = {}
+
+    def _upload_bundle() -> Tuple[str, bool]:
+        # 압축도 다른 spec 업로드와 겹치도록 task 안에서
+        body = artifacts.build_bundle(analysis_id, specs)
+        bundle_sizes["bytes"] = len(body)
+        return artifacts.put(
+            get_client("s3"), bucket, f"{artifacts.artifact_prefix(analysis_id)}{artifacts.BUNDLE_NAME}",
+            body, artifacts.BUNDLE_CONTENT_TYPE, etags
+        )
 
-        key = f"analysis/{analysis_id}/{spec_name}"
+    if bundle and specs:
+        tasks[artifacts.BUNDLE_NAME] = _upload_bundle
+    results, errors = run_parallel(tasks, concurrent=concurrent)
+
+    bundle_result = results.pop(artifacts.BUNDLE_NAME, None)
+    skipped = [name for name, (_, was_skipped) in results.items() if was_skipped]
+    for spec_name in results:
+        print(f"✅ Uploaded {spec_name} to S3" + (" (unchanged, skipped)" if spec_name in skipped else ""))
+    for spec_name, e in errors.items():
+        print(f"❌ Error uploading {spec_name}: {e}")
+
+    summary = {
+        "bundle": bundle_result[0] if bundle_result else None,
+        "bundle_bytes": bundle_sizes.get("bytes", 0),
+        "uploaded": len(results) - len(skipped) + (1 if bundle_result and not bundle_result[1] else 0),
+        "skipped": len(skipped) + (1 if bundle_result and bundle_result[1] else 0),
+    }
+    return {**uploaded, **{name: url for name, (url, _) in results.items()}}, summary
 
-        try:
-            s3.put_object(
-                Bucket=bucket,
-                Key=key,
-                Body=content.encode("utf-8"),
-                ContentType="text/plain"
-            )
-            urls[spec_name] = f"s3://{bucket}/{key}"
-            print(f"✅ Uploaded {spec_name} to S3")
-        except Exception as e:
-            print(f"❌ Error uploading {spec_name}: {e}")
 
-    return urls
+def _stream_specs_to_s3(
+    base_url: str,
+    api_key: str,
+    model: str,
+    project_info: Dict[str, Any],
+    readme_content: str,
+    file_list: List[str],
+    bucket: str,
+    analysis_id: str,
+    timer: StageTimer,
+    invocation_start: float,
+    ledger: Optional[llm_router.TokenLedger] = None
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    streaming 생성 중 섹션이 닫히는 즉시 S3에 업로드 (CI가 Dockerfile부터 빌드 시작 가능)
+    Returns (specs, 업로드된 spec URL)
+    """
+    futures = {}
 
+    def _on_uploaded(future) -> None:
+        if future.exception() is None and "time_to_first_artifact" not in timer.timings_ms:
+            timer.record("time_to_first_artifact", invocation_start)
 
-def lambda_handler(event, context):
-    """
-    Main Lambda handler for AI Code Analyzer
+    with ThreadPoolExecutor(max_workers=len(SPEC_SECTIONS)) as executor:
+        def _on_section(key: str, content: str) -> None:
+            print(f"📤 Section {key} complete, uploading")
+            future = executor.submit(_upload_spec, bucket, analysis_id, key, content)
+            future.add_done_callback(_on_uploaded)
+            futures[key] = future
 
-    Analyzes ANY project type and generates deployment specifications.
+        specs = _generate_deployment_specs_streaming(
+            base_url, api_key, model, project_info, readme_content, file_list, _on_section, ledger
+        )
 
-    Event format:
-    {
-        "repository": "owner/repo",
-        "commit_sha": "abc123",
-        "branch": "main",
-        "pusher": "username",
-        "timestamp": "2025-01-01T00:00:00Z",
-        "file_list": ["file1.py", "file2.js", ...],  # Optional
-        "readme_content": "...",  # Optional
-        "file_samples": {"main.py": "content..."}  # Optional
+        urls = {}
+        for key, future in futures.items():
+            try:
+                urls[key] = future.result()[0]
+                print(f"✅ Uploaded {key} to S3")
+            except Exception as e:
+                print(f"❌ Error uploading {key}: {e}")
+
+    return specs, urls
+
+
+def _consume_cold_start() -> bool:
+    """container의 첫 invocation이면 True (이후 False)"""
+    global _cold_start
+    cold, _cold_start = _cold_start, False
+    return cold
+
+
+def _runtime_stats(cold_start: bool, secret_stats_before: Dict[str, int]) -> Dict[str, Any]:
+    """cold/warm 여부, 모듈 import 시간, 이번 invocation의 SSM 호출 수, container 누적 통계"""
+    secret_stats = secrets.stats()
+    return {
+        "cold_start": cold_start,
+        "import_time_ms": IMPORT_TIME_MS,
+        "ssm_calls": secret_stats["ssm_calls"] - secret_stats_before["ssm_calls"],
+        "secret_cache_hits": secret_stats["hits"] - secret_stats_before["hits"],
+        # warm container의 모든 분석 누적 (이번 분석 값은 result의 cache.status / spec_parse)
+        "container_totals": {
+            "analysis_cache": analysis_cache.stats(),
+            "spec_parse": spec_parser.stats()
+        }
     }
-    """
-    print("🌸 AI Code Analyzer invoked")
-    print(f"Event: {json.dumps(event, default=str)}")
 
-    # Use direct OpenAI API instead of letsur endpoint
-    # Get OpenAI API key from SSM Parameter Store
+
+def _cached_result_usable(
+    cached: Dict[str, Any],
+    repository: str,
+    existing_deployments: List[Dict]
+) -> bool:
+    """캐시된 포트가 다른 repo의 배포와 충돌하면 재사용하지 않음"""
+    port = cached.get("project_info", {}).get("app_port", 8000)
+    for dep in existing_deployments:
+        if dep.get("repository") != repository and dep.get("port") == port:
+            print(f"⚠️ Cached port {port} now conflicts with {dep.get('repository')}, re-analyzing")
+            return False
+    return True
+
+
+def _deployment_name(repository: str, service: Optional[Dict[str, Any]] = None) -> str:
+    """배포 목록/분석 항목의 이름 (monorepo service는 <repository>/<root>)"""
+    root = (service or {}).get("root")
+    return f"{repository}/{root}" if root else repository
+
+
+def _assign_service_port(project_info: Dict[str, Any], used_ports: Set[int]) -> Dict[str, Any]:
+    """monorepo service: LLM이 고른 포트도 겹치면 재할당 (rule 판별에서 고정 포트로 확인된 경우는 유지)"""
+    return rule_detector.assign_port({"port_configurable": True, **project_info}, used_ports)
+
+
+def _is_cacheable(project_info: Dict[str, Any], specs: Dict[str, str]) -> bool:
+    """fallback 결과는 캐시하지 않음 (다음 push에서 LLM 재시도)"""
+    if project_info.get("notes") == FALLBACK_DETECTION_NOTES:
+        return False
+    if specs.get("recommendations", "").startswith(FALLBACK_SPECS_PREFIX):
+        return False
+    return bool(specs.get("dockerfile"))
+
+
+def _estimate_build(
+    table_name: str,
+    repository: str,
+    project_info: Dict[str, Any],
+    specs: Dict[str, str],
+    file_samples: Optional[Dict[str, str]]
+) -> Dict[str, Any]:
+    """Dockerfile/manifest 기반 추정 + 같은 repository/base image의 실측 보정"""
+    dockerfile = specs.get("dockerfile", "")
+    preliminary = build_estimator.estimate(dockerfile, project_info, file_samples)
     try:
-        ssm = boto3.client('ssm', region_name='ap-northeast-2')
-        response = ssm.get_parameter(Name='/delightful-deploy/openai-api-key', WithDecryption=True)
-        api_key = response['Parameter']['Value']
+        history = build_estimator.load_history(
+            get_resource("dynamodb").Table(table_name), repository, preliminary["base_image"]
+        )
     except Exception as e:
-        print(f"❌ ERROR: Failed to get OpenAI API key from SSM: {e}")
-        api_key = None
+        print(f"⚠️ Could not load build history: {e}")
+        return preliminary
 
-    if not api_key:
-        print("❌ ERROR: OpenAI API key not configured")
+    if not history:
+        return preliminary
+    return build_estimator.estimate(dockerfile, project_info, file_samples, history)
+
+
+def _size_resources(table_name: str, repository: str, project_info: Dict[str, Any]) -> Dict[str, Any]:
+    """같은 repository의 관측 사용률 + framework 사전값으로 Fargate 크기/scaling 결정"""
+    try:
+        samples = right_sizing.load_samples(get_resource("dynamodb").Table(table_name), repository)
+    except Exception as e:
+        print(f"⚠️ Could not load utilization samples: {e}")
+        samples = []
+    return right_sizing.recommend(project_info, samples)
+
+
+def _record_utilization(event: Dict[str, Any]) -> Dict[str, Any]:
+    """배포된 서비스의 CloudWatch 사용률 sample을 repository별로 기록 (다음 분석의 right-sizing 입력)"""
+    table = get_resource("dynamodb").Table(os.getenv("AI_ANALYSIS_TABLE", "delightful-deploy-ai-analysis"))
+    repository = event.get("repository")
+    samples = event.get("samples")
+
+    if not repository or not isinstance(samples, list) or not samples:
         return {
-            "statusCode": 500,
-            "body": json.dumps({"error": "API key not configured"})
+            "statusCode": 400,
+            "body": json.dumps({"error": "repository and a non-empty samples list are required"})
         }
 
-    # Use direct OpenAI API endpoint
-    base_url = "https://api.openai.com/v1"
-    model = "gpt-4o"  # Using gpt-4o model
+    try:
+        stored = right_sizing.record_samples(table, repository, samples)
+    except (KeyError, TypeError, ValueError, ArithmeticError) as e:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"error": f"Invalid utilization samples: {e}"})
+        }
+    except Exception as e:
+        print(f"❌ Error recording utilization samples for {repository}: {e}")
+        return {"statusCode": 500, "body": json.dumps({"repository": repository, "error": str(e)})}
+    print(f"✅ Recorded {len(samples)} utilization samples for {repository} ({stored} kept)")
+    return {
+        "statusCode": 200,
+        "body": json.dumps({"repository": repository, "status": "recorded", "samples": stored})
+    }
 
-    print(f"✅ OpenAI API configured (base_url={base_url}, model={model})")
 
-    # Extract environment variables
+def _record_build_metrics(event: Dict[str, Any]) -> Dict[str, Any]:
+    """CI가 보고한 실제 image 크기/빌드 시간을 분석 항목과 보정 통계에 기록"""
+    table = get_resource("dynamodb").Table(os.getenv("AI_ANALYSIS_TABLE", "delightful-deploy-ai-analysis"))
+    analysis_id = event.get("analysis_id")
+    if not analysis_id:
+        return {"statusCode": 400, "body": json.dumps({"error": "analysis_id is required"})}
+
+    try:
+        item = table.get_item(Key={"analysis_id": analysis_id}).get("Item")
+        if not item:
+            return {
+                "statusCode": 404,
+                "body": json.dumps({"error": f"Analysis not found: {analysis_id}"})
+            }
+
+        build_estimate = json.loads(item["build_estimate"]) if item.get("build_estimate") else None
+        outcome = build_estimator.record_actuals(
+            table, analysis_id, item.get("repository", "unknown/repo"), build_estimate,
+            float(event["image_size_mb"]), float(event["build_seconds"])
+        )
+        print(f"✅ Recorded build metrics for {analysis_id}: {outcome}")
+        return {
+            "statusCode": 200,
+            "body": json.dumps({"analysis_id": analysis_id, "status": "recorded", **outcome})
+        }
+
+    except (KeyError, TypeError, ValueError) as e:
+        return {
+            "statusCode": 400,
+            "body": json.dumps({"error": f"Invalid build metrics: {e}"})
+        }
+    except Exception as e:
+        print(f"❌ Error recording build metrics for {analysis_id}: {e}")
+        return {"statusCode": 500, "body": json.dumps({"analysis_id": analysis_id, "error": str(e)})}
+
+
+def _analyzer_settings() -> Dict[str, Any]:
+    """환경변수 기반 설정 (단일/batch invocation 공통)"""
     ai_analysis_table = os.getenv("AI_ANALYSIS_TABLE", "delightful-deploy-ai-analysis")
-    s3_bucket = os.getenv("S3_BUCKET", "delightful-deploy-artifacts")
+    return {
+        # Use direct OpenAI API endpoint
+        "base_url": "https://api.openai.com/v1",
+        # task별 모델 (analysis: 작은 모델, generation: 큰 모델), fallback/가격은 clients/llm_router
+        "model": llm_router.GENERATION_MODEL,
+        "analysis_model": llm_router.ANALYSIS_MODEL,
+        "token_budget": llm_router.DEFAULT_REPO_DAILY_TOKEN_BUDGET,
+        "ai_analysis_table": ai_analysis_table,
+        "s3_bucket": os.getenv("S3_BUCKET", "delightful-deploy-artifacts"),
+        "cache_table": os.getenv("ANALYSIS_CACHE_TABLE", ai_analysis_table),
+        "cache_enabled": os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() == "true",
+        "cache_ttl": int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", str(analysis_cache.DEFAULT_TTL_SECONDS))),
+        "execution_mode": os.getenv("ANALYZER_EXECUTION_MODE", "concurrent"),
+        "rule_fast_path": os.getenv("RULE_FAST_PATH_ENABLED", "true").lower() == "true",
+        "dockerfile_autofix": os.getenv("DOCKERFILE_AUTOFIX", "true").lower() == "true",
+        # project_info / spec bundle을 json_schema(strict)로 요청 (검증/부분 repair는 항상 수행)
+        "structured_output": os.getenv("STRUCTURED_OUTPUT_ENABLED", "true").lower() == "true",
+        "history_enabled": os.getenv("HISTORY_EXPORT_ENABLED", "true").lower() == "true",
+        "history_prefix": os.getenv("HISTORY_PREFIX", history.HISTORY_PREFIX),
+        "artifact_bundle": os.getenv("ARTIFACT_BUNDLE_ENABLED", "true").lower() == "true",
+        # 파일 내용 S3 cache (blob SHA key, 모든 commit/branch 공유). 꺼도 container 메모리 LRU는 사용
+        "blob_cache_enabled": os.getenv("BLOB_CACHE_ENABLED", "true").lower() == "true",
+        # async 모드: enqueue 대상 SQS queue와 최대 시도 횟수 (queue의 maxReceiveCount와 맞춤)
+        "job_queue_url": os.getenv("ANALYSIS_QUEUE_URL", ""),
+        "job_max_attempts": int(os.getenv("ANALYSIS_JOB_MAX_ATTEMPTS", "3")),
+        # 같은 repository/commit 동시 분석은 lease를 잡은 호출 하나만 계산
+        "single_flight": os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true",
+        "single_flight_max_wait": int(
+            os.getenv("SINGLE_FLIGHT_MAX_WAIT_SECONDS", str(single_flight.DEFAULT_MAX_WAIT_SECONDS))
+        ),
+    }
 
-    # Extract event parameters
-    repository = event.get("repository", "unknown/repo")
-    commit_sha = event.get("commit_sha", "unknown")
-    branch = event.get("branch", "main")
 
-    # Use analysis_id from event payload (provided by GitHub Actions workflow)
-    # If not provided, fall back to generating one
+def _export_history(settings: Dict[str, Any], results: List[Dict[str, Any]]) -> None:
+    """분석 결과를 history partition에 part 파일 하나로 append (실패해도 분석 결과에는 영향 없음)"""
+    # 다른 호출의 결과를 공유받은 경우(single-flight follower)는 중복 집계하지 않음
+    results = [r for r in results if (r.get("single_flight") or {}).get("role") != "follower"]
+    if not settings["history_enabled"] or not results:
+        return
+    try:
+        keys = history.append(
+            get_client("s3"), settings["s3_bucket"],
+            [history.build_row(result) for result in results], settings["history_prefix"]
+        )
+        print(f"🗂️ Exported {len(results)} history row(s) to {', '.join(keys)}")
+    except Exception as e:
+        print(f"⚠️ Error exporting analysis history: {e}")
+
+
+def _compact_history(event: Dict[str, Any]) -> Dict[str, Any]:
+    """하루치 history part 파일을 daily 파일 하나로 병합 (기본: 어제, UTC)"""
+    settings = _analyzer_settings()
+    day = event.get("date") or (datetime.now(timezone.utc) - timedelta(days=1)).date().isoformat()
+    fmt = event.get("format") or os.getenv("HISTORY_COMPACT_FORMAT", "parquet")
+    try:
+        summary = history.compact(get_client("s3"), settings["s3_bucket"], day, settings["history_prefix"], fmt)
+    except Exception as e:
+        print(f"❌ Error compacting history for {day}: {e}")
+        return {"statusCode": 500, "body": json.dumps({"error": str(e), "date": day})}
+
+    print(f"✅ Compacted history {day}: {summary['merged']} file(s) → {summary['key']}")
+    return {"statusCode": 200, "body": json.dumps(summary)}
+
+
+def _resolve_analysis_id(event: Dict[str, Any]) -> str:
+    """
+    Use analysis_id from event payload (provided by GitHub Actions workflow)
+    If not provided, fall back to generating one
+    """
     analysis_id = event.get("analysis_id")
     if not analysis_id:
         print("⚠️ No analysis_id in event, generating one...")
         analysis_id = hashlib.md5(
-            f"{repository}-{commit_sha}".encode()
+            f"{event.get('repository', 'unknown/repo')}-{event.get('commit_sha', 'unknown')}".encode()
         ).hexdigest()[:24]
+    return analysis_id
 
-    print(f"📝 Using analysis_id: {analysis_id}")
+
+def _enqueue_analysis(event: Dict[str, Any]) -> Dict[str, Any]:
+    """async 모드: 상태 항목 생성 + SQS enqueue 후 analysis_id를 바로 반환 (API key/LLM 불필요)"""
+    settings = _analyzer_settings()
+    if not settings["job_queue_url"]:
+        print("❌ ERROR: ANALYSIS_QUEUE_URL not configured for async mode")
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"error": "Analysis queue not configured"})
+        }
+
+    analysis_id = _resolve_analysis_id(event)
+    repository = event.get("repository", "unknown/repo")
+    commit_sha = event.get("commit_sha", "unknown")
+    job_event = {k: v for k, v in event.items() if k != "async"}
+    try:
+        jobs.create(
+            get_resource("dynamodb").Table(settings["ai_analysis_table"]), analysis_id, repository, commit_sha
+        )
+        queued = jobs.enqueue(
+            get_client("sqs"), settings["job_queue_url"], get_client("s3"), settings["s3_bucket"],
+            analysis_id, job_event
+        )
+    except Exception as e:
+        print(f"❌ Error enqueueing analysis {analysis_id}: {e}")
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"analysis_id": analysis_id, "status": "error", "error": str(e)})
+        }
+
+    print(f"📨 Queued analysis {analysis_id} ({queued['message_id']})")
+    return {
+        "statusCode": 202,
+        "body": json.dumps({
+            "analysis_id": analysis_id,
+            "repository": repository,
+            "commit_sha": commit_sha,
+            "status": "queued",
+            "message_id": queued["message_id"],
+            # polling용 event
+            "status_request": {"action": "job_status", "analysis_id": analysis_id}
+        })
+    }
+
+
+def _job_status(event: Dict[str, Any]) -> Dict[str, Any]:
+    """async job 상태 조회 (상태 항목 get_item 1회)"""
+    analysis_id = event.get("analysis_id")
+    if not analysis_id:
+        return {"statusCode": 400, "body": json.dumps({"error": "analysis_id is required"})}
 
     try:
-        print(f"🔍 Analyzing repository: {repository} @ {commit_sha}")
+        status = jobs.read(get_resource("dynamodb").Table(_analyzer_settings()["ai_analysis_table"]), analysis_id)
+    except Exception as e:
+        print(f"❌ Error reading job status {analysis_id}: {e}")
+        return {"statusCode": 500, "body": json.dumps({"analysis_id": analysis_id, "error": str(e)})}
 
-        # Step 0: Get existing deployments to avoid conflicts
-        print("📊 Querying existing deployments...")
-        existing_deployments = _get_existing_deployments()
+    if status is None:
+        return {"statusCode": 404, "body": json.dumps({"analysis_id": analysis_id, "status": "not_found"})}
+    return {"statusCode": 200, "body": json.dumps(status)}
+
+
+def _run_single_flight(
+    event: Dict[str, Any],
+    analysis_id: str,
+    settings: Dict[str, Any],
+    compute: Callable[[], Dict[str, Any]],
+    context: Any = None
+) -> Dict[str, Any]:
+    """
+    같은 repository/commit_sha를 이미 분석 중인 호출이 있으면 그 결과를 기다려서 돌려줌.
+    lease를 잡으면 compute() 결과를 lease에 기록, 실패하면 lease를 풀어서 기다리던 호출이 이어받음.
+    lease 조회/기록 자체가 실패하거나 max wait를 넘기면 그냥 직접 계산합니다.
+    """
+    repository = event.get("repository", "unknown/repo")
+    commit_sha = event.get("commit_sha", "unknown")
+    if not settings["single_flight"] or commit_sha == "unknown":
+        return compute()
+
+    max_wait = settings["single_flight_max_wait"]
+    if context is not None and hasattr(context, "get_remaining_time_in_millis"):
+        # 기다리다 timeout 되면 직접 계산할 시간이 남지 않으므로 남은 시간의 절반까지만
+        max_wait = min(max_wait, context.get_remaining_time_in_millis() / 2000)
+    flight = single_flight.SingleFlight(
+        get_resource("dynamodb").Table(settings["ai_analysis_table"]),
+        single_flight.lease_key(repository, commit_sha), analysis_id
+    )
+    wait_start = time.perf_counter()
+    try:
+        role, shared = flight.acquire_or_wait(max_wait)
+    except Exception as e:
+        print(f"⚠️ Single-flight lease unavailable ({e}), analyzing without it")
+        return compute()
+
+    if role == "follower":
+        print(f"🔁 Reusing in-flight analysis {shared['analysis_id']} for {repository} @ {commit_sha}")
+        return {**shared, "single_flight": {
+            "role": "follower",
+            "requested_analysis_id": analysis_id,
+            "waited_ms": round((time.perf_counter() - wait_start) * 1000, 1)
+        }}
+    if role == "timeout":
+        print(f"⌛ Gave up waiting for in-flight analysis of {repository} @ {commit_sha}, analyzing directly")
+        result = compute()
+        result["single_flight"] = {"role": "timeout"}
+        return result
 
-        # Get repository information from event or simulate
-        file_list = event.get("file_list", [
-            "README.md",
-            "requirements.txt",
-            "app/main.py",
-            "app/__init__.py",
-            "Dockerfile",
-            ".gitignore"
-        ])
+    try:
+        result = compute()
+    except Exception:
+        flight.release()
+        raise
+    result["single_flight"] = {"role": "leader"}
+    flight.complete(result)
+    return result
+
+
+def _is_sqs_event(event: Dict[str, Any]) -> bool:
+    records = event.get("Records")
+    return bool(records) and all(record.get("eventSource") == "aws:sqs" for record in records)
+
+
+def _analyze_repository(
+    event: Dict[str, Any],
+    analysis_id: str,
+    settings: Dict[str, Any],
+    api_key: str,
+    timer: StageTimer,
+    invocation_start: float,
+    registry: Optional[deployment_index.DeploymentRegistry] = None,
+    writes: Optional[WriteBuffer] = None,
+    progress: Optional[Callable[[str], None]] = None,
+    source: Optional[Tuple[List[str], str, Dict[str, Any], Dict[str, str]]] = None
+) -> Dict[str, Any]:
+    """
+    repository 하나를 분석해서 result dict 반환 (실패 시 예외).
+    batch 모드에서는 공유 배포 목록(registry)과 DynamoDB 기록 buffer(writes)를 넘겨받습니다.
+    async job은 progress로 단계(fetch/analyze/generate/upload) 전환을 기록합니다.
+    monorepo service는 event["service"]와 이미 가져온 subtree(source: file_list, readme, tree_info, blob_shas,
+    경로는 service root 기준)를 받고, 배포 목록/분석 항목에는 <repository>/<root> 이름으로 기록됩니다.
+    """
+    report_stage = progress or (lambda stage: None)
+    parse_log = spec_parser.start_log()
+    base_url = settings["base_url"]
+    ai_analysis_table = settings["ai_analysis_table"]
+    s3_bucket = settings["s3_bucket"]
+    cache_table = settings["cache_table"]
+    cache_enabled = settings["cache_enabled"]
+    cache_ttl = settings["cache_ttl"]
+    rule_fast_path = settings["rule_fast_path"]
+    execution_mode = resolve_execution_mode(event.get("execution_mode"), settings["execution_mode"])
+    concurrent = execution_mode != "serial"
+
+    # Extract event parameters
+    repository = event.get("repository", "unknown/repo")
+    commit_sha = event.get("commit_sha", "unknown")
+    branch = event.get("branch", "main")
+    service = event.get("service")
+    deployment_name = _deployment_name(repository, service)
 
-        readme_content = event.get("readme_content", """# Demo Application
+    print(f"🔍 Analyzing repository: {deployment_name} @ {commit_sha} ({execution_mode})")
+
+    # Get repository information from event or simulate
+    file_list = event.get("file_list", [
+        "README.md",
+        "requirements.txt",
+        "app/main.py",
+        "app/__init__.py",
+        "Dockerfile",
+        ".gitignore"
+    ])
+
+    readme_content = event.get("readme_content", """# Demo Application
 
 A demo application for deployment automation.
 
@@ -960,96 +1910,868 @@ python app/main.py
 Server runs on port 8000.
 """)
 
-        file_samples = event.get("file_samples", None)
+    file_samples = event.get("file_samples", None)
+    token_budget = int(event.get("token_budget", settings["token_budget"]))
 
-        # Step 1: Fetch actual repository files if GitHub event
-        if "github" in repository.lower():
-            print("📥 Fetching repository files from GitHub...")
-            try:
-                # GitHub repo 형식: owner/repo
-                file_list, readme_content = _fetch_github_repo_info(repository, commit_sha)
-            except Exception as e:
-                print(f"⚠️ Could not fetch from GitHub: {e}, using provided data")
+    # Step 0 + 1: Existing deployments (conflict avoidance) and GitHub fetch are independent
+    prefetch_tasks: Dict[str, Callable[[], Any]] = {}
+    if registry is None:
+        print("📊 Querying existing deployments...")
+        prefetch_tasks["existing_deployments"] = lambda: _get_existing_deployments(ai_analysis_table)
+    if source is None and "github" in repository.lower():
+        print("📥 Fetching repository files from GitHub...")
+        # GitHub repo 형식: owner/repo
+        prefetch_tasks["github_fetch"] = lambda: _fetch_github_repo_info(repository, commit_sha, s3_bucket)
+    if token_budget > 0:
+        prefetch_tasks["token_usage"] = lambda: llm_router.load_repo_usage(
+            get_resource("dynamodb").Table(ai_analysis_table), repository
+        )
 
+    report_stage("fetch")
+    with timer.stage("prefetch"):
+        prefetched, prefetch_errors = run_parallel(prefetch_tasks, timer=timer, concurrent=concurrent)
+
+    if registry is None:
+        registry = deployment_index.DeploymentRegistry(prefetched.get("existing_deployments", []))
+    existing_deployments = registry.snapshot()
+    tree_info: Dict[str, Any] = {}
+    tree_blobs: Dict[str, str] = {}
+    if source is not None:
+        file_list, readme_content, tree_info, tree_blobs = source
+    elif "github_fetch" in prefetched:
+        file_list, readme_content, tree_info, tree_blobs, _ = prefetched["github_fetch"]
+    elif "github_fetch" in prefetch_errors:
+        print(f"⚠️ Could not fetch from GitHub: {prefetch_errors['github_fetch']}, using provided data")
+
+    # Step 1.05: Route models by the repository's remaining daily token budget
+    if "token_usage" in prefetch_errors:
+        print(f"⚠️ Could not read token usage: {prefetch_errors['token_usage']}")
+    ledger = llm_router.TokenLedger(token_budget, prefetched.get("token_usage", 0))
+    budget_state = llm_router.budget_state(ledger.used_before, token_budget)
+    models = llm_router.select_models(budget_state)
+    model = models["generation"]
+    if budget_state != "ok":
+        print(f"💸 Token budget {budget_state} for {repository}: {ledger.used_before}/{token_budget} tokens today")
+
+    # Step 1.1: Auto-fetch the most relevant manifests/entrypoints as file samples
+    # (lockfile은 설치 계획에만 쓰고 프롬프트/캐시 key에는 넣지 않음)
+    lockfile_samples: Dict[str, str] = {}
+    if tree_info:
+        sample_paths = file_ranking.select_sample_paths(
+            file_list, exclude=list(file_samples or {})
+        )
+        lock_paths = [
+            path for path in lockfile_resolver.lockfile_paths(file_list)
+            if path not in sample_paths and path not in (file_samples or {})
+        ]
+        if sample_paths or lock_paths:
+            with timer.stage("sample_fetch"):
+                fetched_samples = _fetch_github_file_samples(
+                    repository, commit_sha, sample_paths + lock_paths, tree_blobs,
+                    s3_bucket if settings["blob_cache_enabled"] else None
+                )
+            lockfile_samples = {path: fetched_samples.pop(path) for path in lock_paths if path in fetched_samples}
+            # event로 받은 sample이 우선
+            file_samples = {**fetched_samples, **(file_samples or {})}
+
+    def _resolve_install_plan(info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """실제 lockfile 기반 설치 계획 (file_list가 비어 있으면 파일 존재를 모르는 것으로 처리)"""
+        return lockfile_resolver.resolve(
+            info, file_list or None, {**lockfile_samples, **(file_samples or {})}
+        )
+
+    install_plan = None
+
+    # Step 1.2: Look up content-addressed analysis cache
+    report_stage("analyze")
+    cache_key = analysis_cache.compute_cache_key(
+        file_list, readme_content, file_samples, PROMPT_VERSION,
+        f"{models['analysis']}+{models['generation']}", template_registry.version()
+    )
+    cached = None
+    streamed_urls: Dict[str, str] = {}
+    repaired_sections: Dict[str, str] = {}
+    if not cache_enabled:
+        cache_status = "disabled"
+    elif event.get("force_refresh"):
+        cache_status = "bypass"
+    else:
+        with timer.stage("cache_lookup"):
+            cached = analysis_cache.lookup(get_resource("dynamodb").Table(cache_table), cache_key)
+        if cached and not _cached_result_usable(cached, deployment_name, existing_deployments):
+            cached = None
+        if cached and service is not None:
+            # 같은 monorepo의 다른 service가 먼저 잡은 포트와 겹치면 캐시된 spec을 쓸 수 없음
+            claimed = registry.claim(deployment_name, cached["project_info"], _assign_service_port)
+            if claimed.get("app_port") != cached["project_info"].get("app_port"):
+                print(f"⚠️ Cached port {cached['project_info'].get('app_port')} is taken by another service")
+                cached = None
+        cache_status = "hit" if cached else "miss"
+        analysis_cache.record(bool(cached))
+    print(f"🗄️ Analysis cache {cache_status} ({cache_key[:12]})")
+
+    # Step 1.3: Rule-based fast path for well-known stacks (no LLM call)
+    rule_info = None
+    # budget을 다 쓴 경우 force_llm/RULE_FAST_PATH_ENABLED와 관계없이 rule 경로를 먼저 시도
+    if not cached and (budget_state == "exhausted" or (rule_fast_path and not event.get("force_llm"))):
+        with timer.stage("rule_detection"):
+            rule_info = rule_detector.detect(file_list, file_samples)
+
+    if cached:
+        analysis_path = "cache"
+        project_info = cached["project_info"]
+        specs = dict(cached["specs"])
+    elif rule_info:
+        analysis_path = "rule"
+        print(f"⚡ Rule-based detection: {rule_info['primary_framework']} ({rule_info.get('entrypoint', 'n/a')})")
+        project_info = registry.claim(deployment_name, rule_info, rule_detector.assign_port)
+        install_plan = _resolve_install_plan(project_info)
+        report_stage("generate")
+        with timer.stage("spec_generation"):
+            specs = _generate_rule_based_specs(project_info, install_plan)
+    else:
         # Step 1.5: Analyze project using GPT-5 with existing deployment context
         print("🤖 Running intelligent project analysis...")
-        project_info = _analyze_project_with_gpt5(
-            base_url, api_key, model, file_list, readme_content, file_samples, existing_deployments
-        )
+        with timer.stage("project_analysis"):
+            project_info = _analyze_project_with_gpt5(
+                base_url, api_key, models["analysis"], file_list, readme_content, file_samples,
+                existing_deployments, ledger, settings["structured_output"]
+            )
+        if service is not None:
+            # 동시에 분석 중인 다른 service와 포트가 겹치지 않도록 spec 생성 전에 등록
+            project_info = registry.claim(deployment_name, project_info, _assign_service_port)
 
         # Step 2: Generate deployment specs using GPT-5
         print("📦 Generating deployment specifications...")
-        specs = _generate_deployment_specs(
-            base_url, api_key, model, project_info, readme_content, file_list
+        report_stage("generate")
+        with timer.stage("spec_generation"):
+            if execution_mode == "streaming":
+                specs, streamed_urls = _stream_specs_to_s3(
+                    base_url, api_key, model, project_info, readme_content, file_list,
+                    s3_bucket, analysis_id, timer, invocation_start, ledger
+                )
+            elif concurrent:
+                specs = _generate_deployment_specs_concurrent(
+                    base_url, api_key, model, project_info, readme_content, file_list, timer, ledger
+                )
+            else:
+                specs = _generate_deployment_specs(
+                    base_url, api_key, model, project_info, readme_content, file_list, ledger,
+                    settings["structured_output"]
+                )
+
+        # Step 2.1: Validate specs and regenerate only the invalid sections (전체 fallback이면 건너뜀)
+        if not specs.get("recommendations", "").startswith(FALLBACK_SPECS_PREFIX):
+            with timer.stage("spec_validation"):
+                repaired_sections = _repair_specs(
+                    base_url, api_key, model, project_info, readme_content, file_list, specs, concurrent, ledger
+                )
+            for key in repaired_sections:
+                # streaming 모드에서 이미 올라간 원본은 다시 업로드
+                streamed_urls.pop(key, None)
+
+        analysis_path = "llm" if _is_cacheable(project_info, specs) else "fallback"
+
+    if install_plan is None:
+        install_plan = _resolve_install_plan(project_info)
+    if install_plan and install_plan["notes"]:
+        print(f"📦 Install plan ({install_plan['package_manager']}): {'; '.join(install_plan['notes'])}")
+
+    # Step 2.2: Validate / optimize the generated Dockerfile (cached specs were validated before caching)
+    if not cached and specs.get("dockerfile"):
+        with timer.stage("dockerfile_validation"):
+            dockerfile, dockerfile_report = dockerfile_validator.validate_dockerfile(
+                specs["dockerfile"], project_info, file_list, settings["dockerfile_autofix"]
+            )
+        summary = dockerfile_report["summary"]
+        print(f"🩺 Dockerfile validation: {summary['error']} errors, {summary['warning']} warnings, {summary['fixed']} fixed")
+        if dockerfile != specs["dockerfile"]:
+            specs["dockerfile"] = dockerfile
+            # streaming 모드에서 이미 올라간 원본은 수정본으로 다시 업로드
+            streamed_urls.pop("dockerfile", None)
+        specs["dockerfile_findings"] = json.dumps(dockerfile_report, indent=2)
+
+    if cache_enabled and analysis_path == "llm":
+        if writes is not None:
+            writes.put(cache_table, analysis_cache.build_item(cache_key, project_info, specs, cache_ttl))
+        else:
+            analysis_cache.store(
+                get_resource("dynamodb").Table(cache_table), cache_key, project_info, specs, cache_ttl
+            )
+
+    if analysis_path != "rule":
+        # 같은 batch의 다음 repo가 이 포트를 피할 수 있도록 등록
+        registry.claim(deployment_name, project_info)
+
+    # Step 2.4: Image size / cold build time estimate (calibrated with recorded build actuals)
+    with timer.stage("build_estimate"):
+        build_estimate = _estimate_build(ai_analysis_table, deployment_name, project_info, specs, file_samples)
+
+    # Step 2.45: Right-size Fargate task / autoscaling from observed utilization
+    with timer.stage("right_sizing"):
+        sizing = _size_resources(ai_analysis_table, deployment_name, project_info)
+
+    # Step 2.5: Generate Terraform tfvars
+    print("⚙️ Generating Terraform variables...")
+    commit_sha_short = commit_sha[:7] if commit_sha and commit_sha != "unknown" else "latest"
+    specs["terraform_tfvars"] = _generate_terraform_tfvars(
+        project_info, analysis_id, commit_sha_short, sizing
+    )
+
+    # Step 3: Determine recommendation
+    confidence = project_info.get("confidence", "medium")
+    has_dockerfile = bool(specs.get("dockerfile"))
+
+    if confidence == "high" and has_dockerfile:
+        recommendation = "auto-apply"
+        recommendation_text = f"✅ High confidence detection: {project_info.get('primary_language')} with {project_info.get('primary_framework', 'standard')} framework. Ready for deployment."
+    elif confidence == "medium":
+        recommendation = "review-recommended"
+        recommendation_text = f"⚠️ Medium confidence detection. Please review generated specs before deployment."
+    else:
+        recommendation = "manual-review"
+        recommendation_text = f"🔍 Low confidence or unknown project type. Manual review required."
+
+    # Step 4 + 5: Store analysis results and upload specs to S3 (fan-out)
+    print("💾 Storing analysis results / ☁️ Uploading specs to S3...")
+    recommendation_text += f" {build_estimator.summary_text(build_estimate)}"
+    recommendation_text += f" {right_sizing.summary_text(sizing)}"
+    token_usage = ledger.summary()
+    if ledger.calls:
+        recommendation_text += (
+            f" LLM usage: {token_usage['total_tokens']:,} tokens (~${token_usage['cost_usd']:.4f}, {token_usage['model']})."
         )
 
-        # Step 2.5: Generate Terraform tfvars
-        print("⚙️ Generating Terraform variables...")
-        commit_sha_short = commit_sha[:7] if commit_sha and commit_sha != "unknown" else "latest"
-        specs["terraform_tfvars"] = _generate_terraform_tfvars(
-            project_info, analysis_id, commit_sha_short
+    extra_attributes = {
+        "build_estimate": json.dumps(build_estimate),
+        "resource_sizing": json.dumps(sizing),
+        "template_version": template_registry.version()
+    }
+    if install_plan:
+        extra_attributes["install_plan"] = json.dumps(lockfile_resolver.summary(install_plan))
+    if tree_info:
+        extra_attributes["root_tree_sha"] = tree_info["root_tree_sha"]
+    if ledger.calls:
+        extra_attributes["token_usage"] = json.dumps(token_usage)
+    persist_tasks = {
+        "s3_upload": lambda: _upload_specs_to_s3(
+            s3_bucket, analysis_id, specs, concurrent, streamed_urls, settings["artifact_bundle"]
+        ),
+    }
+    if writes is not None:
+        # batch 모드: batch_write_item으로 모아서 기록 (_handle_batch에서 flush)
+        writes.put(ai_analysis_table, _build_analysis_item(
+            analysis_id, deployment_name, commit_sha, project_info, specs, recommendation, extra_attributes
+        ), owner=analysis_id)
+    else:
+        persist_tasks["store_results"] = lambda: _store_analysis_results(
+            ai_analysis_table, analysis_id, deployment_name, commit_sha,
+            project_info, specs, recommendation, extra_attributes, sizing
+        )
+    if ledger.calls:
+        persist_tasks["token_usage"] = lambda: llm_router.record_repo_usage(
+            get_resource("dynamodb").Table(ai_analysis_table), repository, ledger
         )
+    report_stage("upload")
+    with timer.stage("persist"):
+        persisted, persist_errors = run_parallel(persist_tasks, timer=timer, concurrent=concurrent)
+    if "token_usage" in persist_errors:
+        print(f"⚠️ Error recording token usage: {persist_errors['token_usage']}")
+    if "s3_upload" in persist_errors:
+        raise persist_errors["s3_upload"]
+    spec_urls, artifact_summary = persisted["s3_upload"]
+
+    # Step 6: Prepare response for GitHub Actions
+    result = {
+        "analysis_id": analysis_id,
+        "repository": repository,
+        "deployment_name": deployment_name,
+        "commit_sha": commit_sha,
+        "branch": branch,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "project_info": project_info,
+        "recommendation": recommendation,
+        "recommendation_text": recommendation_text,
+        "spec_urls": spec_urls,
+        "specs_generated": list(specs.keys()),
+        "dockerfile_validation": (
+            json.loads(specs["dockerfile_findings"])["summary"] if specs.get("dockerfile_findings") else None
+        ),
+        "tree_fetch": tree_info,
+        "blob_cache": blob_cache.stats(),
+        "structured_output": {
+            "enabled": settings["structured_output"],
+            "repaired_sections": repaired_sections,
+            **spec_schema.stats()
+        },
+        "cache": {
+            "status": cache_status,
+            "key": cache_key
+        },
+        "spec_parse": parse_log.summary(),
+        "templates": {"version": template_registry.version(), **template_registry.stats()},
+
+        # GitHub Actions가 바로 사용할 수 있는 정보
+        "deployment_config": {
+            "cpu": sizing["cpu"],
+            "memory": sizing["memory"],
+            "desired_count": sizing["desired_count"],
+            "min_capacity": sizing["min_capacity"],
+            "max_capacity": sizing["max_capacity"],
+            "cpu_target_value": sizing["cpu_target_value"],
+            "memory_target_value": sizing["memory_target_value"],
+            "port": project_info.get("app_port", 8000),
+            "runtime": project_info.get("runtime", "python:3.11-slim"),
+            # docker build context (monorepo service root)
+            "build_context": (service or {}).get("root") or ".",
+            "build_command": _get_build_command(project_info, install_plan),
+            "start_command": _get_start_command(project_info),
+            "estimated_image_size_mb": build_estimate["image_size_mb"],
+            "estimated_build_seconds": build_estimate["build_seconds"]
+        },
+        "build_estimate": build_estimate,
+        "resource_sizing": sizing,
+        "install_plan": lockfile_resolver.summary(install_plan),
+        "token_usage": token_usage,
+
+        # S3에서 다운로드할 파일 경로 (실제 업로드된 key; bundle 하나에 전체 spec + manifest.json)
+        "download_urls": {
+            "bundle": artifact_summary["bundle"],
+            "dockerfile": spec_urls.get("dockerfile"),
+            "terraform_vars": spec_urls.get("terraform_tfvars"),
+            "appspec": spec_urls.get("appspec")
+        },
+        "artifacts": artifact_summary,
+
+        "execution_mode": execution_mode,
+        "analysis_path": analysis_path,
+        "stage_timings_ms": timer.timings_ms,
+
+        "status": "success"
+    }
+    if service is not None:
+        result["service"] = {**service, "tree_sha": tree_info.get("root_tree_sha")}
+    return result
 
-        # Step 3: Determine recommendation
-        confidence = project_info.get("confidence", "medium")
-        has_dockerfile = bool(specs.get("dockerfile"))
 
-        if confidence == "high" and has_dockerfile:
-            recommendation = "auto-apply"
-            recommendation_text = f"✅ High confidence detection: {project_info.get('primary_language')} with {project_info.get('primary_framework', 'standard')} framework. Ready for deployment."
-        elif confidence == "medium":
-            recommendation = "review-recommended"
-            recommendation_text = f"⚠️ Medium confidence detection. Please review generated specs before deployment."
-        else:
-            recommendation = "manual-review"
-            recommendation_text = f"🔍 Low confidence or unknown project type. Manual review required."
-
-        # Step 4: Store analysis results
-        print("💾 Storing analysis results...")
-        _store_analysis_results(
-            ai_analysis_table, analysis_id, repository, commit_sha,
-            project_info, specs, recommendation
+def _analyze_items(
+    items: List[Dict[str, Any]],
+    analysis_ids: List[str],
+    settings: Dict[str, Any],
+    api_key: str,
+    registry: deployment_index.DeploymentRegistry,
+    timer: StageTimer,
+    max_concurrency: int,
+    sources: Optional[List[Optional[Tuple[List[str], str, Dict[str, Any], Dict[str, str]]]]] = None
+) -> List[Dict[str, Any]]:
+    """
+    여러 항목을 bounded concurrency로 분석 (partial failure, 실패 항목은 error result).
+    배포 목록(registry)은 공유하고, DynamoDB 기록은 batch_write_item으로 모은 뒤 기록된 항목만 index에 반영합니다.
+    sources[index]가 있으면 GitHub 조회 대신 그 파일 목록을 사용 (monorepo service).
+    """
+    writes = WriteBuffer()
+
+    def _run_item(index: int) -> Dict[str, Any]:
+        item_start = time.perf_counter()
+        item_timer = StageTimer()
+        result = _analyze_repository(
+            items[index], analysis_ids[index], settings, api_key, item_timer, item_start, registry, writes,
+            source=sources[index] if sources else None
         )
+        item_timer.record("total", item_start)
+        return result
 
-        # Step 5: Upload specs to S3
-        print("☁️ Uploading specs to S3...")
-        spec_urls = _upload_specs_to_s3(s3_bucket, analysis_id, specs)
+    with timer.stage("analysis"):
+        results, errors = run_parallel(
+            {str(index): (lambda index=index: _run_item(index)) for index in range(len(items))},
+            max_workers=max_concurrency
+        )
 
-        # Step 6: Prepare response for GitHub Actions
-        result = {
-            "analysis_id": analysis_id,
+    # 분석 결과/캐시 항목을 batch_write_item으로 기록하고, 기록된 항목만 index에 반영
+    with timer.stage("batch_write"):
+        failed_writes = writes.flush(get_resource("dynamodb")) if len(writes) else set()
+        summaries = [
+            _deployment_summary(
+                result["deployment_name"], result["analysis_id"], result["project_info"], result["resource_sizing"]
+            )
+            for result in results.values()
+            if result["analysis_id"] not in failed_writes
+        ]
+        if summaries:
+            try:
+                index_table = get_resource("dynamodb").Table(settings["ai_analysis_table"])
+                deployment_index.record_deployments(index_table, summaries, _index_backfill(index_table))
+            except Exception as e:
+                print(f"⚠️ Error updating deployment index: {e}")
+
+    item_results = []
+    for index, item in enumerate(items):
+        key = str(index)
+        if key in results and analysis_ids[index] not in failed_writes:
+            item_results.append(results[key])
+            continue
+
+        error = errors.get(key) or RuntimeError("Failed to store analysis results")
+        name = _deployment_name(item.get("repository", "unknown/repo"), item.get("service"))
+        print(f"❌ ERROR analyzing {name}: {error}")
+        error_result = {
+            "analysis_id": analysis_ids[index],
+            "repository": item.get("repository", "unknown/repo"),
+            "commit_sha": item.get("commit_sha", "unknown"),
+            "status": "error",
+            "error": str(error),
+            "error_type": type(error).__name__
+        }
+        if item.get("service"):
+            error_result["service"] = item["service"]
+        item_results.append(error_result)
+    return item_results
+
+
+def _handle_batch(
+    event: Dict[str, Any],
+    settings: Dict[str, Any],
+    api_key: str,
+    cold_start: bool,
+    secret_stats_before: Dict[str, int],
+    invocation_start: float
+) -> Dict[str, Any]:
+    """
+    여러 repository를 한 invocation에서 분석 (bounded concurrency, partial failure).
+    배포 목록/HTTP pool/secret은 공유하고, DynamoDB 기록은 batch_write_item으로 모읍니다.
+    """
+    timer = StageTimer()
+    # batch 밖의 필드(execution_mode, force_refresh 등)는 모든 항목의 기본값
+    defaults = {k: v for k, v in event.items() if k not in ("batch", "max_concurrency")}
+    items = [{**defaults, **item} for item in event["batch"]]
+    analysis_ids = [_resolve_analysis_id(item) for item in items]
+    max_concurrency = max(1, int(event.get("max_concurrency") or os.getenv("BATCH_MAX_CONCURRENCY", "4")))
+
+    print(f"📚 Batch analysis: {len(items)} repositories (max_concurrency={max_concurrency})")
+
+    with timer.stage("existing_deployments"):
+        registry = deployment_index.DeploymentRegistry(
+            _get_existing_deployments(settings["ai_analysis_table"])
+        )
+
+    item_results = _analyze_items(items, analysis_ids, settings, api_key, registry, timer, max_concurrency)
+
+    failed = sum(1 for result in item_results if result["status"] == "error")
+    if not failed:
+        status = "success"
+    elif failed < len(items):
+        status = "partial_failure"
+    else:
+        status = "error"
+    timer.record("total", invocation_start)
+
+    print(f"✅ Batch complete: {len(items) - failed} succeeded, {failed} failed")
+    _export_history(settings, item_results)
+
+    return {
+        "statusCode": 500 if status == "error" else 200,
+        "body": json.dumps({
+            "status": status,
+            "total": len(items),
+            "succeeded": len(items) - failed,
+            "failed": failed,
+            "results": item_results,
+            "stage_timings_ms": timer.timings_ms,
+            "http_pool": http_session.stats(),
+            "runtime_stats": _runtime_stats(cold_start, secret_stats_before)
+        }, default=str)
+    }
+
+
+def _handle_monorepo(
+    event: Dict[str, Any],
+    settings: Dict[str, Any],
+    api_key: str,
+    cold_start: bool,
+    secret_stats_before: Dict[str, int],
+    invocation_start: float
+) -> Dict[str, Any]:
+    """
+    monorepo: 배포 단위(service)를 찾아서 service마다 spec bundle을 생성 (batch와 같은 병렬 분석).
+    포트는 기존 배포 + 같은 repository의 다른 service와 겹치지 않게 등록됩니다.
+    subtree tree SHA가 이전 분석과 같은 service는 다시 분석하지 않고 이전 결과(analysis_path "unchanged")를 돌려줍니다.
+    """
+    timer = StageTimer()
+    repository = event.get("repository", "unknown/repo")
+    commit_sha = event.get("commit_sha", "unknown")
+    base_analysis_id = _resolve_analysis_id(event)
+    table = get_resource("dynamodb").Table(settings["ai_analysis_table"])
+    version = f"{PROMPT_VERSION}+{template_registry.version()}"
+    max_concurrency = max(1, int(event.get("max_concurrency") or os.getenv("BATCH_MAX_CONCURRENCY", "4")))
+
+    tasks: Dict[str, Callable[[], Any]] = {
+        "existing_deployments": lambda: _get_existing_deployments(settings["ai_analysis_table"]),
+        "previous": lambda: service_discovery.load_previous(table, repository),
+    }
+    if "github" in repository.lower():
+        print("📥 Fetching repository files from GitHub...")
+        tasks["github_fetch"] = lambda: _fetch_github_repo_info(repository, commit_sha, settings["s3_bucket"])
+    with timer.stage("prefetch"):
+        prefetched, prefetch_errors = run_parallel(tasks, timer=timer)
+
+    file_list = event.get("file_list") or []
+    readme_content = event.get("readme_content", "")
+    file_samples = event.get("file_samples") or {}
+    tree_info: Dict[str, Any] = {}
+    blobs: Dict[str, str] = {}
+    directories: Dict[str, str] = {}
+    if "github_fetch" in prefetched:
+        file_list, readme_content, tree_info, blobs, directories = prefetched["github_fetch"]
+    elif "github_fetch" in prefetch_errors:
+        print(f"⚠️ Could not fetch from GitHub: {prefetch_errors['github_fetch']}, using provided data")
+
+    with timer.stage("service_discovery"):
+        services = service_discovery.discover(file_list, file_samples)
+    roots = [svc["root"] for svc in services]
+    print(f"🧭 Discovered {len(services)} services: {', '.join(svc['root'] or '.' for svc in services)}")
+
+    # service 디렉터리의 README (없으면 repository README)
+    readme_paths = {
+        svc["root"]: path for svc in services for path in file_list
+        if svc["root"] and posixpath.dirname(path) == svc["root"]
+        and posixpath.basename(path).lower() in README_NAMES
+    }
+    readmes = {path: file_samples[path] for path in readme_paths.values() if path in file_samples}
+    if tree_info and len(readmes) < len(readme_paths):
+        with timer.stage("readme_fetch"):
+            readmes.update(_fetch_github_file_samples(
+                repository, commit_sha, [path for path in readme_paths.values() if path not in readmes], blobs,
+                settings["s3_bucket"] if settings["blob_cache_enabled"] else None
+            ))
+
+    registry = deployment_index.DeploymentRegistry(prefetched.get("existing_deployments", []))
+    previous = prefetched.get("previous", {})
+    defaults = {
+        k: v for k, v in event.items()
+        if k not in ("monorepo", "max_concurrency", "analysis_id", "file_list", "readme_content", "file_samples")
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+    items, analysis_ids, sources = [], [], []
+    for svc in services:
+        root = svc["root"]
+        tree_sha = directories.get(root)
+        deployment_name = _deployment_name(repository, svc)
+        last = previous.get(root) or {}
+        if (
+            not event.get("force_refresh") and tree_sha and last.get("tree_sha") == tree_sha
+            and last.get("version") == version
+            and _cached_result_usable(last, deployment_name, registry.snapshot())
+        ):
+            # 변경 없는 service: 포트만 등록해서 다시 분석하는 service가 피하도록 함
+            registry.claim(deployment_name, last["project_info"])
+            print(f"♻️ {deployment_name} unchanged since {str(last.get('commit_sha'))[:7]}, reusing {last['analysis_id']}")
+            results[root] = {
+                **last["summary"],
+                "analysis_id": last["analysis_id"],
+                "repository": repository,
+                "deployment_name": deployment_name,
+                "commit_sha": last.get("commit_sha"),
+                "project_info": last["project_info"],
+                "service": {**svc, "tree_sha": tree_sha},
+                "analysis_path": "unchanged",
+                "status": "success",
+            }
+            continue
+
+        service_files = list(service_discovery.subtree(dict.fromkeys(file_list), root, roots))
+        service_samples = service_discovery.subtree(
+            {path: content for path, content in file_samples.items() if path not in readmes}, root, roots
+        )
+        readme = readmes.get(readme_paths.get(root, ""), readme_content)
+        items.append({
+            **defaults,
+            "service": {"name": svc["name"], "root": root},
+            "file_list": service_files,
+            "readme_content": readme,
+            "file_samples": service_samples or None,
+        })
+        analysis_ids.append(f"{base_analysis_id}-{svc['name']}")
+        sources.append((
+            service_files, readme,
+            {**tree_info, "root_tree_sha": tree_sha, "service_root": root} if tree_sha else {},
+            service_discovery.subtree(blobs, root, roots)
+        ))
+
+    analyzed = []
+    if items:
+        print(f"📚 Analyzing {len(items)} changed services (max_concurrency={max_concurrency})")
+        analyzed = _analyze_items(items, analysis_ids, settings, api_key, registry, timer, max_concurrency, sources)
+        for item, result in zip(items, analyzed):
+            results[item["service"]["root"]] = result
+
+    if directories:
+        entries = {
+            root: (
+                previous[root] if result["analysis_path"] == "unchanged"
+                else service_discovery.build_entry(result, directories[root], version)
+            )
+            for root, result in results.items()
+            if result["status"] == "success" and root in directories
+        }
+        service_discovery.record(table, repository, commit_sha, entries)
+
+    service_results = [results[root] for root in roots]
+    failed = sum(1 for result in service_results if result["status"] == "error")
+    if not failed:
+        status = "success"
+    elif failed < len(service_results):
+        status = "partial_failure"
+    else:
+        status = "error"
+    timer.record("total", invocation_start)
+
+    print(
+        f"✅ Monorepo analysis complete: {len(items)} analyzed, "
+        f"{len(services) - len(items)} unchanged, {failed} failed"
+    )
+    _export_history(settings, analyzed)
+
+    return {
+        "statusCode": 500 if status == "error" else 200,
+        "body": json.dumps({
+            "status": status,
+            "analysis_id": base_analysis_id,
             "repository": repository,
             "commit_sha": commit_sha,
-            "branch": branch,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "project_info": project_info,
-            "recommendation": recommendation,
-            "recommendation_text": recommendation_text,
-            "spec_urls": spec_urls,
-            "specs_generated": list(specs.keys()),
-
-            # GitHub Actions가 바로 사용할 수 있는 정보
-            "deployment_config": {
-                "cpu": _get_cpu_from_complexity(project_info.get("deployment_complexity", "moderate")),
-                "memory": _get_memory_from_complexity(project_info.get("deployment_complexity", "moderate")),
-                "port": project_info.get("app_port", 8000),
-                "runtime": project_info.get("runtime", "python:3.11-slim"),
-                "build_command": _get_build_command(project_info),
-                "start_command": _get_start_command(project_info)
-            },
-
-            # S3에서 다운로드할 파일 경로
-            "download_urls": {
-                "dockerfile": f"s3://{s3_bucket}/analysis/{analysis_id}/dockerfile",
-                "terraform_vars": f"s3://{s3_bucket}/analysis/{analysis_id}/terraform.tfvars",
-                "appspec": f"s3://{s3_bucket}/analysis/{analysis_id}/appspec.yaml"
-            },
-
-            "status": "success"
+            "total": len(services),
+            "analyzed": len(items),
+            "unchanged": len(services) - len(items),
+            "failed": failed,
+            "services": service_results,
+            "tree_fetch": tree_info,
+            "stage_timings_ms": timer.timings_ms,
+            "http_pool": http_session.stats(),
+            "runtime_stats": _runtime_stats(cold_start, secret_stats_before)
+        }, default=str)
+    }
+
+
+def _process_job_messages(
+    event: Dict[str, Any],
+    settings: Dict[str, Any],
+    api_key: str,
+    cold_start: bool,
+    secret_stats_before: Dict[str, int],
+    context: Any = None
+) -> Dict[str, Any]:
+    """
+    SQS event source로 들어온 async job 처리.
+    실패한 메시지만 batchItemFailures로 돌려줘서 SQS가 재시도하고,
+    마지막 시도까지 실패하면 상태를 failed로 남깁니다 (메시지는 redrive로 DLQ).
+    """
+    table = get_resource("dynamodb").Table(settings["ai_analysis_table"])
+    failures = []
+
+    for record in event["Records"]:
+        message_id = record.get("messageId")
+        attempt = int((record.get("attributes") or {}).get("ApproximateReceiveCount", 1))
+        try:
+            job_event = jobs.load_message(record["body"], get_client("s3"), settings["s3_bucket"])
+        except Exception as e:
+            print(f"❌ Unreadable job message {message_id}: {e}")
+            failures.append({"itemIdentifier": message_id})
+            continue
+
+        analysis_id = _resolve_analysis_id(job_event)
+        # SQS는 at-least-once: 이미 완료된 job의 중복 전달은 건너뜀
+        try:
+            current = jobs.read(table, analysis_id)
+        except Exception as e:
+            print(f"⚠️ Could not read job status {analysis_id}: {e}")
+            current = None
+        if current and current["status"] == "completed":
+            print(f"⏭️ Job {analysis_id} already completed, skipping duplicate delivery")
+            continue
+
+        print(f"📬 Processing job {analysis_id} (attempt {attempt}/{settings['job_max_attempts']})")
+        progress = jobs.ProgressReporter(table, analysis_id)
+        progress.start(attempt)
+        job_start = time.perf_counter()
+        timer = StageTimer()
+        try:
+            result = _run_single_flight(
+                job_event, analysis_id, settings,
+                lambda: _analyze_repository(
+                    job_event, analysis_id, settings, api_key, timer, job_start, progress=progress
+                ),
+                context
+            )
+            result["http_pool"] = http_session.stats()
+            result["runtime_stats"] = _runtime_stats(cold_start, secret_stats_before)
+            timer.record("total", job_start)
+            progress.complete(result)
+            print(f"✅ Job {analysis_id} complete ({result['analysis_path']})")
+            _export_history(settings, [result])
+        except Exception as e:
+            print(f"❌ ERROR during job {analysis_id}: {e}")
+            traceback.print_exc()
+            will_retry = attempt < settings["job_max_attempts"]
+            progress.fail(e, will_retry)
+            timer.record("total", job_start)
+            _export_history(settings, [{
+                "analysis_id": analysis_id,
+                "repository": job_event.get("repository", "unknown/repo"),
+                "commit_sha": job_event.get("commit_sha", "unknown"),
+                "status": "error",
+                "error": str(e),
+                "error_type": type(e).__name__,
+                "stage_timings_ms": timer.timings_ms
+            }])
+            if will_retry:
+                failures.append({"itemIdentifier": message_id})
+
+    return {"batchItemFailures": failures}
+
+
+def lambda_handler(event, context):
+    """
+    Main Lambda handler for AI Code Analyzer
+
+    Analyzes ANY project type and generates deployment specifications.
+
+    Event format:
+    {
+        "repository": "owner/repo",
+        "commit_sha": "abc123",
+        "branch": "main",
+        "pusher": "username",
+        "timestamp": "2025-01-01T00:00:00Z",
+        "file_list": ["file1.py", "file2.js", ...],  # Optional
+        "readme_content": "...",  # Optional
+        "file_samples": {"main.py": "content..."},  # Optional
+        "force_refresh": false,  # Optional, bypass the analysis cache
+        "force_llm": false,  # Optional, skip the rule-based fast path
+        "token_budget": 300000,  # Optional, daily per-repository token budget (LLM_REPO_DAILY_TOKEN_BUDGET, 0 = unlimited)
+        "execution_mode": "concurrent",  # Optional, "concurrent" | "streaming" | "serial"
+        "async": false,  # Optional, enqueue to ANALYSIS_QUEUE_URL and return the analysis_id immediately (202)
+        "monorepo": false  # Optional, one spec bundle per discovered service (runs synchronously, see below)
+    }
+
+    Monorepo mode discovers deployable roots (Dockerfile / runtime manifests) and analyzes them in parallel:
+    → {"services": [{"service": {"name", "root", "tree_sha"}, "deployment_name": "owner/repo/<root>",
+                     "analysis_id": "<id>-<service name>", "deployment_config": {..., "build_context": "<root>"}}, ...]}
+    Ports never conflict with existing deployments or sibling services. Services whose subtree tree SHA
+    is unchanged since the last run are not re-analyzed ("analysis_path": "unchanged", services#<repository> item).
+
+    Concurrent invocations for the same repository/commit_sha share one analysis (SINGLE_FLIGHT_ENABLED):
+    the first takes a lease#<repository>#<commit_sha> item, later ones wait up to
+    SINGLE_FLIGHT_MAX_WAIT_SECONDS and return the leader's result with "single_flight": {"role": "follower"}.
+
+    Async job status (poll after "async": true; reads one small status item):
+    {
+        "action": "job_status",
+        "analysis_id": "..."
+    }
+    → {"status": "queued" | "running" | "retrying" | "completed" | "failed",
+       "stage": "queued" | "fetch" | "analyze" | "generate" | "upload", "stages": {...}, "result": {...}}
+
+    SQS event source records (ANALYSIS_QUEUE_URL) are processed as async jobs and
+    return {"batchItemFailures": [...]} (ReportBatchItemFailures).
+
+    Build metrics (actual image size / build time reported by CI, used to calibrate estimates):
+    {
+        "action": "record_build_metrics",
+        "analysis_id": "...",
+        "image_size_mb": 412.5,
+        "build_seconds": 96
+    }
+
+    Utilization samples (deployed service metrics, used to right-size the next analysis):
+    {
+        "action": "record_utilization",
+        "repository": "owner/repo",
+        "samples": [{"cpu": 512, "memory": 1024, "task_count": 2, "cpu_utilization": 31.5,
+                     "memory_utilization": 24.0, "latency_p95_ms": 180}, ...]
+    }
+
+    History compaction (daily, e.g. from an EventBridge schedule; merges one day's part files):
+    {
+        "action": "compact_history",
+        "date": "2025-01-31",  # Optional, defaults to yesterday (UTC)
+        "format": "parquet"  # Optional, HISTORY_COMPACT_FORMAT; falls back to jsonl.gz without pyarrow
+    }
+
+    Batch format (one invocation, shared deployment index / HTTP pool):
+    {
+        "batch": [{"repository": "owner/repo", "commit_sha": "abc123"}, ...],
+        "max_concurrency": 4,  # Optional, BATCH_MAX_CONCURRENCY
+        ...  # other fields are defaults for every item
+    }
+    """
+    timer = StageTimer()
+    invocation_start = time.perf_counter()
+
+    print("🌸 AI Code Analyzer invoked")
+    print(f"Event: {json.dumps(event, default=str)}")
+
+    if event.get("action") == "record_build_metrics":
+        return _record_build_metrics(event)
+    if event.get("action") == "record_utilization":
+        return _record_utilization(event)
+    if event.get("action") == "compact_history":
+        return _compact_history(event)
+    if event.get("action") == "job_status":
+        return _job_status(event)
+    if event.get("async") and not _is_sqs_event(event) and not event.get("monorepo"):
+        return _enqueue_analysis(event)
+
+    cold_start = _consume_cold_start()
+    secret_stats_before = secrets.stats()
+
+    # Use direct OpenAI API instead of letsur endpoint
+    # Get OpenAI API key from SSM Parameter Store (cached while the container is warm)
+    api_key = _get_secret_from_ssm(OPENAI_API_KEY_PARAM, OPENAI_API_KEY_REGION)
+    if not api_key:
+        print(f"❌ ERROR: Failed to get OpenAI API key from SSM")
+
+    if not api_key:
+        print("❌ ERROR: OpenAI API key not configured")
+        if _is_sqs_event(event):
+            # SQS 메시지가 삭제되지 않도록 batch 전체를 실패 처리
+            raise RuntimeError("API key not configured")
+        return {
+            "statusCode": 500,
+            "body": json.dumps({"error": "API key not configured"})
         }
 
+    settings = _analyzer_settings()
+    print(
+        f"✅ OpenAI API configured (base_url={settings['base_url']}, "
+        f"analysis={settings['analysis_model']}, generation={settings['model']})"
+    )
+
+    if _is_sqs_event(event):
+        return _process_job_messages(event, settings, api_key, cold_start, secret_stats_before, context)
+
+    if isinstance(event.get("batch"), list):
+        return _handle_batch(event, settings, api_key, cold_start, secret_stats_before, invocation_start)
+
+    if event.get("monorepo"):
+        return _handle_monorepo(event, settings, api_key, cold_start, secret_stats_before, invocation_start)
+
+    repository = event.get("repository", "unknown/repo")
+    commit_sha = event.get("commit_sha", "unknown")
+    analysis_id = _resolve_analysis_id(event)
+    print(f"📝 Using analysis_id: {analysis_id}")
+
+    try:
+        result = _run_single_flight(
+            event, analysis_id, settings,
+            lambda: _analyze_repository(event, analysis_id, settings, api_key, timer, invocation_start),
+            context
+        )
+        result["http_pool"] = http_session.stats()
+        result["runtime_stats"] = _runtime_stats(cold_start, secret_stats_before)
+        timer.record("total", invocation_start)
+
         print(f"✅ Analysis complete!")
         print(f"📊 Results: {json.dumps(result, indent=2, default=str)}")
+        _export_history(settings, [result])
 
         return {
             "statusCode": 200,
@@ -1058,17 +2780,26 @@ Server runs on port 8000.
 
     except Exception as e:
         print(f"❌ ERROR during analysis: {e}")
-        import traceback
         traceback.print_exc()
 
+        error_result = {
+            "analysis_id": analysis_id,
+            "repository": repository,
+            "commit_sha": commit_sha,
+            "status": "error",
+            "error": str(e),
+            "error_type": type(e).__name__
+        }
+        timer.record("total", invocation_start)
+        _export_history(settings, [{**error_result, "stage_timings_ms": timer.timings_ms}])
+
         return {
             "statusCode": 500,
-            "body": json.dumps({
-                "analysis_id": analysis_id,
-                "repository": repository,
-                "commit_sha": commit_sha,
-                "status": "error",
-                "error": str(e),
-                "error_type": type(e).__name__
-            })
+            "body": json.dumps(error_result)
         }
+
+
+_cold_start = True
+
+# handler 모듈 전체 import 시간 (cold start 측정용)
+IMPORT_TIME_MS = round((time.perf_counter() - _MODULE_LOAD_START) * 1000, 1)
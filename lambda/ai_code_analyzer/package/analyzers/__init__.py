@@ -1,3 +0,0 @@
-"""
-Project analyzers using GPT-5
-"""
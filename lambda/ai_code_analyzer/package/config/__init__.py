@@ -1,3 +0,0 @@
-"""
-Configuration module for Lambda AI Analyzer
-"""
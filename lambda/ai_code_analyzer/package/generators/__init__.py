@@ -1,3 +0,0 @@
-"""
-Generators for deployment specifications
-"""
@@ -1,3 +0,0 @@
-"""
-Templates for deployment specifications
-"""
@@ -0,0 +1,8 @@
+"""
+Offline replay harness for the analyzer pipeline
+lambda_handler를 local stand-in(S3/DynamoDB/SSM, OpenAI/GitHub HTTP) 위에서 실행합니다.
+Lambda 패키지(build.sh)에는 포함되지 않습니다.
+
+    python -m replay.record event.json --out fixtures/replay/my-repo.json   # 실제 OpenAI/GitHub 응답 녹화
+    python -m replay.bench --iterations 10                                    # test-repos + 녹화 fixture benchmark
+"""
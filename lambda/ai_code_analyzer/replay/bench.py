@@ -0,0 +1,101 @@
+"""
+Analyzer pipeline benchmark
+    python -m replay.bench                                   # 전체 corpus, 5회씩
+    python -m replay.bench --scenario fastapi --stages       # stage별 p50 표
+    python -m replay.bench --save /tmp/base.json             # 기준값 저장
+    python -m replay.bench --compare /tmp/base.json          # 기준 대비 wall p50이 threshold 이상 느려지면 exit 1
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+from replay import corpus
+from replay.runner import run_scenario
+
+# 이보다 작은 차이는 noise로 보고 regression으로 치지 않음
+NOISE_FLOOR_MS = 1.0
+
+
+def _print_summary(results: List[Dict[str, Any]], show_stages: bool) -> None:
+    header = f"{'scenario':<28} {'path':<9} {'wall p50':>9} {'p95':>9} {'parse':>7} {'peak KiB':>9} {'tokens':>7} {'http':>5}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        status = result["analysis_path"] if result["status"] == "success" else "ERROR"
+        print(
+            f"{result['name']:<28} {str(status):<9} {result['wall_ms']['p50']:>9.2f} {result['wall_ms']['p95']:>9.2f} "
+            f"{result['parse_ms']:>7.3f} {result.get('alloc_peak_kib', 0):>9.1f} {result['tokens']:>7} "
+            f"{result['http']['requests']:>5}"
+        )
+        if result["status"] != "success":
+            print(f"    error: {result['error']}")
+        if show_stages:
+            for stage, ms in sorted(result["stages_ms"].items(), key=lambda item: -item[1]):
+                print(f"    {stage:<40} {ms:>9.2f}")
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """기준 대비 느려진 scenario (wall p50, stage p50)"""
+    regressions = []
+    for result in results:
+        base = baseline.get(result["name"])
+        if not base:
+            continue
+        pairs = [("wall", base["wall_ms"]["p50"], result["wall_ms"]["p50"])] + [
+            (stage, base["stages_ms"][stage], ms)
+            for stage, ms in result["stages_ms"].items()
+            if stage in base.get("stages_ms", {})
+        ]
+        for label, before, after in pairs:
+            if after - before > max(NOISE_FLOOR_MS, before * threshold):
+                regressions.append(f"{result['name']} {label}: {before:.2f} → {after:.2f} ms")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay the analyzer against local stand-ins and report timings")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--scenario", help="substring filter on scenario names")
+    parser.add_argument("--fixtures", default=corpus.FIXTURES_DIR, help="recorded fixture directory")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="simulated latency per synthetic LLM call")
+    parser.add_argument("--no-allocations", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--stages", action="store_true", help="print per-stage p50")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--save", help="write results to this file (baseline for --compare)")
+    parser.add_argument("--compare", help="baseline file from --save")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown ratio for --compare")
+    args = parser.parse_args()
+
+    scenarios = corpus.corpus(args.scenario, args.fixtures)
+    if not scenarios:
+        parser.error("no scenarios matched")
+
+    results = [
+        run_scenario(scenario, args.iterations, args.llm_latency_ms, not args.no_allocations)
+        for scenario in scenarios
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        _print_summary(results, args.stages)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({result["name"]: result for result in results}, f, indent=2)
+
+    failed = [result["name"] for result in results if result["status"] != "success"]
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for line in regressions:
+            print(f"⚠️ regression: {line}")
+
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
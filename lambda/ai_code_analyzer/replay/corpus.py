@@ -0,0 +1,147 @@
+"""
+Replay corpus
+test-repos/ 의 세 프로젝트로 만든 합성 시나리오와 fixtures/replay/*.json 녹화 fixture를 같은 형식으로 다룹니다.
+
+scenario / fixture 형식:
+{
+    "name": "fastapi/llm-streaming",
+    "event": {...},                       # lambda_handler event
+    "tables": {"<table>": {"<analysis_id>": {...}}},   # 실행 전 DynamoDB 상태 (선택)
+    "http": [{"method", "url", "fingerprint", "shape", "status", "headers", "body" | "lines"}],  # 녹화 응답 (선택)
+    "synthetic": {"repository_dir": "...", "github": true, "llm": true},   # 합성 응답 (선택)
+    "env": {"STRUCTURED_OUTPUT_ENABLED": "false"},   # 실행 동안 적용할 handler 설정 환경변수 (선택)
+    "warmup": 1,
+    "duplicates": 2                       # 같은 event를 analysis_id만 바꿔 동시에 실행 (선택)
+}
+"""
+import glob
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+LAMBDA_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(os.path.dirname(LAMBDA_ROOT))
+TEST_REPOS_DIR = os.path.join(REPO_ROOT, "test-repos")
+FIXTURES_DIR = os.path.join(LAMBDA_ROOT, "fixtures", "replay")
+
+TEST_REPOS = {
+    "fastapi": "fastapi-deploy-test",
+    "express": "express-todo-deploy-test",
+    "streamlit": "streamlit-calculator-deploy-test",
+}
+
+# 정적 asset 등은 event에 sample로 넣지 않음 (GitHub Actions workflow와 동일)
+SAMPLE_EXTENSIONS = (".py", ".js", ".ts", ".json", ".txt", ".toml", ".lock", ".yaml", ".yml", ".mod", ".sum")
+MAX_SAMPLE_CHARS = 20000
+
+
+def read_repository(directory: str) -> Dict[str, str]:
+    """directory의 text 파일 {relative path: content}"""
+    files = {}
+    for root, dirs, names in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d not in ("node_modules", "__pycache__"))
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    files[os.path.relpath(path, directory).replace(os.sep, "/")] = f.read()
+            except (UnicodeDecodeError, OSError):
+                continue
+    return files
+
+
+def _event(repository: str, files: Dict[str, str], **extra: Any) -> Dict[str, Any]:
+    readme = next((content for path, content in files.items() if path.lower() == "readme.md"), "")
+    return {
+        "repository": repository,
+        "commit_sha": "0" * 40,
+        "branch": "main",
+        "file_list": list(files),
+        "readme_content": readme,
+        "file_samples": {
+            path: content[:MAX_SAMPLE_CHARS] for path, content in files.items()
+            if path.endswith(SAMPLE_EXTENSIONS) and path.lower() != "readme.md"
+        },
+        **extra
+    }
+
+
+def test_repo_scenarios(test_repos_dir: str = TEST_REPOS_DIR) -> List[Dict[str, Any]]:
+    """
+    프로젝트마다: rule fast path, LLM 경로 3가지 실행 모드 + 구분자 응답 형식, async job (enqueue → SQS → status),
+    같은 commit 동시 호출 (single-flight), 캐시 hit, 합성 GitHub API를 거치는 전체 경로
+    """
+    scenarios = []
+    for short, directory in TEST_REPOS.items():
+        path = os.path.join(test_repos_dir, directory)
+        if not os.path.isdir(path):
+            continue
+        files = read_repository(path)
+        synthetic = {"repository_dir": path}
+        repository = f"replay/{directory}"
+
+        scenarios.append({
+            "name": f"{short}/rule",
+            "event": _event(repository, files, force_refresh=True),
+            "synthetic": synthetic,
+        })
+        for mode in ("serial", "concurrent", "streaming"):
+            scenarios.append({
+                "name": f"{short}/llm-{mode}",
+                "event": _event(repository, files, force_refresh=True, force_llm=True, execution_mode=mode),
+                "synthetic": {**synthetic, "llm": True},
+            })
+        scenarios.append({
+            "name": f"{short}/llm-delimited",
+            "event": _event(repository, files, force_refresh=True, force_llm=True, execution_mode="serial"),
+            "synthetic": {**synthetic, "llm": True},
+            # json_schema 대신 ---SECTION--- 구분자 응답 (SpecIndex 파싱 경로)
+            "env": {"STRUCTURED_OUTPUT_ENABLED": "false"},
+        })
+        scenarios.append({
+            "name": f"{short}/async",
+            "event": _event(repository, files, force_refresh=True, force_llm=True, **{"async": True}),
+            "synthetic": {**synthetic, "llm": True},
+        })
+        scenarios.append({
+            "name": f"{short}/duplicate",
+            "event": _event(repository, files, force_refresh=True, force_llm=True),
+            "synthetic": {**synthetic, "llm": True},
+            # 같은 commit 동시 호출 2개: LLM 호출은 한 번만 나가야 함
+            "duplicates": 2,
+        })
+        scenarios.append({
+            "name": f"{short}/cache-hit",
+            "event": _event(repository, files, force_llm=True),
+            "synthetic": {**synthetic, "llm": True},
+            # 첫 실행(miss)으로 캐시를 채우고 이후 hit만 측정
+            "warmup": 1,
+        })
+        # "github"가 이름에 있으면 handler가 trees/readme/contents API로 파일을 가져옴
+        scenarios.append({
+            "name": f"{short}/github-rule",
+            "event": {
+                "repository": f"replay-github/{directory}", "commit_sha": "0" * 40, "branch": "main",
+                "force_refresh": True
+            },
+            "synthetic": {**synthetic, "github": True},
+        })
+    return scenarios
+
+
+def load_fixtures(fixtures_dir: str = FIXTURES_DIR) -> List[Dict[str, Any]]:
+    """녹화된 fixture (python -m replay.record)"""
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            fixture = json.load(f)
+        fixture.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+        fixtures.append(fixture)
+    return fixtures
+
+
+def corpus(name_filter: Optional[str] = None, fixtures_dir: str = FIXTURES_DIR) -> List[Dict[str, Any]]:
+    scenarios = test_repo_scenarios() + load_fixtures(fixtures_dir)
+    if name_filter:
+        scenarios = [s for s in scenarios if name_filter in s["name"]]
+    return scenarios
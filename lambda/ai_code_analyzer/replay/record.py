@@ -0,0 +1,109 @@
+"""
+Record a replay fixture
+실제 OpenAI/GitHub로 event 하나를 실행하면서 HTTP 응답을 fixture로 저장합니다.
+AWS는 local stand-in을 쓰므로 실제 테이블/bucket에는 쓰지 않습니다. 배포 index는 --seed-table로
+실제 테이블에서 읽기 전용으로 가져올 수 있습니다 (충돌 회피 프롬프트가 같아지도록).
+
+    OPENAI_API_KEY=sk-... GITHUB_TOKEN=... python -m replay.record event.json \\
+        --out fixtures/replay/my-repo.json [--seed-table delightful-deploy-ai-analysis]
+
+Authorization 헤더와 prompt 본문은 저장하지 않습니다 (fingerprint와 요청 형태만).
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+from analyzers import deployment_index
+from clients import http_session
+from replay.stubs import StubResponse, plain, request_fingerprint, request_shape
+
+# 재생에 필요한 응답 헤더만
+KEPT_HEADERS = ("Content-Type", "Retry-After")
+
+
+class Recorder:
+    """실제 http_session.request를 감싸서 응답을 exchanges에 기록"""
+
+    def __init__(self, real_request):
+        self.real_request = real_request
+        self.exchanges: List[Dict[str, Any]] = []
+
+    def request(self, method: str, url: str, **kwargs) -> StubResponse:
+        payload = kwargs.get("json")
+        response = self.real_request(method, url, **kwargs)
+        exchange = {
+            "method": method,
+            "url": url,
+            "fingerprint": request_fingerprint(method, url, payload),
+            "shape": request_shape(url, payload),
+            "status": response.status_code,
+            "headers": {k: response.headers[k] for k in KEPT_HEADERS if k in response.headers},
+        }
+        # stream 응답은 전부 읽어서 line 단위로 저장하고, 호출자에게는 같은 line을 돌려줌
+        if kwargs.get("stream"):
+            with response:
+                exchange["lines"] = list(response.iter_lines(decode_unicode=True))
+        else:
+            exchange["body"] = response.text
+        self.exchanges.append(exchange)
+        return StubResponse(exchange["status"], exchange.get("body", ""), exchange["headers"],
+                            exchange.get("lines"), url=url)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record OpenAI/GitHub responses for one analyzer event")
+    parser.add_argument("event", help="lambda_handler event JSON file")
+    parser.add_argument("--out", required=True, help="fixture path (e.g. fixtures/replay/<name>.json)")
+    parser.add_argument("--name", help="scenario name (default: file name)")
+    parser.add_argument("--seed-table", help="read the active deployments index from this real table")
+    args = parser.parse_args()
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        parser.error("OPENAI_API_KEY is required to record")
+
+    with open(args.event) as f:
+        event = json.load(f)
+
+    tables: Dict[str, Dict[str, Any]] = {}
+    if args.seed_table:
+        from clients.aws import get_resource
+        item = get_resource("dynamodb").Table(args.seed_table).get_item(
+            Key={"analysis_id": deployment_index.INDEX_ITEM_KEY}
+        ).get("Item")
+        if item:
+            tables[args.seed_table] = {deployment_index.INDEX_ITEM_KEY: plain(item)}
+
+    from replay.runner import Harness
+    import handler
+
+    scenario = {
+        "name": args.name or os.path.splitext(os.path.basename(args.out))[0],
+        "event": {**event, "force_refresh": True},
+        "tables": tables,
+    }
+    harness = Harness(scenario)
+    harness.aws.ssm.parameters[handler.OPENAI_API_KEY_PARAM] = api_key
+    if os.getenv("GITHUB_TOKEN"):
+        harness.aws.ssm.parameters[handler.GITHUB_TOKEN_PARAM] = os.environ["GITHUB_TOKEN"]
+
+    recorder = Recorder(http_session.request)
+    # HTTPStandIn 대신 recorder를 설치 (녹화 중에는 실제 요청)
+    harness.http.request = recorder.request
+    body, wall_ms = harness.invoke()
+
+    if body.get("status") != "success":
+        print(f"❌ Analysis failed, fixture not written: {body.get('error')}")
+        sys.exit(1)
+
+    scenario["http"] = recorder.exchanges
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(scenario, f, indent=2, ensure_ascii=False)
+    print(f"✅ Recorded {len(recorder.exchanges)} HTTP exchanges ({body.get('analysis_path')}, {wall_ms:.0f} ms) → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
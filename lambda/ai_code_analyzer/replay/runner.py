@@ -0,0 +1,224 @@
+"""
+Scenario execution
+scenario 하나에 대해 stand-in을 구성하고 lambda_handler를 실행해서 stage timing/할당량/파싱 시간을 모읍니다.
+"""
+import contextlib
+import io
+import json
+import os
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+REPLAY_QUEUE_URL = "https://sqs.local/000000000000/replay-analysis-jobs"
+os.environ.setdefault("ANALYSIS_QUEUE_URL", REPLAY_QUEUE_URL)
+
+import handler  # noqa: E402
+from analyzers import rule_detector, single_flight, spec_parser  # noqa: E402
+from replay import corpus  # noqa: E402
+from replay.stubs import HTTPStandIn, LocalAWS, SyntheticGitHub, SyntheticOpenAI, dynamo_value  # noqa: E402
+
+REPLAY_API_KEY = "sk-replay"
+
+# 합성 응답은 ms 단위로 끝나므로 single-flight follower polling 간격도 줄임
+single_flight.POLL_INITIAL_SECONDS = 0.002
+
+
+def synthetic_llm_output(files: Dict[str, str]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    합성 OpenAI 응답 내용: rule 판별 결과를 project_info로, 템플릿 spec을 LLM 응답 본문으로 사용
+    (실제 응답과 비슷한 길이/구조로 파싱 경로를 통과시키기 위함)
+    """
+    file_list = list(files)
+    project_info = rule_detector.detect(file_list, files) or rule_detector.detect_basic(file_list, "replay")
+    project_info = {**project_info, "confidence": "high", "notes": "synthetic replay response"}
+    specs = handler._generate_rule_based_specs(project_info)
+    specs["dockerfile"] = f"```dockerfile\n{specs['dockerfile']}\n```"
+    specs["buildspec"] = specs["buildspec"] or "version: 0.2\nphases:\n  build:\n    commands:\n      - docker build -t app .\n"
+    specs["recommendations"] = f"# Deployment recommendations\n\n{specs['recommendations']}\n"
+    return project_info, specs
+
+
+class Harness:
+    """scenario 하나의 stand-in 묶음 (반복 실행 동안 DynamoDB/S3 상태 유지)"""
+
+    def __init__(self, scenario: Dict[str, Any], llm_latency_ms: float = 0.0):
+        self.scenario = scenario
+        tables = {
+            name: {key: dynamo_value(item) for key, item in items.items()}
+            for name, items in (scenario.get("tables") or {}).items()
+        }
+        self.aws = LocalAWS(tables, {handler.OPENAI_API_KEY_PARAM: REPLAY_API_KEY})
+        self.http = HTTPStandIn(scenario.get("http"))
+
+        synthetic = scenario.get("synthetic") or {}
+        if synthetic.get("repository_dir"):
+            files = corpus.read_repository(synthetic["repository_dir"])
+            if synthetic.get("llm"):
+                project_info, specs = synthetic_llm_output(files)
+                openai = SyntheticOpenAI(project_info, specs, handler.SPEC_SECTIONS, llm_latency_ms)
+                self.http.add_handler(lambda url: url.endswith("/chat/completions"), openai)
+            if synthetic.get("github"):
+                github = SyntheticGitHub(scenario["event"]["repository"], files, handler.GITHUB_API_BASE)
+                self.http.add_handler(github.handles, github)
+
+    def invoke(self, event: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], float]:
+        """lambda_handler 1회 (handler 로그는 버림). Returns (response body, wall ms)"""
+        event = event or self.scenario["event"]
+        with self._env():
+            if event.get("async"):
+                return self._invoke_async(event)
+            if self.scenario.get("duplicates"):
+                return self._invoke_duplicates(event, int(self.scenario["duplicates"]))
+            return self._invoke(event)
+
+    @contextlib.contextmanager
+    def _env(self):
+        """scenario의 env (handler 설정 환경변수)를 실행 동안만 적용"""
+        overrides = self.scenario.get("env") or {}
+        previous = {name: os.environ.get(name) for name in overrides}
+        os.environ.update(overrides)
+        try:
+            yield
+        finally:
+            for name, value in previous.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+    def _invoke(self, event: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+        with self.aws, self.http, contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            response = handler.lambda_handler(json.loads(json.dumps(event)), None)
+            wall_ms = (time.perf_counter() - start) * 1000
+        return json.loads(response["body"]), wall_ms
+
+
+    def _invoke_async(self, event: Dict[str, Any]) -> Tuple[Dict[str, Any], float]:
+        """
+        enqueue → local SQS로 job 처리 → job_status 조회.
+        stage_timings_ms는 세 호출 각각의 시간 (enqueue/status read가 CI가 기다리는 시간)
+        """
+        timings = {}
+
+        def _timed(name: str, call: Callable[[], Any]) -> Any:
+            start = time.perf_counter()
+            value = call()
+            timings[name] = round((time.perf_counter() - start) * 1000, 2)
+            return value
+
+        with self.aws, self.http, contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            queued = _timed("enqueue", lambda: json.loads(
+                handler.lambda_handler(json.loads(json.dumps(event)), None)["body"]
+            ))
+            queue_url = os.environ["ANALYSIS_QUEUE_URL"]
+            _timed("job", lambda: self.aws.sqs.drain(queue_url, lambda e: handler.lambda_handler(e, None)))
+            status = _timed("status_read", lambda: json.loads(handler.lambda_handler(
+                {"action": "job_status", "analysis_id": queued.get("analysis_id")}, None
+            )["body"]))
+            wall_ms = (time.perf_counter() - start) * 1000
+
+        result = status.get("result") or {}
+        body = {
+            "status": "success" if status.get("status") == "completed" else "error",
+            "error": status.get("error") or queued.get("error"),
+            "analysis_path": result.get("analysis_path"),
+            "execution_mode": "async",
+            "stage_timings_ms": timings,
+            "token_usage": {"total_tokens": result.get("total_tokens", 0)},
+            "job": status,
+        }
+        return body, wall_ms
+
+
+    def _invoke_duplicates(self, event: Dict[str, Any], count: int) -> Tuple[Dict[str, Any], float]:
+        """
+        같은 commit에 대한 호출 count개를 동시에 실행 (analysis_id만 다름).
+        반복 실행마다 commit_sha를 바꿔서 이전 반복의 완료된 lease를 재사용하지 않게 함.
+        leader의 body에 각 호출의 single-flight 역할을 붙여서 반환
+        """
+        run_id = time.perf_counter_ns()
+        commit_sha = f"{run_id:040x}"[-40:]
+        events = [
+            json.loads(json.dumps({**event, "commit_sha": commit_sha, "analysis_id": f"dup-{run_id}-{index}"}))
+            for index in range(count)
+        ]
+        with self.aws, self.http, contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=count) as executor:
+                bodies = [
+                    json.loads(response["body"])
+                    for response in executor.map(lambda e: handler.lambda_handler(e, None), events)
+                ]
+            wall_ms = (time.perf_counter() - start) * 1000
+
+        roles = [(body.get("single_flight") or {}).get("role") for body in bodies]
+        body = next((b for b, role in zip(bodies, roles) if role == "leader"), bodies[0])
+        return {**body, "duplicates": roles}, wall_ms
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_scenario(scenario: Dict[str, Any], iterations: int = 5, llm_latency_ms: float = 0.0,
+                 allocations: bool = True) -> Dict[str, Any]:
+    """
+    warmup 후 iterations번 실행한 timing 요약.
+    할당량은 timing을 왜곡하지 않도록 tracemalloc을 켠 별도 1회 실행으로 측정합니다.
+    """
+    harness = Harness(scenario, llm_latency_ms)
+    for _ in range(int(scenario.get("warmup", 0))):
+        harness.invoke()
+    harness.http.stats = dict.fromkeys(harness.http.stats, 0)
+
+    walls: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    parse_ms: List[float] = []
+    body: Dict[str, Any] = {}
+    for _ in range(iterations):
+        before = spec_parser.stats()
+        body, wall_ms = harness.invoke()
+        after = spec_parser.stats()
+        walls.append(wall_ms)
+        # 분석 결과의 spec_parse (async job 요약에는 없으므로 container 누적 차이로 대신)
+        parse_ms.append((body.get("spec_parse") or {}).get("total_ms", after["total_ms"] - before["total_ms"]))
+        for stage, ms in (body.get("stage_timings_ms") or {}).items():
+            stages.setdefault(stage, []).append(ms)
+
+    summary = {
+        "name": scenario["name"],
+        "iterations": iterations,
+        "status": body.get("status"),
+        "error": body.get("error"),
+        "analysis_path": body.get("analysis_path"),
+        "execution_mode": body.get("execution_mode"),
+        "wall_ms": {
+            "p50": round(_percentile(walls, 50), 2),
+            "p95": round(_percentile(walls, 95), 2),
+            "min": round(min(walls), 2),
+        },
+        "stages_ms": {stage: round(_percentile(values, 50), 2) for stage, values in stages.items()},
+        "parse_ms": round(sum(parse_ms) / len(parse_ms), 3),
+        "tokens": (body.get("token_usage") or {}).get("total_tokens", 0),
+        "http": dict(harness.http.stats),
+    }
+
+    if allocations:
+        tracemalloc.start()
+        try:
+            start_current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            harness.invoke()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        summary["alloc_peak_kib"] = round((peak - start_current) / 1024, 1)
+        summary["alloc_retained_kib"] = round((current - start_current) / 1024, 1)
+
+    return summary
@@ -0,0 +1,666 @@
+"""
+Local stand-ins for AWS and outbound HTTP
+clients.aws의 client/resource 생성과 clients.http_session.request를 바꿔 끼워서
+handler 코드는 그대로 두고 in-memory S3/DynamoDB/SSM, 녹화된/합성 HTTP 응답으로 실행합니다.
+"""
+import base64
+import copy
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from botocore.exceptions import ClientError
+
+from clients import aws, http_session, secrets
+
+
+def _client_error(code: str, operation: str, message: str = "") -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": message or code}}, operation)
+
+
+def _check_types(value: Any) -> None:
+    """boto3와 같이 float은 거부 (Decimal만 허용)"""
+    if isinstance(value, float):
+        raise TypeError("Float types are not supported. Use Decimal types instead.")
+    if isinstance(value, dict):
+        for item in value.values():
+            _check_types(item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            _check_types(item)
+
+
+def _resolve(name: str, names: Dict[str, str]) -> str:
+    return names.get(name, name)
+
+
+class LocalTable:
+    """
+    DynamoDB Table 하위 집합 (hash key analysis_id).
+    조건식은 attribute_exists/attribute_not_exists와 단순 비교(=, <, <=, >, >=, <>)를 AND/OR로 묶은 것만 지원합니다.
+    """
+
+    def __init__(self, name: str, items: Dict[str, Dict[str, Any]], lock: threading.Lock):
+        self.name = name
+        self.items = items
+        self._lock = lock
+
+    def _clause_ok(self, item: Optional[Dict[str, Any]], clause: str,
+                   names: Dict[str, str], values: Dict[str, Any]) -> bool:
+        clause = clause.strip()
+        while clause.startswith("(") and clause.endswith(")") and clause.count("(") > clause.count("attribute_"):
+            clause = clause[1:-1].strip()
+        match = re.fullmatch(r"(attribute_exists|attribute_not_exists)\s*\(\s*(\S+?)\s*\)", clause)
+        if match:
+            exists = item is not None and _resolve(match.group(2), names) in item
+            return exists == (match.group(1) == "attribute_exists")
+        match = re.fullmatch(r"(\S+)\s*(<>|<=|>=|=|<|>)\s*(\S+)", clause)
+        if not match:
+            raise ValueError(f"Unsupported condition in stand-in: {clause}")
+        left = (item or {}).get(_resolve(match.group(1), names))
+        right = values[match.group(3)]
+        if left is None:
+            return match.group(2) == "<>"
+        return {
+            "=": left == right, "<>": left != right, "<": left < right,
+            "<=": left <= right, ">": left > right, ">=": left >= right,
+        }[match.group(2)]
+
+    def _condition_ok(self, item: Optional[Dict[str, Any]], expression: Optional[str],
+                      names: Dict[str, str], values: Dict[str, Any]) -> bool:
+        """OR로 나눈 그룹 중 하나라도 (AND 절이 모두) 참이면 통과 (중첩 괄호는 지원하지 않음)"""
+        if not expression:
+            return True
+        return any(
+            all(self._clause_ok(item, clause, names, values) for clause in re.split(r"\s+(?:AND|and)\s+", group))
+            for group in re.split(r"\s+(?:OR|or)\s+", expression)
+        )
+
+    def get_item(self, Key: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            item = self.items.get(Key["analysis_id"])
+            return {"Item": copy.deepcopy(item)} if item is not None else {}
+
+    def put_item(self, Item: Dict[str, Any], ConditionExpression: Optional[str] = None,
+                 ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+                 ExpressionAttributeValues: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        _check_types(Item)
+        with self._lock:
+            current = self.items.get(Item["analysis_id"])
+            if not self._condition_ok(current, ConditionExpression,
+                                      ExpressionAttributeNames or {}, ExpressionAttributeValues or {}):
+                raise _client_error("ConditionalCheckFailedException", "PutItem")
+            self.items[Item["analysis_id"]] = copy.deepcopy(Item)
+        return {}
+
+    def delete_item(self, Key: Dict[str, Any], ConditionExpression: Optional[str] = None,
+                    ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+                    ExpressionAttributeValues: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            current = self.items.get(Key["analysis_id"])
+            if not self._condition_ok(current, ConditionExpression,
+                                      ExpressionAttributeNames or {}, ExpressionAttributeValues or {}):
+                raise _client_error("ConditionalCheckFailedException", "DeleteItem")
+            self.items.pop(Key["analysis_id"], None)
+        return {}
+
+    def update_item(self, Key: Dict[str, Any], UpdateExpression: str,
+                    ConditionExpression: Optional[str] = None,
+                    ExpressionAttributeNames: Optional[Dict[str, str]] = None,
+                    ExpressionAttributeValues: Optional[Dict[str, Any]] = None,
+                    ReturnValues: str = "NONE", **kwargs) -> Dict[str, Any]:
+        names = ExpressionAttributeNames or {}
+        values = ExpressionAttributeValues or {}
+        _check_types(values)
+        with self._lock:
+            current = self.items.get(Key["analysis_id"])
+            if not self._condition_ok(current, ConditionExpression, names, values):
+                raise _client_error("ConditionalCheckFailedException", "UpdateItem")
+            item = copy.deepcopy(current) if current is not None else dict(Key)
+
+            for action, body in re.findall(r"\b(SET|ADD|REMOVE)\s+(.*?)(?=\s+\b(?:SET|ADD|REMOVE)\s+|$)", UpdateExpression):
+                for part in (p.strip() for p in body.split(",")):
+                    if action == "SET":
+                        name, value = (x.strip() for x in part.split("=", 1))
+                        item[_resolve(name, names)] = copy.deepcopy(values[value])
+                    elif action == "ADD":
+                        name, value = part.split()
+                        attr = _resolve(name, names)
+                        item[attr] = item.get(attr, 0) + values[value]
+                    else:
+                        item.pop(_resolve(part, names), None)
+
+            self.items[Key["analysis_id"]] = item
+            return {"Attributes": copy.deepcopy(item)} if ReturnValues != "NONE" else {}
+
+    def scan(self, FilterExpression: Optional[str] = None, ProjectionExpression: Optional[str] = None,
+             ExpressionAttributeNames: Optional[Dict[str, str]] = None, **kwargs) -> Dict[str, Any]:
+        names = ExpressionAttributeNames or {}
+        with self._lock:
+            items = [
+                copy.deepcopy(item) for item in self.items.values()
+                if self._condition_ok(item, FilterExpression, names, kwargs.get("ExpressionAttributeValues") or {})
+            ]
+        if ProjectionExpression:
+            attrs = [_resolve(a.strip(), names) for a in ProjectionExpression.split(",")]
+            items = [{a: item[a] for a in attrs if a in item} for item in items]
+        return {"Items": items, "Count": len(items)}
+
+    def query(self, **kwargs) -> Dict[str, Any]:
+        return {"Items": [], "Count": 0}
+
+
+class LocalDynamoDB:
+    """boto3.resource("dynamodb") 하위 집합"""
+
+    def __init__(self, tables: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None):
+        self.tables: Dict[str, Dict[str, Dict[str, Any]]] = copy.deepcopy(tables or {})
+        self._lock = threading.Lock()
+
+    def Table(self, name: str) -> LocalTable:
+        with self._lock:
+            items = self.tables.setdefault(name, {})
+        return LocalTable(name, items, self._lock)
+
+    def batch_write_item(self, RequestItems: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        for name, requests_ in RequestItems.items():
+            if len(requests_) > 25:
+                raise _client_error("ValidationException", "BatchWriteItem", "Too many items requested")
+            table = self.Table(name)
+            for request in requests_:
+                if "PutRequest" in request:
+                    table.put_item(Item=request["PutRequest"]["Item"])
+                else:
+                    table.delete_item(Key=request["DeleteRequest"]["Key"])
+        return {"UnprocessedItems": {}}
+
+
+class LocalS3:
+    """boto3.client("s3") 하위 집합 (bucket/key → body, metadata)"""
+
+    def __init__(self):
+        self.objects: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def put_object(self, Bucket: str, Key: str, Body: Any = b"", **kwargs) -> Dict[str, Any]:
+        if isinstance(Body, str):
+            Body = Body.encode("utf-8")
+        elif hasattr(Body, "read"):
+            Body = Body.read()
+        etag = f'"{hashlib.md5(Body).hexdigest()}"'
+        with self._lock:
+            self.objects[(Bucket, Key)] = {"Body": bytes(Body), "ETag": etag, **kwargs}
+        return {"ETag": etag}
+
+    def _get(self, Bucket: str, Key: str, operation: str) -> Dict[str, Any]:
+        with self._lock:
+            obj = self.objects.get((Bucket, Key))
+        if obj is None:
+            raise _client_error("NoSuchKey" if operation == "GetObject" else "404", operation)
+        return obj
+
+    def get_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        obj = self._get(Bucket, Key, "GetObject")
+        meta = {k: v for k, v in obj.items() if k != "Body"}
+        return {"Body": io.BytesIO(obj["Body"]), "ContentLength": len(obj["Body"]), **meta}
+
+    def head_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        obj = self._get(Bucket, Key, "HeadObject")
+        return {"ContentLength": len(obj["Body"]), **{k: v for k, v in obj.items() if k != "Body"}}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = "", MaxKeys: int = 1000,
+                        ContinuationToken: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            keys = sorted(k for b, k in self.objects if b == Bucket and k.startswith(Prefix))
+        start = int(ContinuationToken or 0)
+        page = keys[start:start + MaxKeys]
+        resp = {"Contents": [
+                    {"Key": k, "Size": len(self.objects[(Bucket, k)]["Body"]), "ETag": self.objects[(Bucket, k)]["ETag"]}
+                    for k in page
+                ],
+                "KeyCount": len(page), "IsTruncated": start + MaxKeys < len(keys)}
+        if resp["IsTruncated"]:
+            resp["NextContinuationToken"] = str(start + MaxKeys)
+        return resp
+
+    def delete_object(self, Bucket: str, Key: str, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            self.objects.pop((Bucket, Key), None)
+        return {}
+
+    def delete_objects(self, Bucket: str, Delete: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        for obj in Delete.get("Objects", []):
+            self.delete_object(Bucket, obj["Key"])
+        return {"Deleted": [{"Key": obj["Key"]} for obj in Delete.get("Objects", [])]}
+
+
+class LocalSSM:
+    def __init__(self, parameters: Optional[Dict[str, str]] = None):
+        self.parameters = dict(parameters or {})
+
+    def get_parameter(self, Name: str, WithDecryption: bool = False, **kwargs) -> Dict[str, Any]:
+        if Name not in self.parameters:
+            raise _client_error("ParameterNotFound", "GetParameter")
+        return {"Parameter": {"Name": Name, "Value": self.parameters[Name]}}
+
+
+class LocalSQS:
+    """
+    boto3.client("sqs") 하위 집합 + Lambda SQS event source 흉내.
+    lambda_event()로 visible 메시지를 받아 Records event를 만들고, settle()로 응답의
+    batchItemFailures는 다시 visible로, 나머지는 삭제합니다 (max_receives 초과는 dead_letters로).
+    """
+
+    def __init__(self, max_receives: int = 3):
+        self.max_receives = max_receives
+        self.messages: Dict[str, Dict[str, Any]] = {}
+        self.dead_letters: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._counter = 0
+
+    def send_message(self, QueueUrl: str, MessageBody: str, **kwargs) -> Dict[str, Any]:
+        if len(MessageBody.encode("utf-8")) > 256 * 1024:
+            raise _client_error("InvalidParameterValue", "SendMessage", "Message must be shorter than 262144 bytes")
+        with self._lock:
+            self._counter += 1
+            message_id = f"msg-{self._counter:06d}"
+            self.messages[message_id] = {
+                "queue_url": QueueUrl, "body": MessageBody, "receives": 0, "in_flight": False
+            }
+        return {"MessageId": message_id, "MD5OfMessageBody": hashlib.md5(MessageBody.encode("utf-8")).hexdigest()}
+
+    def receive_message(self, QueueUrl: str, MaxNumberOfMessages: int = 1, **kwargs) -> Dict[str, Any]:
+        received = []
+        with self._lock:
+            for message_id, message in self.messages.items():
+                if len(received) >= MaxNumberOfMessages:
+                    break
+                if message["queue_url"] != QueueUrl or message["in_flight"]:
+                    continue
+                message["receives"] += 1
+                message["in_flight"] = True
+                received.append({
+                    "MessageId": message_id, "ReceiptHandle": message_id, "Body": message["body"],
+                    "Attributes": {"ApproximateReceiveCount": str(message["receives"])},
+                })
+        return {"Messages": received} if received else {}
+
+    def delete_message(self, QueueUrl: str, ReceiptHandle: str, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            self.messages.pop(ReceiptHandle, None)
+        return {}
+
+    def lambda_event(self, queue_url: str, batch_size: int = 1) -> Optional[Dict[str, Any]]:
+        """visible 메시지로 만든 SQS event (없으면 None)"""
+        messages = self.receive_message(queue_url, batch_size).get("Messages", [])
+        if not messages:
+            return None
+        return {"Records": [
+            {
+                "messageId": message["MessageId"],
+                "receiptHandle": message["ReceiptHandle"],
+                "body": message["Body"],
+                "attributes": message["Attributes"],
+                "eventSource": "aws:sqs",
+                "eventSourceARN": f"arn:aws:sqs:local:000000000000:{queue_url.rsplit('/', 1)[-1]}",
+            }
+            for message in messages
+        ]}
+
+    def settle(self, event: Dict[str, Any], response: Optional[Dict[str, Any]]) -> None:
+        """Lambda 응답 처리: 실패 항목은 다시 visible (예외로 끝났으면 response=None → 전부 재시도)"""
+        if response is None:
+            failed = {record["messageId"] for record in event["Records"]}
+        else:
+            failed = {item["itemIdentifier"] for item in response.get("batchItemFailures", [])}
+        with self._lock:
+            for record in event["Records"]:
+                message_id = record["messageId"]
+                message = self.messages.get(message_id)
+                if message is None:
+                    continue
+                if message_id not in failed:
+                    del self.messages[message_id]
+                elif message["receives"] >= self.max_receives:
+                    self.dead_letters.append(self.messages.pop(message_id))
+                else:
+                    message["in_flight"] = False
+
+    def drain(self, queue_url: str, invoke: Callable[[Dict[str, Any]], Any], batch_size: int = 1) -> int:
+        """queue가 빌 때까지 invoke(event) 반복. Returns 처리한 event 수"""
+        count = 0
+        while True:
+            event = self.lambda_event(queue_url, batch_size)
+            if event is None:
+                return count
+            count += 1
+            try:
+                response = invoke(event)
+            except Exception:
+                response = None
+            self.settle(event, response)
+
+
+class LocalAWS:
+    """
+    clients.aws 대신 stand-in을 돌려주도록 교체 (with 블록 안에서만).
+    tables: {table name: {analysis_id: item}} 초기 상태
+    """
+
+    def __init__(self, tables: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+                 parameters: Optional[Dict[str, str]] = None):
+        self.dynamodb = LocalDynamoDB(tables)
+        self.s3 = LocalS3()
+        self.ssm = LocalSSM(parameters)
+        self.sqs = LocalSQS()
+        self.services: Dict[Tuple[str, str], Any] = {
+            ("resource", "dynamodb"): self.dynamodb,
+            ("client", "s3"): self.s3,
+            ("client", "ssm"): self.ssm,
+            ("client", "sqs"): self.sqs,
+        }
+        self._original: Optional[Callable] = None
+
+    def add(self, kind: str, service: str, stand_in: Any) -> None:
+        self.services[(kind, service)] = stand_in
+
+    def _get(self, kind: str, service: str, region_name: Optional[str]) -> Any:
+        try:
+            return self.services[(kind, service)]
+        except KeyError:
+            raise RuntimeError(f"No local stand-in for {kind} {service}")
+
+    def __enter__(self) -> "LocalAWS":
+        self._original = aws._get
+        aws._get = self._get
+        secrets._cache.clear()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        aws._get = self._original
+        secrets._cache.clear()
+
+
+# -- HTTP ---------------------------------------------------------------------
+
+class StubResponse:
+    """requests.Response 하위 집합 (json/text/iter_lines/raise_for_status/context manager)"""
+
+    def __init__(self, status_code: int = 200, body: Any = b"", headers: Optional[Dict[str, str]] = None,
+                 lines: Optional[List[str]] = None, url: str = ""):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body)
+        self.status_code = status_code
+        self.content = body.encode("utf-8") if isinstance(body, str) else body
+        self.headers = requests.structures.CaseInsensitiveDict(headers or {})
+        self.lines = lines
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def iter_lines(self, decode_unicode: bool = False, **kwargs) -> Iterator[Any]:
+        lines = self.lines if self.lines is not None else self.text.splitlines()
+        for line in lines:
+            yield line if decode_unicode else line.encode("utf-8")
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "StubResponse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def request_fingerprint(method: str, url: str, payload: Any = None) -> str:
+    """method + url + JSON body 기준 key (Authorization 등 헤더는 포함하지 않음)"""
+    digest = hashlib.sha256(f"{method.upper()} {url}".encode("utf-8"))
+    if payload is not None:
+        digest.update(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return digest.hexdigest()[:24]
+
+
+def request_shape(url: str, payload: Any = None) -> Dict[str, Any]:
+    """prompt가 바뀌어 fingerprint가 달라졌을 때 대신 맞춰볼 요청 형태"""
+    payload = payload or {}
+    messages = payload.get("messages") or [{}]
+    return {
+        "endpoint": url.split("?", 1)[0],
+        "stream": bool(payload.get("stream")),
+        "json_mode": bool(payload.get("response_format")),
+        # concurrent 섹션 요청 구분용 ("Generate the complete Dockerfile ...")
+        "prompt_head": (messages[-1].get("content") or "")[:48],
+    }
+
+
+def _loose(shape: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {k: v for k, v in (shape or {}).items() if k != "prompt_head"}
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class SyntheticOpenAI:
+    """
+    chat/completions 합성 응답. 분석 요청(JSON mode)에는 project_info를,
+    생성 요청에는 섹션 구분자 형식의 spec 전체(또는 요청된 섹션 하나)를 돌려줍니다.
+    json_schema 요청에는 schema의 property만 담은 객체 (spec bundle, project_info repair)를 돌려줍니다.
+    """
+
+    def __init__(self, project_info: Dict[str, Any], specs: Dict[str, str],
+                 sections: Dict[str, Tuple[str, str]], latency_ms: float = 0.0, chunk_chars: int = 64):
+        self.project_info = project_info
+        self.specs = specs
+        self.sections = sections
+        self.latency_ms = latency_ms
+        self.chunk_chars = chunk_chars
+
+    def _full_response(self) -> str:
+        return "\n".join(
+            f"---{delimiter}---\n{self.specs.get(key, '')}\n" for key, (delimiter, _) in self.sections.items()
+        )
+
+    def _content(self, payload: Dict[str, Any]) -> str:
+        response_format = payload.get("response_format") or {}
+        schema = (response_format.get("json_schema") or {}).get("schema")
+        if schema and response_format["json_schema"].get("name") == "deployment_specs":
+            return json.dumps({key: self.specs.get(key, "") for key in schema["properties"]})
+        if schema:
+            # project_info 전체 또는 repair 요청 필드만
+            return json.dumps({key: self.project_info.get(key) for key in schema["properties"]})
+        if response_format:
+            return json.dumps(self.project_info)
+        prompt = payload["messages"][-1]["content"]
+        for key, (_, description) in self.sections.items():
+            if prompt.startswith(f"Generate {description}"):
+                return self.specs.get(key, "")
+        return self._full_response()
+
+    def __call__(self, method: str, url: str, payload: Dict[str, Any]) -> StubResponse:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        content = self._content(payload)
+        prompt_chars = sum(len(m.get("content", "")) for m in payload.get("messages", []))
+        usage = {"prompt_tokens": prompt_chars // 4, "completion_tokens": _approx_tokens(content)}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if not payload.get("stream"):
+            return StubResponse(200, {
+                "model": payload.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                "usage": usage
+            }, {"Content-Type": "application/json"}, url=url)
+
+        lines = []
+        for start in range(0, len(content), self.chunk_chars):
+            chunk = {"choices": [{"index": 0, "delta": {"content": content[start:start + self.chunk_chars]}}]}
+            lines += [f"data: {json.dumps(chunk)}", ""]
+        lines += [f"data: {json.dumps({'choices': [], 'usage': usage})}", "", "data: [DONE]"]
+        return StubResponse(200, b"", {"Content-Type": "text/event-stream"}, lines=lines, url=url)
+
+
+def _git_blob_sha(content: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+class SyntheticGitHub:
+    """local directory를 GitHub trees/readme/contents/blobs API처럼 제공 (SHA는 내용 기반)"""
+
+    def __init__(self, repository: str, files: Dict[str, str], api_base: str = "https://api.github.com"):
+        self.prefix = f"{api_base}/repos/{repository}"
+        self.files = files
+        self.trees: Dict[str, List[Dict[str, str]]] = {}
+        self.root_sha = self._build("")
+
+    def _build(self, directory: str) -> str:
+        prefix = f"{directory}/" if directory else ""
+        names = sorted({path[len(prefix):].split("/", 1)[0] for path in self.files if path.startswith(prefix)})
+        entries = []
+        for name in names:
+            path = f"{prefix}{name}"
+            if path in self.files:
+                entries.append({"path": name, "type": "blob", "sha": _git_blob_sha(self.files[path].encode("utf-8"))})
+            else:
+                entries.append({"path": name, "type": "tree", "sha": self._build(path)})
+        sha = hashlib.sha1(json.dumps(entries, sort_keys=True).encode("utf-8")).hexdigest()
+        self.trees[sha] = entries
+        return sha
+
+    def _recursive(self, sha: str, prefix: str = "") -> List[Dict[str, str]]:
+        listing = []
+        for entry in self.trees[sha]:
+            listing.append({**entry, "path": f"{prefix}{entry['path']}"})
+            if entry["type"] == "tree":
+                listing += self._recursive(entry["sha"], f"{prefix}{entry['path']}/")
+        return listing
+
+    def handles(self, url: str) -> bool:
+        return url.startswith(self.prefix + "/")
+
+    def __call__(self, method: str, url: str, payload: Any = None) -> StubResponse:
+        path, _, query = url[len(self.prefix):].partition("?")
+        if path.startswith("/git/trees/"):
+            sha = path[len("/git/trees/"):]
+            sha = sha if sha in self.trees else self.root_sha
+            tree = self._recursive(sha) if "recursive=1" in query else self.trees[sha]
+            return StubResponse(200, {"sha": sha, "tree": tree, "truncated": False}, url=url)
+        if path == "/readme":
+            for name, content in self.files.items():
+                if "/" not in name and name.lower().startswith("readme"):
+                    return StubResponse(200, {
+                        "name": name, "content": base64.b64encode(content.encode("utf-8")).decode("ascii")
+                    }, url=url)
+        if path.startswith("/git/blobs/"):
+            sha = path[len("/git/blobs/"):]
+            content = next((c for c in self.files.values() if _git_blob_sha(c.encode("utf-8")) == sha), None)
+            if content is not None:
+                return StubResponse(200, content, {"Content-Type": "application/vnd.github.raw"}, url=url)
+        if path.startswith("/contents/"):
+            content = self.files.get(path[len("/contents/"):])
+            if content is not None:
+                return StubResponse(200, content, {"Content-Type": "text/plain"}, url=url)
+        return StubResponse(404, {"message": "Not Found"}, url=url)
+
+
+class HTTPStandIn:
+    """
+    http_session.request 대체.
+    순서: 녹화된 응답(fingerprint 일치) → 녹화된 응답(요청 형태 일치, prompt 변경 대응) → 합성 handler → 404
+    """
+
+    def __init__(self, exchanges: Optional[List[Dict[str, Any]]] = None):
+        self.exchanges = list(exchanges or [])
+        self._used: set = set()
+        self.handlers: List[Tuple[Callable[[str], bool], Callable[..., StubResponse]]] = []
+        self.stats = {"requests": 0, "exact": 0, "shape": 0, "synthetic": 0, "missing": 0}
+        self._lock = threading.Lock()
+        self._original: Optional[Callable] = None
+
+    def add_handler(self, matches: Callable[[str], bool], handler: Callable[..., StubResponse]) -> None:
+        self.handlers.append((matches, handler))
+
+    def _recorded(self, method: str, url: str, payload: Any) -> Optional[StubResponse]:
+        fingerprint = request_fingerprint(method, url, payload)
+        shape = request_shape(url, payload)
+        with self._lock:
+            candidates = [i for i, e in enumerate(self.exchanges) if i not in self._used and e["method"] == method]
+            match = next((i for i in candidates if self.exchanges[i]["fingerprint"] == fingerprint), None)
+            kind = "exact"
+            if match is None and shape["endpoint"].endswith("/chat/completions"):
+                match = next((i for i in candidates if self.exchanges[i].get("shape") == shape), None)
+                if match is None:
+                    match = next((i for i in candidates if _loose(self.exchanges[i].get("shape")) == _loose(shape)), None)
+                kind = "shape"
+            if match is None:
+                return None
+            # 같은 요청이 여러 번 녹화된 경우(재시도) 순서대로 소비
+            self._used.add(match)
+            self.stats[kind] += 1
+        exchange = self.exchanges[match]
+        return StubResponse(exchange["status"], exchange.get("body", ""), exchange.get("headers"),
+                            exchange.get("lines"), url=url)
+
+    def request(self, method: str, url: str, **kwargs) -> StubResponse:
+        with self._lock:
+            self.stats["requests"] += 1
+        payload = kwargs.get("json")
+        response = self._recorded(method, url, payload)
+        if response is not None:
+            return response
+        for matches, handler in self.handlers:
+            if matches(url):
+                with self._lock:
+                    self.stats["synthetic"] += 1
+                return handler(method, url, payload)
+        with self._lock:
+            self.stats["missing"] += 1
+        return StubResponse(404, {"message": f"No replay response for {method} {url}"}, url=url)
+
+    def __enter__(self) -> "HTTPStandIn":
+        # invocation마다 녹화 응답을 처음부터 다시 사용
+        self._used.clear()
+        self._original = http_session.request
+        http_session.request = self.request
+        return self
+
+    def __exit__(self, *exc) -> None:
+        http_session.request = self._original
+
+
+def plain(value: Any) -> Any:
+    """Decimal → int/float (fixture JSON 저장용)"""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, dict):
+        return {k: plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [plain(v) for v in value]
+    return value
+
+
+def dynamo_value(value: Any) -> Any:
+    """fixture JSON → DynamoDB 값 (float → Decimal)"""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {k: dynamo_value(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [dynamo_value(v) for v in value]
+    return value
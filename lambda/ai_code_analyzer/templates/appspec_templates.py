@@ -2,6 +2,7 @@
 AppSpec templates for CodeDeploy Blue-Green deployment
 CodeDeploy 담당자가 이 파일을 수정하면 Lambda가 자동으로 반영합니다.
 """
+from templates import registry
 
 APPSPEC_TEMPLATE = """version: 0.0
 Resources:
@@ -23,6 +24,9 @@ Hooks:
 """
 
 
+_APPSPEC = registry.register("appspec", APPSPEC_TEMPLATE)
+
+
 def generate_appspec(port: int) -> str:
     """AppSpec YAML 생성"""
-    return APPSPEC_TEMPLATE.format(port=port)
+    return _APPSPEC.render(port=port)
@@ -0,0 +1,59 @@
+"""
+Template rendering micro-benchmark
+    python -m templates.benchmark --iterations 20000
+"""
+import argparse
+import timeit
+
+from templates import registry
+from templates.appspec_templates import APPSPEC_TEMPLATE
+from templates.fallback_templates import (
+    FALLBACK_APPSPEC_TEMPLATE, FALLBACK_DOCKERFILE_TEMPLATE, FALLBACK_TERRAFORM_ECS_TEMPLATE
+)
+from templates.terraform_templates import TERRAFORM_TFVARS_TEMPLATE
+
+TFVARS_PARAMS = {
+    "analysis_id": "bench", "primary_language": "Python", "primary_framework": "FastAPI",
+    "image_tag": "abc1234", "port": 8000, "cpu": 256, "memory": 512,
+    "desired_count": 2, "min_capacity": 2, "max_capacity": 4,
+    "cpu_target_value": 70, "memory_target_value": 80,
+    "health_check_path": "/health", "health_check_interval": 30, "health_check_timeout": 5,
+    "health_check_healthy_threshold": 2, "health_check_unhealthy_threshold": 3,
+    "deployment_minimum_healthy_percent": 100, "deployment_maximum_percent": 200,
+    "database_enabled": "false", "database_type": "none",
+}
+PORTS = [8000, 3000, 8501, 8080]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmark template rendering")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    counter = iter(range(10 ** 9))
+    cases = {
+        "tfvars str.format (before)": lambda: TERRAFORM_TFVARS_TEMPLATE.format(**TFVARS_PARAMS),
+        "tfvars registry": lambda: registry.render("terraform/tfvars", **TFVARS_PARAMS),
+        "appspec str.format (before)": lambda: APPSPEC_TEMPLATE.format(port=PORTS[next(counter) % 4]),
+        "appspec registry (4 ports)": lambda: registry.render("appspec", port=PORTS[next(counter) % 4]),
+        "fallback specs f-string (before)": lambda: [
+            FALLBACK_DOCKERFILE_TEMPLATE.format(runtime="python:3.11-slim", port=8000),
+            FALLBACK_TERRAFORM_ECS_TEMPLATE.format(port=8000),
+            FALLBACK_APPSPEC_TEMPLATE.format(port=8000),
+        ],
+        "fallback specs registry": lambda: [
+            registry.render("fallback/dockerfile", runtime="python:3.11-slim", port=8000),
+            registry.render("fallback/terraform_ecs", port=8000),
+            registry.render("fallback/appspec", port=8000),
+        ],
+    }
+
+    print(f"templates: {len(registry.names())}, version: {registry.version()}")
+    for label, case in cases.items():
+        seconds = timeit.timeit(case, number=args.iterations)
+        print(f"{label:36s} {seconds / args.iterations * 1e6:8.2f} µs/render")
+    print(registry.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -2,23 +2,26 @@
 Dockerfile templates for different languages/frameworks
 Docker 담당자가 이 파일을 수정하면 Lambda가 자동으로 반영합니다.
 """
+from templates import registry
 
 # Python Dockerfile template
-PYTHON_TEMPLATE = """# Multi-stage build for Python application
-FROM python:3.11-slim as builder
+PYTHON_TEMPLATE = """# syntax=docker/dockerfile:1
+# Multi-stage build for Python application
+{install_stages}FROM python:3.11-slim as builder
 WORKDIR /app
 
-# Install dependencies
-COPY requirements.txt .
-RUN pip install --no-cache-dir --user -r requirements.txt
+# Install dependencies (lockfile-resolved, pip/uv cache mounted)
+{install_steps}
 
 # Final stage
 FROM python:3.11-slim
 WORKDIR /app
 
-# Copy dependencies from builder
-COPY --from=builder /root/.local /root/.local
-ENV PATH=/root/.local/bin:$PATH
+# Install curl for healthcheck
+RUN apt-get update && apt-get install -y --no-install-recommends curl && rm -rf /var/lib/apt/lists/*
+
+# Copy dependencies from builder (/usr/local is readable by the non-root user)
+COPY --from=builder /install /usr/local
 
 # Copy application code
 COPY . .
@@ -38,27 +41,26 @@ CMD {start_command}
 """
 
 # Node.js Dockerfile template
-NODEJS_TEMPLATE = """# Multi-stage build for Node.js application
+NODEJS_TEMPLATE = """# syntax=docker/dockerfile:1
+# Multi-stage build for Node.js application
 FROM node:20-alpine as builder
 WORKDIR /app
 
-# Install dependencies
-COPY package*.json ./
-RUN npm ci --only=production
+# Install dependencies (lockfile-resolved, package manager cache mounted)
+{install_steps}
 
 # Build if needed
 COPY . .
-RUN npm run build || echo "No build script"
+{build_steps}
 
 # Final stage
 FROM node:20-alpine
 WORKDIR /app
 
-# Copy from builder
-COPY --from=builder /app/node_modules ./node_modules
-COPY --from=builder /app/dist ./dist
-COPY --from=builder /app/build ./build
-COPY package*.json ./
+# Copy from builder (node_modules, build output if any, and sources)
+COPY --from=builder /app ./
+ENV NODE_ENV=production
+ENV PORT={port}
 
 # Create non-root user
 RUN adduser -D -u 1000 appuser && chown -R appuser:appuser /app
@@ -75,19 +77,19 @@ CMD {start_command}
 """
 
 # Go Dockerfile template
-GO_TEMPLATE = """# Multi-stage build for Go application
-FROM golang:1.21-alpine as builder
+GO_TEMPLATE = """# syntax=docker/dockerfile:1
+# Multi-stage build for Go application
+FROM golang:{go_version}-alpine as builder
 WORKDIR /app
 
-# Copy go mod files
-COPY go.mod go.sum ./
-RUN go mod download
+# Copy go mod files and download modules (module cache mounted)
+{install_steps}
 
 # Copy source code
 COPY . .
 
-# Build
-RUN CGO_ENABLED=0 GOOS=linux go build -a -installsuffix cgo -o app .
+# Build (module + build cache mounted)
+{build_steps}
 
 # Final stage - minimal image
 FROM alpine:latest
@@ -198,13 +200,13 @@ CMD ["java", "-jar", "app.jar"]
 """
 
 # Streamlit Dockerfile template (special handling for Streamlit apps)
-STREAMLIT_TEMPLATE = """# Multi-stage build for Streamlit application
-FROM python:3.11-slim as builder
+STREAMLIT_TEMPLATE = """# syntax=docker/dockerfile:1
+# Multi-stage build for Streamlit application
+{install_stages}FROM python:3.11-slim as builder
 WORKDIR /app
 
-# Install dependencies
-COPY requirements.txt .
-RUN pip install --no-cache-dir --user -r requirements.txt
+# Install dependencies (lockfile-resolved, pip/uv cache mounted)
+{install_steps}
 
 # Final stage
 FROM python:3.11-slim
@@ -213,9 +215,8 @@ WORKDIR /app
 # Install curl for healthcheck
 RUN apt-get update && apt-get install -y --no-install-recommends curl && rm -rf /var/lib/apt/lists/*
 
-# Copy dependencies from builder
-COPY --from=builder /root/.local /root/.local
-ENV PATH=/root/.local/bin:$PATH
+# Copy dependencies from builder (/usr/local is readable by the non-root user)
+COPY --from=builder /install /usr/local
 
 # Copy application code
 COPY . .
@@ -235,25 +236,43 @@ CMD {start_command}
 """
 
 
-def get_dockerfile_template(language: str, framework: str = "") -> str:
-    """언어/프레임워크에 맞는 Dockerfile 템플릿 반환"""
+# registry 이름 → 템플릿 (import 시 한 번 compile)
+DOCKERFILE_TEMPLATES = {
+    "dockerfile/python": PYTHON_TEMPLATE,
+    "dockerfile/nodejs": NODEJS_TEMPLATE,
+    "dockerfile/go": GO_TEMPLATE,
+    "dockerfile/rust": RUST_TEMPLATE,
+    "dockerfile/java": JAVA_TEMPLATE,
+    "dockerfile/streamlit": STREAMLIT_TEMPLATE,
+}
+for _name, _source in DOCKERFILE_TEMPLATES.items():
+    registry.register(_name, _source)
+
+
+def get_dockerfile_template_name(language: str, framework: str = "") -> str:
+    """언어/프레임워크에 맞는 Dockerfile 템플릿의 registry 이름"""
     language_lower = language.lower()
     framework_lower = framework.lower() if framework else ""
 
     # Streamlit 특수 처리
     if "streamlit" in framework_lower:
-        return STREAMLIT_TEMPLATE
+        return "dockerfile/streamlit"
 
     if "python" in language_lower:
-        return PYTHON_TEMPLATE
+        return "dockerfile/python"
     elif "javascript" in language_lower or "typescript" in language_lower or "node" in language_lower:
-        return NODEJS_TEMPLATE
+        return "dockerfile/nodejs"
     elif "go" in language_lower or "golang" in language_lower:
-        return GO_TEMPLATE
+        return "dockerfile/go"
     elif "rust" in language_lower:
-        return RUST_TEMPLATE
+        return "dockerfile/rust"
     elif "java" in language_lower or "kotlin" in language_lower:
-        return JAVA_TEMPLATE
+        return "dockerfile/java"
     else:
         # 기본: Python 템플릿 사용
-        return PYTHON_TEMPLATE
+        return "dockerfile/python"
+
+
+def get_dockerfile_template(language: str, framework: str = "") -> str:
+    """언어/프레임워크에 맞는 Dockerfile 템플릿 반환"""
+    return DOCKERFILE_TEMPLATES[get_dockerfile_template_name(language, framework)]
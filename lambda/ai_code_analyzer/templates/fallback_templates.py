@@ -0,0 +1,50 @@
+"""
+Fallback spec templates
+LLM spec 생성이 실패했거나 rule 기반 경로에서 사용하는 최소 spec입니다.
+"""
+from templates import registry
+
+FALLBACK_DOCKERFILE_TEMPLATE = """# Multi-stage build
+FROM {runtime} AS base
+WORKDIR /app
+COPY . .
+
+FROM {runtime}
+WORKDIR /app
+COPY --from=base /app .
+RUN useradd -m -u 1000 appuser
+USER appuser
+EXPOSE {port}
+HEALTHCHECK --interval=30s CMD curl -f http://localhost:{port}/health || exit 1
+CMD ["python", "app.py"]
+"""
+
+FALLBACK_TERRAFORM_ECS_TEMPLATE = """resource "aws_ecs_task_definition" "app" {{
+  family                   = "delightful-deploy"
+  requires_compatibilities = ["FARGATE"]
+  network_mode            = "awsvpc"
+  cpu                     = 256
+  memory                  = 512
+
+  container_definitions = jsonencode([{{
+    name  = "app"
+    image = "${{var.ecr_repository_url}}:latest"
+    portMappings = [{{ containerPort = {port} }}]
+  }}])
+}}
+"""
+
+FALLBACK_APPSPEC_TEMPLATE = """version: 0.0
+Resources:
+  - TargetService:
+      Type: AWS::ECS::Service
+      Properties:
+        TaskDefinition: <TASK_DEFINITION>
+        LoadBalancerInfo:
+          ContainerName: "app"
+          ContainerPort: {port}
+"""
+
+registry.register("fallback/dockerfile", FALLBACK_DOCKERFILE_TEMPLATE)
+registry.register("fallback/terraform_ecs", FALLBACK_TERRAFORM_ECS_TEMPLATE)
+registry.register("fallback/appspec", FALLBACK_APPSPEC_TEMPLATE)
@@ -0,0 +1,127 @@
+"""
+Template registry
+템플릿은 모듈 import 시 한 번 등록/compile(필드 목록, 해시, format_map 바인딩)되고,
+렌더링은 파라미터 치환만 합니다. 같은 파라미터 렌더링 결과는 container 안에서 재사용됩니다.
+version()은 등록된 모든 템플릿 원문의 해시라서 템플릿이 바뀌면 분석 캐시 key도 바뀝니다.
+
+micro-benchmark: python -m templates.benchmark
+"""
+import hashlib
+import threading
+from string import Formatter
+from typing import Any, Dict, List, Optional, Tuple
+
+# 템플릿별로 보관하는 렌더링 결과 수 (appspec/Dockerfile은 port/언어 조합이 적음)
+MAX_MEMO_ENTRIES = 256
+
+# warm container 동안 누적되는 카운터 (render 카운터는 lock 없이 갱신하는 근사치)
+_stats = {"compiles": 0, "renders": 0, "memo_hits": 0}
+_lock = threading.Lock()
+
+
+class CompiledTemplate:
+    """
+    str.format 형식 템플릿. compile 시 필드 목록을 한 번만 파싱합니다.
+    memoize=False는 analysis_id처럼 매번 달라지는 파라미터가 있는 템플릿용 (memo key 계산 생략).
+    """
+
+    def __init__(self, name: str, source: str, memoize: bool = True):
+        self.name = name
+        self.source = source
+        self.fields: Tuple[str, ...] = tuple(sorted({
+            field.split(".", 1)[0].split("[", 1)[0]
+            for _, field, _, _ in Formatter().parse(source)
+            if field
+        }))
+        self._field_set = frozenset(self.fields)
+        self.digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:12]
+        self._format = source.format_map
+        self._memo: Optional[Dict[Tuple[Any, ...], str]] = {} if memoize else None
+
+    def render(self, **params: Any) -> str:
+        return self.render_map(params)
+
+    def render_map(self, params: Dict[str, Any]) -> str:
+        if not self._field_set <= params.keys():
+            missing = sorted(self._field_set - params.keys())
+            raise KeyError(f"Template {self.name} is missing parameters: {', '.join(missing)}")
+        _stats["renders"] += 1
+
+        if self._memo is None:
+            return self._format(params)
+        try:
+            key = tuple(map(params.__getitem__, self.fields))
+            cached = self._memo.get(key)
+        except TypeError:
+            # dict 등 hash 불가 파라미터는 memo 없이 렌더링
+            return self._format(params)
+        if cached is not None:
+            _stats["memo_hits"] += 1
+            return cached
+
+        rendered = self._format(params)
+        with _lock:
+            if len(self._memo) >= MAX_MEMO_ENTRIES:
+                self._memo.pop(next(iter(self._memo)), None)
+            self._memo[key] = rendered
+        return rendered
+
+
+_templates: Dict[str, CompiledTemplate] = {}
+_version: Optional[str] = None
+
+
+def register(name: str, source: str, memoize: bool = True) -> CompiledTemplate:
+    """템플릿 등록 (같은 이름이면 교체하고 version을 다시 계산)"""
+    global _version
+    compiled = CompiledTemplate(name, source, memoize)
+    with _lock:
+        _templates[name] = compiled
+        _version = None
+        _stats["compiles"] += 1
+    return compiled
+
+
+def get(name: str) -> CompiledTemplate:
+    _load_builtin()
+    return _templates[name]
+
+
+def render(name: str, **params: Any) -> str:
+    return get(name).render_map(params)
+
+
+def names() -> List[str]:
+    _load_builtin()
+    return sorted(_templates)
+
+
+def version() -> str:
+    """등록된 템플릿 전체의 해시 (분석 캐시 key / 분석 항목에 기록)"""
+    global _version
+    _load_builtin()
+    with _lock:
+        if _version is None:
+            digest = hashlib.sha256()
+            for name in sorted(_templates):
+                digest.update(f"{name}\0{_templates[name].digest}\0".encode("utf-8"))
+            _version = digest.hexdigest()[:12]
+        return _version
+
+
+def stats() -> Dict[str, Any]:
+    """현재 container의 compile/render 횟수"""
+    with _lock:
+        return {**_stats, "templates": len(_templates)}
+
+
+_builtin_loaded = False
+
+
+def _load_builtin() -> None:
+    """기본 템플릿 모듈을 import해서 등록 (container당 한 번)"""
+    global _builtin_loaded
+    if _builtin_loaded:
+        return
+    from templates import appspec_templates, dockerfile_templates, fallback_templates, terraform_templates  # noqa: F401
+    _builtin_loaded = True
@@ -2,6 +2,7 @@
 Terraform tfvars templates
 Terraform 담당자가 이 파일을 수정하면 Lambda가 자동으로 반영합니다.
 """
+from templates import registry
 
 TERRAFORM_TFVARS_TEMPLATE = """# ========================================
 # AI Analyzer Generated Configuration
@@ -49,6 +50,9 @@ database_engine = "{database_type}"
 # enable_container_insights = true
 """
 
+# analysis_id / image_tag가 매번 달라서 memo 없이 치환만
+_TFVARS = registry.register("terraform/tfvars", TERRAFORM_TFVARS_TEMPLATE, memoize=False)
+
 
 def generate_terraform_tfvars(
     analysis_id: str,
@@ -66,7 +70,7 @@ def generate_terraform_tfvars(
 ) -> str:
     """Terraform tfvars 파일 생성"""
 
-    return TERRAFORM_TFVARS_TEMPLATE.format(
+    return _TFVARS.render(
         analysis_id=analysis_id,
         primary_language=primary_language,
         primary_framework=primary_framework,
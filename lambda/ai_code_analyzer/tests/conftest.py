@@ -0,0 +1,23 @@
+"""
+Lambda root(handler.py, analyzers/, clients/ ...)를 import 경로에 추가합니다.
+배포 zip과 같은 absolute import를 그대로 사용하기 위함 (build.sh는 tests/를 포함하지 않음).
+"""
+import os
+import sys
+
+import pytest
+
+LAMBDA_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if LAMBDA_ROOT not in sys.path:
+    sys.path.insert(0, LAMBDA_ROOT)
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "ap-northeast-2")
+
+from replay.stubs import LocalAWS  # noqa: E402
+
+
+@pytest.fixture
+def aws():
+    """clients.aws를 DynamoDB/S3/SSM/SQS stand-in으로 교체"""
+    with LocalAWS() as local:
+        yield local
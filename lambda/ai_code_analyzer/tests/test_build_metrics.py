@@ -0,0 +1,57 @@
+import json
+
+import pytest
+from botocore.exceptions import ClientError
+
+import handler
+from analyzers import build_estimator
+
+TABLE = "ai-analysis"
+ESTIMATE = {"base_image": "python:3.11-slim", "model_image_size_mb": 200.0, "model_build_seconds": 60.0}
+
+
+@pytest.fixture
+def table(aws, monkeypatch):
+    monkeypatch.setenv("AI_ANALYSIS_TABLE", TABLE)
+    table = aws.dynamodb.Table(TABLE)
+    table.put_item(Item={
+        "analysis_id": "analysis-1", "repository": "team/api", "build_estimate": json.dumps(ESTIMATE)
+    })
+    return table
+
+
+def _record(**event):
+    response = handler.lambda_handler({"action": "record_build_metrics", **event}, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+def test_records_actuals_and_calibration(table):
+    status, body = _record(analysis_id="analysis-1", image_size_mb=300, build_seconds=45)
+
+    assert status == 200
+    assert (body["calibrated"], body["size_ratio"], body["time_ratio"]) == (True, 1.5, 0.75)
+    assert float(table.items["analysis-1"]["build_actuals"]["image_size_mb"]) == 300.0
+    for key in build_estimator.stats_keys("team/api", ESTIMATE["base_image"]).values():
+        assert table.items[key]["samples"] == 1
+
+
+def test_invalid_or_missing_fields_return_400(table):
+    assert _record(image_size_mb=300, build_seconds=45)[0] == 400
+    assert _record(analysis_id="analysis-1", build_seconds=45)[0] == 400
+    assert _record(analysis_id="analysis-1", image_size_mb="big", build_seconds=45)[0] == 400
+
+
+def test_unknown_analysis_returns_404(table):
+    assert _record(analysis_id="missing", image_size_mb=300, build_seconds=45)[0] == 404
+
+
+def test_storage_error_returns_500(table, monkeypatch):
+    def _denied(*args, **kwargs):
+        raise ClientError({"Error": {"Code": "AccessDeniedException"}}, "UpdateItem")
+
+    monkeypatch.setattr(build_estimator, "record_actuals", _denied)
+
+    status, body = _record(analysis_id="analysis-1", image_size_mb=300, build_seconds=45)
+
+    assert status == 500
+    assert "AccessDenied" in body["error"]
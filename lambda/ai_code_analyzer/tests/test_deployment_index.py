@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+import handler
+from analyzers import deployment_index
+
+TABLE = "ai-analysis"
+
+
+def _analysis_item(repository: str, port: int, timestamp: str):
+    return {
+        "analysis_id": f"{repository.replace('/', '-')}-{timestamp}",
+        "repository": repository,
+        "timestamp": timestamp,
+        "project_info": json.dumps({"app_port": port, "primary_language": "Python"}),
+    }
+
+
+def _summary(repository: str, port: int):
+    return deployment_index.build_summary(repository, "a-1", {"app_port": port}, 256, 512)
+
+
+def test_first_write_backfills_existing_deployments(aws):
+    table = aws.dynamodb.Table(TABLE)
+    table.put_item(Item=_analysis_item("team/old", 8000, "2025-01-01T00:00:00"))
+    table.put_item(Item=_analysis_item("team/old", 8001, "2025-02-01T00:00:00"))
+    table.put_item(Item=_analysis_item("team/other", 3000, "2025-01-15T00:00:00"))
+
+    deployment_index.record_deployment(table, _summary("team/new", 8501), handler._index_backfill(table))
+
+    ports = {dep["repository"]: dep["port"] for dep in deployment_index.read_deployments(table)}
+    assert ports == {"team/old": 8001, "team/other": 3000, "team/new": 8501}
+
+
+def test_existing_index_is_updated_without_scan(aws):
+    table = aws.dynamodb.Table(TABLE)
+    deployment_index.record_deployment(table, _summary("team/a", 8000), lambda: [])
+
+    def _fail():
+        raise AssertionError("index exists, no backfill expected")
+
+    deployment_index.record_deployments(table, [_summary("team/b", 8001)], _fail)
+
+    assert {dep["repository"] for dep in deployment_index.read_deployments(table)} == {"team/a", "team/b"}
+
+
+def test_failed_backfill_leaves_index_missing(aws):
+    table = aws.dynamodb.Table(TABLE)
+
+    def _fail():
+        raise RuntimeError("scan throttled")
+
+    with pytest.raises(RuntimeError):
+        deployment_index.record_deployment(table, _summary("team/new", 8000), _fail)
+
+    # 일부만 담긴 index를 만들지 않으므로 조회는 계속 scan으로 대체됨
+    assert deployment_index.read_deployments(table) is None
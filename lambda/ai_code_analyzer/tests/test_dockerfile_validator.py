@@ -0,0 +1,55 @@
+from analyzers.dockerfile_validator import validate_dockerfile
+
+USER_SITE_DOCKERFILE = """FROM python:3.11-slim AS builder
+WORKDIR /app
+COPY requirements.txt .
+RUN pip install --user --no-cache-dir -r requirements.txt
+
+FROM python:3.11-slim
+WORKDIR /app
+COPY --from=builder /root/.local /root/.local
+ENV PATH=/root/.local/bin:$PATH
+COPY . .
+USER 1000
+EXPOSE 8000
+CMD ["uvicorn", "main:app", "--host", "0.0.0.0", "--port", "8000"]"""
+
+
+def test_user_site_copy_moves_destination_only():
+    dockerfile, report = validate_dockerfile(
+        USER_SITE_DOCKERFILE, {"app_port": 8000}, ["requirements.txt", "main.py"]
+    )
+
+    lines = dockerfile.split("\n")
+    assert "COPY --from=builder /root/.local /usr/local" in lines
+    assert "COPY --from=builder /usr/local /root/.local" not in lines
+    # /usr/local/bin은 기본 PATH에 있으므로 /root/.local/bin ENV는 제거
+    assert not any("/root/.local/bin" in line for line in lines)
+    assert [(f["rule"], f["fixed"]) for f in report["findings"]] == [("multistage-user-site", True)]
+
+
+def test_user_site_path_keeps_other_entries():
+    dockerfile, _ = validate_dockerfile(
+        USER_SITE_DOCKERFILE.replace("ENV PATH=/root/.local/bin:$PATH", "ENV PATH=/root/.local/bin:/opt/tools:$PATH"),
+        {"app_port": 8000}, ["requirements.txt", "main.py"]
+    )
+
+    assert "ENV PATH=/opt/tools:$PATH" in dockerfile.split("\n")
+
+
+def test_user_site_copy_keeps_flags():
+    dockerfile, _ = validate_dockerfile(
+        USER_SITE_DOCKERFILE.replace("--from=builder", "--from=builder --chown=1000:1000"),
+        {"app_port": 8000}, ["requirements.txt", "main.py"]
+    )
+
+    assert "COPY --from=builder --chown=1000:1000 /root/.local /usr/local" in dockerfile.split("\n")
+
+
+def test_dependency_address_is_not_rewritten():
+    dockerfile, report = validate_dockerfile(
+        "FROM node:20\nEXPOSE 3000\nCMD node server.js --redis redis://localhost:6379", {"app_port": 3000}
+    )
+
+    assert "redis://localhost:6379" in dockerfile
+    assert [(f["rule"], f["fixed"]) for f in report["findings"]] == [("loopback-port", False)]
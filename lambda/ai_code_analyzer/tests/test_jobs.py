@@ -0,0 +1,138 @@
+import json
+
+import pytest
+
+import handler
+from analyzers import jobs
+
+QUEUE_URL = "https://sqs.local/000000000000/analysis-jobs"
+BUCKET = "artifacts"
+TABLE = "ai-analysis"
+
+
+@pytest.fixture
+def table(aws):
+    return aws.dynamodb.Table(TABLE)
+
+
+def test_small_event_is_sent_inline(aws):
+    queued = jobs.enqueue(aws.sqs, QUEUE_URL, aws.s3, BUCKET, "job-1", {"repository": "team/app"})
+
+    message = aws.sqs.messages[queued["message_id"]]
+    assert queued["event_s3_key"] is None
+    assert not aws.s3.objects
+    assert jobs.load_message(message["body"], aws.s3, BUCKET) == {"repository": "team/app", "analysis_id": "job-1"}
+
+
+def test_large_event_is_sent_as_s3_pointer(aws):
+    event = {"repository": "team/app", "file_samples": {"big.py": "x" * (jobs.MAX_INLINE_EVENT_BYTES + 1)}}
+
+    queued = jobs.enqueue(aws.sqs, QUEUE_URL, aws.s3, BUCKET, "job-2", event)
+
+    body = aws.sqs.messages[queued["message_id"]]["body"]
+    assert queued["event_s3_key"] == "jobs/job-2/event.json"
+    assert json.loads(body) == {"analysis_id": "job-2", "event_s3_key": "jobs/job-2/event.json"}
+    assert jobs.load_message(body, aws.s3, BUCKET) == {**event, "analysis_id": "job-2"}
+
+
+def test_progress_records_stage_transitions(table):
+    jobs.create(table, "job-3", "team/app", "a" * 40)
+    progress = jobs.ProgressReporter(table, "job-3")
+
+    progress.start(1)
+    for stage in ("fetch", "fetch", "analyze", "generate", "upload"):
+        progress(stage)
+    progress.complete({"analysis_path": "rule", "token_usage": {"total_tokens": 12}})
+
+    status = jobs.read(table, "job-3")
+    assert status["status"] == "completed"
+    assert status["stage"] == "upload"
+    assert status["attempts"] == 1
+    assert list(status["stages"]) == list(jobs.STAGES)
+    assert status["result"]["analysis_path"] == "rule"
+    assert status["result"]["total_tokens"] == 12
+
+
+def test_failed_attempt_records_error(table):
+    jobs.create(table, "job-4", "team/app", "a" * 40)
+    progress = jobs.ProgressReporter(table, "job-4")
+    progress.start(2)
+
+    progress.fail(ValueError("boom"), will_retry=True)
+
+    status = jobs.read(table, "job-4")
+    assert (status["status"], status["error"], status["error_type"]) == ("retrying", "boom", "ValueError")
+
+
+def test_read_missing_job(table):
+    assert jobs.read(table, "missing") is None
+
+
+@pytest.fixture
+def job_handler(aws, monkeypatch):
+    """SQS로 들어온 job을 처리하는 handler (분석 자체는 event["fail"]에 따라 성공/실패하는 가짜)"""
+    aws.ssm.parameters[handler.OPENAI_API_KEY_PARAM] = "sk-test"
+    monkeypatch.setenv("ANALYSIS_QUEUE_URL", QUEUE_URL)
+    monkeypatch.setenv("AI_ANALYSIS_TABLE", TABLE)
+    monkeypatch.setenv("S3_BUCKET", BUCKET)
+    monkeypatch.setenv("HISTORY_EXPORT_ENABLED", "false")
+
+    def _analyze(event, analysis_id, settings, api_key, timer, invocation_start, progress=None, **kwargs):
+        progress("fetch")
+        if event.get("fail"):
+            raise RuntimeError("analysis failed")
+        progress("upload")
+        return {"analysis_id": analysis_id, "analysis_path": "rule", "status": "success"}
+
+    monkeypatch.setattr(handler, "_analyze_repository", _analyze)
+    return lambda event: handler.lambda_handler(event, None)
+
+
+def _enqueue(invoke, analysis_id, **extra):
+    response = invoke({
+        "async": True, "analysis_id": analysis_id, "repository": "team/app", "commit_sha": analysis_id * 8, **extra
+    })
+    assert response["statusCode"] == 202
+
+
+def test_sqs_job_completes(aws, job_handler):
+    _enqueue(job_handler, "ok01")
+
+    event = aws.sqs.lambda_event(QUEUE_URL)
+    response = job_handler(event)
+    aws.sqs.settle(event, response)
+
+    assert response == {"batchItemFailures": []}
+    assert not aws.sqs.messages
+    status = json.loads(job_handler({"action": "job_status", "analysis_id": "ok01"})["body"])
+    assert status["status"] == "completed"
+    assert status["result"]["analysis_path"] == "rule"
+
+
+def test_sqs_job_retries_then_fails(aws, job_handler):
+    _enqueue(job_handler, "bad1", fail=True)
+
+    event = aws.sqs.lambda_event(QUEUE_URL)
+    response = job_handler(event)
+    assert response == {"batchItemFailures": [{"itemIdentifier": event["Records"][0]["messageId"]}]}
+    assert json.loads(job_handler({"action": "job_status", "analysis_id": "bad1"})["body"])["status"] == "retrying"
+    aws.sqs.settle(event, response)
+
+    # 마지막 시도(job_max_attempts)의 실패는 재시도하지 않고 failed로 남김
+    assert aws.sqs.drain(QUEUE_URL, job_handler) == 2
+
+    status = json.loads(job_handler({"action": "job_status", "analysis_id": "bad1"})["body"])
+    assert (status["status"], status["attempts"], status["error"]) == ("failed", 3, "analysis failed")
+    assert not aws.sqs.messages
+
+
+def test_unreadable_message_is_retried(aws, job_handler):
+    bad = aws.sqs.send_message(QueueUrl=QUEUE_URL, MessageBody="not json")
+    aws.sqs.send_message(QueueUrl=QUEUE_URL, MessageBody=json.dumps({
+        "analysis_id": "ok02", "repository": "team/app", "commit_sha": "b" * 40
+    }))
+
+    event = aws.sqs.lambda_event(QUEUE_URL, batch_size=2)
+    response = job_handler(event)
+
+    assert response["batchItemFailures"] == [{"itemIdentifier": bad["MessageId"]}]
@@ -0,0 +1,65 @@
+import json
+import os
+
+from botocore.exceptions import ClientError
+
+import handler
+from analyzers import right_sizing
+
+LAMBDA_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE = os.path.join(LAMBDA_ROOT, "fixtures", "utilization_samples.json")
+TABLE = "ai-analysis"
+
+
+def _fixture():
+    with open(FIXTURE) as f:
+        return json.load(f)
+
+
+def test_fixture_recommendation():
+    fixture = _fixture()
+
+    sizing = right_sizing.recommend(fixture["project_info"], fixture["samples"])
+
+    assert (sizing["cpu"], sizing["memory"]) == (256, 512)
+    assert (sizing["desired_count"], sizing["min_capacity"], sizing["max_capacity"]) == (2, 2, 4)
+    assert (sizing["cpu_target_value"], sizing["memory_target_value"]) == (76, 80)
+    assert sizing["monthly_cost_usd"] < sizing["baseline"]["monthly_cost_usd"]
+    assert (sizing["prior"], sizing["confidence"], sizing["samples"]) == ("framework:fastapi", "high", 48)
+
+
+def test_recorded_samples_drive_sizing(aws, monkeypatch):
+    monkeypatch.setenv("AI_ANALYSIS_TABLE", TABLE)
+    fixture = _fixture()
+
+    response = handler.lambda_handler(
+        {"action": "record_utilization", "repository": "team/api", "samples": fixture["samples"]}, None
+    )
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"])["samples"] == len(fixture["samples"])
+    sizing = handler._size_resources(TABLE, "team/api", fixture["project_info"])
+    assert (sizing["cpu"], sizing["memory"], sizing["cpu_target_value"]) == (256, 512, 76)
+
+
+def test_record_utilization_rejects_invalid_samples(aws):
+    missing = handler.lambda_handler({"action": "record_utilization", "repository": "team/api"}, None)
+    invalid = handler.lambda_handler(
+        {"action": "record_utilization", "repository": "team/api", "samples": [{"cpu_utilization": "high"}]}, None
+    )
+
+    assert (missing["statusCode"], invalid["statusCode"]) == (400, 400)
+
+
+def test_record_utilization_storage_error_returns_500(aws, monkeypatch):
+    def _throttled(*args, **kwargs):
+        raise ClientError({"Error": {"Code": "ProvisionedThroughputExceededException"}}, "PutItem")
+
+    monkeypatch.setattr(right_sizing, "record_samples", _throttled)
+
+    response = handler.lambda_handler(
+        {"action": "record_utilization", "repository": "team/api", "samples": [{"cpu_utilization": 10}]}, None
+    )
+
+    assert response["statusCode"] == 500
+    assert "ProvisionedThroughputExceeded" in json.loads(response["body"])["error"]
@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from analyzers import single_flight
+from analyzers.single_flight import SingleFlight
+
+KEY = single_flight.lease_key("team/app", "a" * 40)
+
+
+@pytest.fixture
+def table(aws):
+    return aws.dynamodb.Table("ai-analysis")
+
+
+def _flight(table, owner, sleep=None):
+    return SingleFlight(table, KEY, owner, sleep=sleep or (lambda seconds: None))
+
+
+def test_first_caller_is_leader(table):
+    assert _flight(table, "a").acquire_or_wait(10) == ("leader", None)
+    assert table.items[KEY]["lease_owner"] == "a"
+
+
+def test_follower_receives_leader_result(table):
+    leader = _flight(table, "a")
+    leader.acquire_or_wait(10)
+    sleeps = []
+
+    def _sleep(seconds):
+        # follower가 기다리는 동안 leader가 완료
+        sleeps.append(seconds)
+        leader.complete({"analysis_id": "a", "status": "success"})
+
+    role, result = _flight(table, "b", _sleep).acquire_or_wait(10)
+
+    assert (role, result) == ("follower", {"analysis_id": "a", "status": "success"})
+    assert sleeps == [single_flight.POLL_INITIAL_SECONDS]
+
+
+def test_result_completed_before_call_is_not_reused(table):
+    leader = _flight(table, "a")
+    leader.acquire_or_wait(10)
+    leader.complete({"analysis_id": "a"})
+    time.sleep(0.002)
+
+    assert _flight(table, "b").acquire_or_wait(10) == ("leader", None)
+
+
+def test_released_lease_is_taken_over(table):
+    leader = _flight(table, "a")
+    leader.acquire_or_wait(10)
+    before = single_flight.stats()["takeover"]
+
+    role, _ = _flight(table, "b", lambda seconds: leader.release()).acquire_or_wait(10)
+
+    assert role == "leader"
+    assert table.items[KEY]["lease_owner"] == "b"
+    assert single_flight.stats()["takeover"] == before + 1
+
+
+def test_expired_lease_is_taken_over(table):
+    _flight(table, "a").acquire_or_wait(10)
+    table.items[KEY]["expires_at"] = int(time.time()) - 1
+
+    assert _flight(table, "b").acquire_or_wait(10) == ("leader", None)
+
+
+def test_wait_times_out(table):
+    _flight(table, "a").acquire_or_wait(10)
+
+    assert _flight(table, "b").acquire_or_wait(0) == ("timeout", None)
+
+
+def test_too_large_result_releases_lease(table, monkeypatch):
+    monkeypatch.setattr(single_flight, "MAX_RESULT_BYTES", 64)
+    leader = _flight(table, "a")
+    leader.acquire_or_wait(10)
+
+    leader.complete({"analysis_id": "a", "specs": "x" * 100})
+
+    assert KEY not in table.items
+    assert _flight(table, "b").acquire_or_wait(10) == ("leader", None)
+
+
+def test_only_owner_can_complete_or_release(table):
+    _flight(table, "a").acquire_or_wait(10)
+    other = _flight(table, "b")
+
+    other.complete({"analysis_id": "b"})
+    other.release()
+
+    assert table.items[KEY]["lease_owner"] == "a"
+    assert table.items[KEY]["lease_status"] == "running"
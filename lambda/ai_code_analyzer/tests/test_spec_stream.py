@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+from analyzers.spec_stream import IncrementalSectionParser
+
+DELIMITERS = {"DOCKERFILE": "dockerfile", "TERRAFORM": "terraform_ecs", "APPSPEC": "appspec"}
+RESPONSE = (
+    "intro\n---DOCKERFILE---\nFROM python:3.11\nCMD [\"python\", \"app.py\"]\n"
+    "---TERRAFORM---\nresource \"aws_ecs_service\" \"app\" {}\n"
+    "---APPSPEC---\nversion: 0.0\n---\nResources: []\n"
+)
+
+
+def _stream(text, size):
+    parser = IncrementalSectionParser(DELIMITERS)
+    closed = []
+    for start in range(0, len(text), size):
+        closed.extend(parser.feed(text[start:start + size]))
+    closed.extend(parser.finish())
+    return parser, closed
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 13, len(RESPONSE)])
+def test_sections_close_in_order_for_any_chunking(size):
+    parser, closed = _stream(RESPONSE, size)
+
+    assert closed == [
+        ("dockerfile", 'FROM python:3.11\nCMD ["python", "app.py"]'),
+        ("terraform_ecs", 'resource "aws_ecs_service" "app" {}'),
+        # 본문 안의 YAML '---'에서 잘리지 않음
+        ("appspec", "version: 0.0\n---\nResources: []"),
+    ]
+    assert parser.text == RESPONSE
+
+
+def test_section_closes_as_soon_as_next_delimiter_arrives():
+    parser = IncrementalSectionParser(DELIMITERS)
+
+    assert parser.feed("---DOCKERFILE---\nFROM node:20\n---TERRA") == []
+    assert parser.feed("FORM---\n") == [("dockerfile", "FROM node:20")]
+
+
+def test_long_stream_is_linear():
+    # delta마다 전체 버퍼를 복사하면 수 초 걸리는 크기
+    body = "RUN echo step\n" * 40000
+    parser = IncrementalSectionParser(DELIMITERS)
+
+    start = time.perf_counter()
+    parser.feed("---DOCKERFILE---\n")
+    for line in body.splitlines(keepends=True):
+        for token in (line[:4], line[4:]):
+            parser.feed(token)
+    closed = parser.finish()
+
+    assert closed == [("dockerfile", body.strip())]
+    assert time.perf_counter() - start < 2.0